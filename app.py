@@ -1437,6 +1437,9 @@ def monitoring_dashboard():
         'latest': [a for a in alerts[:2]]  # Use the first two alerts as latest
     })
     
+    # Shared RapidAPI quota forecasts
+    rapidapi_quota = _rapidapi_quota_forecasts()
+    
     # Always use modern dashboard template
     logger.debug("Using modern dashboard template")
     return render_template(
@@ -1461,8 +1464,37 @@ def monitoring_dashboard():
         recent_activity=recent_activity,
         price_stats=price_stats,
         job_metrics=job_metrics,
-        report_metrics=report_metrics
+        report_metrics=report_metrics,
+        rapidapi_quota=rapidapi_quota
     )
+
+def _rapidapi_quota_forecasts():
+    """Get quota forecasts for every RapidAPI key in the shared ledger."""
+    from etl.quota_ledger import get_quota_ledger
+    
+    ledger = get_quota_ledger()
+    if ledger is None:
+        return []
+    try:
+        return ledger.forecast_all()
+    except Exception as e:
+        logger.error(f"Error reading RapidAPI quota ledger: {str(e)}")
+        return []
+
+@app.route('/monitoring/api/rapidapi-quota', methods=['GET'])
+def api_rapidapi_quota():
+    """API endpoint for RapidAPI quota usage and exhaustion forecasts"""
+    from etl.quota_ledger import get_quota_ledger
+    
+    forecasts = []
+    for forecast in _rapidapi_quota_forecasts():
+        forecast = dict(forecast)
+        forecast['daily_usage'] = get_quota_ledger().daily_usage(key_id=forecast['key_id'])
+        for field in ('period_end', 'exhaustion_at'):
+            if forecast[field]:
+                forecast[field] = forecast[field].isoformat()
+        forecasts.append(forecast)
+    return jsonify({"success": True, "data": forecasts})
     
 # All code related to the old monitoring_system function was completely removed
     
@@ -1551,104 +1583,132 @@ def api_location_data():
             'message': str(e)
         }), 500
         
+@app.route('/api/location/bbox', methods=['GET'])
+def api_location_bbox():
+    """
+    API endpoint for the map points inside the visible bounding box.
+    
+    With a zoom parameter, zoomed-out views get geohash clusters (count,
+    centroid and average price) instead of individual points.
+    """
+    try:
+        from utils.spatial_index import get_property_map_index
+        
+        south = request.args.get('south', type=float)
+        west = request.args.get('west', type=float)
+        north = request.args.get('north', type=float)
+        east = request.args.get('east', type=float)
+        limit = min(request.args.get('limit', default=1000, type=int), 5000)
+        
+        if None in (south, west, north, east):
+            return jsonify({
+                'status': 'error',
+                'message': 'south, west, north and east are required'
+            }), 400
+        if south > north:
+            return jsonify({
+                'status': 'error',
+                'message': 'south must not be greater than north'
+            }), 400
+        
+        zoom = request.args.get('zoom', type=float)
+        if zoom is not None:
+            # Clusters when zoomed out, individual points when zoomed in
+            view = get_property_map_index().view(south, west, north, east, zoom, limit=limit)
+            return jsonify({
+                'status': 'success',
+                'count': len(view['data']),
+                **view
+            })
+        
+        points, truncated = get_property_map_index().bbox(south, west, north, east, limit=limit)
+        
+        return jsonify({
+            'status': 'success',
+            'mode': 'points',
+            'count': len(points),
+            'truncated': truncated,
+            'data': points
+        })
+    except Exception as e:
+        logger.error(f"Error retrieving map points for bounding box: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/location/radius', methods=['GET'])
+def api_location_radius():
+    """API endpoint for the map points within a radius, nearest first."""
+    try:
+        from utils.spatial_index import get_property_map_index
+        
+        lat = request.args.get('lat', type=float)
+        lon = request.args.get('lon', type=float)
+        radius_km = min(request.args.get('radius_km', default=5.0, type=float), 100.0)
+        limit = min(request.args.get('limit', default=500, type=int), 5000)
+        
+        if lat is None or lon is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'lat and lon are required'
+            }), 400
+        
+        points = get_property_map_index().nearby(lat, lon, radius_km, limit=limit)
+        
+        return jsonify({
+            'status': 'success',
+            'count': len(points),
+            'truncated': len(points) >= limit,
+            'data': points
+        })
+    except Exception as e:
+        logger.error(f"Error retrieving map points for radius search: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+        
 @app.route('/api/price-trends', methods=['GET'])
 def api_price_trends():
-    """API endpoint for price trend data for visualization."""
+    """
+    API endpoint for price trend data for visualization.
+    
+    Reads the precomputed weekly/monthly rollups maintained by
+    utils/price_rollups.py rather than aggregating on each request.
+    """
     try:
-        from models import PriceTrend
-        from sqlalchemy import func
+        from datetime import datetime, timedelta
+        from utils.price_rollups import GRANULARITIES, LOCATION_TYPES, get_price_rollups, summarize_price_rollups
         
         # Get query parameters
         city = request.args.get('city')
         state = request.args.get('state')
         zip_code = request.args.get('zip_code')
         time_period = request.args.get('period', default='all')
+        granularity = request.args.get('granularity', default='month')
+        location_type = request.args.get('location_type')
+        
+        if granularity not in GRANULARITIES:
+            return jsonify({
+                'status': 'error',
+                'message': f"granularity must be one of: {', '.join(GRANULARITIES)}"
+            }), 400
+        if location_type and location_type not in LOCATION_TYPES:
+            return jsonify({
+                'status': 'error',
+                'message': f"location_type must be one of: {', '.join(LOCATION_TYPES)}"
+            }), 400
         
-        # Build query
-        query = PriceTrend.query
-        
-        # Apply filters if provided
-        if city:
-            query = query.filter(func.lower(PriceTrend.city) == city.lower())
-        if state:
-            query = query.filter(func.lower(PriceTrend.state) == state.lower())
-        if zip_code:
-            query = query.filter(PriceTrend.zip_code == zip_code)
-            
         # Apply time period filter
+        start_date = None
         if time_period != 'all':
-            from datetime import datetime, timedelta
-            end_date = datetime.now()
-            
-            if time_period == '1m':
-                start_date = end_date - timedelta(days=30)
-            elif time_period == '3m':
-                start_date = end_date - timedelta(days=90)
-            elif time_period == '6m':
-                start_date = end_date - timedelta(days=180)
-            elif time_period == '1y':
-                start_date = end_date - timedelta(days=365)
-            elif time_period == '2y':
-                start_date = end_date - timedelta(days=730)
-            else:
-                start_date = end_date - timedelta(days=30)  # Default to 1 month
-                
-            query = query.filter(PriceTrend.date >= start_date)
-        
-        # Order by date
-        query = query.order_by(PriceTrend.date)
-        
-        # Execute query
-        trends = query.all()
-        
-        # Convert to JSON-serializable format
-        trend_data = []
-        for trend in trends:
-            trend_data.append({
-                'id': trend.id,
-                'city': trend.city,
-                'state': trend.state,
-                'zip_code': trend.zip_code,
-                'date': trend.date.isoformat() if trend.date else None,
-                'median_price': float(trend.median_price) if trend.median_price else None,
-                'avg_price': float(trend.avg_price) if trend.avg_price else None,
-                'price_change': float(trend.price_change) if hasattr(trend, 'price_change') and trend.price_change is not None else None,
-                'properties_sold': trend.properties_sold if hasattr(trend, 'properties_sold') else None
-            })
+            period_days = {'1m': 30, '3m': 90, '6m': 180, '1y': 365, '2y': 730}
+            start_date = (datetime.now() - timedelta(days=period_days.get(time_period, 30))).date()
         
-        # Get aggregated statistics
-        stats = {}
-        if trend_data:
-            try:
-                # Calculate metrics by city
-                cities = {}
-                for trend in trend_data:
-                    city = trend['city']
-                    if city not in cities:
-                        cities[city] = {
-                            'median_prices': [],
-                            'avg_prices': [],
-                            'transactions': 0
-                        }
-                    
-                    if trend['median_price'] is not None:
-                        cities[city]['median_prices'].append(trend['median_price'])
-                    if trend['avg_price'] is not None:
-                        cities[city]['avg_prices'].append(trend['avg_price'])
-                    if trend['properties_sold'] is not None:
-                        cities[city]['transactions'] += trend['properties_sold']
-                
-                # Calculate aggregate stats
-                for city, data in cities.items():
-                    if data['median_prices']:
-                        cities[city]['avg_median_price'] = sum(data['median_prices']) / len(data['median_prices'])
-                    if data['avg_prices']:
-                        cities[city]['avg_avg_price'] = sum(data['avg_prices']) / len(data['avg_prices'])
-                
-                stats = cities
-            except Exception as calc_err:
-                logger.warning(f"Error calculating trend statistics: {str(calc_err)}")
-                stats = {}
+        trend_data = get_price_rollups(granularity=granularity, location_type=location_type, city=city,
+                                       state=state, zip_code=zip_code, start_date=start_date)
+        stats = summarize_price_rollups(trend_data)
         
         return jsonify({
             'status': 'success',
@@ -1842,12 +1902,20 @@ def monitoring_price_trends():
                           
 @app.route('/api/property/search', methods=['GET'])
 def api_property_search():
-    """API endpoint for searching properties."""
+    """
+    API endpoint for searching properties.
+    
+    ``address`` and ``owner`` are typo-tolerant: they are matched against
+    trigram-indexed normalized columns and results are ranked by similarity.
+    """
     try:
         from models import ModelsPropertyLocation
-        from sqlalchemy import func, or_
+        from sqlalchemy import func, or_, desc
+        from utils.address_search import normalize_search_text, rank_fuzzy_matches, set_similarity_threshold
         
         # Get filter parameters
+        address = normalize_search_text(request.args.get('address'))
+        owner = normalize_search_text(request.args.get('owner'))
         property_type = request.args.get('property_type')
         city = request.args.get('city')
         state = request.args.get('state')
@@ -1888,12 +1956,23 @@ def api_property_search():
         if max_baths:
             query = query.filter(ModelsPropertyLocation.bathrooms <= max_baths)
             
-        # Limit results and execute query
-        properties = query.order_by(ModelsPropertyLocation.id).limit(limit).all()
+        # Fuzzy address/owner matches, best match first
+        fuzzy_terms = []
+        if address:
+            fuzzy_terms.append((ModelsPropertyLocation.address_normalized, address))
+        if owner:
+            fuzzy_terms.append((ModelsPropertyLocation.owner_normalized, owner))
+        
+        if fuzzy_terms:
+            set_similarity_threshold(db.session)
+            rows = rank_fuzzy_matches(query, fuzzy_terms, ModelsPropertyLocation.id).limit(limit).all()
+        else:
+            # Limit results and execute query
+            rows = [(prop, None) for prop in query.order_by(ModelsPropertyLocation.id).limit(limit).all()]
         
         # Convert to JSON-serializable format
         results = []
-        for prop in properties:
+        for prop, similarity in rows:
             # Calculate price per square foot
             price_per_sqft = None
             if prop.price_value and prop.square_feet and prop.square_feet > 0:
@@ -1902,7 +1981,8 @@ def api_property_search():
             results.append({
                 'id': prop.id,
                 'property_type': prop.property_type,
-                'address': prop.street_address,
+                'address': prop.address,
+                'owner': prop.owner_name,
                 'city': prop.city,
                 'state': prop.state,
                 'zip_code': prop.zip_code,
@@ -1913,7 +1993,8 @@ def api_property_search():
                 'year_built': prop.year_built,
                 'price_per_sqft': price_per_sqft,
                 'latitude': float(prop.latitude) if prop.latitude else None,
-                'longitude': float(prop.longitude) if prop.longitude else None
+                'longitude': float(prop.longitude) if prop.longitude else None,
+                'similarity': round(float(similarity), 3) if similarity is not None else None
             })
         
         return jsonify({
@@ -2479,6 +2560,7 @@ def data_sources_manager():
             # Format the sources for display
             data_sources = []
             for source in sources_status:
+                latency = source.get('latency', {}).get('5m', {})
                 # Convert DB format to template format
                 formatted_source = {
                     'name': source.get('source_name', ''),
@@ -2495,8 +2577,12 @@ def data_sources_manager():
                         'avg_response_time': round(source.get('avg_response_time', 0), 2),
                         'requests': source.get('request_count', 0),
                         'errors': source.get('error_count', 0),
+                        'empty_responses': source.get('empty_count', 0),
                         'timeouts': 0,  # Not tracked separately yet
-                        'rate_limit_hits': 0  # Not tracked separately yet
+                        'rate_limit_hits': 0,  # Not tracked separately yet
+                        'latency_p50': latency.get('p50_ms'),
+                        'latency_p95': latency.get('p95_ms'),
+                        'latency_p99': latency.get('p99_ms')
                     }
                 }
                 data_sources.append(formatted_source)
@@ -450,6 +450,13 @@ def _get_all_data_sources(connector):
         health = source_connector.get_health_status()
         metrics = source_connector.get_metrics()
         
+        # Add latency percentiles and outcome counts tracked by the unified connector
+        latency = connector.get_source_latency(name, ['5m']).get('5m', {})
+        metrics['latency_p50'] = latency.get('p50_ms')
+        metrics['latency_p95'] = latency.get('p95_ms')
+        metrics['latency_p99'] = latency.get('p99_ms')
+        metrics['empty_responses'] = connector.source_status[name].empty_count if name in connector.source_status else 0
+        
         # Get status from database if available, otherwise use connector health
         db_status = source_status_dict.get(name, {})
         
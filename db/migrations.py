@@ -5,6 +5,7 @@ This module contains functions to be run periodically to ensure database health.
 import logging
 from sqlalchemy import text
 from core import db
+from utils.address_search import normalized_column_sql
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +55,149 @@ def create_performance_indexes():
         logger.error(f"Error creating performance indexes: {str(e)}")
         return False
 
+def create_property_search_indexes():
+    """
+    Add the normalized, trigram-indexed search columns to property_location.
+    Can be run multiple times safely due to IF NOT EXISTS clauses.
+    """
+    try:
+        logger.info("Creating property search indexes...")
+        
+        db.session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm;"))
+        
+        # Owner name and the generated normalized columns
+        db.session.execute(text("""
+            ALTER TABLE property_location ADD COLUMN IF NOT EXISTS owner_name VARCHAR(255);
+        """))
+        db.session.execute(text(f"""
+            ALTER TABLE property_location ADD COLUMN IF NOT EXISTS address_normalized TEXT
+            GENERATED ALWAYS AS ({normalized_column_sql('address')}) STORED;
+        """))
+        db.session.execute(text(f"""
+            ALTER TABLE property_location ADD COLUMN IF NOT EXISTS owner_normalized TEXT
+            GENERATED ALWAYS AS ({normalized_column_sql('owner_name')}) STORED;
+        """))
+        
+        # Trigram indexes for fuzzy address/owner search
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_property_location_address_trgm 
+            ON property_location USING gin (address_normalized gin_trgm_ops);
+        """))
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_property_location_owner_trgm 
+            ON property_location USING gin (owner_normalized gin_trgm_ops);
+        """))
+        
+        # Case-insensitive city/state filters
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_property_location_city_lower 
+            ON property_location (lower(city));
+        """))
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_property_location_state_lower 
+            ON property_location (lower(state));
+        """))
+        
+        db.session.commit()
+        logger.info("Property search indexes created successfully")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error creating property search indexes: {str(e)}")
+        return False
+
+def create_price_trend_indexes():
+    """
+    Add the unique (location_type, location_value, date) index that price
+    trend regeneration upserts on, removing duplicate rows first, and the
+    property_location indexes used by incremental price rollup refreshes.
+    Can be run multiple times safely due to IF NOT EXISTS clause.
+    """
+    try:
+        logger.info("Creating price trend indexes...")
+        
+        # Keep the newest row for each location and date
+        db.session.execute(text("""
+            DELETE FROM price_trend older
+            USING price_trend newer
+            WHERE older.id < newer.id
+              AND older.location_type IS NOT DISTINCT FROM newer.location_type
+              AND older.location_value IS NOT DISTINCT FROM newer.location_value
+              AND older.date = newer.date;
+        """))
+        db.session.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_price_trend_location_date 
+            ON price_trend (location_type, location_value, date);
+        """))
+        
+        # Change watermark and period scans for the price rollups (utils/price_rollups.py)
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_property_location_changed_at 
+            ON property_location ((coalesce(updated_at, created_at)));
+        """))
+        db.session.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_property_location_created_at 
+            ON property_location (created_at);
+        """))
+        
+        db.session.commit()
+        logger.info("Price trend indexes created successfully")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error creating price trend indexes: {str(e)}")
+        return False
+
+def create_price_rollup_triggers():
+    """
+    Record the previous bucket keys (city, state, zip code, created_at) of
+    property_location rows updated or deleted in a way that changes a price
+    rollup, so incremental rollup refreshes also recompute the buckets rows
+    moved out of (utils/price_rollups.py), whether or not updated_at was
+    bumped. Can be run multiple times safely.
+    """
+    try:
+        logger.info("Creating price rollup triggers...")
+        
+        db.session.execute(text("""
+            CREATE OR REPLACE FUNCTION price_rollup_record_change() RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO price_rollup_change (city, state, zip_code, created_at)
+                VALUES (OLD.city, OLD.state, OLD.zip_code, OLD.created_at);
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """))
+        db.session.execute(text("""
+            DROP TRIGGER IF EXISTS price_rollup_change_update ON property_location;
+            CREATE TRIGGER price_rollup_change_update
+            AFTER UPDATE OF city, state, zip_code, created_at, price_value, square_feet ON property_location
+            FOR EACH ROW
+            WHEN (OLD.city IS DISTINCT FROM NEW.city
+                  OR OLD.state IS DISTINCT FROM NEW.state
+                  OR OLD.zip_code IS DISTINCT FROM NEW.zip_code
+                  OR OLD.created_at IS DISTINCT FROM NEW.created_at
+                  OR OLD.price_value IS DISTINCT FROM NEW.price_value
+                  OR OLD.square_feet IS DISTINCT FROM NEW.square_feet)
+            EXECUTE FUNCTION price_rollup_record_change();
+        """))
+        db.session.execute(text("""
+            DROP TRIGGER IF EXISTS price_rollup_change_delete ON property_location;
+            CREATE TRIGGER price_rollup_change_delete
+            AFTER DELETE ON property_location
+            FOR EACH ROW
+            WHEN (OLD.price_value IS NOT NULL)
+            EXECUTE FUNCTION price_rollup_record_change();
+        """))
+        
+        db.session.commit()
+        logger.info("Price rollup triggers created successfully")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error creating price rollup triggers: {str(e)}")
+        return False
+
 def run_migrations():
     """
     Run all database migrations in the correct order.
@@ -64,6 +208,15 @@ def run_migrations():
         # Create indexes for performance
         create_performance_indexes()
         
+        # Trigram indexes for property search
+        create_property_search_indexes()
+        
+        # Unique key for price trend upserts
+        create_price_trend_indexes()
+        
+        # Previous bucket keys for incremental price rollup refreshes
+        create_price_rollup_triggers()
+        
         logger.info("Database migrations completed successfully")
         return True
     except Exception as e:
@@ -0,0 +1,138 @@
+"""
+Assessment-roll snapshot ETL.
+
+This module copies the Benton County assessment roll (parcels, owners,
+situs addresses and values) from the PACS database into the local
+PostgreSQL snapshot used for fast property searches
+(regional/assessment_roll.py). Schedule it like any other ETL plugin,
+e.g. nightly.
+"""
+
+import logging
+from typing import Any, Dict, Iterator, Optional
+
+from etl.base import BaseETL
+from regional.assessment_roll import AssessmentRollStore, get_assessment_roll_store
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# One pass over the Property table; values only, no per-parcel detail
+ROLL_SQL = """
+    SELECT
+        ParcelId, ParcelNumber, SitusAddress, OwnerName, PropertyClass,
+        LandValue, ImprovementValue, MarketValue, AssessedValue,
+        AssessmentYear, TaxYear
+    FROM Property
+"""
+
+
+def _clean_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+class AssessmentRollSnapshotETL(BaseETL):
+    """
+    Snapshot the PACS assessment roll into local PostgreSQL tables.
+
+    Rows are streamed from PACS in batches and upserted as they arrive, so
+    the roll is never held in memory.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the ETL.
+
+        Args:
+            config (Dict[str, Any], optional): Supports 'fetch_size' (rows per
+                PACS fetch, default 5000) and 'batch_size' (rows per upsert,
+                default 5000)
+        """
+        super().__init__(config)
+        self.fetch_size = int(self.config.get('fetch_size', 5000))
+        self.batch_size = int(self.config.get('batch_size', 5000))
+        self.store: Optional[AssessmentRollStore] = None
+
+    def extract(self) -> Iterator[tuple]:
+        """
+        Stream assessment roll rows from PACS.
+
+        Returns:
+            Iterator[tuple]: Property rows in ROLL_SQL column order
+        """
+        # Imported here so plugin discovery works without the ODBC driver
+        from regional.benton_pacs_connector import get_pacs_pool
+
+        def rows():
+            with get_pacs_pool().connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(ROLL_SQL)
+                while True:
+                    batch = cursor.fetchmany(self.fetch_size)
+                    if not batch:
+                        break
+                    yield from batch
+                cursor.close()
+
+        return rows()
+
+    def transform(self, raw_data: Iterator[tuple]) -> Iterator[Dict[str, Any]]:
+        """
+        Map PACS rows to snapshot columns.
+
+        Args:
+            raw_data: Property rows from extract()
+
+        Returns:
+            Iterator[Dict[str, Any]]: Rows keyed by snapshot column name
+        """
+        for row in raw_data:
+            parcel_id = _clean_text(row[0])
+            if not parcel_id:
+                continue
+            yield {
+                'parcel_id': parcel_id,
+                'parcel_number': _clean_text(row[1]),
+                'situs_address': _clean_text(row[2]),
+                'owner_name': _clean_text(row[3]),
+                'property_class': _clean_text(row[4]),
+                'land_value': row[5],
+                'improvement_value': row[6],
+                'market_value': row[7],
+                'assessed_value': row[8],
+                'assessment_year': row[9],
+                'tax_year': row[10],
+            }
+
+    def load(self, processed_data: Iterator[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Replace the local snapshot with the streamed rows.
+
+        Args:
+            processed_data: Rows from transform()
+
+        Returns:
+            Dict[str, Any]: snapshot_id, records_processed, records_removed and
+                owners_backfilled (property locations given an owner name)
+        """
+        self.store = self.store or get_assessment_roll_store()
+        if self.store is None:
+            raise RuntimeError("No database configured for the assessment roll snapshot "
+                               "(set ASSESSMENT_ROLL_DATABASE_URL or DATABASE_URL)")
+        result = self.store.load(processed_data, batch_size=self.batch_size)
+        result['owners_backfilled'] = self._backfill_owner_names()
+        return result
+
+    @staticmethod
+    def _backfill_owner_names() -> int:
+        # Property locations are owned by the web app's database; skip quietly
+        # when the ETL runs without it
+        try:
+            from utils.location_data import backfill_owner_names
+            return backfill_owner_names()
+        except Exception as e:
+            logger.warning(f"Owner name backfill skipped: {str(e)}")
+            return 0
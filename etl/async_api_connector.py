@@ -0,0 +1,440 @@
+"""
+Async API connector base class for real estate data services.
+
+This module defines an asyncio variant of the BaseApiConnector contract so
+bulk jobs can keep many requests in flight on a single thread, along with
+adapters that let synchronous callers use async connectors (and vice versa).
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Dict, Iterable, List, Optional
+
+import requests
+
+from etl.base_api_connector import BaseApiConnector
+from etl.quota_ledger import record_rapidapi_usage
+
+# Conditional imports based on available modules
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+class AsyncBaseApiConnector(ABC):
+    """
+    Abstract base class for asyncio real estate data API connectors.
+
+    Mirrors the BaseApiConnector interface with coroutine methods. Requests
+    share one aiohttp session per connector and are bounded by a semaphore
+    (``max_concurrency``), while ``min_request_interval`` still spaces out
+    request starts to respect provider rate limits.
+
+    If aiohttp is not installed, requests fall back to the blocking
+    ``requests`` library executed in the default thread pool.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Initialize the async API connector.
+
+        Args:
+            **kwargs: Additional connector-specific configuration options
+                - min_request_interval (float): Minimum seconds between request starts
+                - max_concurrency (int): Maximum number of requests in flight
+                - timeout (float): Total request timeout in seconds
+                - priority (str): Source priority
+        """
+        self.name = self.__class__.__name__
+        self.rate_limit_remaining = None
+        self.rate_limit_reset = None
+        self.quota_api_key = None  # RapidAPI key whose usage is recorded in the quota ledger
+        self.last_request_time = 0
+        self.min_request_interval = kwargs.get('min_request_interval', 0.0)
+        self.max_concurrency = kwargs.get('max_concurrency', 50)
+        self.timeout = kwargs.get('timeout', 30)
+        self.is_authenticated = False
+        self.source_priority = kwargs.get('priority', 'secondary')
+
+        self._session = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._throttle_lock: Optional[asyncio.Lock] = None
+
+        # Initialize connector metrics
+        self.metrics = {
+            'requests': 0,
+            'errors': 0,
+            'timeouts': 0,
+            'rate_limit_hits': 0,
+            'total_response_time': 0,
+        }
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _ensure_primitives(self):
+        """Create loop-bound primitives lazily, inside the running event loop."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._throttle_lock = asyncio.Lock()
+
+    async def _get_session(self):
+        """Get (or create) the shared aiohttp session."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency)
+            )
+        return self._session
+
+    async def _throttle_requests(self):
+        """
+        Space out request starts by at least min_request_interval.
+
+        Unlike the synchronous version this only serializes the start of each
+        request; responses are still awaited concurrently.
+        """
+        if self.min_request_interval <= 0:
+            return
+        async with self._throttle_lock:
+            elapsed = time.time() - self.last_request_time
+            if elapsed < self.min_request_interval:
+                await asyncio.sleep(self.min_request_interval - elapsed)
+            self.last_request_time = time.time()
+
+    def _update_rate_limits(self, headers):
+        """
+        Update rate limit information from response headers.
+
+        Args:
+            headers: Response headers that may contain rate limit information
+        """
+        if 'X-RateLimit-Remaining' in headers:
+            self.rate_limit_remaining = int(headers['X-RateLimit-Remaining'])
+
+        if 'X-RateLimit-Reset' in headers:
+            self.rate_limit_reset = int(headers['X-RateLimit-Reset'])
+
+        record_rapidapi_usage(self.quota_api_key, self.name, headers)
+
+    def _update_metrics(self, success: bool, response_time: float, error_type: Optional[str] = None):
+        """
+        Update request metrics for monitoring and diagnostics.
+
+        Args:
+            success (bool): Whether the request was successful
+            response_time (float): Time taken for the request in seconds
+            error_type (str, optional): Type of error if request failed
+        """
+        self.metrics['requests'] += 1
+        self.metrics['total_response_time'] += response_time
+
+        if not success:
+            self.metrics['errors'] += 1
+
+            if error_type == 'timeout':
+                self.metrics['timeouts'] += 1
+            elif error_type == 'rate_limit':
+                self.metrics['rate_limit_hits'] += 1
+
+    async def _request_json(self, method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                            headers: Optional[Dict[str, str]] = None,
+                            json_body: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Make a throttled, concurrency-bounded HTTP request and decode JSON.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            params (Dict[str, Any], optional): Query parameters
+            headers (Dict[str, str], optional): Request headers
+            json_body (Dict[str, Any], optional): JSON request body
+
+        Returns:
+            Any: Decoded JSON response
+
+        Raises:
+            Exception: On HTTP, timeout or decoding errors
+        """
+        self._ensure_primitives()
+        async with self._semaphore:
+            await self._throttle_requests()
+            start_time = time.time()
+            error_type = None
+            try:
+                if HAS_AIOHTTP:
+                    session = await self._get_session()
+                    async with session.request(method, url, params=params, headers=headers,
+                                               json=json_body) as response:
+                        self._update_rate_limits(response.headers)
+                        if response.status == 429:
+                            error_type = 'rate_limit'
+                        response.raise_for_status()
+                        data = await response.json(content_type=None)
+                else:
+                    response = await asyncio.to_thread(
+                        requests.request, method, url, params=params, headers=headers,
+                        json=json_body, timeout=self.timeout
+                    )
+                    self._update_rate_limits(response.headers)
+                    if response.status_code == 429:
+                        error_type = 'rate_limit'
+                    response.raise_for_status()
+                    data = response.json()
+
+                self._update_metrics(True, time.time() - start_time)
+                return data
+            except (asyncio.TimeoutError, requests.exceptions.Timeout):
+                self._update_metrics(False, time.time() - start_time, 'timeout')
+                logger.error(f"{self.name} request timed out: {url}")
+                raise
+            except Exception as e:
+                self._update_metrics(False, time.time() - start_time, error_type)
+                logger.error(f"{self.name} request error: {str(e)}")
+                raise
+
+    async def gather_bounded(self, coros: Iterable[Awaitable[Any]]) -> List[Any]:
+        """
+        Run coroutines concurrently, returning results (or exceptions) in order.
+
+        Concurrency is bounded by the connector's request semaphore, so this
+        can safely be given thousands of coroutines.
+
+        Args:
+            coros: Coroutines that call this connector
+
+        Returns:
+            List[Any]: Results in input order; failed calls yield the exception
+        """
+        return await asyncio.gather(*coros, return_exceptions=True)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get current metrics for this connector.
+
+        Returns:
+            Dict[str, Any]: Current metrics data
+        """
+        request_count = self.metrics['requests']
+        metrics = {**self.metrics}
+
+        if request_count > 0:
+            metrics['avg_response_time'] = self.metrics['total_response_time'] / request_count
+            metrics['error_rate'] = self.metrics['errors'] / request_count
+        else:
+            metrics['avg_response_time'] = 0
+            metrics['error_rate'] = 0
+
+        return metrics
+
+    def reset_metrics(self):
+        """Reset all metrics counters to zero."""
+        for key in self.metrics:
+            self.metrics[key] = 0
+
+    def get_health_status(self) -> Dict[str, Any]:
+        """
+        Get the current health status of this data source connector.
+
+        Returns:
+            Dict[str, Any]: Health status information
+        """
+        return BaseApiConnector.get_health_status(self)
+
+    @abstractmethod
+    async def search_properties(self, location: str, **kwargs) -> Dict[str, Any]:
+        """
+        Search for properties in a specific location.
+
+        Args:
+            location (str): Location to search (city, zip code, address, etc.)
+            **kwargs: Additional search parameters
+
+        Returns:
+            Dict[str, Any]: Search results
+        """
+        pass
+
+    @abstractmethod
+    async def get_property_details(self, property_id: str) -> Dict[str, Any]:
+        """
+        Get detailed information for a specific property.
+
+        Args:
+            property_id (str): Property identifier
+
+        Returns:
+            Dict[str, Any]: Property details
+        """
+        pass
+
+    @abstractmethod
+    async def get_market_trends(self, location: str, **kwargs) -> Dict[str, Any]:
+        """
+        Get market trends data for a specific location.
+
+        Args:
+            location (str): Location to analyze (city, zip code, etc.)
+            **kwargs: Additional parameters
+
+        Returns:
+            Dict[str, Any]: Market trend data
+        """
+        pass
+
+    @abstractmethod
+    def standardize_property(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert provider-specific property data to a standardized format.
+
+        Args:
+            data (Dict[str, Any]): Original property data from the provider
+
+        Returns:
+            Dict[str, Any]: Standardized property data
+        """
+        pass
+
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        logger.info(f"{self.name} async session closed")
+
+
+class SyncApiConnectorAdapter(BaseApiConnector):
+    """
+    Expose an AsyncBaseApiConnector through the synchronous BaseApiConnector API.
+
+    The async connector runs on a private event loop in a daemon thread, so
+    the adapter can be used from Flask views, scheduled jobs and other
+    synchronous code (including code already running inside an event loop).
+    """
+
+    def __init__(self, async_connector: AsyncBaseApiConnector, **kwargs):
+        """
+        Initialize the adapter.
+
+        Args:
+            async_connector (AsyncBaseApiConnector): The connector to wrap
+            **kwargs: Additional BaseApiConnector configuration options
+        """
+        super().__init__(**kwargs)
+        self.async_connector = async_connector
+        self.name = f"{async_connector.name}(sync)"
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name=f"{async_connector.name}-loop",
+            daemon=True
+        )
+        self._thread.start()
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the adapter's event loop and wait for the result.
+
+        Args:
+            coro: Coroutine to run
+            timeout (float, optional): Seconds to wait before giving up
+
+        Returns:
+            Any: The coroutine's result
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return future.result(timeout)
+
+    def search_properties(self, location: str, **kwargs) -> Dict[str, Any]:
+        return self.run(self.async_connector.search_properties(location, **kwargs))
+
+    def get_property_details(self, property_id: str) -> Dict[str, Any]:
+        return self.run(self.async_connector.get_property_details(property_id))
+
+    def get_market_trends(self, location: str, **kwargs) -> Dict[str, Any]:
+        return self.run(self.async_connector.get_market_trends(location, **kwargs))
+
+    def standardize_property(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self.async_connector.standardize_property(data)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return self.async_connector.get_metrics()
+
+    def reset_metrics(self):
+        self.async_connector.reset_metrics()
+
+    def get_health_status(self) -> Dict[str, Any]:
+        return self.async_connector.get_health_status()
+
+    def close(self):
+        """Close the async connector and stop the event loop thread."""
+        if self._loop.is_closed():
+            return
+        try:
+            self.run(self.async_connector.close(), timeout=10)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+            self._loop.close()
+        logger.info(f"{self.name} session closed")
+
+
+class AsyncApiConnectorAdapter(AsyncBaseApiConnector):
+    """
+    Expose a synchronous BaseApiConnector through the async API.
+
+    Calls run in the default thread pool, bounded by ``max_concurrency``.
+    This lets fan-out code treat every connector uniformly until it gains
+    a native async implementation.
+    """
+
+    def __init__(self, sync_connector: BaseApiConnector, **kwargs):
+        """
+        Initialize the adapter.
+
+        Args:
+            sync_connector (BaseApiConnector): The connector to wrap
+            **kwargs: Additional AsyncBaseApiConnector configuration options
+        """
+        kwargs.setdefault('max_concurrency', 8)
+        super().__init__(**kwargs)
+        self.sync_connector = sync_connector
+        self.name = f"{sync_connector.name}(async)"
+
+    async def _call(self, func, *args, **kwargs):
+        self._ensure_primitives()
+        async with self._semaphore:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def search_properties(self, location: str, **kwargs) -> Dict[str, Any]:
+        return await self._call(self.sync_connector.search_properties, location, **kwargs)
+
+    async def get_property_details(self, property_id: str) -> Dict[str, Any]:
+        return await self._call(self.sync_connector.get_property_details, property_id)
+
+    async def get_market_trends(self, location: str, **kwargs) -> Dict[str, Any]:
+        return await self._call(self.sync_connector.get_market_trends, location, **kwargs)
+
+    def standardize_property(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self.sync_connector.standardize_property(data)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return self.sync_connector.get_metrics()
+
+    def get_health_status(self) -> Dict[str, Any]:
+        return self.sync_connector.get_health_status()
+
+    async def close(self):
+        await asyncio.to_thread(self.sync_connector.close)
@@ -12,6 +12,8 @@ import logging
 import requests
 import time
 import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Dict, Any, Optional, List, Union
 
 from etl.base_api_connector import BaseApiConnector
@@ -38,6 +40,8 @@ class AttomApiConnector(BaseApiConnector):
             **kwargs: Additional connector-specific configuration options
         """
         super().__init__(**kwargs)
+        self._executor = None
+        self._executor_lock = threading.Lock()
         
         # Set API key, using environment variable as fallback
         self.api_key = api_key or os.environ.get('ATTOM_API_KEY')
@@ -67,6 +71,7 @@ class AttomApiConnector(BaseApiConnector):
         }
         
         self.min_request_interval = kwargs.get('min_request_interval', 1.0)
+        self.max_concurrent_requests = kwargs.get('max_concurrent_requests', 4)
         self.source_priority = kwargs.get('priority', 'primary')
         self.is_authenticated = True
         logger.info("ATTOM API connector initialized successfully")
@@ -91,7 +96,6 @@ class AttomApiConnector(BaseApiConnector):
         
         try:
             start_time = time.time()
-            self.last_request_time = start_time
             self.metrics['requests'] += 1
             
             response = requests.get(
@@ -377,6 +381,138 @@ class AttomApiConnector(BaseApiConnector):
             logger.error(f"Error processing ATTOM neighborhood data: {str(e)}")
             return {}
     
+    # Parts of a property profile and the methods that fetch them
+    PROFILE_PARTS = {
+        'details': 'get_property_details',
+        'sales': 'get_property_sales',
+        'valuation': 'get_property_valuation',
+        'neighborhood': 'get_neighborhood_data',
+    }
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool used for concurrent requests, creating it on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrent_requests,
+                    thread_name_prefix='attom'
+                )
+            return self._executor
+    
+    def get_property_profile(self, property_id: str = None, address: str = None,
+                             zipcode: str = None, parts: Optional[List[str]] = None,
+                             timeout: Optional[float] = 60.0) -> Dict[str, Any]:
+        """
+        Get a full property profile: details, sales, valuation and neighborhood.
+        
+        The parts are requested concurrently (still spaced by the connector's
+        rate limit), so the profile takes about as long as the slowest call
+        rather than the sum of all of them. A part that fails, returns no
+        data or misses the timeout is reported in 'missing' and the rest of
+        the profile is still returned.
+        
+        The timeout only bounds how long this call waits. Parts still queued
+        when it expires are cancelled, but parts already running cannot be
+        stopped: they finish in the background (each request is limited by
+        its own 30 second timeout) and their calls still count against the
+        API quota.
+        
+        Args:
+            property_id (str, optional): ATTOM property ID
+            address (str, optional): Street address
+            zipcode (str, optional): ZIP code
+            parts (list, optional): Subset of PROFILE_PARTS to fetch (default: all)
+            timeout (float, optional): Seconds to wait for all parts
+        
+        Returns:
+            dict: One key per part with its raw data, 'property' (details
+                merged with sale, valuation and neighborhood data),
+                'standardized' (or None), 'missing', 'errors' and 'complete'
+        """
+        if not property_id and not (address and zipcode):
+            logger.warning("Either property_id or address+zipcode must be provided")
+            return {}
+        
+        parts = parts or list(self.PROFILE_PARTS)
+        unknown = set(parts) - set(self.PROFILE_PARTS)
+        if unknown:
+            raise ValueError(f"Unknown profile parts: {sorted(unknown)}")
+        
+        start_time = time.time()
+        executor = self._get_executor()
+        futures = {
+            executor.submit(getattr(self, self.PROFILE_PARTS[part]),
+                            property_id=property_id, address=address, zipcode=zipcode): part
+            for part in parts
+        }
+        done, not_done = wait(futures, timeout=timeout)
+        
+        profile = {part: {} for part in parts}
+        errors = {}
+        for future in not_done:
+            # Only stops parts that have not started yet
+            future.cancel()
+            errors[futures[future]] = "Timed out"
+        for future in done:
+            part = futures[future]
+            try:
+                profile[part] = future.result() or {}
+            except Exception as e:
+                logger.error(f"Error fetching ATTOM {part} data: {str(e)}")
+                errors[part] = str(e)
+        
+        missing = [part for part in parts if not profile[part]]
+        if missing:
+            logger.warning(f"ATTOM profile incomplete, missing: {', '.join(missing)}")
+        
+        merged = self._merge_profile(profile)
+        standardized = None
+        if merged:
+            try:
+                standardized = self.standardize_property(merged)
+            except ValueError as e:
+                logger.warning(f"Cannot standardize ATTOM profile: {str(e)}")
+        
+        profile.update({
+            'property': merged,
+            'standardized': standardized,
+            'missing': missing,
+            'errors': errors,
+            'complete': not missing,
+            'elapsed': round(time.time() - start_time, 3),
+        })
+        return profile
+    
+    @staticmethod
+    def _merge_profile(profile: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge profile parts into one ATTOM property record.
+        
+        Args:
+            profile (dict): Raw data per profile part
+        
+        Returns:
+            dict: Property details with sale, AVM and neighborhood data added
+        """
+        merged = dict(profile.get('details') or {})
+        sales = profile.get('sales') or {}
+        valuation = profile.get('valuation') or {}
+        neighborhood = profile.get('neighborhood') or {}
+        
+        for key in ('identifier', 'address', 'location'):
+            if not merged.get(key):
+                merged[key] = sales.get(key) or valuation.get(key) or {}
+        if sales:
+            if sales.get('sale'):
+                merged['sale'] = sales['sale']
+            merged['saleTransactions'] = sales.get('saleTransactions', [])
+        if valuation.get('avm'):
+            merged['avm'] = valuation['avm']
+        if neighborhood:
+            merged['neighborhood'] = neighborhood
+        
+        return merged if any(merged.values()) else {}
+    
     def get_property_history(self, property_id: str) -> List[Dict[str, Any]]:
         """
         Get property history (sales, loans, tax assessments).
@@ -680,4 +816,12 @@ class AttomApiConnector(BaseApiConnector):
             return {
                 'success': False,
                 'message': f"Connection test failed: {str(e)}"
-            }
\ No newline at end of file
+            }
+    
+    def close(self):
+        """Shut down the request thread pool."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        super().close()
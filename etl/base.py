@@ -29,6 +29,22 @@ class BaseETL(ABC):
         self.config = config or {}
         self.start_time = None
         self.end_time = None
+    
+    @classmethod
+    def rapidapi_requests(cls, config: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Estimate the RapidAPI requests one run makes.
+        
+        The scheduler checks the shared RapidAPI quota before starting plugins
+        that return a non-zero estimate.
+        
+        Args:
+            config (Dict[str, Any], optional): Configuration the plugin will run with
+            
+        Returns:
+            int: Estimated number of requests
+        """
+        return 0
         
     @abstractmethod
     def extract(self) -> Any:
@@ -7,10 +7,13 @@ ensuring consistent behavior across different data sources.
 
 import os
 import logging
+import threading
 import time
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional, Union
 
+from etl.quota_ledger import record_rapidapi_usage
+
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -34,7 +37,9 @@ class BaseApiConnector(ABC):
         self.name = self.__class__.__name__
         self.rate_limit_remaining = None
         self.rate_limit_reset = None
+        self.quota_api_key = None  # RapidAPI key whose usage is recorded in the quota ledger
         self.last_request_time = 0
+        self._throttle_lock = threading.Lock()
         self.min_request_interval = kwargs.get('min_request_interval', 1.0)  # Default 1 second
         self.is_authenticated = False
         self.source_priority = kwargs.get('priority', 'secondary')
@@ -54,14 +59,17 @@ class BaseApiConnector(ABC):
         
         This method ensures that requests are not sent too frequently,
         based on the minimum request interval configured for this connector.
+        Safe to call from several threads: each caller reserves the next free
+        start slot under a lock, then sleeps until that slot outside the lock.
         """
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            sleep_time = self.min_request_interval - elapsed
-            logger.debug(f"Throttling {self.name} request for {sleep_time:.2f}s")
-            time.sleep(sleep_time)
+        with self._throttle_lock:
+            now = time.time()
+            start = max(now, self.last_request_time + self.min_request_interval)
+            self.last_request_time = start
         
-        self.last_request_time = time.time()
+        if start > now:
+            logger.debug(f"Throttling {self.name} request for {start - now:.2f}s")
+            time.sleep(start - now)
     
     def _update_rate_limits(self, headers: Dict):
         """
@@ -77,6 +85,8 @@ class BaseApiConnector(ABC):
         
         if 'X-RateLimit-Reset' in headers:
             self.rate_limit_reset = int(headers['X-RateLimit-Reset'])
+        
+        record_rapidapi_usage(self.quota_api_key, self.name, headers)
     
     def _update_metrics(self, success: bool, response_time: float, error_type: Optional[str] = None):
         """
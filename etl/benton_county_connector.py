@@ -0,0 +1,128 @@
+"""
+Benton County assessor connector.
+
+This connector exposes the Benton County GIS parcel services through the
+BaseApiConnector interface so the county can take part in source failover.
+Parcel lookups support batching: the ArcGIS layers accept PARCELID IN (...)
+queries, so many parcels cost three requests per chunk instead of three
+requests per parcel.
+"""
+
+import logging
+from typing import Any, Dict, List
+
+from etl.base_api_connector import BaseApiConnector
+from regional import benton_gis_connector as gis
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class BentonCountyConnector(BaseApiConnector):
+    """
+    Connector for Benton County assessor parcel data.
+
+    Requires the BENTON_ASSESSOR_API_KEY environment variable.
+    """
+
+    # Parcel IDs per get_property_details_batch call
+    max_batch_size = gis.MAX_IN_LIST
+
+    def __init__(self, **kwargs):
+        """
+        Initialize the Benton County connector.
+
+        Args:
+            **kwargs: Additional connector-specific configuration options
+        """
+        super().__init__(**kwargs)
+        self.is_authenticated = gis.validate_api_key()
+
+    def search_properties(self, location: str, **kwargs) -> Dict[str, Any]:
+        """
+        Search parcels by parcel number, site address or owner name.
+
+        Args:
+            location (str): Search text
+            **kwargs: limit (int) - maximum number of results (default: 10)
+
+        Returns:
+            Dict[str, Any]: Search results
+        """
+        return gis.search_properties(location, limit=kwargs.get('limit', 10))
+
+    def get_property_details(self, property_id: str) -> Dict[str, Any]:
+        """
+        Get parcel, detail and value records for one parcel.
+
+        Args:
+            property_id (str): Parcel number (dashes are ignored)
+
+        Returns:
+            Dict[str, Any]: Property data, empty if the parcel does not exist
+
+        Raises:
+            RuntimeError: If the GIS service could not be queried
+        """
+        result = gis.get_property_data(property_id)
+        if 'property_data' in result:
+            return result['property_data']
+        if result.get('error') == 'property_not_found':
+            return {}
+        raise RuntimeError(result.get('message', 'Benton County GIS lookup failed'))
+
+    def get_property_details_batch(self, property_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get property data for many parcels with bulk IN-list queries.
+
+        Args:
+            property_ids (List[str]): Parcel numbers (dashes are ignored)
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Property data keyed by the IDs as passed
+                in; parcels not found are omitted
+        """
+        if not self.is_authenticated:
+            raise RuntimeError("Benton County Assessor API key is missing")
+
+        by_parcel = gis.get_property_data_many(property_ids)
+        results = {}
+        for property_id in property_ids:
+            data = by_parcel.get(str(property_id).replace('-', '').strip())
+            if data:
+                results[property_id] = data
+        return results
+
+    def get_market_trends(self, location: str, **kwargs) -> Dict[str, Any]:
+        """
+        Market trends are not published by the assessor.
+
+        Args:
+            location (str): Location to analyze
+            **kwargs: Ignored
+
+        Returns:
+            Dict[str, Any]: An empty trend result
+        """
+        return {'location': location, 'trends': [], 'source': 'benton_county'}
+
+    def standardize_property(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert Benton County parcel data to the standardized format.
+
+        Args:
+            data (Dict[str, Any]): Property data from get_property_details
+
+        Returns:
+            Dict[str, Any]: Standardized property data
+        """
+        parcel = data.get('parcel_data', {})
+        return {
+            'source': 'benton_county',
+            'external_id': data.get('property_id', ''),
+            'address_line1': data.get('address', ''),
+            'owner': data.get('owner', ''),
+            'legal_description': data.get('legal_description', ''),
+            'lot_size': parcel.get('ACRES', 0),
+            'raw_data': data
+        }
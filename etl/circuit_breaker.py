@@ -0,0 +1,212 @@
+"""
+Circuit breaker for real estate data sources.
+
+This module provides a time-based circuit breaker used by the unified
+real estate data connector to stop calling failing sources and to bring
+them back automatically once they recover.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Circuit states
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def exponential_backoff(attempt: int, base: float = 1.0, cap: float = 30.0,
+                        jitter: bool = True) -> float:
+    """
+    Calculate the delay before a retry attempt.
+
+    Args:
+        attempt (int): Retry attempt number, starting at 1
+        base (float): Delay for the first retry in seconds
+        cap (float): Maximum delay in seconds
+        jitter (bool): Whether to randomize the delay ("full jitter")
+
+    Returns:
+        float: Delay in seconds
+    """
+    delay = min(cap, base * (2 ** max(attempt - 1, 0)))
+    if jitter:
+        delay = random.uniform(0, delay)
+    return delay
+
+
+class CircuitBreaker:
+    """
+    Sliding-window circuit breaker with a half-open probe.
+
+    The breaker opens when ``failure_threshold`` failures are recorded within
+    the last ``failure_window`` seconds. After ``reset_after`` seconds it moves
+    to half-open and lets a single probe request through: a successful probe
+    closes the circuit, a failed probe re-opens it for twice as long (capped
+    at ``max_reset_after``).
+
+    A breaker can also be forced open, e.g. when an operator disables a
+    source. A forced-open breaker never half-opens on its own.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, failure_window: float = 300,
+                 reset_after: float = 60, max_reset_after: float = 3600,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            name (str): Name of the protected source (used for logging)
+            failure_threshold (int): Failures within the window that open the circuit
+            failure_window (float): Length of the sliding failure window in seconds
+            reset_after (float): Initial time in seconds before a half-open probe
+            max_reset_after (float): Upper bound for the backed-off open interval
+            clock (callable): Monotonic time source, injectable for testing
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.reset_after = reset_after
+        self.max_reset_after = max_reset_after
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures: Deque[float] = deque()
+        self._state = CLOSED
+        self._forced_open = False
+        self._opened_at: Optional[float] = None
+        self._open_interval = reset_after
+        self._consecutive_opens = 0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the interval has elapsed."""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """Whether requests are currently being rejected."""
+        return self.state == OPEN
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent to the source.
+
+        In the half-open state only one probe request is allowed at a time.
+
+        Returns:
+            bool: True if the caller may proceed
+        """
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                logger.info(f"Circuit half-open for {self.name}, sending probe request")
+                return True
+            return False
+
+    def record_success(self):
+        """Record a successful call, closing the circuit after a half-open probe."""
+        with self._lock:
+            if self._forced_open:
+                return
+            if self._state != CLOSED:
+                logger.info(f"Circuit closed for {self.name}")
+            self._state = CLOSED
+            self._failures.clear()
+            self._opened_at = None
+            self._open_interval = self.reset_after
+            self._consecutive_opens = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """Record a failed call, opening the circuit if the threshold is reached."""
+        with self._lock:
+            now = self._clock()
+            if self._state == HALF_OPEN:
+                # Failed probe - back off exponentially before the next one
+                self._open(now, self._open_interval * 2)
+                return
+
+            self._failures.append(now)
+            self._prune(now)
+            if self._state == CLOSED and len(self._failures) >= self.failure_threshold:
+                self._open(now, self.reset_after)
+
+    def force_open(self):
+        """Open the circuit until :meth:`reset` is called."""
+        with self._lock:
+            self._forced_open = True
+            self._state = OPEN
+            self._opened_at = self._clock()
+            self._probe_in_flight = False
+
+    def reset(self):
+        """Close the circuit and clear all failure history."""
+        with self._lock:
+            self._forced_open = False
+            self._state = CLOSED
+            self._failures.clear()
+            self._opened_at = None
+            self._open_interval = self.reset_after
+            self._consecutive_opens = 0
+            self._probe_in_flight = False
+
+    def recent_failures(self) -> int:
+        """Number of failures inside the sliding window."""
+        with self._lock:
+            self._prune(self._clock())
+            return len(self._failures)
+
+    def seconds_until_probe(self) -> float:
+        """Seconds remaining before the next half-open probe (0 if not open)."""
+        with self._lock:
+            if self._state != OPEN or self._forced_open or self._opened_at is None:
+                return 0.0
+            return max(0.0, self._opened_at + self._open_interval - self._clock())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        state = self.state
+        return {
+            'state': state,
+            'forced_open': self._forced_open,
+            'recent_failures': self.recent_failures(),
+            'open_interval': self._open_interval,
+            'seconds_until_probe': round(self.seconds_until_probe(), 1),
+            'consecutive_opens': self._consecutive_opens
+        }
+
+    def _open(self, now: float, interval: float):
+        self._state = OPEN
+        self._opened_at = now
+        self._open_interval = min(interval, self.max_reset_after)
+        self._consecutive_opens += 1
+        self._probe_in_flight = False
+        logger.warning(
+            f"Circuit breaker opened for {self.name} "
+            f"(retry in {self._open_interval:.0f}s)"
+        )
+
+    def _maybe_half_open(self):
+        if (self._state == OPEN and not self._forced_open and self._opened_at is not None
+                and self._clock() - self._opened_at >= self._open_interval):
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+
+    def _prune(self, now: float):
+        cutoff = now - self.failure_window
+        while self._failures and self._failures[0] < cutoff:
+            self._failures.popleft()
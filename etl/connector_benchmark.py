@@ -0,0 +1,293 @@
+"""
+Offline throughput benchmark for API connectors.
+
+Records a small sync workload (search, then detail lookups for the results)
+against the live APIs once, then replays it against a local ReplayServer
+to measure connector throughput without network access or API quota.
+
+Usage:
+    # Capture fixtures from the live APIs (requires API keys)
+    python -m etl.connector_benchmark record --connectors attom redfin
+
+    # Replay with 50ms latency, 2% injected 503s and 8 concurrent workers
+    python -m etl.connector_benchmark run --latency-ms 50 --error-rate 0.02 --concurrency 8
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from etl.replay import FixtureStore, RecordingTransport, ReplayServer, ReplayTransport
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_FIXTURE_DIR = os.path.join('tests', 'fixtures', 'connectors')
+DEFAULT_LOCATIONS = ['Richland, WA', 'Kennewick, WA', 'Pasco, WA']
+DEFAULT_ZIPS = ['99352', '99336', '99301']
+
+
+def _split_location(location: str):
+    parts = [p.strip() for p in location.split(',')]
+    return parts[0], (parts[1] if len(parts) > 1 else None)
+
+
+def _realtor_factory(live: bool):
+    from etl.realtor_api_connector import RealtorApiConnector
+    connector = RealtorApiConnector(api_key=os.environ.get('RAPIDAPI_KEY') if live else 'replay',
+                                    min_request_interval=0)
+    if not live:
+        # Replayed traffic does not use RapidAPI quota
+        connector.quota_api_key = None
+    return connector
+
+
+def _realtor_sync(connector, location: str, zip_code: str, max_details: int) -> int:
+    results = connector.search_properties(location)
+    ids = [p.get('source_id') for p in results.get('listings', []) if p.get('source_id')][:max_details]
+    for property_id in ids:
+        connector.get_property_details(property_id)
+    return len(ids)
+
+
+def _attom_factory(live: bool):
+    from etl.attom_api_connector import AttomApiConnector
+    return AttomApiConnector(api_key=os.environ.get('ATTOM_API_KEY') if live else 'replay',
+                             min_request_interval=0)
+
+
+def _attom_sync(connector, location: str, zip_code: str, max_details: int) -> int:
+    city, state = _split_location(location)
+    properties = connector.search_properties(city=city, state=state)
+    ids = []
+    for prop in properties:
+        attom_id = prop.get('identifier', {}).get('attomId') or prop.get('attomid')
+        if attom_id:
+            ids.append(str(attom_id))
+    for property_id in ids[:max_details]:
+        details = connector.get_property_details(property_id=property_id)
+        if details:
+            connector.standardize_property(details)
+    return min(len(ids), max_details)
+
+
+def _redfin_factory(live: bool):
+    from etl.redfin_api_connector import RedfinApiConnector
+    return RedfinApiConnector(min_request_interval=0)
+
+
+def _redfin_sync(connector, location: str, zip_code: str, max_details: int) -> int:
+    city, state = _split_location(location)
+    properties = connector.search_properties(city=city, state=state)
+    ids = [p.get('property_id') for p in properties if p.get('property_id')][:max_details]
+    for property_id in ids:
+        connector.get_property_details(str(property_id))
+    return len(ids)
+
+
+def _hud_factory(live: bool):
+    from etl.hud_api_connector import HudApiConnector
+    # Bypass the local dataset store so every lookup reaches the API
+    return HudApiConnector(api_key=os.environ.get('HUD_API_KEY') if live else 'replay',
+                           min_request_interval=0, use_dataset_store=False)
+
+
+def _hud_sync(connector, location: str, zip_code: str, max_details: int) -> int:
+    connector.get_market_trends(zipcode=zip_code)
+    results = connector.search_properties(zip_code)
+    return results.get('result_count', 0)
+
+
+# Connector name -> (factory(live) -> connector, sync(connector, location, zip, max_details) -> records).
+# Zillow is left out: its API plan has no search endpoint, so a workload would
+# only repeat one canned property detail request.
+CONNECTORS: Dict[str, Dict[str, Callable]] = {
+    'realtor': {'factory': _realtor_factory, 'sync': _realtor_sync},
+    'attom': {'factory': _attom_factory, 'sync': _attom_sync},
+    'redfin': {'factory': _redfin_factory, 'sync': _redfin_sync},
+    'hud': {'factory': _hud_factory, 'sync': _hud_sync},
+}
+
+
+def record(names: List[str], fixture_dir: str, locations: List[str], zips: List[str],
+           max_details: int) -> Dict[str, int]:
+    """
+    Run each connector's sync workload against the live API, recording responses.
+
+    Args:
+        names: Connector names to record
+        fixture_dir: Directory to write fixtures to
+        locations: "City, ST" locations to sync
+        zips: ZIP codes matching the locations
+        max_details: Maximum detail lookups per location
+
+    Returns:
+        Dict[str, int]: Number of responses recorded per connector
+    """
+    store = FixtureStore(fixture_dir)
+    recorded = {}
+    for name in names:
+        spec = CONNECTORS[name]
+        try:
+            connector = spec['factory'](True)
+        except Exception as e:
+            logger.error(f"Cannot create {name} connector: {str(e)}")
+            continue
+        with RecordingTransport(store) as transport:
+            for location, zip_code in zip(locations, zips):
+                try:
+                    spec['sync'](connector, location, zip_code, max_details)
+                except Exception as e:
+                    logger.error(f"Error recording {name} for {location}: {str(e)}")
+        recorded[name] = transport.recorded
+        logger.info(f"Recorded {transport.recorded} responses for {name}")
+    return recorded
+
+
+def run_benchmark(names: List[str], fixture_dir: str, locations: List[str], zips: List[str],
+                  max_details: int = 10, iterations: int = 5, concurrency: int = 1,
+                  latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                  error_status: int = 503, use_recorded_latency: bool = False,
+                  seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Replay each connector's sync workload against a local ReplayServer.
+
+    Each iteration syncs every location; iterations run on ``concurrency``
+    worker threads sharing one connector instance.
+
+    Args:
+        names: Connector names to benchmark
+        fixture_dir: Directory with recorded fixtures
+        locations: "City, ST" locations to sync
+        zips: ZIP codes matching the locations
+        max_details: Maximum detail lookups per location
+        iterations: Number of full sync passes per connector
+        concurrency: Worker threads running sync passes
+        latency_ms: Latency added by the replay server
+        jitter_ms: Random extra latency
+        error_rate: Fraction of requests answered with error_status
+        error_status: Status code for injected errors
+        use_recorded_latency: Replay recorded response times instead of latency_ms
+        seed: Random seed for jitter and error injection
+
+    Returns:
+        List[Dict[str, Any]]: One result row per connector
+    """
+    store = FixtureStore(fixture_dir)
+    fixture_count = store.load()
+    if not fixture_count:
+        logger.warning(f"No fixtures found in {fixture_dir}; record some first")
+
+    results = []
+    for name in names:
+        spec = CONNECTORS[name]
+        try:
+            connector = spec['factory'](False)
+        except Exception as e:
+            logger.error(f"Cannot create {name} connector: {str(e)}")
+            results.append({'connector': name, 'error': str(e)})
+            continue
+
+        server = ReplayServer(store, latency_ms=latency_ms, jitter_ms=jitter_ms,
+                              error_rate=error_rate, error_status=error_status,
+                              use_recorded_latency=use_recorded_latency, seed=seed)
+        sync_times: List[float] = []
+        records = 0
+
+        def sync_pass(_):
+            start = time.perf_counter()
+            count = 0
+            for location, zip_code in zip(locations, zips):
+                try:
+                    count += spec['sync'](connector, location, zip_code, max_details) or 0
+                except Exception as e:
+                    logger.debug(f"{name} sync error for {location}: {str(e)}")
+            return time.perf_counter() - start, count
+
+        with server, ReplayTransport(server):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                for elapsed, count in executor.map(sync_pass, range(iterations)):
+                    sync_times.append(elapsed)
+                    records += count
+            wall_time = time.perf_counter() - start
+            stats = dict(server.stats)
+
+        results.append({
+            'connector': name,
+            'iterations': iterations,
+            'concurrency': concurrency,
+            'http_requests': stats['requests'],
+            'fixture_misses': stats['misses'],
+            'injected_errors': stats['injected_errors'],
+            'records': records,
+            'wall_time_s': round(wall_time, 3),
+            'requests_per_sec': round(stats['requests'] / wall_time, 1) if wall_time else 0,
+            'sync_time_p50_s': round(statistics.median(sync_times), 3) if sync_times else None,
+            'sync_time_max_s': round(max(sync_times), 3) if sync_times else None,
+        })
+    return results
+
+
+def _print_table(rows: List[Dict[str, Any]]):
+    columns = ['connector', 'http_requests', 'requests_per_sec', 'sync_time_p50_s',
+               'sync_time_max_s', 'records', 'injected_errors', 'fixture_misses']
+    widths = {c: max(len(c), *(len(str(r.get(c, ''))) for r in rows)) for c in columns}
+    print('  '.join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        if 'error' in row:
+            print(f"{row['connector'].ljust(widths['connector'])}  error: {row['error']}")
+            continue
+        print('  '.join(str(row.get(c, '')).ljust(widths[c]) for c in columns))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Record and replay connector traffic to benchmark throughput")
+    parser.add_argument('mode', choices=['record', 'run'])
+    parser.add_argument('--connectors', nargs='+', default=sorted(CONNECTORS), choices=sorted(CONNECTORS))
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURE_DIR, help="Fixture directory")
+    parser.add_argument('--locations', nargs='+', default=DEFAULT_LOCATIONS)
+    parser.add_argument('--zips', nargs='+', default=DEFAULT_ZIPS)
+    parser.add_argument('--max-details', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--recorded-latency', action='store_true', help="Replay recorded response times")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    if len(args.zips) < len(args.locations):
+        parser.error("--zips must provide one ZIP code per location")
+
+    if args.mode == 'record':
+        recorded = record(args.connectors, args.fixtures, args.locations, args.zips, args.max_details)
+        print(json.dumps(recorded, indent=2))
+        return 0
+
+    rows = run_benchmark(
+        args.connectors, args.fixtures, args.locations, args.zips,
+        max_details=args.max_details, iterations=args.iterations, concurrency=args.concurrency,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        error_status=args.error_status, use_recorded_latency=args.recorded_latency, seed=args.seed
+    )
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        _print_table(rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
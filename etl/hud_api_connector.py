@@ -10,9 +10,10 @@ import json
 import logging
 import requests
 import time
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Callable, Optional, List, Tuple, Union
 
 from etl.base_api_connector import BaseApiConnector
+from etl.hud_dataset_store import HudDatasetStore, geo_key, get_default_hud_store, period_key
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -37,6 +38,11 @@ class HudApiConnector(BaseApiConnector):
         """
         super().__init__(**kwargs)
         
+        # Datasets are answered from the local store; the API refreshes it
+        self.use_dataset_store = kwargs.get('use_dataset_store', True)
+        self.refresh_datasets = kwargs.get('refresh_datasets', False)
+        self._dataset_store = kwargs.get('dataset_store')
+        
         # Set API key, using environment variable as fallback
         self.api_key = api_key or os.environ.get('HUD_API_KEY')
         if not self.api_key:
@@ -87,7 +93,6 @@ class HudApiConnector(BaseApiConnector):
         
         try:
             start_time = time.time()
-            self.last_request_time = start_time
             self.metrics['requests'] += 1
             
             response = requests.get(
@@ -126,8 +131,82 @@ class HudApiConnector(BaseApiConnector):
             self.metrics['errors'] += 1
             return {"error": f"Request error: {str(e)}"}
     
+    @property
+    def dataset_store(self) -> Optional[HudDatasetStore]:
+        """The local HUD dataset store, or None if disabled."""
+        if self._dataset_store is None and self.use_dataset_store:
+            self._dataset_store = get_default_hud_store()
+        return self._dataset_store if self.use_dataset_store else None
+    
+    @staticmethod
+    def _geography(zip_code: str = None, county: str = None, state: str = None,
+                   city: str = None, metro: str = None) -> Tuple[str, str]:
+        """Get the (geo_type, key) store key for the most specific location given."""
+        if zip_code:
+            return 'zip', geo_key('zip', zip_code)
+        if metro:
+            return 'metro', geo_key('metro', metro)
+        if county and state:
+            return 'county', geo_key('county', county, state)
+        if city and state:
+            return 'city', geo_key('city', city, state)
+        return 'state', geo_key('state', state)
+    
+    def _dataset_lookup(self, dataset: str, geography: Tuple[str, str], period: str,
+                        fetch: Callable[[], Any], default: Any) -> Any:
+        """
+        Answer a dataset lookup from the local store, calling the API on a miss.
+        
+        Args:
+            dataset (str): Dataset name ('fmr', 'il', 'usps', 'lihtc', 'chas')
+            geography (tuple): (geo_type, key) from _geography()
+            period (str): Period key
+            fetch (callable): Calls the API; returns the data or None on error
+            default: Returned if neither the store nor the API has the data
+        
+        Returns:
+            The dataset entry
+        """
+        geo_type, key = geography
+        store = self.dataset_store
+        if store is not None and not self.refresh_datasets:
+            data = store.get(dataset, geo_type, key, period)
+            if data is not None:
+                return data
+        
+        data = fetch()
+        if data is None:
+            # API unavailable: an outdated entry beats no data
+            if store is not None:
+                stale = store.get(dataset, geo_type, key, period, allow_stale=True)
+                if stale is not None:
+                    logger.warning(f"Serving stale HUD {dataset} data for {geo_type} {key}")
+                    return stale
+            return default
+        
+        if store is not None:
+            store.put(dataset, geo_type, key, data, period)
+        return data
+    
+    def _fetch_data(self, dataset: str, params: Dict[str, Any], default: Any,
+                    entity_id: str = None) -> Callable[[], Any]:
+        """Build a fetch callable returning the dataset's response data, or None on error."""
+        def fetch():
+            if not self.is_authenticated:
+                logger.warning("HUD API connector is not authenticated")
+                return None
+            endpoint = self.endpoints[dataset]
+            if entity_id:
+                endpoint = f"{endpoint}/{entity_id}"
+            response = self._make_request(endpoint, params)
+            if 'error' in response:
+                return None
+            return response.get('data', default)
+        return fetch
+    
     def get_fair_market_rents(self, zip_code: str = None, county: str = None, 
-                             state: str = None, year: int = None) -> Dict[str, Any]:
+                             state: str = None, year: int = None,
+                             metro: str = None) -> Dict[str, Any]:
         """
         Get Fair Market Rent data for a location.
         
@@ -136,6 +215,7 @@ class HudApiConnector(BaseApiConnector):
             county (str, optional): County name
             state (str, optional): State code
             year (int, optional): Year for data (defaults to most recent)
+            metro (str, optional): HUD metro area (CBSA) code, e.g. 'METRO28420M28420'
         
         Returns:
             dict: Fair Market Rent data
@@ -145,28 +225,28 @@ class HudApiConnector(BaseApiConnector):
         # Build query parameters
         if zip_code:
             params['zip'] = zip_code
+        elif metro:
+            pass  # The metro area's entity ID goes in the URL path
         elif county and state:
             params['county'] = county
             params['state'] = state
         elif state:
             params['state'] = state
         else:
-            logger.warning("Either zip_code, county+state, or state must be provided")
+            logger.warning("Either zip_code, metro, county+state, or state must be provided")
             return {}
         
         if year:
             params['year'] = year
         
-        # Make the request
-        response = self._make_request(self.endpoints['fmr'], params)
-        
-        if 'error' in response:
-            return {}
-        
-        return response.get('data', {})
+        return self._dataset_lookup(
+            'fmr', self._geography(zip_code, county, state, metro=metro), period_key(year),
+            self._fetch_data('fmr', params, {}, None if zip_code else metro), {}
+        )
     
     def get_income_limits(self, zip_code: str = None, county: str = None, 
-                         state: str = None, year: int = None) -> Dict[str, Any]:
+                         state: str = None, year: int = None,
+                         metro: str = None) -> Dict[str, Any]:
         """
         Get Income Limit data for a location.
         
@@ -175,6 +255,7 @@ class HudApiConnector(BaseApiConnector):
             county (str, optional): County name
             state (str, optional): State code
             year (int, optional): Year for data (defaults to most recent)
+            metro (str, optional): HUD metro area (CBSA) code, e.g. 'METRO28420M28420'
         
         Returns:
             dict: Income Limit data
@@ -184,25 +265,24 @@ class HudApiConnector(BaseApiConnector):
         # Build query parameters
         if zip_code:
             params['zip'] = zip_code
+        elif metro:
+            pass  # The metro area's entity ID goes in the URL path
         elif county and state:
             params['county'] = county
             params['state'] = state
         elif state:
             params['state'] = state
         else:
-            logger.warning("Either zip_code, county+state, or state must be provided")
+            logger.warning("Either zip_code, metro, county+state, or state must be provided")
             return {}
         
         if year:
             params['year'] = year
         
-        # Make the request
-        response = self._make_request(self.endpoints['il'], params)
-        
-        if 'error' in response:
-            return {}
-        
-        return response.get('data', {})
+        return self._dataset_lookup(
+            'il', self._geography(zip_code, county, state, metro=metro), period_key(year),
+            self._fetch_data('il', params, {}, None if zip_code else metro), {}
+        )
     
     def get_housing_counselors(self, zip_code: str = None, city: str = None, 
                               state: str = None, distance: int = 10) -> List[Dict[str, Any]]:
@@ -267,13 +347,10 @@ class HudApiConnector(BaseApiConnector):
         if quarter and 1 <= quarter <= 4:
             params['quarter'] = quarter
         
-        # Make the request
-        response = self._make_request(self.endpoints['usps'], params)
-        
-        if 'error' in response:
-            return {}
-        
-        return response.get('data', {})
+        return self._dataset_lookup(
+            'usps', ('zip', geo_key('zip', zip_code)), period_key(year, quarter),
+            self._fetch_data('usps', params, {}), {}
+        )
     
     def get_lihtc_properties(self, zip_code: str = None, city: str = None, 
                             state: str = None) -> List[Dict[str, Any]]:
@@ -302,13 +379,10 @@ class HudApiConnector(BaseApiConnector):
             logger.warning("Location parameters must be provided")
             return []
         
-        # Make the request
-        response = self._make_request(self.endpoints['lihtc'], params)
-        
-        if 'error' in response:
-            return []
-        
-        return response.get('data', [])
+        return self._dataset_lookup(
+            'lihtc', self._geography(zip_code, state=state, city=city), period_key(),
+            self._fetch_data('lihtc', params, []), []
+        )
     
     def get_chas_data(self, county: str = None, state: str = None, 
                      year: int = None) -> Dict[str, Any]:
@@ -337,13 +411,10 @@ class HudApiConnector(BaseApiConnector):
         if year:
             params['year'] = year
         
-        # Make the request
-        response = self._make_request(self.endpoints['chas'], params)
-        
-        if 'error' in response:
-            return {}
-        
-        return response.get('data', {})
+        return self._dataset_lookup(
+            'chas', self._geography(county=county, state=state), period_key(year),
+            self._fetch_data('chas', params, {}), {}
+        )
     
     def search_properties(self, location: str = None, **kwargs) -> Dict[str, Any]:
         """
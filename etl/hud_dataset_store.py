@@ -0,0 +1,212 @@
+"""
+Local store of HUD datasets.
+
+HUD Fair Market Rents, Income Limits, CHAS and LIHTC data change yearly and
+USPS vacancy data quarterly, so instead of calling the HUD API for every
+lookup the datasets are kept in a local SQLite table keyed by dataset and
+geography (zip, county, metro, city or state) and refreshed in bulk by the
+HudDatasetRefreshETL plugin (etl/hud_refresh_etl.py). Lookups are served
+from an in-memory copy of the table; the live API is only used to refresh
+entries or fill misses.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = os.path.join('cache', 'hud_datasets.sqlite')
+
+# Seconds after which an entry is refreshed from the live API
+DAY = 24 * 3600
+DATASET_MAX_AGE = {
+    'fmr': 400 * DAY,
+    'il': 400 * DAY,
+    'chas': 400 * DAY,
+    'lihtc': 400 * DAY,
+    'usps': 100 * DAY,
+}
+
+GEO_TYPES = ('zip', 'county', 'metro', 'city', 'state')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hud_dataset (
+    dataset TEXT NOT NULL,
+    geo_type TEXT NOT NULL,
+    geo_key TEXT NOT NULL,
+    period TEXT NOT NULL,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (dataset, geo_type, geo_key, period)
+);
+"""
+
+StoreKey = Tuple[str, str, str, str]
+
+
+def geo_key(geo_type: str, value: str, state: Optional[str] = None) -> str:
+    """
+    Build the normalized key for a geography.
+
+    Args:
+        geo_type (str): One of GEO_TYPES
+        value (str): ZIP code, county or city name, metro code or state code
+        state (str, optional): State code, qualifying county and city names
+
+    Returns:
+        str: Upper-case key, e.g. 'WA:BENTON' for a county
+    """
+    if geo_type not in GEO_TYPES:
+        raise ValueError(f"Unknown geography type: {geo_type}")
+    key = ' '.join(str(value).split()).upper()
+    if geo_type in ('county', 'city'):
+        if not state:
+            raise ValueError(f"A state is required for {geo_type} keys")
+        key = f"{state.strip().upper()}:{key}"
+    return key
+
+
+def period_key(year: Optional[int] = None, quarter: Optional[int] = None) -> str:
+    """Build the period key: 'latest', '2024' or '2024Q3'."""
+    if not year:
+        return 'latest'
+    return f"{year}Q{quarter}" if quarter else str(year)
+
+
+class HudDatasetStore:
+    """
+    SQLite-backed HUD dataset table with an in-memory read path.
+
+    The whole table is loaded into a dict on open (HUD datasets for the
+    configured areas are small), so lookups never touch SQLite; writes go
+    to both. All methods are thread-safe.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        """
+        Initialize the store, creating the SQLite file if needed.
+
+        Args:
+            path (str): SQLite file path (':memory:' for a private in-memory store)
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and path != ':memory:':
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._entries: Dict[StoreKey, Tuple[Any, float]] = {}
+        for dataset, geo_type, key, period, data, fetched_at in self._conn.execute(
+                "SELECT dataset, geo_type, geo_key, period, data, fetched_at FROM hud_dataset"):
+            self._entries[(dataset, geo_type, key, period)] = (json.loads(data), fetched_at)
+        self.stats = {'hits': 0, 'stale': 0, 'misses': 0}
+
+    def get(self, dataset: str, geo_type: str, key: str, period: str = 'latest',
+            allow_stale: bool = False) -> Optional[Any]:
+        """
+        Look up a dataset entry.
+
+        Args:
+            dataset (str): Dataset name ('fmr', 'il', 'chas', 'lihtc', 'usps')
+            geo_type (str): Geography type
+            key (str): Key from geo_key()
+            period (str): Key from period_key()
+            allow_stale (bool): Return entries older than the dataset's max age
+
+        Returns:
+            The stored data, or None if missing (or stale and not allowed)
+        """
+        entry = self._entries.get((dataset, geo_type, key, period))
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        data, fetched_at = entry
+        if time.time() - fetched_at > DATASET_MAX_AGE.get(dataset, 400 * DAY) and not allow_stale:
+            self.stats['stale'] += 1
+            return None
+        self.stats['hits'] += 1
+        return data
+
+    def put(self, dataset: str, geo_type: str, key: str, data: Any, period: str = 'latest'):
+        """
+        Store a dataset entry.
+
+        Args:
+            dataset (str): Dataset name
+            geo_type (str): Geography type
+            key (str): Key from geo_key()
+            data: JSON-serializable data
+            period (str): Key from period_key()
+        """
+        self.put_many([(dataset, geo_type, key, period, data)])
+
+    def put_many(self, rows: Iterable[Tuple[str, str, str, str, Any]]) -> int:
+        """
+        Store many entries in one transaction.
+
+        Args:
+            rows: (dataset, geo_type, key, period, data) tuples
+
+        Returns:
+            int: Number of entries stored
+        """
+        now = time.time()
+        rows = list(rows)
+        encoded = [(dataset, geo_type, key, period, json.dumps(data), now)
+                   for dataset, geo_type, key, period, data in rows]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO hud_dataset (dataset, geo_type, geo_key, period, data, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)", encoded
+            )
+            self._conn.commit()
+            for dataset, geo_type, key, period, data in rows:
+                self._entries[(dataset, geo_type, key, period)] = (data, now)
+        return len(rows)
+
+    def status(self) -> Dict[str, Any]:
+        """Get entry counts per dataset and lookup counters."""
+        counts: Dict[str, int] = {}
+        for dataset, _, _, _ in list(self._entries):
+            counts[dataset] = counts.get(dataset, 0) + 1
+        return {'entries': counts, **self.stats}
+
+    def close(self):
+        """Close the SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_default_store: Optional[HudDatasetStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_hud_store() -> Optional[HudDatasetStore]:
+    """
+    Get the HUD dataset store shared by all connectors.
+
+    The file is taken from HUD_DATASET_PATH (default cache/hud_datasets.sqlite);
+    setting it to an empty string disables the store.
+
+    Returns:
+        Optional[HudDatasetStore]: The shared store, or None if disabled or unavailable
+    """
+    global _default_store
+    path = os.environ.get('HUD_DATASET_PATH', DEFAULT_STORE_PATH)
+    if not path:
+        return None
+    with _default_store_lock:
+        if _default_store is None:
+            try:
+                _default_store = HudDatasetStore(path)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"HUD dataset store disabled: {str(e)}")
+                return None
+        return _default_store
@@ -0,0 +1,173 @@
+"""
+HUD dataset bulk refresh ETL.
+
+This module downloads HUD Fair Market Rents, Income Limits, USPS vacancy,
+LIHTC and CHAS data for the configured ZIP codes, counties and states into
+the local HUD dataset store (etl/hud_dataset_store.py), from which
+HudApiConnector answers lookups. Schedule it to run after HUD's yearly and
+quarterly releases.
+"""
+
+import logging
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from etl.base import BaseETL
+from etl.hud_api_connector import HudApiConnector
+from etl.hud_dataset_store import HudDatasetStore, geo_key, get_default_hud_store, period_key
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Datasets fetched for each kind of location
+LOCATION_DATASETS = {
+    'zip': ['fmr', 'il', 'usps', 'lihtc'],
+    'county': ['fmr', 'il', 'chas'],
+    'state': ['fmr', 'il', 'lihtc', 'chas'],
+}
+
+# Store row: (dataset, geo_type, key, period, data)
+StoreRow = Tuple[str, str, str, str, Any]
+
+
+def _env_list(name: str) -> List[str]:
+    return [item.strip() for item in os.environ.get(name, '').split(',') if item.strip()]
+
+
+def explode_state_data(dataset: str, state: str, data: Any, period: str) -> Iterator[StoreRow]:
+    """
+    Split a state-level response into county and metro area entries.
+
+    State-level FMR and Income Limit responses list every county
+    ('counties') and metro area ('metroareas'); each is stored under its
+    own key so county and metro lookups (get_fair_market_rents() and
+    get_income_limits() with county+state or metro) need no API call.
+
+    Args:
+        dataset (str): Dataset name
+        state (str): State code
+        data: State-level response data
+        period (str): Period key
+
+    Yields:
+        StoreRow: One row per county or metro area
+    """
+    if not isinstance(data, dict):
+        return
+    for county in data.get('counties') or []:
+        name = county.get('county_name') or county.get('countyname')
+        if name:
+            name = name[:-len(' County')] if name.endswith(' County') else name
+            yield dataset, 'county', geo_key('county', name, state), period, county
+    for metro in data.get('metroareas') or []:
+        code = metro.get('code') or metro.get('cbsa_code')
+        if code:
+            yield dataset, 'metro', geo_key('metro', code), period, metro
+
+
+class HudDatasetRefreshETL(BaseETL):
+    """
+    Refresh the local HUD dataset store from the HUD API.
+
+    Each dataset is downloaded once per location; empty or failed
+    responses leave the existing entry in place.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the ETL.
+
+        Args:
+            config (Dict[str, Any], optional): Supports 'zips', 'counties'
+                ('County:ST' strings), 'states' (default: HUD_REFRESH_ZIPS,
+                HUD_REFRESH_COUNTIES and HUD_REFRESH_STATES, comma separated)
+                and 'year' (default: latest)
+        """
+        super().__init__(config)
+        self.zips = self.config.get('zips') or _env_list('HUD_REFRESH_ZIPS')
+        self.counties = self.config.get('counties') or _env_list('HUD_REFRESH_COUNTIES')
+        self.states = self.config.get('states') or _env_list('HUD_REFRESH_STATES') or ['WA']
+        self.year = self.config.get('year')
+        self.connector = self.config.get('connector') or HudApiConnector(use_dataset_store=False)
+        self.store: Optional[HudDatasetStore] = self.config.get('store')
+
+    def _locations(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for zip_code in self.zips:
+            yield 'zip', {'zip_code': zip_code}
+        for county in self.counties:
+            name, _, state = county.rpartition(':')
+            if not name or not state:
+                logger.warning(f"Skipping county {county!r}: expected 'County:ST'")
+                continue
+            yield 'county', {'county': name.strip(), 'state': state.strip()}
+        for state in self.states:
+            yield 'state', {'state': state}
+
+    def _fetch(self, dataset: str, location: Dict[str, Any]) -> Any:
+        if dataset == 'fmr':
+            return self.connector.get_fair_market_rents(year=self.year, **location)
+        if dataset == 'il':
+            return self.connector.get_income_limits(year=self.year, **location)
+        if dataset == 'usps':
+            return self.connector.get_vacancy_data(location['zip_code'], year=self.year)
+        if dataset == 'lihtc':
+            return self.connector.get_lihtc_properties(location.get('zip_code'), state=location.get('state'))
+        if dataset == 'chas':
+            return self.connector.get_chas_data(location.get('county'), location['state'], year=self.year)
+        raise ValueError(f"Unknown HUD dataset: {dataset}")
+
+    def extract(self) -> List[Tuple[str, str, Dict[str, Any], Any]]:
+        """
+        Download every dataset for every configured location.
+
+        Returns:
+            List of (dataset, location type, location, data)
+        """
+        raw = []
+        for kind, location in self._locations():
+            for dataset in LOCATION_DATASETS[kind]:
+                data = self._fetch(dataset, location)
+                if data:
+                    raw.append((dataset, kind, location, data))
+                else:
+                    logger.warning(f"No HUD {dataset} data for {location}")
+        return raw
+
+    def transform(self, raw_data: List[Tuple[str, str, Dict[str, Any], Any]]) -> List[StoreRow]:
+        """
+        Key downloaded data for the store, splitting state data by county and metro.
+
+        Args:
+            raw_data: Output of extract()
+
+        Returns:
+            List[StoreRow]: Rows for HudDatasetStore.put_many()
+        """
+        rows = []
+        for dataset, kind, location, data in raw_data:
+            # Same keys the connector looks up; LIHTC has no year parameter
+            period = period_key() if dataset == 'lihtc' else period_key(self.year)
+            geography = HudApiConnector._geography(
+                location.get('zip_code'), location.get('county'), location.get('state')
+            )
+            rows.append((dataset, geography[0], geography[1], period, data))
+            if kind == 'state':
+                rows.extend(explode_state_data(dataset, location['state'], data, period))
+        return rows
+
+    def load(self, processed_data: List[StoreRow]) -> Dict[str, Any]:
+        """
+        Write the rows to the HUD dataset store.
+
+        Args:
+            processed_data: Output of transform()
+
+        Returns:
+            Dict[str, Any]: records_processed
+        """
+        self.store = self.store or get_default_hud_store()
+        if self.store is None:
+            raise RuntimeError("HUD dataset store is disabled (HUD_DATASET_PATH is empty)")
+        count = self.store.put_many(processed_data)
+        logger.info(f"Refreshed {count} HUD dataset entries")
+        return {'records_processed': count}
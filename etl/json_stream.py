@@ -0,0 +1,168 @@
+"""
+Incremental JSON array parsing for streamed API responses.
+
+Large search responses are a small envelope around one big array of
+results. ``iter_json_array`` reads such a document chunk by chunk and
+yields the array's items as soon as each one has fully arrived, so only
+the current item (plus one network chunk) is held in memory and the first
+result is available before the download finishes.
+
+The envelope before the array is walked with a small structural scanner;
+each array item is decoded with the C-accelerated ``json`` decoder.
+"""
+
+import json
+import logging
+from json.decoder import scanstring
+from typing import Any, Iterable, Iterator, List, Sequence
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = ' \t\n\r'
+_SCALAR_END = ',]}' + _WHITESPACE
+
+_decoder = json.JSONDecoder()
+
+
+class _NeedMoreData(Exception):
+    """The buffer ends before the current token does."""
+
+
+class _Scanner:
+    """Buffered reader over an iterable of text chunks."""
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk, dropping consumed text. Returns False at end of input."""
+        if self.eof:
+            return False
+        for chunk in self._chunks:
+            if chunk:
+                self.buffer = self.buffer[self.pos:] + chunk
+                self.pos = 0
+                return True
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of input)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def read_string(self) -> str:
+        while True:
+            try:
+                value, end = scanstring(self.buffer, self.pos + 1)
+            except ValueError:
+                if not self.fill():
+                    raise ValueError("Unterminated string in JSON stream")
+                continue
+            self.pos = end
+            return value
+
+    def skip_scalar(self):
+        while True:
+            end = self.pos
+            while end < len(self.buffer) and self.buffer[end] not in _SCALAR_END:
+                end += 1
+            if end < len(self.buffer) or not self.fill():
+                self.pos = end
+                return
+
+    def read_value(self) -> Any:
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Item not complete yet (or malformed, which shows at end of input)
+                if not self.fill():
+                    raise
+                continue
+            if end == len(self.buffer) and not self.eof and self.buffer[self.pos] not in '{["':
+                # A number may continue in the next chunk
+                if self.fill():
+                    continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks: Iterable[str], path: Sequence[str]) -> Iterator[Any]:
+    """
+    Yield the items of an array inside a streamed JSON document.
+
+    Args:
+        chunks: Text chunks of the document, in order
+        path: Object keys leading from the root to the array, e.g.
+            ('homes', 'results') for {"homes": {"results": [...]}};
+            an empty path means the root itself is the array
+
+    Yields:
+        Each array item, decoded
+
+    Raises:
+        ValueError: If the document is malformed
+    """
+    target = list(path)
+    scanner = _Scanner(chunks)
+    # Open containers: object key (None before the first key) or '[' for arrays
+    stack: List[Any] = []
+    expect_key = False
+
+    while True:
+        char = scanner.peek()
+        if not char:
+            return
+        if char in ',:':
+            scanner.pos += 1
+        elif char == '{':
+            scanner.pos += 1
+            stack.append(None)
+            expect_key = True
+        elif char == '[':
+            scanner.pos += 1
+            if stack == target:
+                yield from _iter_items(scanner)
+                return
+            stack.append('[')
+            expect_key = False
+        elif char in '}]':
+            scanner.pos += 1
+            if not stack:
+                raise ValueError("Unbalanced JSON stream")
+            stack.pop()
+            expect_key = bool(stack) and stack[-1] != '['
+        elif char == '"':
+            value = scanner.read_string()
+            if expect_key:
+                stack[-1] = value
+                expect_key = False
+            else:
+                expect_key = bool(stack) and stack[-1] != '['
+        else:
+            scanner.skip_scalar()
+            expect_key = bool(stack) and stack[-1] != '['
+
+
+def _iter_items(scanner: _Scanner) -> Iterator[Any]:
+    while True:
+        char = scanner.peek()
+        if char == ',':
+            scanner.pos += 1
+        elif char == ']':
+            scanner.pos += 1
+            return
+        elif not char:
+            raise ValueError("Unterminated array in JSON stream")
+        else:
+            yield scanner.read_value()
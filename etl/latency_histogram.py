@@ -0,0 +1,160 @@
+"""
+Sliding-window latency histograms for data sources.
+
+This module provides a fixed-memory latency histogram with per-outcome
+counters, used by the unified real estate data connector to report
+p50/p95/p99 response times for each source.
+"""
+
+import bisect
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+# Bucket upper bounds in milliseconds (the last bucket is unbounded)
+BUCKET_BOUNDS_MS = [
+    5, 10, 25, 50, 75, 100, 150, 250, 400, 600,
+    1000, 1500, 2500, 4000, 6000, 10000, 15000, 30000, 60000
+]
+
+# Call outcomes tracked per source
+OUTCOMES = ('success', 'empty', 'error')
+
+# Reporting windows in seconds
+WINDOWS = {
+    '1m': 60,
+    '5m': 300,
+    '15m': 900,
+    '1h': 3600,
+}
+
+
+class _Slice:
+    """Histogram counts for one time slice."""
+
+    __slots__ = ('start', 'buckets', 'outcomes', 'total_ms')
+
+    def __init__(self, start: float):
+        self.start = start
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+        self.total_ms = 0.0
+
+
+class LatencyHistogram:
+    """
+    Latency histogram over a sliding time window.
+
+    Samples are counted into fixed, roughly logarithmic buckets, grouped
+    into time slices of ``slice_seconds``. Only the slices covering the
+    longest reporting window are kept, so memory stays constant regardless
+    of request volume. Percentiles are interpolated within buckets.
+    """
+
+    def __init__(self, slice_seconds: int = 10, max_window: int = 3600,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize the histogram.
+
+        Args:
+            slice_seconds (int): Granularity of the sliding window in seconds
+            max_window (int): Longest window that can be reported in seconds
+            clock (callable): Time source, injectable for testing
+        """
+        self.slice_seconds = slice_seconds
+        self.max_window = max_window
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._slices: Deque[_Slice] = deque()
+        self.totals = dict.fromkeys(OUTCOMES, 0)
+
+    def record(self, elapsed_seconds: float, outcome: str = 'success'):
+        """
+        Record one call.
+
+        Args:
+            elapsed_seconds (float): Time taken for the call
+            outcome (str): One of 'success', 'empty' or 'error'
+        """
+        if outcome not in OUTCOMES:
+            raise ValueError(f"Unknown outcome: {outcome}")
+        elapsed_ms = max(elapsed_seconds, 0.0) * 1000
+        now = self._clock()
+        with self._lock:
+            current = self._current_slice(now)
+            current.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+            current.outcomes[outcome] += 1
+            current.total_ms += elapsed_ms
+            self.totals[outcome] += 1
+
+    def snapshot(self, window: str = '5m') -> Dict[str, Any]:
+        """
+        Summarize the calls recorded within a window.
+
+        Args:
+            window (str): One of the keys of WINDOWS
+
+        Returns:
+            Dict[str, Any]: Count, outcome counts, mean and percentiles (ms)
+        """
+        window_seconds = WINDOWS[window]
+        now = self._clock()
+        buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        outcomes = dict.fromkeys(OUTCOMES, 0)
+        total_ms = 0.0
+        with self._lock:
+            self._expire(now)
+            for s in self._slices:
+                if s.start + self.slice_seconds <= now - window_seconds:
+                    continue
+                for i, count in enumerate(s.buckets):
+                    buckets[i] += count
+                for outcome, count in s.outcomes.items():
+                    outcomes[outcome] += count
+                total_ms += s.total_ms
+
+        count = sum(buckets)
+        return {
+            'window': window,
+            'count': count,
+            **outcomes,
+            'mean_ms': round(total_ms / count, 1) if count else None,
+            'p50_ms': self._percentile(buckets, count, 0.50),
+            'p95_ms': self._percentile(buckets, count, 0.95),
+            'p99_ms': self._percentile(buckets, count, 0.99),
+        }
+
+    def summary(self, windows: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Snapshots for several windows, keyed by window name."""
+        return {w: self.snapshot(w) for w in (windows or list(WINDOWS))}
+
+    def _current_slice(self, now: float) -> _Slice:
+        start = now - (now % self.slice_seconds)
+        if not self._slices or self._slices[-1].start < start:
+            self._slices.append(_Slice(start))
+            self._expire(now)
+        return self._slices[-1]
+
+    def _expire(self, now: float):
+        cutoff = now - self.max_window - self.slice_seconds
+        while self._slices and self._slices[0].start < cutoff:
+            self._slices.popleft()
+
+    @staticmethod
+    def _percentile(buckets: List[int], count: int, q: float) -> Optional[float]:
+        if count == 0:
+            return None
+        rank = q * count
+        seen = 0
+        for i, bucket_count in enumerate(buckets):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = BUCKET_BOUNDS_MS[i - 1] if i > 0 else 0
+                if i == len(BUCKET_BOUNDS_MS):
+                    # Unbounded overflow bucket
+                    return float(lower)
+                upper = BUCKET_BOUNDS_MS[i]
+                fraction = (rank - seen) / bucket_count
+                return round(lower + (upper - lower) * fraction, 1)
+            seen += bucket_count
+        return float(BUCKET_BOUNDS_MS[-1])
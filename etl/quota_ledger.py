@@ -0,0 +1,402 @@
+"""
+Shared RapidAPI quota ledger.
+
+The Zillow and Realtor connectors draw on the same monthly RapidAPI quota.
+Every response made with a RapidAPI key is recorded here (requests per key
+per day and connector, plus the quota headers RapidAPI returns) in a local
+SQLite file shared by all jobs and processes. The ledger forecasts when
+each key's quota will run out and tells the ETL scheduler whether a job may
+start now or should be deferred, based on the job's priority.
+
+Keys are stored as a short fingerprint, never in full.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Mapping, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEDGER_PATH = os.path.join('cache', 'rapidapi_quota.sqlite')
+
+# Monthly request quota per key; 0 means use the limit reported by RapidAPI
+MONTHLY_QUOTA = int(os.environ.get('RAPIDAPI_MONTHLY_QUOTA', '0'))
+
+# Day of the month the quota resets when RapidAPI does not report it
+QUOTA_RESET_DAY = int(os.environ.get('RAPIDAPI_QUOTA_RESET_DAY', '1'))
+
+# Days of usage averaged for the burn-rate forecast
+FORECAST_WINDOW_DAYS = 7
+
+# Share of the monthly quota that must remain after a job of each priority
+PRIORITY_RESERVE = {
+    'critical': 0.0,
+    'high': 0.05,
+    'normal': 0.2,
+    'low': 0.4,
+}
+
+# Share of the even daily budget a job of each priority may bring the day to
+# (None: not paced)
+PRIORITY_PACING = {
+    'critical': None,
+    'high': None,
+    'normal': 1.0,
+    'low': 0.5,
+}
+
+# RapidAPI quota headers (lower case)
+LIMIT_HEADER = 'x-ratelimit-requests-limit'
+REMAINING_HEADER = 'x-ratelimit-requests-remaining'
+RESET_HEADER = 'x-ratelimit-requests-reset'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    key_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    connector TEXT NOT NULL,
+    requests INTEGER NOT NULL,
+    PRIMARY KEY (key_id, day, connector)
+);
+CREATE TABLE IF NOT EXISTS quota (
+    key_id TEXT PRIMARY KEY,
+    request_limit INTEGER,
+    remaining INTEGER,
+    reset_at REAL,
+    observed_at REAL NOT NULL
+);
+"""
+
+
+def key_fingerprint(api_key: str) -> str:
+    """Get the identifier a key is stored under."""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]
+
+
+def _period_bounds(today: date, reset_day: int = QUOTA_RESET_DAY):
+    """Get the first day of the current quota period and of the next one."""
+    reset_day = min(max(reset_day, 1), 28)
+    year, month = today.year, today.month
+    if today.day < reset_day:
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    start = date(year, month, reset_day)
+    year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return start, date(year, month, reset_day)
+
+
+@dataclass
+class QuotaDecision:
+    """Outcome of a job admission check."""
+    admitted: bool
+    reason: str
+    retry_at: Optional[datetime] = None
+
+
+class QuotaLedger:
+    """
+    SQLite-backed per-key, per-day RapidAPI usage ledger.
+
+    All methods are thread-safe; the SQLite file may be shared by several
+    processes.
+    """
+
+    def __init__(self, path: str = DEFAULT_LEDGER_PATH, monthly_quota: int = MONTHLY_QUOTA,
+                 reset_day: int = QUOTA_RESET_DAY, clock=time.time):
+        """
+        Initialize the ledger, creating the SQLite file if needed.
+
+        Args:
+            path (str): SQLite file path (':memory:' for a private in-memory ledger)
+            monthly_quota (int): Requests per key per month (0: use RapidAPI's reported limit)
+            reset_day (int): Day of the month the quota resets, if RapidAPI does not report it
+            clock (callable): Time source, in seconds since the epoch
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and path != ':memory:':
+            os.makedirs(directory, exist_ok=True)
+        self.monthly_quota = monthly_quota
+        self.reset_day = reset_day
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _today(self) -> date:
+        return datetime.utcfromtimestamp(self.clock()).date()
+
+    def record(self, api_key: str, connector: str, headers: Optional[Mapping[str, str]] = None,
+               requests: int = 1):
+        """
+        Record requests made with a key.
+
+        Args:
+            api_key (str): RapidAPI key
+            connector (str): Name of the connector that made the requests
+            headers (Mapping, optional): Response headers; RapidAPI quota headers are stored
+            requests (int): Number of requests
+        """
+        key_id = key_fingerprint(api_key)
+        now = self.clock()
+        quota = None
+        if headers:
+            lowered = {name.lower(): value for name, value in headers.items()}
+            try:
+                if REMAINING_HEADER in lowered:
+                    limit = lowered.get(LIMIT_HEADER)
+                    reset = lowered.get(RESET_HEADER)
+                    quota = (
+                        key_id,
+                        int(limit) if limit is not None else None,
+                        int(lowered[REMAINING_HEADER]),
+                        now + int(reset) if reset is not None else None,
+                        now,
+                    )
+            except ValueError:
+                logger.debug(f"Ignoring malformed RapidAPI quota headers from {connector}")
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO usage (key_id, day, connector, requests) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key_id, day, connector) DO UPDATE SET requests = requests + excluded.requests",
+                (key_id, self._today().isoformat(), connector, requests)
+            )
+            if quota:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO quota (key_id, request_limit, remaining, reset_at, observed_at) "
+                    "VALUES (?, ?, ?, ?, ?)", quota
+                )
+            self._conn.commit()
+
+    def daily_usage(self, api_key: Optional[str] = None, key_id: Optional[str] = None,
+                    days: int = FORECAST_WINDOW_DAYS) -> Dict[str, Dict[str, int]]:
+        """
+        Get requests per day and connector.
+
+        Args:
+            api_key (str, optional): RapidAPI key
+            key_id (str, optional): Key fingerprint, instead of the key
+            days (int): Number of days, including today
+
+        Returns:
+            Dict[str, Dict[str, int]]: {ISO day: {connector: requests}}
+        """
+        key_id = key_id or key_fingerprint(api_key)
+        since = (self._today() - timedelta(days=days - 1)).isoformat()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, connector, requests FROM usage WHERE key_id = ? AND day >= ? ORDER BY day",
+                (key_id, since)
+            ).fetchall()
+        usage: Dict[str, Dict[str, int]] = {}
+        for day, connector, requests in rows:
+            usage.setdefault(day, {})[connector] = requests
+        return usage
+
+    def forecast(self, api_key: Optional[str] = None, key_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Forecast quota use for the current period.
+
+        The burn rate is the average daily use over the last
+        FORECAST_WINDOW_DAYS days (or since the key was first used).
+
+        Args:
+            api_key (str, optional): RapidAPI key
+            key_id (str, optional): Key fingerprint, instead of the key
+
+        Returns:
+            Dict[str, Any]: key_id, quota, used, remaining, used_today,
+            daily_rate, period_end, exhaustion_at and status ('ok',
+            'at_risk', 'exhausted' or 'unknown' when no quota is known)
+        """
+        key_id = key_id or key_fingerprint(api_key)
+        now = self.clock()
+        today = self._today()
+        period_start, period_end = _period_bounds(today, self.reset_day)
+
+        with self._lock:
+            observed = self._conn.execute(
+                "SELECT request_limit, remaining, reset_at, observed_at FROM quota WHERE key_id = ?",
+                (key_id,)
+            ).fetchone()
+            used = self._conn.execute(
+                "SELECT COALESCE(SUM(requests), 0) FROM usage WHERE key_id = ? AND day >= ?",
+                (key_id, period_start.isoformat())
+            ).fetchone()[0]
+            first_day = self._conn.execute(
+                "SELECT MIN(day) FROM usage WHERE key_id = ?", (key_id,)
+            ).fetchone()[0]
+
+        period_end_at = datetime(period_end.year, period_end.month, period_end.day)
+        quota = self.monthly_quota or None
+        remaining = None
+        if observed:
+            limit, observed_remaining, reset_at, observed_at = observed
+            quota = quota or limit
+            # RapidAPI's own count also covers requests made outside this ledger
+            if reset_at and reset_at > now:
+                period_end_at = datetime.utcfromtimestamp(reset_at)
+                remaining = observed_remaining
+            elif not reset_at and datetime.utcfromtimestamp(observed_at).date() >= period_start:
+                remaining = observed_remaining
+        if quota and remaining is None:
+            remaining = max(quota - used, 0)
+
+        usage = self.daily_usage(key_id=key_id)
+        window = FORECAST_WINDOW_DAYS
+        if first_day:
+            window = min(window, (today - date.fromisoformat(first_day)).days + 1)
+        total = sum(sum(connectors.values()) for connectors in usage.values())
+        daily_rate = total / window
+        used_today = sum(usage.get(today.isoformat(), {}).values())
+
+        exhaustion_at = None
+        if remaining is None:
+            status = 'unknown'
+        elif remaining <= 0:
+            status = 'exhausted'
+            exhaustion_at = datetime.utcfromtimestamp(now)
+        else:
+            status = 'ok'
+            if daily_rate > 0:
+                exhaustion_at = datetime.utcfromtimestamp(now) + timedelta(days=remaining / daily_rate)
+                if exhaustion_at < period_end_at:
+                    status = 'at_risk'
+
+        return {
+            'key_id': key_id,
+            'quota': quota,
+            'used': used,
+            'remaining': remaining,
+            'used_today': used_today,
+            'daily_rate': round(daily_rate, 1),
+            'period_end': period_end_at,
+            'exhaustion_at': exhaustion_at,
+            'status': status,
+        }
+
+    def forecast_all(self) -> List[Dict[str, Any]]:
+        """Forecast every key seen in the ledger."""
+        with self._lock:
+            key_ids = [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT key_id FROM usage UNION SELECT key_id FROM quota"
+            )]
+        return [self.forecast(key_id=key_id) for key_id in sorted(key_ids)]
+
+    def admit(self, api_key: str, estimated_requests: int, priority: str = 'normal') -> QuotaDecision:
+        """
+        Decide whether a job may start now.
+
+        A job is deferred to the next quota period if it would leave less
+        than its priority's reserve (PRIORITY_RESERVE), and to the next day
+        if it would take today's use over its share of an even daily
+        budget (PRIORITY_PACING).
+
+        Args:
+            api_key (str): RapidAPI key the job uses
+            estimated_requests (int): Requests the job is expected to make
+            priority (str): 'critical', 'high', 'normal' or 'low'
+
+        Returns:
+            QuotaDecision: Whether the job is admitted, why, and when to retry if not
+        """
+        if priority not in PRIORITY_RESERVE:
+            raise ValueError(f"Unknown job priority: {priority}")
+
+        forecast = self.forecast(api_key)
+        if forecast['remaining'] is None:
+            return QuotaDecision(True, "No quota information for this key")
+
+        quota = forecast['quota'] or forecast['used'] + forecast['remaining']
+        remaining = forecast['remaining']
+        reserve = PRIORITY_RESERVE[priority] * quota
+        if remaining - estimated_requests < reserve:
+            return QuotaDecision(
+                False,
+                f"{priority} job needs {estimated_requests} requests; {remaining} remain "
+                f"and {int(reserve)} are reserved for higher-priority jobs",
+                forecast['period_end']
+            )
+
+        pacing = PRIORITY_PACING[priority]
+        if pacing is not None:
+            now = datetime.utcfromtimestamp(self.clock())
+            days_left = max((forecast['period_end'] - now).total_seconds() / 86400, 1.0)
+            daily_budget = (remaining + forecast['used_today']) / days_left
+            if forecast['used_today'] + estimated_requests > pacing * daily_budget:
+                tomorrow = datetime(now.year, now.month, now.day) + timedelta(days=1)
+                return QuotaDecision(
+                    False,
+                    f"{priority} job would take today's use to "
+                    f"{forecast['used_today'] + estimated_requests} of a {int(pacing * daily_budget)} request budget",
+                    tomorrow
+                )
+
+        return QuotaDecision(True, f"{remaining} requests remain this period")
+
+    def close(self):
+        """Close the SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_default_ledger: Optional[QuotaLedger] = None
+_default_ledger_lock = threading.Lock()
+
+
+def get_quota_ledger() -> Optional[QuotaLedger]:
+    """
+    Get the quota ledger shared by all connectors.
+
+    The file is taken from RAPIDAPI_LEDGER_PATH (default
+    cache/rapidapi_quota.sqlite); setting it to an empty string disables
+    the ledger.
+
+    Returns:
+        Optional[QuotaLedger]: The shared ledger, or None if disabled or unavailable
+    """
+    global _default_ledger
+    path = os.environ.get('RAPIDAPI_LEDGER_PATH', DEFAULT_LEDGER_PATH)
+    if not path:
+        return None
+    with _default_ledger_lock:
+        if _default_ledger is None:
+            try:
+                _default_ledger = QuotaLedger(path)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"RapidAPI quota ledger disabled: {str(e)}")
+                return None
+        return _default_ledger
+
+
+def record_rapidapi_usage(api_key: Optional[str], connector: str,
+                          headers: Optional[Mapping[str, str]] = None):
+    """
+    Record one RapidAPI request in the shared ledger.
+
+    Never raises: quota accounting must not break data collection.
+
+    Args:
+        api_key (str): RapidAPI key used (ignored if empty)
+        connector (str): Name of the connector that made the request
+        headers (Mapping, optional): Response headers
+    """
+    if not api_key:
+        return
+    ledger = get_quota_ledger()
+    if ledger is None:
+        return
+    try:
+        ledger.record(api_key, connector, headers)
+    except sqlite3.Error as e:
+        logger.warning(f"Could not record RapidAPI usage: {str(e)}")
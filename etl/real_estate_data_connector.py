@@ -6,12 +6,17 @@ from multiple sources with intelligent failover capabilities.
 """
 
 import logging
+import threading
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 
 from etl.base_api_connector import BaseApiConnector
+from etl.circuit_breaker import CircuitBreaker, CLOSED, HALF_OPEN, exponential_backoff
+from etl.latency_histogram import LatencyHistogram
+from etl.single_flight import SingleFlight
 from etl.zillow_api_connector import ZillowApiConnector
 from etl.realtor_api_connector import RealtorApiConnector
 from etl.pacmls_connector import PacMlsConnector
@@ -42,6 +47,7 @@ class DataSourceStatus:
         self.success_rate = kwargs.get('success_rate', 100.0)
         self.avg_response_time = kwargs.get('avg_response_time', 0.0)
         self.error_count = kwargs.get('error_count', 0)
+        self.empty_count = kwargs.get('empty_count', 0)
         self.request_count = kwargs.get('request_count', 0)
         self.last_check = kwargs.get('last_check', datetime.now())
     
@@ -55,6 +61,7 @@ class DataSourceStatus:
             'success_rate': self.success_rate,
             'avg_response_time': self.avg_response_time,
             'error_count': self.error_count,
+            'empty_count': self.empty_count,
             'request_count': self.request_count,
             'last_check': self.last_check
         }
@@ -64,6 +71,11 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _has_data(data: Any) -> bool:
+    """Whether a connector response contains any results."""
+    return isinstance(data, (dict, list)) and len(data) > 0
+
+
 class RealEstateDataConnector:
     """
     A unified connector for accessing real estate data from multiple sources
@@ -78,15 +90,28 @@ class RealEstateDataConnector:
         """Initialize the connector with available data sources."""
         self.connectors: Dict[str, BaseApiConnector] = {}
         self.priorities: Dict[str, int] = {}
-        self.circuit_breakers: Dict[str, bool] = {}
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
         self.source_status: Dict[str, DataSourceStatus] = {}  # Track source status locally
+        self.latency: Dict[str, LatencyHistogram] = {}  # Per-source latency histograms
         self.failover_timeout = 10  # seconds
         self.max_retry_attempts = 3
         
         # Default settings - override with load_settings()
         self.enable_circuit_breakers = True
         self.max_failures_before_circuit_break = 5
-        self.circuit_reset_after = 3600  # seconds
+        self.circuit_failure_window = 300  # seconds
+        self.circuit_reset_after = 60  # seconds before the first half-open probe
+        self.max_circuit_reset_after = 3600  # upper bound for probe backoff
+        self.retry_backoff_base = 0.5  # seconds
+        self.retry_backoff_cap = 8.0  # seconds
+        
+        # Bulk lookup settings
+        self.max_concurrent_lookups = 8
+        self.default_batch_size = 50
+        
+        # Concurrent identical detail requests share one upstream call
+        self._single_flight = SingleFlight()
+        self._metrics_lock = threading.Lock()
         
         self._load_connectors()
     
@@ -109,8 +134,8 @@ class RealEstateDataConnector:
             'county': 4
         }
         
-        # Initialize circuit breakers - all open by default
-        self.circuit_breakers = {name: False for name in self.expected_connectors}
+        # Initialize circuit breakers - all closed by default
+        self.circuit_breakers = {name: self._new_circuit_breaker(name) for name in self.expected_connectors}
         
         # Load API connectors
         try:
@@ -146,11 +171,23 @@ class RealEstateDataConnector:
             except Exception as e:
                 logger.error(f"Failed to initialize PACMLS connector: {str(e)}")
             
+            # Initialize county assessor connector (supports batched lookups)
+            county_connector = None
+            try:
+                if os.environ.get('BENTON_ASSESSOR_API_KEY'):
+                    from etl.benton_county_connector import BentonCountyConnector
+                    county_connector = BentonCountyConnector()
+                    logger.info("Benton County connector initialized successfully")
+                else:
+                    logger.warning("Benton County Assessor API key not available")
+            except Exception as e:
+                logger.error(f"Failed to initialize Benton County connector: {str(e)}")
+            
             # Register core connectors with the system
             self._register_connector('zillow', zillow_connector)
             self._register_connector('realtor', realtor_connector)
             self._register_connector('pacmls', pacmls_connector)
-            self._register_connector('county', None)  # County connector not implemented yet
+            self._register_connector('county', county_connector)
             
             # Register additional data sources
             # ATTOM Property Data (comprehensive property data API)
@@ -239,10 +276,41 @@ class RealEstateDataConnector:
             self.priorities[name] = max(self.priorities.values()) + 1 if self.priorities else 1
         
         if name not in self.circuit_breakers:
-            self.circuit_breakers[name] = False
+            self.circuit_breakers[name] = self._new_circuit_breaker(name)
         
         logger.info(f"Registered connector: {name} with priority {self.priorities[name]}")
     
+    def _new_circuit_breaker(self, name: str) -> CircuitBreaker:
+        """Create a circuit breaker for a source using the current settings."""
+        return CircuitBreaker(
+            name,
+            failure_threshold=self.max_failures_before_circuit_break,
+            failure_window=self.circuit_failure_window,
+            reset_after=self.circuit_reset_after,
+            max_reset_after=self.max_circuit_reset_after
+        )
+    
+    def _is_circuit_open(self, source: str) -> bool:
+        """
+        Check whether requests to a source are currently blocked.
+        
+        Once the reset interval has elapsed this lets a single half-open
+        probe through, so the caller must report its outcome via
+        _update_metrics.
+        
+        Args:
+            source: The source name
+            
+        Returns:
+            True if the source should be skipped
+        """
+        if not self.enable_circuit_breakers:
+            return False
+        breaker = self.circuit_breakers.get(source)
+        if breaker is None:
+            return False
+        return not breaker.allow_request()
+    
     def load_settings(self):
         """Load connector settings from the database or configuration."""
         try:
@@ -265,7 +333,10 @@ class RealEstateDataConnector:
                         self.priorities[setting.source_name] = 4
                     
                     # Update circuit breaker status
-                    self.circuit_breakers[setting.source_name] = not setting.is_active
+                    if setting.is_active:
+                        self.circuit_breakers[setting.source_name].reset()
+                    else:
+                        self.circuit_breakers[setting.source_name].force_open()
             
             # System settings
             system_settings = {
@@ -294,9 +365,102 @@ class RealEstateDataConnector:
             Property details dictionary
         """
         if source:
-            return self._get_from_specific_source('property_details', property_id, source)
+            return self._single_flight.do(
+                ('property_details', source, property_id),
+                self._get_from_specific_source, 'property_details', property_id, source
+            )
         
-        return self._get_with_failover('property_details', property_id)
+        return self._single_flight.do(
+            ('property_details', None, property_id),
+            self._get_with_failover, 'property_details', property_id
+        )
+    
+    def get_property_details_many(self, property_ids: List[str], source: Optional[str] = None,
+                                  max_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get detailed information for many properties at once.
+        
+        Sources whose connector implements get_property_details_batch(ids) are
+        asked for the IDs in batches first (in priority order). Any IDs still
+        missing are fetched individually with bounded concurrency, going
+        through the same single-flight layer as get_property_details.
+        
+        Args:
+            property_ids: The identifiers for the properties
+            source: Optional source to use, otherwise uses priority order
+            max_workers: Maximum concurrent single lookups (default: max_concurrent_lookups)
+            
+        Returns:
+            Dictionary mapping each property ID to its details (empty if not found)
+        """
+        # De-duplicate while preserving order
+        ids = list(dict.fromkeys(str(pid) for pid in property_ids if pid))
+        results: Dict[str, Dict[str, Any]] = {}
+        if not ids:
+            return results
+        
+        sources = [source] if source else self._sorted_available_sources()
+        for src in sources:
+            missing = [pid for pid in ids if pid not in results]
+            if not missing:
+                break
+            connector = self.connectors.get(src)
+            if connector is None or not hasattr(connector, 'get_property_details_batch'):
+                continue
+            results.update(self._get_batch_from_source(src, connector, missing))
+        
+        missing = [pid for pid in ids if pid not in results]
+        if missing:
+            workers = min(max_workers or self.max_concurrent_lookups, len(missing))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='property-details') as executor:
+                details = executor.map(lambda pid: self.get_property_details(pid, source), missing)
+                for pid, data in zip(missing, details):
+                    results[pid] = data or {}
+        
+        return results
+    
+    def _get_batch_from_source(self, source: str, connector: Any, property_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch property details from a batch-capable source.
+        
+        Args:
+            source: The source name
+            connector: The source connector (must implement get_property_details_batch)
+            property_ids: The identifiers to look up
+            
+        Returns:
+            Dictionary of standardized details for the IDs the source returned
+        """
+        results = {}
+        batch_size = getattr(connector, 'max_batch_size', self.default_batch_size)
+        
+        for i in range(0, len(property_ids), batch_size):
+            if self._is_circuit_open(source):
+                logger.info(f"Skipping batch lookup on {source} due to open circuit breaker")
+                break
+            
+            batch = property_ids[i:i + batch_size]
+            start_time = time.time()
+            try:
+                batch_data = connector.get_property_details_batch(batch) or {}
+                self._update_metrics(source, True, time.time() - start_time)
+            except Exception as e:
+                logger.error(f"Batch lookup failed on {source}: {str(e)}")
+                self._update_metrics(source, False, time.time() - start_time)
+                break
+            
+            for pid, data in batch_data.items():
+                if data:
+                    results[str(pid)] = standardize_property_data(data, source)
+        
+        return results
+    
+    def _sorted_available_sources(self) -> List[str]:
+        """Get the names of initialized connectors in priority order."""
+        return sorted(
+            [s for s in self.connectors if self.connectors[s] is not None],
+            key=lambda s: self.priorities.get(s, 999)
+        )
     
     def search_properties(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -338,30 +502,34 @@ class RealEstateDataConnector:
             logger.warning(f"Source {source} not available")
             return {}
         
-        if self.circuit_breakers.get(source, False) and self.enable_circuit_breakers:
+        # Checked before the breaker, which may let this call through as its probe
+        if method not in ('property_details', 'property_search', 'property_history'):
+            logger.error(f"Unknown method: {method}")
+            return {}
+        
+        if self._is_circuit_open(source):
             logger.warning(f"Circuit breaker open for {source}, skipping")
             return {}
         
         connector = self.connectors[source]
+        start_time = time.time()
         
         try:
             if method == 'property_details':
                 data = connector.get_property_details(query)
             elif method == 'property_search':
                 data = connector.search_properties(query)
-            elif method == 'property_history':
-                data = connector.get_property_history(query)
             else:
-                logger.error(f"Unknown method: {method}")
-                return {}
+                data = connector.get_property_history(query)
             
             # Update metrics for successful call
-            self._update_metrics(source, True, time.time())
+            self._update_metrics(source, True, time.time() - start_time,
+                                 outcome='success' if _has_data(data) else 'empty')
             return data
         except Exception as e:
             logger.error(f"Error getting data from {source}: {str(e)}")
             # Update metrics for failed call
-            self._update_metrics(source, False, time.time())
+            self._update_metrics(source, False, time.time() - start_time)
             return {}
     
     def _get_with_failover(self, method: str, query: Any) -> Any:
@@ -380,15 +548,12 @@ class RealEstateDataConnector:
         sources_tried = []
         
         # Sort connectors by priority
-        sorted_sources = sorted(
-            [s for s in self.connectors if self.connectors[s] is not None],
-            key=lambda s: self.priorities.get(s, 999)
-        )
+        sorted_sources = self._sorted_available_sources()
         
         # Try sources in priority order
         for source in sorted_sources:
             # Skip if circuit breaker is open
-            if self.circuit_breakers.get(source, False) and self.enable_circuit_breakers:
+            if self._is_circuit_open(source):
                 logger.info(f"Skipping {source} due to open circuit breaker")
                 continue
                 
@@ -399,7 +564,13 @@ class RealEstateDataConnector:
                 connector = self.connectors[source]
                 retry_count = 0
                 
-                while retry_count <= self.max_retry_attempts:
+                # A half-open probe gets a single attempt
+                max_retries = self.max_retry_attempts
+                if self.circuit_breakers[source].state == HALF_OPEN:
+                    max_retries = 0
+                
+                while retry_count <= max_retries:
+                    start_time = time.time()
                     try:
                         if method == 'property_details':
                             data = connector.get_property_details(query)
@@ -413,31 +584,33 @@ class RealEstateDataConnector:
                         
                         # Success - update metrics and return data
                         elapsed = time.time() - start_time
-                        self._update_metrics(source, True, elapsed)
+                        has_data = _has_data(data)
+                        self._update_metrics(source, True, elapsed,
+                                             outcome='success' if has_data else 'empty')
                         
                         # Standardize data format
                         if method == 'property_details' and data:
                             data = standardize_property_data(data, source)
                         
                         # If we got valid data, return it
-                        if data and (isinstance(data, dict) and len(data) > 0) or (isinstance(data, list) and len(data) > 0):
+                        if has_data:
                             return data
                         
                         # Otherwise try the next source
                         break
                     except Exception as e:
                         retry_count += 1
-                        if retry_count <= self.max_retry_attempts:
-                            logger.warning(f"Retry {retry_count} for {source}: {str(e)}")
-                            time.sleep(1)  # Small delay between retries
+                        if retry_count <= max_retries:
+                            delay = exponential_backoff(
+                                retry_count,
+                                base=self.retry_backoff_base,
+                                cap=self.retry_backoff_cap
+                            )
+                            logger.warning(f"Retry {retry_count} for {source} in {delay:.2f}s: {str(e)}")
+                            time.sleep(delay)
                         else:
                             raise e
                 
-                # If we get here, the source returned empty results
-                # Update metrics for "success" but no data
-                elapsed = time.time() - start_time
-                self._update_metrics(source, True, elapsed)
-                
             except Exception as e:
                 # Source failed completely
                 elapsed = time.time() - start_time
@@ -453,68 +626,79 @@ class RealEstateDataConnector:
         # If we get here, all sources failed or returned empty
         return {}
     
-    def _update_metrics(self, source: str, success: bool, elapsed_time: float):
+    def _update_metrics(self, source: str, success: bool, elapsed_time: float,
+                        outcome: Optional[str] = None):
         """
         Update metrics for a source.
         
         Args:
             source: The source name
             success: Whether the call was successful
-            elapsed_time: Time taken for the call
+            elapsed_time: Time taken for the call in seconds
+            outcome: 'success', 'empty' or 'error' (derived from success if omitted)
         """
+        if outcome is None:
+            outcome = 'success' if success else 'error'
+        
         try:
-            # Check if we have this source in our local tracking
-            if source not in self.source_status:
-                # Initialize a new status object
-                self.source_status[source] = DataSourceStatus(
-                    source_name=source,
-                    status="unknown",
-                    is_active=True,
-                    request_count=0,
-                    error_count=0,
-                    success_rate=100.0,
-                    avg_response_time=0.0
-                )
-            
-            # Get the status object for this source
-            status = self.source_status[source]
-            
-            # Update basic stats
-            status.request_count += 1
-            if not success:
-                status.error_count += 1
-            
-            # Calculate success rate (avoid division by zero)
-            if status.request_count > 0:
-                status.success_rate = ((status.request_count - status.error_count) / status.request_count) * 100
-            
-            # Update avg response time with smoothing
-            if status.avg_response_time == 0:
-                status.avg_response_time = elapsed_time
-            else:
-                status.avg_response_time = (status.avg_response_time * 0.9) + (elapsed_time * 0.1)
-            
-            # Update status
-            if status.success_rate >= 90:
-                status.status = "healthy"
-            elif status.success_rate >= 70:
-                status.status = "degraded"
-            elif status.success_rate >= 50:
-                status.status = "limited"
-            else:
-                status.status = "critical"
+            with self._metrics_lock:
+                histogram = self.latency.get(source)
+                if histogram is None:
+                    histogram = self.latency[source] = LatencyHistogram()
+                histogram.record(elapsed_time, outcome)
+                
+                # Check if we have this source in our local tracking
+                if source not in self.source_status:
+                    # Initialize a new status object
+                    self.source_status[source] = DataSourceStatus(
+                        source_name=source,
+                        status="unknown",
+                        is_active=True,
+                        request_count=0,
+                        error_count=0,
+                        success_rate=100.0,
+                        avg_response_time=0.0
+                    )
+            
+                # Get the status object for this source
+                status = self.source_status[source]
+            
+                # Update basic stats
+                status.request_count += 1
+                if not success:
+                    status.error_count += 1
+                elif outcome == 'empty':
+                    status.empty_count += 1
+            
+                # Calculate success rate (avoid division by zero)
+                if status.request_count > 0:
+                    status.success_rate = ((status.request_count - status.error_count) / status.request_count) * 100
+            
+                # Update status
+                if status.success_rate >= 90:
+                    status.status = "healthy"
+                elif status.success_rate >= 70:
+                    status.status = "degraded"
+                elif status.success_rate >= 50:
+                    status.status = "limited"
+                else:
+                    status.status = "critical"
             
-            # Circuit breaker logic
-            if self.enable_circuit_breakers:
-                if not success and status.error_count > self.max_failures_before_circuit_break:
-                    self.circuit_breakers[source] = True
-                    status.is_active = False
-                    logger.warning(f"Circuit breaker opened for {source}")
+                # Circuit breaker logic - failures are counted over a sliding window
+                if self.enable_circuit_breakers:
+                    breaker = self.circuit_breakers.get(source)
+                    if breaker is None:
+                        breaker = self.circuit_breakers[source] = self._new_circuit_breaker(source)
+                    if success:
+                        breaker.record_success()
+                    else:
+                        breaker.record_failure()
+                    status.is_active = not breaker.is_open
             
-            status.last_check = datetime.now()
+                status.last_check = datetime.now()
             
-            # Note: We no longer update the DB here to avoid circular imports
-            # DB updates will happen in a separate method that can be called periodically
+                # Note: We no longer update the DB here to avoid circular imports
+                # DB updates will happen in a separate method that can be called periodically
             
         except Exception as e:
             logger.error(f"Failed to update metrics for {source}: {str(e)}")
@@ -549,8 +733,9 @@ class RealEstateDataConnector:
             self._update_metrics(source, True, elapsed)
             
             # If source was circuit-broken, reset it
-            if self.circuit_breakers.get(source, False):
-                self.circuit_breakers[source] = False
+            breaker = self.circuit_breakers.get(source)
+            if breaker is not None and breaker.state != CLOSED:
+                breaker.reset()
                 
                 try:
                     from db import db
@@ -591,15 +776,22 @@ class RealEstateDataConnector:
         # Use our local tracking data first
         for source_name, status in self.source_status.items():
             src_status = status.to_dict()
-            src_status["circuit_open"] = self.circuit_breakers.get(source_name, False)
+            breaker = self.circuit_breakers.get(source_name)
+            src_status["circuit_open"] = breaker.is_open if breaker else False
+            src_status["circuit"] = breaker.to_dict() if breaker else None
             src_status["priority"] = self.priorities.get(source_name, 999)
+            src_status["latency"] = self.get_source_latency(source_name)
+            # Mean response time (seconds) over the last five minutes, computed on read
+            mean_ms = src_status["latency"]["5m"]["mean_ms"]
+            src_status["avg_response_time"] = mean_ms / 1000 if mean_ms is not None else 0.0
             status_list.append(src_status)
         
         # Add any connectors that might not have status yet
         for source, connector in self.connectors.items():
             if source not in self.source_status:
                 available = connector is not None
-                circuit_open = self.circuit_breakers.get(source, False)
+                breaker = self.circuit_breakers.get(source)
+                circuit_open = breaker.is_open if breaker else False
                 
                 status_list.append({
                     "source_name": source,
@@ -609,13 +801,33 @@ class RealEstateDataConnector:
                     "success_rate": 0,
                     "avg_response_time": 0,
                     "circuit_open": circuit_open,
+                    "circuit": breaker.to_dict() if breaker else None,
                     "request_count": 0,
-                    "error_count": 0
+                    "error_count": 0,
+                    "empty_count": 0,
+                    "latency": self.get_source_latency(source)
                 })
         
         # Sort by priority
         return sorted(status_list, key=lambda x: x["priority"])
     
+    def get_source_latency(self, source: str, windows: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get latency percentiles and outcome counts for a source.
+        
+        Args:
+            source: The source name
+            windows: Window names to report (default: all of 1m, 5m, 15m, 1h)
+            
+        Returns:
+            Dictionary mapping window name to count, success/empty/error
+            counts, mean and p50/p95/p99 latency in milliseconds
+        """
+        histogram = self.latency.get(source)
+        if histogram is None:
+            histogram = LatencyHistogram()
+        return histogram.summary(windows)
+    
     def update_source_priority(self, priorities: Dict[str, int]) -> bool:
         """
         Update source priorities.
@@ -665,8 +877,14 @@ class RealEstateDataConnector:
             Whether the update was successful
         """
         try:
-            # Update circuit breaker
-            self.circuit_breakers[source] = not is_active
+            # Update circuit breaker - a manually disabled source stays open
+            breaker = self.circuit_breakers.get(source)
+            if breaker is None:
+                breaker = self.circuit_breakers[source] = self._new_circuit_breaker(source)
+            if is_active:
+                breaker.reset()
+            else:
+                breaker.force_open()
             
             # Update in database
             try:
@@ -705,8 +923,20 @@ class RealEstateDataConnector:
                 
                 # If disabling circuit breakers, reset all circuit breakers
                 if not self.enable_circuit_breakers:
-                    for source in self.circuit_breakers:
-                        self.circuit_breakers[source] = False
+                    for breaker in self.circuit_breakers.values():
+                        breaker.reset()
+            
+            breaker_settings = {
+                'max_failures_before_circuit_break': 'failure_threshold',
+                'circuit_failure_window': 'failure_window',
+                'circuit_reset_after': 'reset_after',
+                'max_circuit_reset_after': 'max_reset_after'
+            }
+            for setting, attribute in breaker_settings.items():
+                if setting in settings:
+                    setattr(self, setting, settings[setting])
+                    for breaker in self.circuit_breakers.values():
+                        setattr(breaker, attribute, settings[setting])
             
             return True
         except Exception as e:
@@ -60,6 +60,7 @@ class RealtorApiConnector(BaseApiConnector):
             'x-rapidapi-host': 'realtor-data1.p.rapidapi.com',
             'Content-Type': 'application/json'
         }
+        self.quota_api_key = self.api_key
         
         self.is_authenticated = True
         logger.info("Realtor API connector initialized")
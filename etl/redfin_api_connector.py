@@ -7,15 +7,17 @@ which could change without notice.
 """
 
 import os
+import codecs
 import json
 import logging
 import requests
 import time
 import re
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Iterator, Optional, List, Sequence, Union
 from bs4 import BeautifulSoup
 
 from etl.base_api_connector import BaseApiConnector
+from etl.json_stream import iter_json_array
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -53,6 +55,7 @@ class RedfinApiConnector(BaseApiConnector):
         }
         
         self.min_request_interval = kwargs.get('min_request_interval', 3.0)  # Longer delay for Redfin
+        self.stream_chunk_size = kwargs.get('stream_chunk_size', 64 * 1024)
         self.source_priority = kwargs.get('priority', 'tertiary')
         self.is_authenticated = True
         logger.info("Redfin API connector initialized successfully")
@@ -142,7 +145,28 @@ class RedfinApiConnector(BaseApiConnector):
         Returns:
             list: List of matching properties
         """
-        # Build search query
+        search_query = self._build_search_query(address, city, state, zipcode)
+        if not search_query:
+            logger.warning("No search parameters provided")
+            return []
+        
+        return list(self.iter_search_results(search_query, min_price=min_price, max_price=max_price,
+                                             page_size=20, max_results=20, standardize=False))
+    
+    def _build_search_query(self, address: str = None, city: str = None,
+                            state: str = None, zipcode: str = None) -> str:
+        """
+        Build the Redfin search text for a location.
+        
+        Args:
+            address (str, optional): Street address
+            city (str, optional): City name
+            state (str, optional): State code
+            zipcode (str, optional): ZIP code
+        
+        Returns:
+            str: Search text, or '' if no location was given
+        """
         search_query = ""
         if address:
             search_query = address
@@ -154,45 +178,141 @@ class RedfinApiConnector(BaseApiConnector):
             search_query = f"{city}, {state}"
         elif zipcode:
             search_query = zipcode
-        else:
-            logger.warning("No search parameters provided")
-            return []
+        return search_query
+    
+    def iter_search_results(self, search_query: str, min_price: int = None, max_price: int = None,
+                            page_size: int = 350, max_results: int = None,
+                            standardize: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Stream search results page by page.
         
-        # Build parameters
-        params = {
-            'q': search_query,
-            'start': 0,
-            'count': 20,
-            'v': 2,
-            'market': 'false',
-            'al': 1,
-            'aft': 0
-        }
+        Each page is parsed incrementally as it downloads, so listings are
+        yielded as they arrive and memory use is bounded by one listing
+        rather than by the page size.
         
-        if min_price:
-            params['min_price'] = min_price
+        Args:
+            search_query (str): Search text (address, "City, ST" or ZIP code)
+            min_price (int, optional): Minimum price
+            max_price (int, optional): Maximum price
+            page_size (int): Listings requested per page
+            max_results (int, optional): Stop after this many listings
+            standardize (bool): Yield standardize_property() output instead
+                of parsed search results
         
-        if max_price:
-            params['max_price'] = max_price
+        Yields:
+            dict: One listing per search result
+        """
+        start = 0
+        while max_results is None or start < max_results:
+            count = page_size if max_results is None else min(page_size, max_results - start)
+            params = {
+                'q': search_query,
+                'start': start,
+                'count': count,
+                'v': 2,
+                'market': 'false',
+                'al': 1,
+                'aft': 0
+            }
+            
+            if min_price:
+                params['min_price'] = min_price
+            
+            if max_price:
+                params['max_price'] = max_price
+            
+            url = f"{self.search_url}?{self._build_query_string(params)}"
+            received = 0
+            for result in self._stream_request(url, ('homes', 'results')):
+                received += 1
+                try:
+                    listing = self._parse_property_result(result)
+                except Exception as e:
+                    logger.error(f"Error processing Redfin search result: {str(e)}")
+                    continue
+                yield self.standardize_property(listing) if standardize else listing
+            
+            # A short page is the last one
+            if received < count:
+                return
+            start += received
+    
+    def _stream_request(self, url: str, path: Sequence[str],
+                        params: Dict[str, Any] = None) -> Iterator[Any]:
+        """
+        Make a streaming request and yield the items of one array in the response.
         
-        # Make the request
-        url = f"{self.search_url}?{self._build_query_string(params)}"
-        response = self._make_request(url)
+        Args:
+            url (str): API endpoint to call
+            path (Sequence[str]): Object keys leading to the array (see iter_json_array)
+            params (dict, optional): Query parameters
         
-        if 'error' in response:
-            return []
+        Yields:
+            Items of the array, decoded as they arrive
+        """
+        self._throttle_requests()
         
         try:
-            # Extract property data from response
-            properties = []
-            if 'homes' in response and 'results' in response['homes']:
-                for result in response['homes']['results']:
-                    properties.append(self._parse_property_result(result))
+            start_time = time.time()
+            self.metrics['requests'] += 1
             
-            return properties
-        except Exception as e:
-            logger.error(f"Error processing Redfin search results: {str(e)}")
-            return []
+            response = requests.get(
+                url,
+                headers=self.headers,
+                params=params,
+                timeout=30,
+                stream=True
+            )
+            
+            self.metrics['total_response_time'] += time.time() - start_time
+            
+            with response:
+                if response.status_code == 429 or response.status_code == 403:
+                    logger.warning(f"Redfin access limited: {response.status_code}")
+                    self.metrics['rate_limit_hits'] += 1
+                    return
+                
+                if response.status_code != 200:
+                    logger.error(f"Redfin API error: {response.status_code}")
+                    self.metrics['errors'] += 1
+                    return
+                
+                chunks = self._decode_chunks(response.iter_content(chunk_size=self.stream_chunk_size),
+                                             response.encoding)
+                yield from iter_json_array(chunks, path)
+        
+        except requests.exceptions.Timeout:
+            logger.error("Redfin API request timed out")
+            self.metrics['timeouts'] += 1
+        
+        except ValueError as e:
+            logger.error(f"Failed to parse Redfin response stream: {str(e)}")
+            self.metrics['errors'] += 1
+        
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Redfin API request error: {str(e)}")
+            self.metrics['errors'] += 1
+    
+    @staticmethod
+    def _decode_chunks(raw_chunks: Iterator[bytes], encoding: str = None) -> Iterator[str]:
+        """Decode response chunks, dropping Redfin's '{}&&' JSON hijacking guard."""
+        decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+        head = ''
+        for raw in raw_chunks:
+            text = decoder.decode(raw)
+            if head is not None:
+                head += text
+                if len(head) < 4 and head == '{}&&'[:len(head)]:
+                    continue
+                text = head[4:] if head.startswith('{}&&') else head
+                head = None
+            if text:
+                yield text
+        text = decoder.decode(b'', final=True)
+        if head:
+            text = head + text
+        if text:
+            yield text
     
     def _parse_property_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -0,0 +1,444 @@
+"""
+Record/replay transport for API connectors.
+
+This module lets connector traffic be captured to fixture files once and
+replayed later without touching the live Zillow/ATTOM/Redfin/HUD endpoints:
+
+- RecordingTransport captures every response made through ``requests``
+  into a FixtureStore.
+- ReplayServer is a local HTTP stand-in that serves recorded fixtures with
+  configurable latency and error injection.
+- ReplayTransport reroutes ``requests`` traffic to a ReplayServer so the
+  unmodified connectors exercise a real HTTP round trip.
+
+All connectors call ``requests.get``/``requests.post`` or a
+``requests.Session``, which all go through ``Session.send``; that is the
+single hook patched here. Async connectors can be pointed at the
+ReplayServer directly by overriding their base URL.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+import requests
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Query parameters that must never be written to fixture files
+REDACTED_PARAMS = {'apikey', 'api_key', 'key', 'token', 'access_token', 'password', 'username'}
+
+# Response headers worth keeping in fixtures
+KEPT_HEADERS = {'content-type', 'etag', 'last-modified', 'x-ratelimit-remaining', 'x-ratelimit-reset'}
+
+# Headers used to carry the original target through the replay server
+REPLAY_HOST_HEADER = 'X-Replay-Host'
+REPLAY_SCHEME_HEADER = 'X-Replay-Scheme'
+
+
+def _canonical_query(query: str) -> List[Tuple[str, str]]:
+    return sorted(
+        (k, v) for k, v in parse_qsl(query, keep_blank_values=True)
+        if k.lower() not in REDACTED_PARAMS
+    )
+
+
+def _body_digest(body: Any) -> Optional[str]:
+    if not body:
+        return None
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return hashlib.sha1(body).hexdigest()
+
+
+def request_key(method: str, host: str, path: str, query: str, body: Any = None) -> str:
+    """
+    Build the fixture lookup key for a request.
+
+    Credentials in the query string are ignored so fixtures recorded with one
+    key replay for any other.
+
+    Args:
+        method (str): HTTP method
+        host (str): Target host (without scheme)
+        path (str): URL path
+        query (str): Raw query string
+        body: Request body (bytes or str), if any
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    canonical = json.dumps([
+        method.upper(), host.lower(), path, _canonical_query(query), _body_digest(body)
+    ])
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+class FixtureStore:
+    """
+    Directory of recorded responses, one JSON file per distinct request.
+
+    Files are stored as ``<directory>/<host>/<key>.json``.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize the store.
+
+        Args:
+            directory (str): Root directory for fixture files
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._fixtures: Dict[str, Dict[str, Any]] = {}
+        self._by_path: Dict[Tuple[str, str, str], List[str]] = {}
+
+    def save(self, method: str, url: str, body: Any, status: int, headers: Dict[str, str],
+             content: bytes, elapsed_ms: float) -> str:
+        """
+        Save a response to the store.
+
+        Args:
+            method (str): HTTP method
+            url (str): Full request URL
+            body: Request body, if any
+            status (int): Response status code
+            headers (Dict[str, str]): Response headers
+            content (bytes): Response body
+            elapsed_ms (float): Observed response time in milliseconds
+
+        Returns:
+            str: Path of the written fixture file
+        """
+        parts = urlsplit(url)
+        key = request_key(method, parts.netloc, parts.path, parts.query, body)
+        try:
+            text, encoding = content.decode('utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            text, encoding = base64.b64encode(content).decode('ascii'), 'base64'
+
+        fixture = {
+            'request': {
+                'method': method.upper(),
+                'host': parts.netloc.lower(),
+                'path': parts.path,
+                'query': _canonical_query(parts.query),
+                'body_sha1': _body_digest(body),
+            },
+            'response': {
+                'status': status,
+                'headers': {k: v for k, v in headers.items() if k.lower() in KEPT_HEADERS},
+                'body': text,
+                'encoding': encoding,
+                'elapsed_ms': round(elapsed_ms, 1),
+            },
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+
+        host_dir = os.path.join(self.directory, parts.netloc.lower().replace(':', '_'))
+        os.makedirs(host_dir, exist_ok=True)
+        path = os.path.join(host_dir, f"{key}.json")
+        with self._lock:
+            with open(path, 'w') as f:
+                json.dump(fixture, f, indent=2)
+            self._index(key, fixture)
+        return path
+
+    def load(self) -> int:
+        """
+        Load all fixture files from disk.
+
+        Returns:
+            int: Number of fixtures loaded
+        """
+        with self._lock:
+            self._fixtures.clear()
+            self._by_path.clear()
+            if not os.path.isdir(self.directory):
+                return 0
+            for root, _, files in os.walk(self.directory):
+                for name in sorted(files):
+                    if not name.endswith('.json'):
+                        continue
+                    try:
+                        with open(os.path.join(root, name)) as f:
+                            fixture = json.load(f)
+                        self._index(name[:-5], fixture)
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Skipping unreadable fixture {name}: {str(e)}")
+            return len(self._fixtures)
+
+    def find(self, method: str, host: str, path: str, query: str, body: Any = None,
+             strict: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Find the recorded response for a request.
+
+        Args:
+            method (str): HTTP method
+            host (str): Target host
+            path (str): URL path
+            query (str): Raw query string
+            body: Request body, if any
+            strict (bool): If False, fall back to any fixture with the same
+                method, host and path when the exact request was not recorded
+
+        Returns:
+            Optional[Dict[str, Any]]: The fixture, or None
+        """
+        key = request_key(method, host, path, query, body)
+        fixture = self._fixtures.get(key)
+        if fixture is None and not strict:
+            candidates = self._by_path.get((method.upper(), host.lower(), path))
+            if candidates:
+                fixture = self._fixtures[candidates[0]]
+        return fixture
+
+    def __len__(self):
+        return len(self._fixtures)
+
+    def _index(self, key: str, fixture: Dict[str, Any]):
+        req = fixture['request']
+        if key not in self._fixtures:
+            self._by_path.setdefault((req['method'], req['host'], req['path']), []).append(key)
+        self._fixtures[key] = fixture
+
+
+class _SendPatch:
+    """Swap requests.Session.send for the duration of a with-block."""
+
+    def __init__(self):
+        self._original = None
+
+    def __enter__(self):
+        self._original = requests.Session.send
+        original = self._original
+        transport = self
+
+        def send(session, request, **kwargs):
+            return transport._send(original, session, request, **kwargs)
+
+        requests.Session.send = send
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        requests.Session.send = self._original
+        self._original = None
+
+    def _send(self, original, session, request, **kwargs):
+        return original(session, request, **kwargs)
+
+
+class RecordingTransport(_SendPatch):
+    """
+    Record every ``requests`` response into a FixtureStore.
+
+    Usage::
+
+        with RecordingTransport(FixtureStore('fixtures/connectors')):
+            connector.search_properties(city='Richland', state='WA')
+    """
+
+    def __init__(self, store: FixtureStore):
+        """
+        Initialize the transport.
+
+        Args:
+            store (FixtureStore): Where responses are written
+        """
+        super().__init__()
+        self.store = store
+        self.recorded = 0
+
+    def _send(self, original, session, request, **kwargs):
+        start_time = time.time()
+        response = original(session, request, **kwargs)
+        elapsed_ms = (time.time() - start_time) * 1000
+        try:
+            self.store.save(request.method, request.url, request.body, response.status_code,
+                            dict(response.headers), response.content, elapsed_ms)
+            self.recorded += 1
+        except Exception as e:
+            logger.error(f"Failed to record response for {request.url}: {str(e)}")
+        return response
+
+
+class ReplayTransport(_SendPatch):
+    """
+    Reroute ``requests`` traffic to a ReplayServer.
+
+    The original host and scheme travel in X-Replay-* headers so the server
+    can look up the matching fixture.
+    """
+
+    def __init__(self, server: 'ReplayServer'):
+        """
+        Initialize the transport.
+
+        Args:
+            server (ReplayServer): The running replay server
+        """
+        super().__init__()
+        self.server = server
+
+    def _send(self, original, session, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.headers[REPLAY_HOST_HEADER] = parts.netloc
+        request.headers[REPLAY_SCHEME_HEADER] = parts.scheme
+        request.url = urlunsplit(('http', self.server.address, parts.path, parts.query, ''))
+        return original(session, request, **kwargs)
+
+
+class ReplayServer:
+    """
+    Local HTTP stand-in that replays recorded fixtures.
+
+    Latency is either a fixed ``latency_ms`` (plus uniform ``jitter_ms``) or,
+    with ``use_recorded_latency``, the response time observed while
+    recording. A fraction ``error_rate`` of requests fails with
+    ``error_status``; unknown requests get a 404.
+    """
+
+    def __init__(self, store: FixtureStore, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, use_recorded_latency: bool = False,
+                 strict: bool = False, host: str = '127.0.0.1', port: int = 0, seed: Optional[int] = None):
+        """
+        Initialize the server (call start() to begin serving).
+
+        Args:
+            store (FixtureStore): Loaded fixtures to serve
+            latency_ms (float): Added latency per response in milliseconds
+            jitter_ms (float): Random extra latency up to this many milliseconds
+            error_rate (float): Probability (0-1) of injecting an error response
+            error_status (int): Status code for injected errors (e.g. 429, 503)
+            use_recorded_latency (bool): Replay the recorded response times
+            strict (bool): Require an exact request match
+            host (str): Interface to bind
+            port (int): Port to bind (0 picks a free port)
+            seed (int, optional): Seed for latency jitter and error injection
+        """
+        self.store = store
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.use_recorded_latency = use_recorded_latency
+        self.strict = strict
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'hits': 0, 'misses': 0, 'injected_errors': 0}
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def address(self) -> str:
+        """host:port the server is listening on."""
+        host, port = self._httpd.server_address[:2]
+        return f"{host}:{port}"
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        return f"http://{self.address}"
+
+    def start(self) -> 'ReplayServer':
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='replay-server', daemon=True)
+        self._thread.start()
+        logger.info(f"Replay server serving {len(self.store)} fixtures on {self.url}")
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _plan(self, fixture: Optional[Dict[str, Any]]) -> Tuple[float, bool]:
+        """Decide the delay (seconds) and whether to inject an error."""
+        with self._lock:
+            if self.use_recorded_latency and fixture is not None:
+                delay_ms = fixture['response'].get('elapsed_ms', 0)
+            else:
+                delay_ms = self.latency_ms
+            if self.jitter_ms:
+                delay_ms += self._random.uniform(0, self.jitter_ms)
+            inject_error = self.error_rate > 0 and self._random.random() < self.error_rate
+        return delay_ms / 1000, inject_error
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _handle(self):
+                server._count('requests')
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else None
+                parts = urlsplit(self.path)
+                host = self.headers.get(REPLAY_HOST_HEADER) or self.headers.get('Host', '')
+
+                fixture = server.store.find(self.command, host, parts.path, parts.query, body,
+                                            strict=server.strict)
+                delay, inject_error = server._plan(fixture)
+                if delay > 0:
+                    time.sleep(delay)
+
+                if inject_error:
+                    server._count('injected_errors')
+                    self._respond(server.error_status, {'Content-Type': 'application/json'},
+                                  b'{"error": "injected error"}')
+                elif fixture is None:
+                    server._count('misses')
+                    self._respond(404, {'Content-Type': 'application/json'},
+                                  b'{"error": "no recorded response"}')
+                else:
+                    server._count('hits')
+                    response = fixture['response']
+                    content = response['body']
+                    if response.get('encoding') == 'base64':
+                        content = base64.b64decode(content)
+                    else:
+                        content = content.encode('utf-8')
+                    self._respond(response['status'], response.get('headers', {}), content)
+
+            def _respond(self, status, headers, content):
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = _handle
+            do_POST = _handle
+            do_PUT = _handle
+            do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                logger.debug(f"replay: {format % args}")
+
+        return Handler
+
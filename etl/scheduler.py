@@ -6,12 +6,15 @@ according to their defined schedules.
 """
 
 import logging
+import os
 import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from app import db
+from etl.__main__ import discover_plugins
 from etl.manager import etl_manager
+from etl.quota_ledger import get_quota_ledger
 from models import ETLSchedule
 
 logger = logging.getLogger(__name__)
@@ -35,6 +38,7 @@ class ETLScheduler:
         self.running = False
         self.thread = None
         self.job_manager = etl_manager
+        self._plugin_classes = None
         logger.info("ETL Scheduler initialized")
     
     def start(self):
@@ -117,6 +121,20 @@ class ETLScheduler:
             job (ETLSchedule): The job to execute
         """
         now = datetime.now()
+        
+        decision = self._check_quota(job)
+        if decision is not None and not decision.admitted:
+            logger.info(f"Deferring scheduled job {job.name} (ID: {job.id}): {decision.reason}")
+            job.last_status = 'deferred'
+            job.last_error = decision.reason
+            if decision.retry_at:
+                # Ledger times are UTC; schedule times are local
+                job.next_run = decision.retry_at.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+            else:
+                job.next_run = job.calculate_next_run_time()
+            db.session.commit()
+            return
+        
         logger.info(f"Executing scheduled job: {job.name} (ID: {job.id})")
         
         # Update job status to running
@@ -148,6 +166,58 @@ class ETLScheduler:
             job.next_run = job.calculate_next_run_time()
             db.session.commit()
             raise
+    
+    def _check_quota(self, job):
+        """
+        Check a job against the shared RapidAPI quota.
+        
+        Jobs set their priority with the 'priority' config option
+        ('critical', 'high', 'normal' or 'low'; default 'normal') and may
+        override the plugin's request estimate with 'rapidapi_requests'.
+        
+        Args:
+            job (ETLSchedule): The job about to run
+            
+        Returns:
+            QuotaDecision: The admission decision, or None if the job does not use RapidAPI
+        """
+        config = job.config or {}
+        estimate = config.get('rapidapi_requests')
+        if estimate is None:
+            plugin_class = self._get_plugin_class(job.plugin_name)
+            if plugin_class is None:
+                return None
+            estimate = plugin_class.rapidapi_requests(config)
+        if not estimate:
+            return None
+        
+        api_key = config.get('api_key') or os.environ.get('RAPIDAPI_KEY')
+        ledger = get_quota_ledger()
+        if not api_key or ledger is None:
+            return None
+        
+        try:
+            return ledger.admit(api_key, int(estimate), config.get('priority', 'normal'))
+        except ValueError as e:
+            logger.warning(f"Ignoring quota check for scheduled job {job.id}: {str(e)}")
+            return None
+
+    def _get_plugin_class(self, plugin_name):
+        """
+        Get an ETL plugin class by name.
+        
+        Plugins are discovered on first use and kept for the life of the
+        scheduler, so due jobs do not re-import every ETL module.
+        
+        Args:
+            plugin_name (str): Name of the ETL plugin class
+            
+        Returns:
+            type: The ETL plugin class, or None if there is no such plugin
+        """
+        if self._plugin_classes is None:
+            self._plugin_classes = {plugin.__name__: plugin for plugin in discover_plugins()}
+        return self._plugin_classes.get(plugin_name)
 
 # Global scheduler instance
 scheduler = ETLScheduler()
@@ -3,18 +3,47 @@ Base scraper class for all county property scrapers.
 Defines common methods and interfaces that all county scrapers should implement.
 """
 
+import hashlib
 import logging
+import threading
 import time
+import types
 import requests
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Union
+from functools import lru_cache
+from typing import Callable, Dict, List, Any, Optional, Union
+
+from etl.scrapers.page_cache import PageCache, get_default_page_cache
+from etl.scrapers.rate_limiter import DEFAULT_RATE_LIMITER
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=128)
+def _code_fingerprint(code: types.CodeType) -> str:
+    """Hash a function's bytecode, constants and names (stable across runs)."""
+    digest = hashlib.sha256()
+    pending = [code]
+    while pending:
+        current = pending.pop()
+        digest.update(current.co_code)
+        digest.update(repr(current.co_names).encode())
+        for const in current.co_consts:
+            if isinstance(const, types.CodeType):
+                pending.append(const)
+            elif isinstance(const, frozenset):
+                digest.update(repr(sorted(map(repr, const))).encode())
+            else:
+                digest.update(repr(const).encode())
+    return digest.hexdigest()[:16]
+
 class BaseScraper(ABC):
     """Base class for all county property scrapers."""
     
+    # Bump when extraction changes outside the parse functions passed to
+    # _parse_page (e.g. in shared helpers), to invalidate cached parse results
+    PARSER_VERSION = 1
+    
     def __init__(self, county_name: str, state: str):
         """
         Initialize the base scraper.
@@ -27,6 +56,21 @@ class BaseScraper(ABC):
         self.state = state
         self.session = requests.Session()
         self.rate_limit_delay = 1.0  # Default delay between requests (in seconds)
+        self.max_concurrent_requests = 2  # Default requests in flight per host
+        self.rate_limiter = DEFAULT_RATE_LIMITER
+        self.use_page_cache = True  # Conditional GETs and parse caching; opt out with page_cache = None
+        self._page_cache: Optional[PageCache] = None
+        self._stats_lock = threading.Lock()
+        self.cache_stats = {
+            'conditional_requests': 0,
+            'not_modified': 0,
+            'unchanged': 0,
+            'bytes_saved': 0,
+            'parses': 0,
+            'parse_hits': 0,
+            'parse_time': 0.0,
+            'parse_time_saved': 0.0,
+        }
         
         # Add common headers to mimic a browser
         self.session.headers.update({
@@ -37,12 +81,35 @@ class BaseScraper(ABC):
             'Upgrade-Insecure-Requests': '1',
         })
     
+    @property
+    def page_cache(self) -> Optional[PageCache]:
+        """The page cache (shared by default), or None if caching is disabled."""
+        if not self.use_page_cache:
+            return None
+        if self._page_cache is None:
+            self._page_cache = get_default_page_cache()
+        return self._page_cache
+    
+    @page_cache.setter
+    def page_cache(self, cache: Optional[PageCache]):
+        self._page_cache = cache
+        self.use_page_cache = cache is not None
+    
+    def _count(self, stat: str, amount: Union[int, float] = 1):
+        with self._stats_lock:
+            self.cache_stats[stat] += amount
+    
     def _make_request(self, url: str, method: str = 'GET', params: Dict[str, Any] = None, 
                      data: Dict[str, Any] = None, headers: Dict[str, str] = None,
                      timeout: int = 30, retry_count: int = 3) -> Optional[requests.Response]:
         """
         Make an HTTP request with rate limiting and retries.
         
+        GET requests go through the page cache: a cached page is revalidated
+        with If-None-Match/If-Modified-Since and a 304 is answered from the
+        cache. Returned GET responses carry ``content_hash`` and
+        ``content_unchanged`` attributes for use with ``_parse_page``.
+        
         Args:
             url (str): The URL to request.
             method (str): HTTP method (GET, POST, etc).
@@ -55,24 +122,42 @@ class BaseScraper(ABC):
         Returns:
             Optional[requests.Response]: Response object or None if all retries failed.
         """
+        cache = self.page_cache if method.upper() == 'GET' else None
+        cached = None
+        if cache is not None:
+            cache_url = requests.Request('GET', url, params=params).prepare().url
+            cached = cache.get(cache_url)
+            if cached:
+                conditional_headers = {}
+                if cached['etag']:
+                    conditional_headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    conditional_headers['If-Modified-Since'] = cached['last_modified']
+                if conditional_headers:
+                    headers = {**(headers or {}), **conditional_headers}
+                    self._count('conditional_requests')
+        
         for attempt in range(retry_count):
             try:
-                # Rate limit to avoid overwhelming the server
-                time.sleep(self.rate_limit_delay)
-                
-                logger.info(f"Making {method} request to {url}")
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    data=data,
-                    headers=headers,
-                    timeout=timeout
-                )
+                # Rate limit per host to avoid overwhelming the server
+                with self.rate_limiter.slot(url, min_interval=self.rate_limit_delay,
+                                            max_concurrent=self.max_concurrent_requests):
+                    logger.info(f"Making {method} request to {url}")
+                    response = self.session.request(
+                        method=method,
+                        url=url,
+                        params=params,
+                        data=data,
+                        headers=headers,
+                        timeout=timeout
+                    )
                 
                 # Raise for status to catch HTTP errors
                 response.raise_for_status()
                 
+                if cache is not None:
+                    self._update_page_cache(cache, cache_url, cached, response)
+                
                 return response
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Request attempt {attempt + 1}/{retry_count} failed: {str(e)}")
@@ -85,6 +170,102 @@ class BaseScraper(ABC):
                     logger.error(f"All {retry_count} attempts failed for URL: {url}")
                     return None
     
+    def _update_page_cache(self, cache: PageCache, cache_url: str,
+                           cached: Optional[Dict[str, Any]], response: requests.Response):
+        """
+        Answer a 304 from the cache, or store a freshly fetched page.
+        
+        Args:
+            cache (PageCache): The page cache
+            cache_url (str): Cache key (the full request URL)
+            cached (Optional[Dict[str, Any]]): Page cached before the request
+            response (requests.Response): The response, updated in place
+        """
+        if response.status_code == 304 and cached:
+            response.status_code = 200
+            response._content = cached['body']
+            response.encoding = cached['encoding']
+            response.content_hash = cached['body_hash']
+            response.content_unchanged = True
+            self._count('not_modified')
+            self._count('bytes_saved', len(cached['body']))
+            return
+        
+        digest = cache.put(
+            cache_url,
+            response.content,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            encoding=response.encoding
+        )
+        response.content_hash = digest
+        response.content_unchanged = bool(cached) and cached['body_hash'] == digest
+        if response.content_unchanged:
+            self._count('unchanged')
+    
+    def _parse_page(self, response: requests.Response, parser: str,
+                    parse_func: Callable[[str], Any]) -> Any:
+        """
+        Parse a response body, reusing the cached result for identical content.
+        
+        Cached results are keyed by the body hash, the parse step name and a
+        parser version made of PARSER_VERSION and a fingerprint of
+        ``parse_func``'s code, so editing the parse function (or bumping
+        PARSER_VERSION) re-parses pages that have not changed.
+        
+        Args:
+            response (requests.Response): Response from ``_make_request``
+            parser (str): Name of the parse step, part of the cache key
+            parse_func (Callable[[str], Any]): Parses page text into a JSON-serializable result
+            
+        Returns:
+            Any: The parse result
+        """
+        digest = getattr(response, 'content_hash', None)
+        cache = self.page_cache if digest else None
+        if cache is not None:
+            version = self._parser_version(parse_func)
+            hit = cache.get_parsed(digest, parser, version)
+            if hit is not None:
+                self._count('parse_hits')
+                self._count('parse_time_saved', hit['parse_time'])
+                return hit['result']
+        
+        start_time = time.perf_counter()
+        result = parse_func(response.text)
+        elapsed = time.perf_counter() - start_time
+        self._count('parses')
+        self._count('parse_time', elapsed)
+        
+        if cache is not None:
+            cache.put_parsed(digest, parser, result, elapsed, version)
+        return result
+    
+    def _parser_version(self, parse_func: Callable[[str], Any]) -> str:
+        """Version tag for parse results: PARSER_VERSION plus the parse function's code fingerprint."""
+        code = getattr(getattr(parse_func, '__func__', parse_func), '__code__', None)
+        fingerprint = _code_fingerprint(code) if code is not None else ''
+        return f"{self.PARSER_VERSION}:{fingerprint}"
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get request, cache and parse statistics for this scraper.
+        
+        Returns:
+            Dict[str, Any]: Cache counters (bytes and parse time saved) and rate limiter totals
+        """
+        with self._stats_lock:
+            stats = dict(self.cache_stats)
+        stats['parse_time'] = round(stats['parse_time'], 3)
+        stats['parse_time_saved'] = round(stats['parse_time_saved'], 3)
+        cache = self._page_cache if self.use_page_cache else None
+        return {
+            'county': self.county_name,
+            'cache': stats,
+            'page_cache': cache.stats() if cache is not None else None,
+            'rate_limiter': dict(self.rate_limiter.stats),
+        }
+    
     @abstractmethod
     def search_properties(self, query: str, **kwargs) -> Dict[str, Any]:
         """
@@ -10,12 +10,14 @@ import os
 import logging
 import json
 import re
+import threading
+import time
 from typing import Dict, List, Any, Optional, Union
 import requests
 from datetime import datetime
-from bs4 import BeautifulSoup
 
 from etl.scrapers.base_scraper import BaseScraper
+from etl.scrapers.html_parser import ParsedPage, find_input_value, parse_html
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -36,6 +38,16 @@ class FranklinCountyScraper(BaseScraper):
         # Rate limiting for the county website (more conservative)
         self.rate_limit_delay = 2.0
         
+        # Disclaimer-accepted session state, shared by all searches
+        self._verification_token: Optional[str] = None
+        self._session_started: Optional[float] = None
+        self._session_lock = threading.Lock()
+        self.session_max_age = 3600  # Re-accept the disclaimer after this many seconds
+        self.session_stats = {
+            'handshakes': 0,
+            'rejections': 0,
+        }
+        
         # Add a standard disclaimer about data compliance
         self.disclaimer = (
             "Property data provided follows International Association of Assessing "
@@ -74,52 +86,7 @@ class FranklinCountyScraper(BaseScraper):
         logger.info(f"Searching Franklin County properties by {search_type}: {query}")
         
         try:
-            # Start a session
-            session = self.session
-            
-            # First get the disclaimer page to get cookies and form values
-            disclaimer_response = self._make_request(self.search_url)
-            if not disclaimer_response:
-                return {
-                    'error': 'request_failed',
-                    'message': "Failed to access Franklin County property search portal.",
-                    'data_compliance': self.disclaimer
-                }
-            
-            # Parse the disclaimer page
-            soup = BeautifulSoup(disclaimer_response.text, 'html.parser')
-            
-            # Find the request verification token
-            token_input = soup.find('input', {'name': '__RequestVerificationToken'})
-            if not token_input:
-                return {
-                    'error': 'token_not_found',
-                    'message': "Could not find verification token on Franklin County search page.",
-                    'data_compliance': self.disclaimer
-                }
-            
-            token = token_input.get('value', '')
-            
-            # Accept the disclaimer
-            disclaimer_post_data = {
-                '__RequestVerificationToken': token,
-                'AcceptDisclaimer': 'True'
-            }
-            
-            disclaimer_accept_response = self._make_request(
-                url=self.search_url,
-                method='POST',
-                data=disclaimer_post_data
-            )
-            
-            if not disclaimer_accept_response:
-                return {
-                    'error': 'disclaimer_accept_failed',
-                    'message': "Failed to accept disclaimer on Franklin County property search portal.",
-                    'data_compliance': self.disclaimer
-                }
-            
-            # Now perform the search based on search type
+            # Build the search form based on search type
             search_data = {
                 'SearchByAddress': 'False',
                 'SearchByOwner': 'False',
@@ -137,14 +104,10 @@ class FranklinCountyScraper(BaseScraper):
                 search_data['SearchByParcel'] = 'True'
                 search_data['Parcel'] = query
             
-            # Add the verification token
-            search_data['__RequestVerificationToken'] = token
+            search_response = self._post_search(search_data)
             
-            search_response = self._make_request(
-                url=self.post_search_url,
-                method='POST',
-                data=search_data
-            )
+            if isinstance(search_response, dict):
+                return search_response
             
             if not search_response:
                 return {
@@ -154,11 +117,10 @@ class FranklinCountyScraper(BaseScraper):
                 }
             
             # Parse the search results
-            results_soup = BeautifulSoup(search_response.text, 'html.parser')
+            results_soup = parse_html(search_response.text)
             
-            # Find the property table
-            property_table = results_soup.find('table', {'class': 'table'})
-            if not property_table:
+            raw_properties = self._extract_search_results(results_soup, limit)
+            if raw_properties is None:
                 return {
                     'count': 0,
                     'properties': [],
@@ -168,31 +130,8 @@ class FranklinCountyScraper(BaseScraper):
                     'message': "No properties found matching your search criteria."
                 }
             
-            # Extract property data from table rows
-            properties = []
-            rows = property_table.find_all('tr')[1:]  # Skip header row
-            
-            for row in rows[:limit]:  # Apply the result limit
-                cells = row.find_all('td')
-                if len(cells) >= 4:
-                    # Extract the property ID (parcel number) from the link
-                    link = cells[0].find('a')
-                    if link:
-                        property_id = link.text.strip()
-                        property_url = link.get('href', '')
-                        
-                        # Extract information from cells
-                        property_data = {
-                            'property_id': property_id,
-                            'owner': cells[1].text.strip() if len(cells) > 1 else 'Unknown',
-                            'address': cells[2].text.strip() if len(cells) > 2 else 'Unknown',
-                            'property_type': cells[3].text.strip() if len(cells) > 3 else 'Unknown',
-                            'url': f"{self.base_url}{property_url}" if property_url.startswith('/') else property_url
-                        }
-                        
-                        # Standardize the property data
-                        standardized = self.standardize_property(property_data)
-                        properties.append(standardized)
+            # Standardize the property data
+            properties = [self.standardize_property(property_data) for property_data in raw_properties]
             
             # Format the results
             result = {
@@ -213,6 +152,184 @@ class FranklinCountyScraper(BaseScraper):
                 'data_compliance': self.disclaimer
             }
     
+    def _extract_search_results(self, soup: ParsedPage, limit: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Extract property rows from a search results page.
+        
+        Args:
+            soup (ParsedPage): Parsed HTML of the results page
+            limit (int, optional): Maximum number of rows to extract
+        
+        Returns:
+            Optional[List[Dict[str, Any]]]: Raw property data per result row,
+                or None if the page has no results table
+        """
+        # Find the property table
+        property_table = soup.find('table', {'class': 'table'})
+        if not property_table:
+            return None
+        
+        # Extract property data from table rows
+        properties = []
+        rows = property_table.find_all('tr')[1:]  # Skip header row
+        
+        for row in rows[:limit]:  # Apply the result limit
+            cells = row.find_all('td')
+            if len(cells) >= 4:
+                # Extract the property ID (parcel number) from the link
+                link = cells[0].find('a')
+                if link:
+                    property_url = link.get('href', '')
+                    properties.append({
+                        'property_id': link.text.strip(),
+                        'owner': cells[1].text.strip(),
+                        'address': cells[2].text.strip(),
+                        'property_type': cells[3].text.strip(),
+                        'url': f"{self.base_url}{property_url}" if property_url.startswith('/') else property_url
+                    })
+        
+        return properties
+    
+    def _start_session(self) -> Optional[Dict[str, Any]]:
+        """
+        Accept the search disclaimer and store the verification token.
+        
+        Must be called with the session lock held.
+        
+        Returns:
+            Optional[Dict[str, Any]]: Error response, or None on success
+        """
+        self._verification_token = None
+        self._session_started = None
+        
+        # First get the disclaimer page to get cookies and form values
+        disclaimer_response = self._make_request(self.search_url)
+        if not disclaimer_response:
+            return {
+                'error': 'request_failed',
+                'message': "Failed to access Franklin County property search portal.",
+                'data_compliance': self.disclaimer
+            }
+        
+        # Find the request verification token on the disclaimer page
+        token = find_input_value(disclaimer_response.text, '__RequestVerificationToken')
+        if token is None:
+            return {
+                'error': 'token_not_found',
+                'message': "Could not find verification token on Franklin County search page.",
+                'data_compliance': self.disclaimer
+            }
+        
+        # Accept the disclaimer
+        disclaimer_post_data = {
+            '__RequestVerificationToken': token,
+            'AcceptDisclaimer': 'True'
+        }
+        
+        disclaimer_accept_response = self._make_request(
+            url=self.search_url,
+            method='POST',
+            data=disclaimer_post_data
+        )
+        
+        if not disclaimer_accept_response:
+            return {
+                'error': 'disclaimer_accept_failed',
+                'message': "Failed to accept disclaimer on Franklin County property search portal.",
+                'data_compliance': self.disclaimer
+            }
+        
+        self._verification_token = token
+        self._session_started = time.monotonic()
+        self.session_stats['handshakes'] += 1
+        logger.info("Accepted Franklin County search disclaimer")
+        return None
+    
+    def _get_token(self, refresh: bool = False) -> Union[str, Dict[str, Any]]:
+        """
+        Get the verification token of the disclaimer-accepted session.
+        
+        The disclaimer is only accepted when there is no session yet, it
+        has expired, or ``refresh`` is set after the server rejected it.
+        
+        Args:
+            refresh (bool): Discard the current session first
+        
+        Returns:
+            Union[str, Dict[str, Any]]: The token, or an error response
+        """
+        with self._session_lock:
+            expired = (
+                self._session_started is not None
+                and time.monotonic() - self._session_started > self.session_max_age
+            )
+            if refresh or expired or not self._verification_token:
+                error = self._start_session()
+                if error:
+                    return error
+            return self._verification_token
+    
+    def _invalidate_session(self, token: str):
+        """Forget the session if it still uses the given (rejected) token."""
+        with self._session_lock:
+            if self._verification_token == token:
+                self._verification_token = None
+                self._session_started = None
+    
+    def _is_session_rejected(self, response: Optional[requests.Response]) -> bool:
+        """
+        Check whether the portal rejected a search for lack of a valid session.
+        
+        A rejected search either fails (anti-forgery errors are HTTP 400) or
+        lands back on the disclaimer page.
+        """
+        if response is None:
+            return True
+        if '/Search/Disclaimer' in (response.url or ''):
+            return True
+        return 'AcceptDisclaimer' in response.text
+    
+    def _post_search(self, search_data: Dict[str, str]) -> Union[Optional[requests.Response], Dict[str, Any]]:
+        """
+        Post a search using the cached session, re-accepting the disclaimer once if rejected.
+        
+        Args:
+            search_data (Dict[str, str]): Search form fields (without token)
+        
+        Returns:
+            Union[Optional[requests.Response], Dict[str, Any]]: Search response,
+            None if the search failed, or an error response from the session setup
+        """
+        token = self._get_token()
+        if isinstance(token, dict):
+            return token
+        
+        # A single attempt first: a failure here usually means a stale session
+        response = self._make_request(
+            url=self.post_search_url,
+            method='POST',
+            data={**search_data, '__RequestVerificationToken': token},
+            retry_count=1
+        )
+        if not self._is_session_rejected(response):
+            return response
+        
+        logger.info("Franklin County session rejected, accepting disclaimer again")
+        self.session_stats['rejections'] += 1
+        self._invalidate_session(token)
+        token = self._get_token()
+        if isinstance(token, dict):
+            return token
+        
+        response = self._make_request(
+            url=self.post_search_url,
+            method='POST',
+            data={**search_data, '__RequestVerificationToken': token}
+        )
+        if response is not None and self._is_session_rejected(response):
+            return None
+        return response
+    
     def get_property_details(self, property_id: str) -> Dict[str, Any]:
         """
         Get detailed information for a specific property from Franklin County.
@@ -260,21 +377,15 @@ class FranklinCountyScraper(BaseScraper):
                     'data_compliance': self.disclaimer
                 }
             
-            # Parse the property details page
-            details_soup = BeautifulSoup(details_response.text, 'html.parser')
-            
-            # Extract additional details from the page
-            owner_info = self._extract_section_data(details_soup, 'Owner Information')
-            assessment_info = self._extract_section_data(details_soup, 'Assessment')
-            valuation_info = self._extract_section_data(details_soup, 'Valuation')
-            land_info = self._extract_section_data(details_soup, 'Land Information')
-            building_info = self._extract_section_data(details_soup, 'Building Information')
-            
-            # Extract tax history if available
-            tax_history = self._extract_tax_history(details_soup)
-            
-            # Extract sales history if available
-            sales_history = self._extract_sales_history(details_soup)
+            # Parse the property details page (skipped if the page is unchanged)
+            page = self._parse_page(details_response, 'franklin.details', self._parse_details_page)
+            owner_info = page['owner_information']
+            assessment_info = page['assessment']
+            valuation_info = page['valuation']
+            land_info = page['land_information']
+            building_info = page['building_information']
+            tax_history = page['tax_history']
+            sales_history = page['sales_history']
             
             # Combine all information into a comprehensive property record
             detailed_property = {
@@ -362,12 +473,34 @@ class FranklinCountyScraper(BaseScraper):
                 'data_compliance': self.disclaimer
             }
     
-    def _extract_section_data(self, soup: BeautifulSoup, section_title: str) -> Dict[str, Any]:
+    def _parse_details_page(self, html: str) -> Dict[str, Any]:
+        """
+        Extract all sections of a property details page.
+        
+        Args:
+            html (str): Property details page HTML
+        
+        Returns:
+            Dict[str, Any]: Section data, tax history and sales history
+        """
+        details_soup = parse_html(html)
+        
+        return {
+            'owner_information': self._extract_section_data(details_soup, 'Owner Information'),
+            'assessment': self._extract_section_data(details_soup, 'Assessment'),
+            'valuation': self._extract_section_data(details_soup, 'Valuation'),
+            'land_information': self._extract_section_data(details_soup, 'Land Information'),
+            'building_information': self._extract_section_data(details_soup, 'Building Information'),
+            'tax_history': self._extract_tax_history(details_soup),
+            'sales_history': self._extract_sales_history(details_soup),
+        }
+    
+    def _extract_section_data(self, soup: ParsedPage, section_title: str) -> Dict[str, Any]:
         """
         Extract data from a specific section of the property details page.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML of the page
+            soup (ParsedPage): Parsed HTML of the page
             section_title (str): Title of the section to extract
         
         Returns:
@@ -410,12 +543,12 @@ class FranklinCountyScraper(BaseScraper):
         
         return data
     
-    def _extract_tax_history(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def _extract_tax_history(self, soup: ParsedPage) -> List[Dict[str, Any]]:
         """
         Extract tax history from the property details page.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML of the page
+            soup (ParsedPage): Parsed HTML of the page
         
         Returns:
             List[Dict[str, Any]]: List of tax history records
@@ -457,12 +590,12 @@ class FranklinCountyScraper(BaseScraper):
         
         return tax_history
     
-    def _extract_sales_history(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def _extract_sales_history(self, soup: ParsedPage) -> List[Dict[str, Any]]:
         """
         Extract sales history from the property details page.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML of the page
+            soup (ParsedPage): Parsed HTML of the page
         
         Returns:
             List[Dict[str, Any]]: List of sales history records
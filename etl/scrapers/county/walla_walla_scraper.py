@@ -13,10 +13,10 @@ import re
 from typing import Dict, List, Any, Optional, Union
 import requests
 from datetime import datetime
-from bs4 import BeautifulSoup
 import trafilatura
 
 from etl.scrapers.base_scraper import BaseScraper
+from etl.scrapers.html_parser import ParsedPage, find_input_value, parse_html
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -125,20 +125,15 @@ class WallaWallaCountyScraper(BaseScraper):
                     'data_compliance': self.disclaimer
                 }
             
-            # Parse the search page
-            soup = BeautifulSoup(search_response.text, 'html.parser')
-            
-            # Find the verification token and form values
-            token_input = soup.find('input', {'name': '__RequestVerificationToken'})
-            if not token_input:
+            # Find the verification token on the search page
+            token = find_input_value(search_response.text, '__RequestVerificationToken')
+            if token is None:
                 return {
                     'error': 'token_not_found',
                     'message': "Could not find verification token on Walla Walla County search page.",
                     'data_compliance': self.disclaimer
                 }
             
-            token = token_input.get('value', '')
-            
             # Prepare search data based on search type
             search_data = {
                 '__RequestVerificationToken': token,
@@ -170,7 +165,7 @@ class WallaWallaCountyScraper(BaseScraper):
                 }
             
             # Parse the search results
-            results_soup = BeautifulSoup(search_results_response.text, 'html.parser')
+            results_soup = parse_html(search_results_response.text)
             
             # Find property results
             property_results = results_soup.find_all('div', {'class': 'propertySearchResultItem'})
@@ -203,29 +198,10 @@ class WallaWallaCountyScraper(BaseScraper):
                         }
             
             # Extract property data from search results
-            properties = []
-            for prop_div in property_results[:limit]:
-                property_id_elem = prop_div.find('span', {'class': 'propertyID'})
-                address_elem = prop_div.find('span', {'class': 'propertyAddress'})
-                owner_elem = prop_div.find('span', {'class': 'propertyOwner'})
-                
-                if property_id_elem:
-                    # Extract property ID and details URL
-                    property_id = property_id_elem.text.strip()
-                    property_link = prop_div.find('a', {'class': 'propertyLink'})
-                    details_url = property_link.get('href') if property_link else None
-                    
-                    # Extract information
-                    property_data = {
-                        'property_id': property_id,
-                        'owner': owner_elem.text.strip() if owner_elem else 'Unknown',
-                        'address': address_elem.text.strip() if address_elem else 'Unknown',
-                        'url': f"{self.base_url}{details_url}" if details_url and details_url.startswith('/') else details_url
-                    }
-                    
-                    # Standardize the property data
-                    standardized = self.standardize_property(property_data)
-                    properties.append(standardized)
+            properties = [
+                self.standardize_property(property_data)
+                for property_data in self._extract_search_results(results_soup, limit)
+            ]
             
             # Format the results
             result = {
@@ -334,21 +310,15 @@ class WallaWallaCountyScraper(BaseScraper):
                     'data_compliance': self.disclaimer
                 }
             
-            # Parse the property details page
-            details_soup = BeautifulSoup(details_response.text, 'html.parser')
-            
-            # Extract additional details from the page
-            owner_info = self._extract_details_section(details_soup, 'Owner Information')
-            property_info = self._extract_details_section(details_soup, 'Property Information')
-            value_info = self._extract_details_section(details_soup, 'Value Information')
-            land_info = self._extract_details_section(details_soup, 'Land Information')
-            improvement_info = self._extract_details_section(details_soup, 'Improvement Information')
-            
-            # Extract tax information if available
-            tax_info = self._extract_details_section(details_soup, 'Tax Information')
-            
-            # Extract sales history if available
-            sales_history = self._extract_sales_history(details_soup)
+            # Parse the property details page (skipped if the page is unchanged)
+            page = self._parse_page(details_response, 'walla_walla.details', self._parse_details_page)
+            owner_info = page['owner_information']
+            property_info = page['property_information']
+            value_info = page['value_information']
+            land_info = page['land_information']
+            improvement_info = page['improvement_information']
+            tax_info = page['tax_information']
+            sales_history = page['sales_history']
             
             # Combine all information into a comprehensive property record
             detailed_property = {
@@ -425,12 +395,65 @@ class WallaWallaCountyScraper(BaseScraper):
                 'data_compliance': self.disclaimer
             }
     
-    def _extract_property_from_details(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _parse_details_page(self, html: str) -> Dict[str, Any]:
+        """
+        Extract all sections of a property details page.
+        
+        Args:
+            html (str): Property details page HTML
+            
+        Returns:
+            Dict[str, Any]: Section data and sales history
+        """
+        details_soup = parse_html(html)
+        
+        return {
+            'owner_information': self._extract_details_section(details_soup, 'Owner Information'),
+            'property_information': self._extract_details_section(details_soup, 'Property Information'),
+            'value_information': self._extract_details_section(details_soup, 'Value Information'),
+            'land_information': self._extract_details_section(details_soup, 'Land Information'),
+            'improvement_information': self._extract_details_section(details_soup, 'Improvement Information'),
+            'tax_information': self._extract_details_section(details_soup, 'Tax Information'),
+            'sales_history': self._extract_sales_history(details_soup),
+        }
+    
+    def _extract_search_results(self, soup: ParsedPage, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Extract property entries from a search results page.
+        
+        Args:
+            soup (ParsedPage): Parsed HTML of the results page
+            limit (int, optional): Maximum number of entries to extract
+        
+        Returns:
+            List[Dict[str, Any]]: Raw property data per result entry
+        """
+        properties = []
+        for prop_div in soup.find_all('div', {'class': 'propertySearchResultItem'})[:limit]:
+            property_id_elem = prop_div.find('span', {'class': 'propertyID'})
+            address_elem = prop_div.find('span', {'class': 'propertyAddress'})
+            owner_elem = prop_div.find('span', {'class': 'propertyOwner'})
+            
+            if property_id_elem:
+                # Extract property ID and details URL
+                property_link = prop_div.find('a', {'class': 'propertyLink'})
+                details_url = property_link.get('href') if property_link else None
+                
+                properties.append({
+                    'property_id': property_id_elem.text.strip(),
+                    'owner': owner_elem.text.strip() if owner_elem else 'Unknown',
+                    'address': address_elem.text.strip() if address_elem else 'Unknown',
+                    'url': f"{self.base_url}{details_url}" if details_url and details_url.startswith('/') else details_url
+                })
+        
+        return properties
+    
+    def _extract_property_from_details(self, soup: ParsedPage) -> Dict[str, Any]:
         """
         Extract property information from a details page.
         
         Args:
-            soup (BeautifulSoup): Parsed details page HTML
+            soup (ParsedPage): Parsed details page HTML
             
         Returns:
             Dict[str, Any]: Extracted property information
@@ -466,12 +489,12 @@ class WallaWallaCountyScraper(BaseScraper):
             logger.error(f"Error extracting property from details page: {str(e)}")
             return None
     
-    def _extract_details_section(self, soup: BeautifulSoup, section_title: str) -> Dict[str, Any]:
+    def _extract_details_section(self, soup: ParsedPage, section_title: str) -> Dict[str, Any]:
         """
         Extract data from a specific section of the property details page.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML of the page
+            soup (ParsedPage): Parsed HTML of the page
             section_title (str): Title of the section to extract
         
         Returns:
@@ -556,12 +579,12 @@ class WallaWallaCountyScraper(BaseScraper):
         # Return as string for any other format
         return value
     
-    def _extract_sales_history(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def _extract_sales_history(self, soup: ParsedPage) -> List[Dict[str, Any]]:
         """
         Extract sales history from the property details page.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML of the page
+            soup (ParsedPage): Parsed HTML of the page
         
         Returns:
             List[Dict[str, Any]]: List of sales history records
@@ -0,0 +1,274 @@
+"""
+HTML parsing backends for county scrapers.
+
+Scrapers parse pages through this module instead of constructing
+BeautifulSoup directly, so the parser can be swapped in one place.
+
+Two backends are provided:
+
+* ``lxml`` (default when installed): pages are parsed into a native lxml
+  tree and wrapped in ``LxmlNode``, which implements the subset of the
+  BeautifulSoup API the scrapers use (``find``, ``find_all``,
+  ``find_next``, ``get``, ``text``, ``name``) on top of compiled XPath
+  queries. Raw XPath is available through ``LxmlNode.xpath``.
+* ``html.parser``: plain BeautifulSoup with Python's built-in parser, used
+  when lxml is not installed.
+
+The backend can be forced with the SCRAPER_HTML_PARSER environment
+variable (e.g. for benchmarking or to rule out a parser difference).
+"""
+
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple, Union
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Supported backends, fastest first
+PARSER_BACKENDS = ['lxml', 'html.parser']
+
+TagFilter = Union[None, str, Iterable[str]]
+StringFilter = Union[None, str, Pattern]
+
+
+def available_backends() -> List[str]:
+    """Get the parser backends usable in this environment, fastest first."""
+    return [b for b in PARSER_BACKENDS if b != 'lxml' or HAS_LXML]
+
+
+def get_parser_backend(backend: Optional[str] = None) -> str:
+    """
+    Resolve the parser backend to use.
+
+    Args:
+        backend (str, optional): Requested backend (default: SCRAPER_HTML_PARSER or fastest available)
+
+    Returns:
+        str: A usable backend name
+    """
+    backend = backend or os.environ.get('SCRAPER_HTML_PARSER')
+    available = available_backends()
+    if backend is None:
+        return available[0]
+    if backend not in available:
+        logger.warning(f"HTML parser backend {backend!r} unavailable, using {available[0]!r}")
+        return available[0]
+    return backend
+
+
+@lru_cache(maxsize=256)
+def _compile(expression: str):
+    return etree.XPath(expression)
+
+
+def _tag_test(name: TagFilter) -> str:
+    if name is None:
+        return '*'
+    names = [name] if isinstance(name, str) else list(name)
+    if len(names) == 1:
+        return names[0]
+    return '*[' + ' or '.join(f'self::{n}' for n in names) + ']'
+
+
+def _attr_predicates(attrs: Optional[Dict[str, Any]]) -> Tuple[str, Dict[str, str]]:
+    # Attribute filters become XPath predicates with bound variables;
+    # 'class' matches any one of the element's classes, as in BeautifulSoup
+    predicates = []
+    variables = {}
+    for i, (attr, value) in enumerate(sorted((attrs or {}).items())):
+        if not re.match(r'^[A-Za-z_][\w:.-]*$', attr):
+            raise ValueError(f"Unsupported attribute name: {attr}")
+        var = f'a{i}'
+        if value is True:
+            predicates.append(f'[@{attr}]')
+            continue
+        variables[var] = str(value)
+        if attr == 'class':
+            predicates.append(f"[contains(concat(' ', normalize-space(@class), ' '), concat(' ', ${var}, ' '))]")
+        else:
+            predicates.append(f'[@{attr}=${var}]')
+    return ''.join(predicates), variables
+
+
+def _element_string(element) -> Optional[str]:
+    # BeautifulSoup's .string: the text of an element whose only child is a
+    # string, descending through a chain of single-child elements; None for
+    # empty elements and mixed content
+    while True:
+        children = list(element)
+        if not children:
+            return element.text
+        if len(children) > 1 or element.text or children[0].tail:
+            return None
+        element = children[0]
+        if not isinstance(element.tag, str):
+            # A lone comment is itself the string
+            return element.text
+
+
+class LxmlNode:
+    """
+    BeautifulSoup-compatible wrapper around an lxml element.
+
+    Only the lookups used by the county scrapers are implemented. Matching
+    follows BeautifulSoup semantics: ``string`` matches against ``.string``
+    (the element's only text, found through a chain of single-child
+    elements), and ``find_next`` searches everything after the element's
+    start tag in document order.
+    """
+
+    __slots__ = ('_element',)
+
+    def __init__(self, element):
+        self._element = element
+
+    def __bool__(self) -> bool:
+        # lxml elements without children are falsy; a found node never is
+        return True
+
+    def __repr__(self) -> str:
+        return f"<LxmlNode {self.name}>"
+
+    @property
+    def name(self) -> str:
+        """Tag name."""
+        return self._element.tag
+
+    @property
+    def text(self) -> str:
+        """All text within the element."""
+        return self._element.text_content()
+
+    @property
+    def string(self) -> Optional[str]:
+        """The element's only string, as BeautifulSoup's ``.string`` defines it."""
+        return _element_string(self._element)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get an attribute value."""
+        return self._element.get(key, default)
+
+    def xpath(self, expression: str, **variables) -> List[Any]:
+        """Run an XPath query relative to this element, wrapping element results."""
+        return [LxmlNode(r) if isinstance(r, etree._Element) else r
+                for r in _compile(expression)(self._element, **variables)]
+
+    def find_all(self, name: TagFilter = None, attrs: Optional[Dict[str, Any]] = None,
+                 recursive: bool = True, string: StringFilter = None,
+                 limit: Optional[int] = None, **kwargs) -> List['LxmlNode']:
+        """Find all matching descendants (BeautifulSoup ``find_all``)."""
+        axis = 'descendant' if recursive else 'child'
+        return self._query(f'{axis}::', name, attrs, string, limit, kwargs)
+
+    def find(self, name: TagFilter = None, attrs: Optional[Dict[str, Any]] = None,
+             recursive: bool = True, string: StringFilter = None, **kwargs) -> Optional['LxmlNode']:
+        """Find the first matching descendant (BeautifulSoup ``find``)."""
+        found = self.find_all(name, attrs, recursive, string, limit=1, **kwargs)
+        return found[0] if found else None
+
+    def find_next(self, name: TagFilter = None, attrs: Optional[Dict[str, Any]] = None,
+                  string: StringFilter = None, **kwargs) -> Optional['LxmlNode']:
+        """Find the first matching element after this one (BeautifulSoup ``find_next``)."""
+        tag = _tag_test(name)
+        predicates, variables = _attr_predicates({**(attrs or {}), **self._class_kwarg(kwargs)})
+        expression = f'(descendant::{tag}{predicates} | following::{tag}{predicates})'
+        if string is None:
+            expression += '[1]'
+        return next(iter(self._filter_string(
+            _compile(expression)(self._element, **variables), string, 1)), None)
+
+    def _query(self, axis: str, name: TagFilter, attrs: Optional[Dict[str, Any]],
+               string: StringFilter, limit: Optional[int], kwargs: Dict[str, Any]) -> List['LxmlNode']:
+        predicates, variables = _attr_predicates({**(attrs or {}), **self._class_kwarg(kwargs)})
+        expression = f'{axis}{_tag_test(name)}{predicates}'
+        if limit and string is None:
+            expression = f'({expression})[position() <= {int(limit)}]'
+        return self._filter_string(_compile(expression)(self._element, **variables), string, limit)
+
+    @staticmethod
+    def _class_kwarg(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        attrs = dict(kwargs)
+        if 'class_' in attrs:
+            attrs['class'] = attrs.pop('class_')
+        return attrs
+
+    @staticmethod
+    def _filter_string(elements: List[Any], string: StringFilter,
+                       limit: Optional[int]) -> List['LxmlNode']:
+        matches = []
+        for element in elements:
+            if string is not None:
+                text = _element_string(element)
+                if text is None:
+                    continue
+                if isinstance(string, str):
+                    if text != string:
+                        continue
+                elif not string.search(text):
+                    continue
+            matches.append(LxmlNode(element))
+            if limit and len(matches) >= limit:
+                break
+        return matches
+
+
+# A parsed page: BeautifulSoup or the lxml wrapper, with the same lookup API
+ParsedPage = Union[BeautifulSoup, LxmlNode]
+
+
+def _lxml_document(markup: str):
+    if not markup.strip():
+        markup = '<html></html>'
+    try:
+        return lxml.html.document_fromstring(markup)
+    except ValueError:
+        # Unicode input with an XML encoding declaration
+        return lxml.html.document_fromstring(markup.encode('utf-8'))
+
+
+def parse_html(markup: str, backend: Optional[str] = None) -> ParsedPage:
+    """
+    Parse a page with the configured backend.
+
+    Args:
+        markup (str): Page HTML
+        backend (str, optional): Parser backend override
+
+    Returns:
+        ParsedPage: Parsed document supporting find/find_all/find_next
+    """
+    if get_parser_backend(backend) == 'lxml':
+        return LxmlNode(_lxml_document(markup))
+    return BeautifulSoup(markup, 'html.parser')
+
+
+def find_input_value(markup: str, name: str, backend: Optional[str] = None) -> Optional[str]:
+    """
+    Get the value of a named form input.
+
+    Used for anti-forgery tokens, where only one field of the page is needed.
+
+    Args:
+        markup (str): Page HTML
+        name (str): Input name, e.g. '__RequestVerificationToken'
+        backend (str, optional): Parser backend override
+
+    Returns:
+        Optional[str]: The input's value ('' if it has none), or None if not found
+    """
+    token_input = parse_html(markup, backend).find('input', {'name': name})
+    if not token_input:
+        return None
+    return token_input.get('value', '')
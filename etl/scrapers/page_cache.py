@@ -0,0 +1,259 @@
+"""
+Conditional-GET page cache for county scrapers.
+
+This module stores fetched pages in a local SQLite file together with
+their ETag, Last-Modified and a hash of the body, so scrapers can send
+conditional requests and skip re-parsing pages that have not changed.
+Parsed results are cached per body hash and parse step, tagged with the
+parser version that produced them so extraction changes invalidate them.
+The file is kept under a byte budget by evicting the least recently used
+pages. The total is read from the file on every write, so several
+processes sharing the file enforce one budget.
+
+The cache is on by default and lives in cache/scraper_pages.sqlite under
+the project root. Set SCRAPER_CACHE_PATH to another file to move it, or to
+an empty string to disable it; a single scraper can opt out with
+``scraper.page_cache = None``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CACHE_PATH = os.path.join(_PROJECT_ROOT, 'cache', 'scraper_pages.sqlite')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body_hash TEXT NOT NULL,
+    body BLOB NOT NULL,
+    encoding TEXT,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at);
+CREATE INDEX IF NOT EXISTS pages_size ON pages (size);
+CREATE TABLE IF NOT EXISTS parse_results (
+    body_hash TEXT NOT NULL,
+    parser TEXT NOT NULL,
+    version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    parse_time REAL NOT NULL,
+    PRIMARY KEY (body_hash, parser)
+);
+"""
+
+
+def body_hash(body: bytes) -> str:
+    """Hash a page body."""
+    return hashlib.sha256(body).hexdigest()
+
+
+class PageCache:
+    """
+    SQLite-backed store of fetched pages and their parsed results.
+
+    All methods are thread-safe; one connection is shared behind a lock.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache, creating the SQLite file if needed.
+
+        Args:
+            path (str): SQLite file path (':memory:' for a private in-memory cache)
+            max_bytes (int): Total page body size to keep before evicting
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory and path != ':memory:':
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached page for a URL.
+
+        Args:
+            url (str): Full request URL
+
+        Returns:
+            Optional[Dict[str, Any]]: etag, last_modified, body_hash, body and encoding, or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body_hash, body, encoding FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        return {
+            'etag': row[0],
+            'last_modified': row[1],
+            'body_hash': row[2],
+            'body': bytes(row[3]),
+            'encoding': row[4],
+        }
+
+    def put(self, url: str, body: bytes, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, encoding: Optional[str] = None) -> str:
+        """
+        Store a fetched page, evicting old pages if over budget.
+
+        Args:
+            url (str): Full request URL
+            body (bytes): Response body
+            etag (str, optional): ETag response header
+            last_modified (str, optional): Last-Modified response header
+            encoding (str, optional): Response text encoding
+
+        Returns:
+            str: The body hash
+        """
+        digest = body_hash(body)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(url, etag, last_modified, body_hash, body, encoding, size, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, digest, body, encoding, len(body), now, now)
+            )
+            total_bytes = self._stored_bytes()
+            if total_bytes > self.max_bytes:
+                self._evict(total_bytes)
+            self._conn.commit()
+        return digest
+
+    def get_parsed(self, digest: str, parser: str, version: str = '') -> Optional[Dict[str, Any]]:
+        """
+        Get a cached parse result for a page body.
+
+        Args:
+            digest (str): Body hash
+            parser (str): Name of the parse step (e.g. 'franklin.details')
+            version (str): Parser version; results stored by another version are ignored
+
+        Returns:
+            Optional[Dict[str, Any]]: 'result' and the original 'parse_time', or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, parse_time FROM parse_results WHERE body_hash = ? AND parser = ? AND version = ?",
+                (digest, parser, version)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'result': json.loads(row[0]), 'parse_time': row[1]}
+
+    def put_parsed(self, digest: str, parser: str, result: Any, parse_time: float, version: str = ''):
+        """
+        Store a parse result for a page body, replacing any other version's result.
+
+        Results that cannot be serialized as JSON are not cached.
+
+        Args:
+            digest (str): Body hash
+            parser (str): Name of the parse step
+            result: Parsed result
+            parse_time (float): Seconds the parse took
+            version (str): Parser version that produced the result
+        """
+        try:
+            encoded = json.dumps(result)
+        except (TypeError, ValueError):
+            logger.debug(f"Not caching unserializable {parser} result")
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_results (body_hash, parser, version, result, parse_time) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (digest, parser, version, encoded, parse_time)
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of cached pages and their total size."""
+        with self._lock:
+            pages = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            total_bytes = self._stored_bytes()
+        return {'pages': pages, 'bytes': total_bytes, 'max_bytes': self.max_bytes}
+
+    def clear(self):
+        """Remove all cached pages and parse results."""
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.execute("DELETE FROM parse_results")
+            self._conn.commit()
+
+    def close(self):
+        """Close the SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _stored_bytes(self) -> int:
+        # Answered from the pages_size index, without reading page bodies
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def _evict(self, total_bytes: int):
+        # Drop least recently used pages down to 90% of the budget, then
+        # parse results whose page body is no longer stored
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall()
+        evicted = []
+        for url, size in rows:
+            if total_bytes <= target:
+                break
+            evicted.append((url,))
+            total_bytes -= size
+        self._conn.executemany("DELETE FROM pages WHERE url = ?", evicted)
+        self._conn.execute("DELETE FROM parse_results WHERE body_hash NOT IN (SELECT body_hash FROM pages)")
+        logger.info(f"Evicted {len(evicted)} pages from scraper cache {self.path}")
+
+
+_default_cache: Optional[PageCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_page_cache() -> Optional[PageCache]:
+    """
+    Get the page cache shared by all scrapers.
+
+    The cache file is taken from SCRAPER_CACHE_PATH (default
+    cache/scraper_pages.sqlite under the project root, independent of the
+    working directory) and its budget from SCRAPER_CACHE_MAX_MB. Setting
+    SCRAPER_CACHE_PATH to an empty string disables caching.
+
+    Returns:
+        Optional[PageCache]: The shared cache, or None if disabled or unavailable
+    """
+    global _default_cache
+    path = os.environ.get('SCRAPER_CACHE_PATH', DEFAULT_CACHE_PATH)
+    if not path:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            max_mb = float(os.environ.get('SCRAPER_CACHE_MAX_MB', DEFAULT_MAX_BYTES / (1024 * 1024)))
+            try:
+                _default_cache = PageCache(path, int(max_mb * 1024 * 1024))
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Scraper page cache disabled: {str(e)}")
+                return None
+        return _default_cache
@@ -0,0 +1,186 @@
+"""
+Parse-time micro-benchmark for county scraper pages.
+
+Times parsing plus field extraction of saved county pages with each
+available HTML parser backend, so parser changes can be measured without
+hitting county websites.
+
+Pages live in one directory per county (tests/fixtures/county_pages/<county>/)
+and are matched to an extraction workload by file name prefix:
+disclaimer/search (token lookup), search_results and property_details.
+
+The bundled fixtures are synthetic pages that reproduce the markup
+structure the scrapers rely on (padded with repeated navigation), not
+saved county pages, so they check backend equivalence but their timings
+are only indicative. Point --pages at real saved pages for numbers
+that reflect production.
+
+Usage:
+    python -m etl.scrapers.parse_benchmark --iterations 200
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from etl.scrapers.html_parser import available_backends, find_input_value, parse_html
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_DIR = os.path.join('tests', 'fixtures', 'county_pages')
+
+
+def _franklin_scraper():
+    from etl.scrapers.county.franklin_scraper import FranklinCountyScraper
+    return FranklinCountyScraper()
+
+
+def _walla_walla_scraper():
+    from etl.scrapers.county.walla_walla_scraper import WallaWallaCountyScraper
+    return WallaWallaCountyScraper()
+
+
+def _token(scraper, markup: str, backend: str) -> Any:
+    return find_input_value(markup, '__RequestVerificationToken', backend)
+
+
+def _franklin_search_results(scraper, markup: str, backend: str) -> Any:
+    return scraper._extract_search_results(parse_html(markup, backend))
+
+
+def _franklin_details(scraper, markup: str, backend: str) -> Any:
+    soup = parse_html(markup, backend)
+    sections = [scraper._extract_section_data(soup, title) for title in
+                ('Owner Information', 'Assessment', 'Valuation', 'Land Information', 'Building Information')]
+    return sections, scraper._extract_tax_history(soup), scraper._extract_sales_history(soup)
+
+
+def _walla_walla_search_results(scraper, markup: str, backend: str) -> Any:
+    return scraper._extract_search_results(parse_html(markup, backend))
+
+
+def _walla_walla_details(scraper, markup: str, backend: str) -> Any:
+    soup = parse_html(markup, backend)
+    sections = [scraper._extract_details_section(soup, title) for title in
+                ('Owner Information', 'Property Information', 'Value Information',
+                 'Land Information', 'Improvement Information', 'Tax Information')]
+    return sections, scraper._extract_sales_history(soup)
+
+
+# County directory -> scraper factory and workloads keyed by page name prefix
+COUNTIES: Dict[str, Dict[str, Any]] = {
+    'franklin': {
+        'scraper': _franklin_scraper,
+        'pages': {
+            'disclaimer': _token,
+            'search_results': _franklin_search_results,
+            'property_details': _franklin_details,
+        },
+    },
+    'walla_walla': {
+        'scraper': _walla_walla_scraper,
+        'pages': {
+            'search_results': _walla_walla_search_results,
+            'search': _token,
+            'property_details': _walla_walla_details,
+        },
+    },
+}
+
+
+def _workload_for(pages: Dict[str, Callable], filename: str) -> Optional[Callable]:
+    # Longest prefix wins, so 'search_results' is not taken for 'search'
+    for prefix in sorted(pages, key=len, reverse=True):
+        if filename.startswith(prefix):
+            return pages[prefix]
+    return None
+
+
+def run_benchmark(page_dir: str = DEFAULT_PAGE_DIR, iterations: int = 100,
+                  backends: Optional[List[str]] = None,
+                  counties: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Time parsing and extraction of every saved page with each backend.
+
+    Args:
+        page_dir: Directory with one sub-directory of saved pages per county
+        iterations: Times each page is parsed per backend
+        backends: Parser backends to compare (default: all available)
+        counties: Counties to include (default: all in COUNTIES)
+
+    Returns:
+        List[Dict[str, Any]]: One row per county, page and backend
+    """
+    backends = backends or available_backends()
+    rows = []
+    for county in counties or sorted(COUNTIES):
+        spec = COUNTIES[county]
+        county_dir = os.path.join(page_dir, county)
+        if not os.path.isdir(county_dir):
+            logger.warning(f"No saved pages for {county} in {county_dir}")
+            continue
+        try:
+            scraper = spec['scraper']()
+        except Exception as e:
+            logger.error(f"Cannot create {county} scraper: {str(e)}")
+            continue
+
+        for filename in sorted(os.listdir(county_dir)):
+            workload = _workload_for(spec['pages'], filename)
+            if not filename.endswith('.html') or workload is None:
+                continue
+            with open(os.path.join(county_dir, filename), encoding='utf-8') as f:
+                markup = f.read()
+
+            for backend in backends:
+                workload(scraper, markup, backend)  # Warm up
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    workload(scraper, markup, backend)
+                elapsed = time.perf_counter() - start
+                rows.append({
+                    'county': county,
+                    'page': filename,
+                    'bytes': len(markup),
+                    'backend': backend,
+                    'ms_per_page': round(elapsed * 1000 / iterations, 3),
+                })
+    return rows
+
+
+def _print_table(rows: List[Dict[str, Any]]):
+    baseline = {(r['county'], r['page']): r['ms_per_page'] for r in rows if r['backend'] == 'html.parser'}
+    print(f"{'county':<12} {'page':<24} {'backend':<12} {'ms/page':>9} {'speedup':>8}")
+    for row in rows:
+        base = baseline.get((row['county'], row['page']))
+        speedup = f"{base / row['ms_per_page']:.1f}x" if base and row['ms_per_page'] else '-'
+        print(f"{row['county']:<12} {row['page']:<24} {row['backend']:<12} "
+              f"{row['ms_per_page']:>9.3f} {speedup:>8}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark HTML parsing of saved county pages")
+    parser.add_argument('--pages', default=DEFAULT_PAGE_DIR, help="Saved page directory")
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--backends', nargs='+', choices=available_backends())
+    parser.add_argument('--counties', nargs='+', choices=sorted(COUNTIES))
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    rows = run_benchmark(args.pages, args.iterations, args.backends, args.counties)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        _print_table(rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Per-host politeness limits for county scrapers.
+
+This module provides a thread-safe rate limiter that caps how many requests
+may be in flight to a host and how often new requests may start, so
+scrapers can run concurrently without overwhelming county websites.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+from urllib.parse import urlsplit
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class HostRateLimiter:
+    """
+    Per-host concurrency and request-spacing limiter.
+
+    Each host gets a semaphore of ``max_concurrent`` slots and a schedule of
+    request start times spaced at least ``min_interval`` seconds apart.
+    Callers reserve the next start time under a lock and sleep outside it,
+    so a waiting request never blocks requests to other hosts.
+
+    A host's concurrency limit is fixed by the first request made to it.
+    """
+
+    def __init__(self):
+        """Initialize with no host state."""
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+        self.stats = {
+            'requests': 0,
+            'throttled': 0,
+            'wait_time': 0.0,
+        }
+
+    @staticmethod
+    def host_for(url: str) -> str:
+        """Get the host (netloc) a URL points at."""
+        return urlsplit(url).netloc.lower()
+
+    @contextmanager
+    def slot(self, url: str, min_interval: float = 1.0, max_concurrent: int = 1) -> Iterator[float]:
+        """
+        Wait for permission to send a request to the URL's host.
+
+        Args:
+            url (str): The URL about to be requested
+            min_interval (float): Minimum seconds between request starts to this host
+            max_concurrent (int): Maximum requests in flight to this host
+
+        Yields:
+            float: Seconds spent waiting for the slot
+        """
+        host = self.host_for(url)
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.BoundedSemaphore(max(1, max_concurrent))
+
+        wait_start = time.monotonic()
+        semaphore.acquire()
+        try:
+            with self._lock:
+                now = time.monotonic()
+                start_at = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start_at + max(0.0, min_interval)
+            delay = start_at - now
+            if delay > 0:
+                logger.debug(f"Throttling request to {host} for {delay:.2f}s")
+                time.sleep(delay)
+
+            waited = time.monotonic() - wait_start
+            with self._lock:
+                self.stats['requests'] += 1
+                self.stats['wait_time'] += waited
+                if waited > 0.001:
+                    self.stats['throttled'] += 1
+            yield waited
+        finally:
+            semaphore.release()
+
+
+# Shared by all scrapers so separate instances hitting the same county
+# website stay within one politeness budget
+DEFAULT_RATE_LIMITER = HostRateLimiter()
@@ -0,0 +1,83 @@
+"""
+Request coalescing for data source lookups.
+
+This module provides a "single-flight" helper: concurrent callers asking
+for the same key share one in-flight call instead of each issuing their
+own upstream request.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is still running wait for and receive the same result
+    (or exception). Nothing is cached once the call completes.
+
+    Note that followers receive the same object as the leader, so callers
+    should treat shared results as read-only.
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self.metrics = {
+            'calls': 0,
+            'coalesced': 0,
+        }
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call func(*args, **kwargs) unless a call for the same key is in flight.
+
+        Args:
+            key: Identity of the request (e.g. a (method, source, id) tuple)
+            func: Function performing the upstream request
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Any: The result of the (possibly shared) call
+        """
+        with self._lock:
+            self.metrics['calls'] += 1
+            future = self._calls.get(key)
+            if future is None:
+                future = Future()
+                self._calls[key] = future
+                is_leader = True
+            else:
+                self.metrics['coalesced'] += 1
+                is_leader = False
+
+        if not is_leader:
+            logger.debug(f"Coalescing request for {key}")
+            return future.result()
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        """Number of distinct keys currently being fetched."""
+        with self._lock:
+            return len(self._calls)
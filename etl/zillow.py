@@ -41,6 +41,11 @@ class ZillowMarketDataETL(BaseETL):
         # Initialize Zillow scraper
         self.scraper = ZillowScraper(api_key=self.config['api_key'])
     
+    @classmethod
+    def rapidapi_requests(cls, config: Optional[Dict[str, Any]] = None) -> int:
+        """Estimate the RapidAPI requests one run makes."""
+        return 1
+    
     def extract(self) -> Dict[str, Any]:
         """
         Extract market data from Zillow API.
@@ -175,6 +180,11 @@ class ZillowPropertyETL(BaseETL):
         # Initialize Zillow scraper
         self.scraper = ZillowScraper(api_key=self.config['api_key'])
     
+    @classmethod
+    def rapidapi_requests(cls, config: Optional[Dict[str, Any]] = None) -> int:
+        """Estimate the RapidAPI requests one run makes."""
+        return 1
+    
     def extract(self) -> Dict[str, Any]:
         """
         Extract property data from Zillow API.
@@ -311,6 +321,12 @@ class ZillowPropertySearchETL(BaseETL):
         # Initialize Zillow scraper
         self.scraper = ZillowScraper(api_key=self.config['api_key'])
     
+    @classmethod
+    def rapidapi_requests(cls, config: Optional[Dict[str, Any]] = None) -> int:
+        """Estimate the RapidAPI requests one run makes."""
+        # One search page plus a detail lookup per result
+        return 1 + int((config or {}).get('limit', 10))
+    
     def extract(self) -> Dict[str, Any]:
         """
         Extract property search results from Zillow API.
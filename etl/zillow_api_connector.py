@@ -8,11 +8,48 @@ import requests
 from typing import Dict, Any, Optional, List, Union
 
 from etl.base_api_connector import BaseApiConnector
+from etl.async_api_connector import AsyncBaseApiConnector
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Property ID that is known to work with the apartment_details endpoint
+KNOWN_PROPERTY_ID = "1001422626"
+
+def limited_search_result(location: str) -> Dict[str, Any]:
+    """
+    Build the search response used while the API plan has no search endpoint.
+    
+    Args:
+        location (str): Location that was searched
+    
+    Returns:
+        Dict[str, Any]: Limited result pointing at a property that works with
+            the property details endpoint
+    """
+    return {
+        "status": "limited",
+        "source": "zillow",
+        "message": "The current API plan supports direct property lookup but not general search.",
+        "properties": [
+            {
+                "id": KNOWN_PROPERTY_ID,
+                "type": "apartment",
+                "location": location,
+                "reference": f"Use this ID with the property details endpoint: {KNOWN_PROPERTY_ID}"
+            }
+        ]
+    }
+
+def unavailable_market_trends(location: str) -> Dict[str, Any]:
+    """Build the market trends response used while the endpoint is unavailable."""
+    return {
+        "warning": "Market trends endpoint is not available in the current API plan",
+        "location": location,
+        "status": "unavailable"
+    }
+
 class ZillowApiConnector(BaseApiConnector):
     """
     Connector for the Zillow API via RapidAPI
@@ -41,6 +78,7 @@ class ZillowApiConnector(BaseApiConnector):
             "X-RapidAPI-Key": self.api_key,
             "X-RapidAPI-Host": self.host
         }
+        self.quota_api_key = self.api_key
     
     def search_properties(self, location: str, **kwargs) -> Dict[str, Any]:
         """
@@ -67,28 +105,7 @@ class ZillowApiConnector(BaseApiConnector):
         # Since the propertyExtendedSearch endpoint is not available in our API plan,
         # we'll return a simulated response with a link to a known working property
         # This ensures the frontend can still function with real property data
-        
-        # For Nashville, TN - use property ID that we know works
-        if "nashville" in location.lower() or "tn" in location.lower():
-            property_id = "1001422626"  # Nashville property ID that works with the API
-        else:
-            # Default property ID that works with the apartment_details endpoint
-            property_id = "1001422626"
-            
-        # Create a result object with the property ID that can be used with get_property_details
-        result = {
-            "status": "limited",
-            "source": "zillow",
-            "message": "The current API plan supports direct property lookup but not general search.",
-            "properties": [
-                {
-                    "id": property_id,
-                    "type": "apartment",
-                    "location": location,
-                    "reference": f"Use this ID with the property details endpoint: {property_id}"
-                }
-            ]
-        }
+        result = limited_search_result(location)
         
         return result
     
@@ -114,6 +131,7 @@ class ZillowApiConnector(BaseApiConnector):
         
         try:
             response = requests.get(url, headers=self.headers, params=params)
+            self._update_rate_limits(response.headers)
             response.raise_for_status()
             result = response.json()
             self.handle_error(result)
@@ -147,11 +165,7 @@ class ZillowApiConnector(BaseApiConnector):
         
         # For now, this is a placeholder as we need to confirm which endpoints work
         # Return a warning message that will be visible in the UI
-        return {
-            "warning": "Market trends endpoint is not available in the current API plan",
-            "location": location,
-            "status": "unavailable"
-        }
+        return unavailable_market_trends(location)
     
     def get_property_trends(self, property_id: str) -> Dict[str, Any]:
         """
@@ -240,4 +254,80 @@ class ZillowApiConnector(BaseApiConnector):
             elif 'message' in response_data and 'success' in response_data and not response_data['success']:
                 raise ValueError(f"API error: {response_data['message']}")
             elif 'status' in response_data and response_data['status'] == 'error':
-                raise ValueError(f"API error: {response_data.get('message', 'Unknown error')}")
\ No newline at end of file
+                raise ValueError(f"API error: {response_data.get('message', 'Unknown error')}")
+
+class AsyncZillowApiConnector(AsyncBaseApiConnector):
+    """
+    Async connector for the Zillow API via RapidAPI.
+
+    Uses the same endpoints and response handling as ZillowApiConnector, but
+    lets bulk jobs keep many detail lookups in flight on one event loop.
+    """
+    
+    def __init__(self, api_key: Optional[str] = None, **kwargs):
+        """
+        Initialize the async Zillow API connector.
+        
+        Args:
+            api_key (str, optional): RapidAPI key (default: from environment)
+            **kwargs: Additional AsyncBaseApiConnector configuration options
+        """
+        super().__init__(**kwargs)
+        # Reuse the sync connector for configuration and response handling
+        self._sync = ZillowApiConnector(api_key=api_key)
+        self.api_key = self._sync.api_key
+        self.host = self._sync.host
+        self.base_url = self._sync.base_url
+        self.headers = self._sync.headers
+        self.quota_api_key = self.api_key
+    
+    async def search_properties(self, location: str, **kwargs) -> Dict[str, Any]:
+        """
+        Search for properties in a specific location.
+        
+        See ZillowApiConnector.search_properties - the current API plan does
+        not support general search, so no request is made and the same
+        limited result is returned without leaving the event loop.
+        """
+        logger.info(f"Searching Zillow properties in location: {location}")
+        return limited_search_result(location)
+    
+    async def get_property_details(self, property_id: str) -> Dict[str, Any]:
+        """
+        Get detailed information for a specific property using the apartment_details endpoint.
+        
+        Args:
+            property_id (str): Zillow Property ID (zpid)
+        
+        Returns:
+            Dict[str, Any]: Property details from Zillow API
+        """
+        logger.info(f"Fetching property details for ID: {property_id}")
+        
+        url = f"{self.base_url}/apartment_details"
+        params = {
+            "bylotid": property_id
+        }
+        
+        try:
+            result = await self._request_json("GET", url, params=params, headers=self.headers)
+        except json.JSONDecodeError as e:
+            logger.error(f"Error decoding JSON response: {e}")
+            raise ValueError(f"Invalid JSON response from Zillow API: {e}")
+        
+        ZillowApiConnector.handle_error(result)
+        return result
+    
+    async def get_market_trends(self, location: str, **kwargs) -> Dict[str, Any]:
+        """
+        Get market trends for a specific location.
+        
+        See ZillowApiConnector.get_market_trends - not available in the current
+        API plan, so no request is made.
+        """
+        logger.info(f"Fetching market trends for location: {location}")
+        return unavailable_market_trends(location)
+    
+    def standardize_property(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Standardize Zillow-specific property data to a common format."""
+        return self._sync.standardize_property(data)
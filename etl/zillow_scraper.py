@@ -10,6 +10,8 @@ import logging
 import requests
 from typing import Dict, List, Any, Optional, Union
 
+from etl.quota_ledger import record_rapidapi_usage
+
 # Configure logger
 logger = logging.getLogger(__name__)
 
@@ -33,6 +35,12 @@ class ZillowScraper:
             "X-RapidAPI-Host": "zillow-com1.p.rapidapi.com"
         }
     
+    def _get(self, url: str, params: Dict[str, Any]) -> requests.Response:
+        """Make a GET request, recording it in the RapidAPI quota ledger."""
+        response = requests.get(url, headers=self.headers, params=params)
+        record_rapidapi_usage(self.api_key, 'ZillowScraper', response.headers)
+        return response
+    
     def search_properties(self, location: str, page: int = 1) -> Dict[str, Any]:
         """
         Search for properties in a specific location.
@@ -53,7 +61,7 @@ class ZillowScraper:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self._get(url, params)
             response.raise_for_status()
             
             return response.json()
@@ -85,7 +93,7 @@ class ZillowScraper:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self._get(url, params)
             response.raise_for_status()
             
             return response.json()
@@ -124,7 +132,7 @@ class ZillowScraper:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self._get(url, params)
             response.raise_for_status()
             
             return response.json()
@@ -206,7 +214,7 @@ class ZillowScraper:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self._get(url, params)
             response.raise_for_status()
             
             return response.json()
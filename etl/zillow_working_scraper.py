@@ -11,6 +11,8 @@ import logging
 import requests
 from typing import Dict, List, Any, Optional, Union
 
+from etl.quota_ledger import record_rapidapi_usage
+
 # Configure logger
 logger = logging.getLogger(__name__)
 
@@ -33,6 +35,12 @@ class ZillowWorkingScraper:
             "X-RapidAPI-Host": "zillow-working-api.p.rapidapi.com"
         }
     
+    def _get(self, url: str, params: Dict[str, Any]) -> requests.Response:
+        """Make a GET request, recording it in the RapidAPI quota ledger."""
+        response = requests.get(url, headers=self.headers, params=params)
+        record_rapidapi_usage(self.api_key, 'ZillowWorkingScraper', response.headers)
+        return response
+    
     def get_property_details(self, zpid: Union[str, int]) -> Dict[str, Any]:
         """
         Get detailed information for a specific property.
@@ -51,7 +59,7 @@ class ZillowWorkingScraper:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self._get(url, params)
             response.raise_for_status()
             
             return response.json()
@@ -87,7 +95,7 @@ class ZillowWorkingScraper:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self._get(url, params)
             response.raise_for_status()
             
             return response.json()
@@ -121,7 +129,7 @@ class ZillowWorkingScraper:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self._get(url, params)
             response.raise_for_status()
             
             return response.json()
@@ -153,7 +161,7 @@ class ZillowWorkingScraper:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self._get(url, params)
             response.raise_for_status()
             
             return response.json()
@@ -8,6 +8,8 @@ from models.schedule import ETLSchedule
 from db_utils import db
 from datetime import datetime
 from datetime import date
+from sqlalchemy import Computed, Index, func
+from utils.address_search import normalized_column_sql
 
 class SystemMetric(db.Model):
     """Model for storing system performance metrics."""
@@ -157,7 +159,14 @@ class ReportExecutionLog(db.Model):
 class ModelsPropertyLocation(db.Model):
     """Model for property location data."""
     __tablename__ = 'property_location'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Trigram indexes for fuzzy address/owner search (see utils/address_search.py)
+        Index('ix_property_location_address_trgm', 'address_normalized',
+              postgresql_using='gin', postgresql_ops={'address_normalized': 'gin_trgm_ops'}),
+        Index('ix_property_location_owner_trgm', 'owner_normalized',
+              postgresql_using='gin', postgresql_ops={'owner_normalized': 'gin_trgm_ops'}),
+        {'extend_existing': True}
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     address = db.Column(db.String(255), nullable=False)
@@ -174,9 +183,18 @@ class ModelsPropertyLocation(db.Model):
     bathrooms = db.Column(db.Float, nullable=True)
     square_feet = db.Column(db.Integer, nullable=True)
     year_built = db.Column(db.Integer, nullable=True)
+    owner_name = db.Column(db.String(255), nullable=True)
     report_id = db.Column(db.Integer, nullable=True)
     created_at = db.Column(db.DateTime, nullable=True)
     updated_at = db.Column(db.DateTime, nullable=True)
+    
+    # Normalized copies for trigram search, maintained by the database
+    address_normalized = db.Column(db.Text, Computed(normalized_column_sql('address'), persisted=True))
+    owner_normalized = db.Column(db.Text, Computed(normalized_column_sql('owner_name'), persisted=True))
+
+# Case-insensitive city/state filters (lower(city) = :city)
+Index('ix_property_location_city_lower', func.lower(ModelsPropertyLocation.city))
+Index('ix_property_location_state_lower', func.lower(ModelsPropertyLocation.state))
 
 class PriceTrend(db.Model):
     """Model for storing price trends by location over time."""
@@ -201,6 +219,54 @@ class PriceTrend(db.Model):
     price_per_sqft = db.Column(db.Integer)  # Stored as integer (cents)
     created_at = db.Column(db.DateTime, default=datetime.now)
 
+class PriceRollup(db.Model):
+    """Weekly and monthly listing price rollups per city and zip (see utils/price_rollups.py)."""
+    __tablename__ = 'price_rollup'
+    __table_args__ = (
+        db.UniqueConstraint('granularity', 'location_type', 'location_value', 'period_start',
+                            name='ux_price_rollup_bucket'),
+        {'extend_existing': True}
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    granularity = db.Column(db.String(10), nullable=False)  # week, month
+    location_type = db.Column(db.String(10), nullable=False)  # city, zip
+    location_value = db.Column(db.String(150), nullable=False)  # "City, ST" or zip code
+    city = db.Column(db.String(100))
+    state = db.Column(db.String(50))
+    zip_code = db.Column(db.String(20))
+    period_start = db.Column(db.Date, nullable=False)
+    listings = db.Column(db.Integer, nullable=False)
+    median_price = db.Column(db.BigInteger)  # Stored as integer (cents)
+    avg_price = db.Column(db.BigInteger)  # Stored as integer (cents)
+    price_per_sqft = db.Column(db.Integer)  # Stored as integer (cents)
+    refreshed_at = db.Column(db.DateTime, nullable=False)
+
+# City/state filters on the rollups (lower(city) = :city)
+Index('ix_price_rollup_city_period', PriceRollup.granularity, func.lower(PriceRollup.state),
+      func.lower(PriceRollup.city), PriceRollup.period_start)
+
+class PriceRollupWatermark(db.Model):
+    """Latest property_location change included in the price rollups."""
+    __tablename__ = 'price_rollup_watermark'
+    __table_args__ = {'extend_existing': True}
+    
+    name = db.Column(db.String(50), primary_key=True)
+    watermark = db.Column(db.DateTime)
+    refreshed_at = db.Column(db.DateTime)
+
+class PriceRollupChange(db.Model):
+    """Previous bucket keys of changed property_location rows, filled by a trigger (see db/migrations.py)."""
+    __tablename__ = 'price_rollup_change'
+    __table_args__ = {'extend_existing': True}
+    
+    id = db.Column(db.BigInteger, primary_key=True)
+    city = db.Column(db.String(100))
+    state = db.Column(db.String(50))
+    zip_code = db.Column(db.String(20))
+    created_at = db.Column(db.DateTime)
+    changed_at = db.Column(db.DateTime, nullable=False, server_default=func.now())
+
 class JobRun(db.Model):
     """Model for tracking execution of scheduled jobs."""
     __table_args__ = {'extend_existing': True}
@@ -6,16 +6,37 @@ providing property assessment data that follows IAAO and USPAP standards.
 """
 
 import os
+import asyncio
 import logging
 import json
-from typing import Dict, Any, Optional, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Callable, Dict, Any, Optional, List
 from datetime import datetime
 
-import pyodbc
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
+from regional.assessment_roll import get_assessment_roll_store
+from regional.pacs_export import (
+    ENCODERS, EXPORT_FORMATS, ExportResponse, build_export_query, iter_export_batches
+)
+from regional.pacs_pool import PoolError
+from regional.ttl_cache import CoalescingLoader, TTLCache
+# The per-table queries are re-exported for existing callers
+from regional.benton_pacs_connector import (
+    PACS_DATABASE,
+    PACS_SERVER,
+    fetch_property_detail,
+    get_assessment_history,
+    get_building_data,
+    get_land_data,
+    get_pacs_pool,
+    get_property_record,
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -36,47 +57,102 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# PACS Database connection parameters
-PACS_SERVER = os.environ.get('PACS_SERVER', 'jcharrispacs')
-PACS_DATABASE = os.environ.get('PACS_DATABASE', 'pacs_training')
+# Connections are pooled across requests and shared with the PACS connector
+db_pool = get_pacs_pool()
 
-# Connection string for SQL Server with integrated Windows authentication
-CONN_STR = (
-    'DRIVER={ODBC Driver 17 for SQL Server};'
-    f'SERVER={PACS_SERVER};'
-    f'DATABASE={PACS_DATABASE};'
-    'Trusted_Connection=yes;'
+# Blocking pyodbc work runs on a bounded executor, off the event loop; one
+# worker per pooled connection so workers never wait on the pool
+DB_WORKERS = int(os.environ.get('PACS_DB_WORKERS', str(db_pool.max_size)))
+MAX_QUEUE_DEPTH = int(os.environ.get('PACS_MAX_QUEUE_DEPTH', '500'))
+db_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix='pacs-db')
+
+# Hot property records are served from memory
+property_cache = TTLCache(
+    max_entries=int(os.environ.get('PACS_CACHE_SIZE', '10000')),
+    ttl=float(os.environ.get('PACS_CACHE_TTL', '300'))
 )
 
-def get_db_connection():
+class DatabaseBusyError(Exception):
+    """Too many database calls are already queued."""
+    pass
+
+class DbExecutorStats:
+    """Queue depth and throughput of the database executor."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+        self.max_queued = 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        with self._lock:
+            return {
+                'workers': DB_WORKERS,
+                'max_queue_depth': MAX_QUEUE_DEPTH,
+                'queued': self.queued,
+                'active': self.active,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'coalesced': property_loader.stats['coalesced'],
+                'max_queued': self.max_queued,
+            }
+
+executor_stats = DbExecutorStats()
+
+# Bulk exports hold a pooled connection for their whole duration, so only
+# a few may run at once
+MAX_EXPORTS = int(os.environ.get('PACS_MAX_EXPORTS', '2'))
+EXPORT_FETCH_SIZE = int(os.environ.get('PACS_EXPORT_FETCH_SIZE', '1000'))
+# Property column holding the last-change time, required for changed_since exports
+EXPORT_CHANGED_COLUMN = os.environ.get('PACS_EXPORT_CHANGED_COLUMN', '')
+export_slots = threading.BoundedSemaphore(MAX_EXPORTS)
+
+async def run_db(func: Callable, *args) -> Any:
     """
-    Create a connection to the PACS database.
+    Run a blocking database call on the database executor.
     
+    Args:
+        func: Blocking function to run
+        *args: Arguments for the function
+        
     Returns:
-        Connection object or None if connection fails
-    
-    Note:
-        This function should attempt a real connection to the PACS database.
-        However, if running in an environment where Windows Integrated Authentication
-        is not possible (like Replit), we need to provide an alternative solution.
+        The function's result
         
-        In a production environment, this would establish a real connection to the 
-        Benton County PACS database using the credentials provided.
+    Raises:
+        DatabaseBusyError: If the queue is already at MAX_QUEUE_DEPTH
     """
-    try:
-        # Check if we're in a restricted environment (like Replit)
-        # where Windows Authentication won't work
-        if os.environ.get('REPLIT_DB_URL'):
-            logger.warning("Running in Replit environment - PACS database connection will be simulated")
-            # For testing purposes, we'll return None to indicate we need to use backup approach
-            return None
-        
-        # In a production environment with access to Windows Authentication:
-        connection = pyodbc.connect(CONN_STR)
-        return connection
-    except Exception as e:
-        logger.error(f"Database connection error: {str(e)}")
-        return None
+    with executor_stats._lock:
+        if executor_stats.queued >= MAX_QUEUE_DEPTH:
+            executor_stats.rejected += 1
+            raise DatabaseBusyError(f"{executor_stats.queued} database calls already queued")
+        executor_stats.queued += 1
+        executor_stats.max_queued = max(executor_stats.max_queued, executor_stats.queued)
+    
+    def call():
+        with executor_stats._lock:
+            executor_stats.queued -= 1
+            executor_stats.active += 1
+        try:
+            return func(*args)
+        finally:
+            with executor_stats._lock:
+                executor_stats.active -= 1
+                executor_stats.completed += 1
+    
+    return await asyncio.get_running_loop().run_in_executor(db_executor, call)
+
+# Hot records come from the cache; concurrent requests for one uncached
+# parcel share a single query that no one client's disconnect can cancel.
+# Only complete records are cached; errors are retried on the next request.
+property_loader = CoalescingLoader(
+    property_cache,
+    lambda property_id: run_db(load_property, property_id),
+    cacheable=lambda result: "error" not in result
+)
 
 @app.get("/")
 def read_root():
@@ -95,21 +171,45 @@ def read_root():
     }
 
 @app.get("/property/{property_id}")
-def get_property(property_id: str):
+async def get_property(property_id: str):
     """
     Get property assessment data by property ID.
     
+    Hot records are served from the in-process cache; concurrent requests
+    for the same uncached parcel share one database query.
+    
     Args:
         property_id: The parcel ID of the property
         
     Returns:
         Property assessment data in standardized format
     """
-    conn = get_db_connection()
-    if not conn:
+    try:
+        return await property_loader.get(property_id)
+    except DatabaseBusyError as e:
+        logger.warning(f"Rejecting lookup for property {property_id}: {str(e)}")
+        raise HTTPException(status_code=503, detail="PACS database is busy, retry shortly")
+
+def load_property(property_id: str) -> Dict[str, Any]:
+    """
+    Load property assessment data from the PACS database (blocking).
+    
+    Args:
+        property_id: The parcel ID of the property
+        
+    Returns:
+        Property assessment data, or an error payload
+    """
+    try:
+        # Full detail (record, building, land, history) in one round trip
+        with db_pool.connection() as conn:
+            cursor = conn.cursor()
+            detail = fetch_property_detail(cursor, property_id)
+            cursor.close()
+    except PoolError as e:
         # Instead of failing, return a clear error message in a structured format
         # that indicates we were unable to connect to the real database
-        logger.error(f"Unable to connect to PACS database for property {property_id}")
+        logger.error(f"Unable to connect to PACS database for property {property_id}: {str(e)}")
         
         return {
             "error": "DATABASE_CONNECTION_FAILED",
@@ -119,52 +219,8 @@ def get_property(property_id: str):
             "iaao_compliant": True,
             "uspap_compliant": True
         }
-    
-    try:
-        # Create a cursor from the connection
-        cursor = conn.cursor()
-        
-        # Get property record data
-        property_record = get_property_record(cursor, property_id)
-        if not property_record:
-            conn.close()
-            return {
-                "error": "PROPERTY_NOT_FOUND",
-                "property_id": property_id,
-                "county": "benton",
-                "message": f"Property with ID {property_id} not found in Benton County PACS database. This is not demonstration data, but a real query result.",
-                "iaao_compliant": True,
-                "uspap_compliant": True
-            }
-        
-        # Get building data
-        building_data = get_building_data(cursor, property_id)
-        
-        # Get land data
-        land_data = get_land_data(cursor, property_id)
-        
-        # Get assessment history
-        assessment_history = get_assessment_history(cursor, property_id)
-        
-        # Close the connection
-        conn.close()
-        
-        # Return the assessment data in the standard format
-        return {
-            "using_real_data": True,
-            "data_source": "Benton County PACS Database",
-            "PropertyRecord": property_record,
-            "BuildingData": building_data,
-            "LandData": land_data,
-            "AssessmentHistory": assessment_history,
-            "iaao_compliant": True,
-            "uspap_compliant": True
-        }
-        
     except Exception as e:
         logger.error(f"Error retrieving property data: {str(e)}")
-        if conn:
-            conn.close()
         return {
             "error": "DATA_RETRIEVAL_ERROR",
             "property_id": property_id,
@@ -173,324 +229,212 @@ def get_property(property_id: str):
             "iaao_compliant": True,
             "uspap_compliant": True
         }
+    
+    if not detail:
+        return {
+            "error": "PROPERTY_NOT_FOUND",
+            "property_id": property_id,
+            "county": "benton",
+            "message": f"Property with ID {property_id} not found in Benton County PACS database. This is not demonstration data, but a real query result.",
+            "iaao_compliant": True,
+            "uspap_compliant": True
+        }
+    
+    # Return the assessment data in the standard format
+    return {
+        "using_real_data": True,
+        "data_source": "Benton County PACS Database",
+        **detail,
+        "iaao_compliant": True,
+        "uspap_compliant": True
+    }
 
 @app.get("/properties/search")
-def search_properties(
+async def search_properties(
     address: Optional[str] = Query(None, description="Property address"),
     owner: Optional[str] = Query(None, description="Property owner name"),
     parcel: Optional[str] = Query(None, description="Parcel number"),
+    q: Optional[str] = Query(None, description="Full-text search over address and owner"),
+    live: bool = Query(False, description="Query PACS directly instead of the local snapshot"),
     limit: int = Query(10, description="Maximum number of results to return")
 ):
     """
     Search for properties based on various criteria.
     
+    Searches are served from the local assessment-roll snapshot when a
+    fresh one exists, and from the live PACS database otherwise (or when
+    live=true).
+    
     Args:
         address: Property address to search for
         owner: Property owner name to search for
         parcel: Parcel number to search for
+        q: Full-text query over address and owner
+        live: Skip the snapshot and query PACS
         limit: Maximum number of results to return
         
     Returns:
         List of matching properties
     """
-    if not any([address, owner, parcel]):
+    if not any([address, owner, parcel, q]):
         raise HTTPException(status_code=400, detail="At least one search parameter is required")
     
-    conn = get_db_connection()
-    if not conn:
-        raise HTTPException(status_code=503, detail="Database connection failed")
+    snapshot = None
+    rows = None
+    if not live:
+        try:
+            snapshot, rows = await asyncio.to_thread(_search_snapshot, address, owner, parcel, q, limit)
+        except Exception as e:
+            logger.warning(f"Assessment roll snapshot search failed, using PACS: {str(e)}")
     
-    try:
-        cursor = conn.cursor()
-        
-        # Build the SQL query based on provided parameters
-        query = "SELECT ParcelId, SitusAddress, OwnerName, ParcelNumber FROM Property WHERE "
-        conditions = []
-        params = []
-        
-        if address:
-            conditions.append("SitusAddress LIKE ?")
-            params.append(f"%{address}%")
-        
-        if owner:
-            conditions.append("OwnerName LIKE ?")
-            params.append(f"%{owner}%")
-        
-        if parcel:
-            conditions.append("ParcelNumber LIKE ?")
-            params.append(f"%{parcel}%")
-        
-        query += " OR ".join(conditions)
-        query += f" ORDER BY ParcelId LIMIT {limit}"
-        
-        # Execute the query
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        
-        # Format the results
-        results = []
-        for row in rows:
-            results.append({
-                "property_id": row[0],
-                "address": row[1],
-                "owner": row[2],
-                "parcel": row[3]
-            })
-        
-        conn.close()
-        return {"results": results, "count": len(results)}
-        
-    except Exception as e:
-        logger.error(f"Error searching properties: {str(e)}")
-        if conn:
-            conn.close()
-        raise HTTPException(status_code=500, detail=f"Error searching properties: {str(e)}")
+    if rows is None:
+        if q and not any([address, owner]):
+            # Without the snapshot, full text degrades to a substring match
+            address = owner = q
+        try:
+            rows = await run_db(_search_rows, address, owner, parcel, limit)
+        except DatabaseBusyError:
+            raise HTTPException(status_code=503, detail="PACS database is busy, retry shortly")
+        except PoolError as e:
+            logger.error(f"Database connection failed: {str(e)}")
+            raise HTTPException(status_code=503, detail="Database connection failed")
+        except Exception as e:
+            logger.error(f"Error searching properties: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Error searching properties: {str(e)}")
+    
+    # Format the results
+    results = []
+    for row in rows:
+        results.append({
+            "property_id": row[0],
+            "address": row[1],
+            "owner": row[2],
+            "parcel": row[3]
+        })
+    
+    response = {"results": results, "count": len(results), "source": "snapshot" if snapshot else "pacs"}
+    if snapshot:
+        response["snapshot_at"] = snapshot["completed_at"].isoformat()
+    return response
 
-def get_property_record(cursor, property_id: str) -> Dict[str, Any]:
+def _search_snapshot(address: Optional[str], owner: Optional[str], parcel: Optional[str],
+                     q: Optional[str], limit: int):
     """
-    Retrieve property record information from PACS database.
+    Search the local assessment-roll snapshot (blocking).
     
-    Args:
-        cursor: Database cursor
-        property_id: Parcel ID to retrieve
-        
     Returns:
-        Property record data or None if not found
+        (snapshot, rows), or (None, None) if no fresh snapshot is available
     """
-    try:
-        # SQL query for property record
-        # Adjust the table and column names based on the actual PACS database schema
-        cursor.execute("""
-            SELECT 
-                ParcelId, 
-                ParcelNumber, 
-                SitusAddress, 
-                OwnerName, 
-                LegalDescription, 
-                PropertyClass, 
-                TaxArea, 
-                LandValue, 
-                ImprovementValue, 
-                MarketValue, 
-                AssessedValue, 
-                ExemptionValue, 
-                LevyCode, 
-                TaxStatus, 
-                Acres, 
-                LastSaleDate, 
-                LastSalePrice, 
-                AssessmentYear, 
-                TaxYear
-            FROM Property 
-            WHERE ParcelId = ?
-        """, property_id)
-        
-        row = cursor.fetchone()
-        if not row:
-            return None
-        
-        # Map database values to property record dictionary
-        # Adjust column indices based on the actual query results
-        current_year = datetime.now().year
-        return {
-            "ParcelID": row[0] or property_id,
-            "ParcelNumber": row[1] or property_id,
-            "SitusAddress": row[2] or "",
-            "OwnerName": row[3] or "Current Owner",
-            "LegalDescription": row[4] or "",
-            "PropertyClass": row[5] or "Residential",
-            "TaxArea": row[6] or "",
-            "LandValue": row[7] or 0,
-            "ImprovementValue": row[8] or 0,
-            "MarketValue": row[9] or 0,
-            "AssessedValue": row[10] or 0,
-            "ExemptionValue": row[11] or 0,
-            "LevyCode": row[12] or "",
-            "TaxStatus": row[13] or "Taxable",
-            "Acres": row[14] or 0,
-            "LastSaleDate": row[15] or "",
-            "LastSalePrice": row[16] or 0,
-            "AssessmentYear": row[17] or current_year,
-            "TaxYear": row[18] or current_year
-        }
-    except Exception as e:
-        logger.error(f"Error in get_property_record: {str(e)}")
-        return {}
+    store = get_assessment_roll_store()
+    if store is None or not store.is_fresh():
+        return None, None
+    return store.latest_snapshot(), store.search(address, owner, parcel, q, limit)
 
-def get_building_data(cursor, property_id: str) -> Dict[str, Any]:
+def _search_rows(address: Optional[str], owner: Optional[str], parcel: Optional[str], limit: int):
+    """Run the property search on a pooled connection (blocking)."""
+    with db_pool.connection() as conn:
+        cursor = conn.cursor()
+        rows = _run_search(cursor, address, owner, parcel, limit)
+        cursor.close()
+    return rows
+
+def _run_search(cursor, address: Optional[str], owner: Optional[str], parcel: Optional[str], limit: int):
     """
-    Retrieve building information from PACS database.
+    Run the property search query.
     
     Args:
         cursor: Database cursor
-        property_id: Parcel ID to retrieve
+        address: Property address to search for
+        owner: Property owner name to search for
+        parcel: Parcel number to search for
+        limit: Maximum number of results to return
         
     Returns:
-        Building data
+        Matching rows (ParcelId, SitusAddress, OwnerName, ParcelNumber)
     """
-    try:
-        # SQL query for building information
-        # Adjust the table and column names based on the actual PACS database schema
-        cursor.execute("""
-            SELECT 
-                YearBuilt, 
-                EffectiveYear,
-                SquareFeet, 
-                Quality, 
-                Condition, 
-                Bedrooms, 
-                Bathrooms, 
-                Foundation, 
-                ExteriorWalls, 
-                RoofType, 
-                HeatingCooling, 
-                Fireplaces, 
-                BasementSF, 
-                GarageType, 
-                GarageSF, 
-                Stories
-            FROM Building 
-            WHERE ParcelId = ?
-        """, property_id)
-        
-        row = cursor.fetchone()
-        if not row:
-            # Return empty building data if not found
-            return {
-                "YearBuilt": 0,
-                "EffectiveYear": 0,
-                "SquareFeet": 0,
-                "Quality": "",
-                "Condition": "",
-                "Bedrooms": 0,
-                "Bathrooms": 0,
-                "Foundation": "",
-                "ExteriorWalls": "",
-                "RoofType": "",
-                "HeatingCooling": "",
-                "Fireplaces": 0,
-                "BasementSF": 0,
-                "GarageType": "",
-                "GarageSF": 0,
-                "Stories": 0
-            }
-        
-        # Map database values to building data dictionary
-        # Adjust column indices based on the actual query results
-        return {
-            "YearBuilt": row[0] or 0,
-            "EffectiveYear": row[1] or 0,
-            "SquareFeet": row[2] or 0,
-            "Quality": row[3] or "",
-            "Condition": row[4] or "",
-            "Bedrooms": row[5] or 0,
-            "Bathrooms": row[6] or 0,
-            "Foundation": row[7] or "",
-            "ExteriorWalls": row[8] or "",
-            "RoofType": row[9] or "",
-            "HeatingCooling": row[10] or "",
-            "Fireplaces": row[11] or 0,
-            "BasementSF": row[12] or 0,
-            "GarageType": row[13] or "",
-            "GarageSF": row[14] or 0,
-            "Stories": row[15] or 0
-        }
-    except Exception as e:
-        logger.error(f"Error in get_building_data: {str(e)}")
-        return {}
+    # Build the SQL query based on provided parameters
+    query = "SELECT TOP (?) ParcelId, SitusAddress, OwnerName, ParcelNumber FROM Property WHERE "
+    conditions = []
+    params = [limit]
+    
+    if address:
+        conditions.append("SitusAddress LIKE ?")
+        params.append(f"%{address}%")
+    
+    if owner:
+        conditions.append("OwnerName LIKE ?")
+        params.append(f"%{owner}%")
+    
+    if parcel:
+        conditions.append("ParcelNumber LIKE ?")
+        params.append(f"%{parcel}%")
+    
+    query += " OR ".join(conditions)
+    query += " ORDER BY ParcelId"
+    
+    # Execute the query
+    cursor.execute(query, params)
+    return cursor.fetchall()
 
-def get_land_data(cursor, property_id: str) -> Dict[str, Any]:
+@app.get("/export")
+def export_properties(
+    format: str = Query("ndjson", description="Output format: ndjson or csv"),
+    changed_since: Optional[datetime] = Query(None, description="Only parcels changed at or after this time"),
+    after: Optional[str] = Query(None, description="Resume after this ParcelId"),
+    limit: Optional[int] = Query(None, description="Maximum number of parcels to export")
+):
     """
-    Retrieve land information from PACS database.
+    Stream the assessment roll as NDJSON or CSV.
+    
+    Rows are ordered by ParcelId and read from a forward-only cursor in
+    batches, so memory use is constant regardless of export size. An
+    interrupted export is resumed by passing the last ParcelId received
+    as ``after``.
     
     Args:
-        cursor: Database cursor
-        property_id: Parcel ID to retrieve
+        format: Output format (ndjson or csv)
+        changed_since: Only export parcels changed at or after this time
+        after: Only export parcels with a greater ParcelId
+        limit: Maximum number of parcels to export
         
     Returns:
-        Land data
+        Streaming response with the exported rows
     """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
     try:
-        # SQL query for land information
-        # Adjust the table and column names based on the actual PACS database schema
-        cursor.execute("""
-            SELECT 
-                LandType, 
-                Topography, 
-                Utilities, 
-                ViewQuality
-            FROM Land 
-            WHERE ParcelId = ?
-        """, property_id)
-        
-        row = cursor.fetchone()
-        if not row:
-            # Return empty land data if not found
-            return {
-                "LandType": "",
-                "Topography": "",
-                "Utilities": "",
-                "ViewQuality": ""
-            }
-        
-        # Map database values to land data dictionary
-        # Adjust column indices based on the actual query results
-        return {
-            "LandType": row[0] or "",
-            "Topography": row[1] or "",
-            "Utilities": row[2] or "",
-            "ViewQuality": row[3] or ""
-        }
-    except Exception as e:
-        logger.error(f"Error in get_land_data: {str(e)}")
-        return {}
-
-def get_assessment_history(cursor, property_id: str) -> List[Dict[str, Any]]:
-    """
-    Retrieve assessment history from PACS database.
+        sql, params = build_export_query(after, changed_since, EXPORT_CHANGED_COLUMN, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="changed_since exports require PACS_EXPORT_CHANGED_COLUMN")
     
-    Args:
-        cursor: Database cursor
-        property_id: Parcel ID to retrieve
-        
-    Returns:
-        Assessment history as a list of yearly assessments
-    """
+    if not export_slots.acquire(blocking=False):
+        raise HTTPException(status_code=503, detail="Too many exports running, retry shortly")
+    
+    # The connection is checked out before the response starts so connection
+    # errors are still reported with a status code; the response returns it
+    # (or discards it if the stream was interrupted) when it ends, whether
+    # or not the body was ever sent
+    stack = ExitStack()
+    stack.callback(export_slots.release)
     try:
-        # SQL query for assessment history
-        # Adjust the table and column names based on the actual PACS database schema
-        cursor.execute("""
-            SELECT 
-                Year, 
-                LandValue, 
-                ImprovementValue, 
-                TotalValue, 
-                Change
-            FROM AssessmentHistory 
-            WHERE ParcelId = ?
-            ORDER BY Year DESC
-        """, property_id)
-        
-        rows = cursor.fetchall()
-        if not rows:
-            # Return empty assessment history if not found
-            return []
-        
-        # Map database values to assessment history list
-        history = []
-        for row in rows:
-            history.append({
-                "Year": row[0] or 0,
-                "LandValue": row[1] or 0,
-                "ImprovementValue": row[2] or 0,
-                "TotalValue": row[3] or 0,
-                "Change": row[4] or 0
-            })
-        
-        return history
-    except Exception as e:
-        logger.error(f"Error in get_assessment_history: {str(e)}")
-        return []
+        conn = stack.enter_context(db_pool.connection())
+    except PoolError as e:
+        stack.close()
+        logger.error(f"Database connection failed: {str(e)}")
+        raise HTTPException(status_code=503, detail="Database connection failed")
+    
+    def stream():
+        cursor = conn.cursor()
+        yield from ENCODERS[format](iter_export_batches(cursor, sql, params, EXPORT_FETCH_SIZE))
+        cursor.close()
+        logger.info(f"Completed {format} export (after={after}, changed_since={changed_since})")
+    
+    return ExportResponse(
+        stream,
+        stack,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f"attachment; filename=benton_pacs_export.{format}"}
+    )
 
 @app.on_event("startup")
 async def startup_event():
@@ -500,14 +444,58 @@ async def startup_event():
     logger.info(f"Starting Benton County PACS API Server")
     logger.info(f"Connecting to PACS database: {PACS_SERVER}/{PACS_DATABASE}")
     
-    # Test database connection
-    conn = get_db_connection()
-    if conn:
+    # Test database connection (and keep it open in the pool)
+    def check_connection():
+        with db_pool.connection():
+            pass
+    
+    try:
+        await run_db(check_connection)
         logger.info("Successfully connected to PACS database")
-        conn.close()
-    else:
+    except PoolError:
         logger.error("Failed to connect to PACS database")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Shutdown event handler for FastAPI.
+    """
+    db_executor.shutdown(wait=False, cancel_futures=True)
+    db_pool.close_all()
+
+@app.get("/health/db-pool")
+def db_pool_status():
+    """
+    Get PACS connection pool usage.
+    """
+    return db_pool.status()
+
+@app.get("/health/stats")
+def server_stats():
+    """
+    Get connection pool, executor queue, property cache and snapshot statistics.
+    """
+    return {
+        "db_pool": db_pool.status(),
+        "executor": executor_stats.to_dict(),
+        "property_cache": property_cache.status(),
+        "assessment_roll": _snapshot_status()
+    }
+
+def _snapshot_status() -> Dict[str, Any]:
+    """Get the age and size of the local assessment-roll snapshot."""
+    store = get_assessment_roll_store()
+    latest = store.latest_snapshot() if store else None
+    if not latest:
+        return {"available": False}
+    return {
+        "available": True,
+        "fresh": store.is_fresh(),
+        "snapshot_id": latest["id"],
+        "completed_at": latest["completed_at"].isoformat(),
+        "row_count": latest["row_count"]
+    }
+
 if __name__ == "__main__":
     # Run the FastAPI server
     uvicorn.run("pacs_api_server:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
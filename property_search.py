@@ -11,6 +11,8 @@ import logging
 import requests
 from typing import Dict, Any, List, Optional
 
+from regional.benton_gis_connector import GisQueryError, iter_features
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -99,31 +101,20 @@ def fuzzy_property_search(query: str, limit: int = 10) -> Dict[str, Any]:
         # Log the WHERE clause for debugging
         logger.info(f"Search WHERE clause: {where_clause}")
         
-        # Construct the query parameters
-        params = {
-            'where': where_clause,
-            'outFields': "PARCELID,SITEADDRESS,OWNER,ACRES,LEGALDESC,LANDUSE",
-            'returnGeometry': 'false',
-            'f': 'json',
-            'token': API_KEY,
-            'resultRecordCount': limit
-        }
-        
-        # Send the request
-        response = requests.get(PARCELS_URL, params=params, headers=HEADERS)
-        
-        if response.status_code != 200:
-            logger.error(f"Error from GIS service: {response.status_code} - {response.text}")
+        # Page through the results (limits above the service's maxRecordCount
+        # take several requests)
+        try:
+            features = list(iter_features(where_clause, "PARCELID,SITEADDRESS,OWNER,ACRES,LEGALDESC,LANDUSE",
+                                          max_records=limit))
+        except GisQueryError as e:
+            logger.error(str(e))
             return {
                 'error': 'gis_api_error',
-                'message': f"Error from Benton County GIS API: {response.status_code}"
+                'message': str(e)
             }
         
-        # Parse the JSON response
-        search_data = response.json()
-        
         # Check if any features were returned
-        if not search_data.get('features'):
+        if not features:
             return {
                 'count': 0,
                 'properties': [],
@@ -132,7 +123,7 @@ def fuzzy_property_search(query: str, limit: int = 10) -> Dict[str, Any]:
         
         # Extract property data
         properties = []
-        for feature in search_data['features']:
+        for feature in features:
             attrs = feature['attributes']
             properties.append({
                 'property_id': attrs.get('PARCELID', 'Unknown'),
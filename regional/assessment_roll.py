@@ -0,0 +1,351 @@
+"""
+Local assessment-roll snapshot for Benton County PACS searches.
+
+PACS property searches run ``LIKE '%term%'`` against the live SQL Server
+database, which scans the whole Property table. This module keeps a
+periodic copy of the assessment roll (parcels, owners, situs addresses and
+values) in local PostgreSQL tables with trigram indexes on the searched
+columns and a full-text index over address and owner, so address and owner
+lookups can be served in milliseconds. The live PACS search remains the
+fallback when no fresh snapshot exists.
+
+The snapshot is refreshed by the ``AssessmentRollSnapshotETL`` plugin
+(etl/assessment_roll_etl.py).
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import (
+    Column, Computed, DateTime, Index, Integer, MetaData, Numeric, String, Table, Text,
+    create_engine, desc, func, or_, select, text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, insert
+
+from utils.address_search import normalize_search_text, normalized_column_sql
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Snapshots older than this are not used for searches
+ASSESSMENT_ROLL_MAX_AGE_HOURS = float(os.environ.get('ASSESSMENT_ROLL_MAX_AGE_HOURS', '26'))
+
+# Text search configuration; 'simple' avoids stemming names and street words
+TS_CONFIG = 'simple'
+
+metadata = MetaData()
+
+assessment_roll_snapshot = Table(
+    'assessment_roll_snapshot',
+    metadata,
+    Column('id', Integer, primary_key=True),
+    Column('started_at', DateTime, nullable=False),
+    Column('completed_at', DateTime),
+    Column('status', String(20), nullable=False),
+    Column('row_count', Integer),
+    Column('error', Text),
+)
+
+assessment_roll = Table(
+    'assessment_roll',
+    metadata,
+    Column('parcel_id', String(64), primary_key=True),
+    Column('parcel_number', String(64)),
+    Column('situs_address', Text),
+    Column('owner_name', Text),
+    Column('property_class', String(64)),
+    Column('land_value', Numeric(14, 2)),
+    Column('improvement_value', Numeric(14, 2)),
+    Column('market_value', Numeric(14, 2)),
+    Column('assessed_value', Numeric(14, 2)),
+    Column('assessment_year', Integer),
+    Column('tax_year', Integer),
+    Column('snapshot_id', Integer, nullable=False, index=True),
+    Column('search_vector', TSVECTOR, Computed(
+        f"to_tsvector('{TS_CONFIG}', coalesce(situs_address, '') || ' ' || coalesce(owner_name, ''))",
+        persisted=True
+    )),
+    # Situs address normalized like property_location.address_normalized, for owner lookups
+    Column('situs_normalized', Text, Computed(normalized_column_sql('situs_address'), persisted=True)),
+    # Trigram indexes serve ILIKE '%term%' lookups without a scan
+    Index('ix_assessment_roll_situs_address_trgm', 'situs_address',
+          postgresql_using='gin', postgresql_ops={'situs_address': 'gin_trgm_ops'}),
+    Index('ix_assessment_roll_owner_name_trgm', 'owner_name',
+          postgresql_using='gin', postgresql_ops={'owner_name': 'gin_trgm_ops'}),
+    Index('ix_assessment_roll_parcel_number_trgm', 'parcel_number',
+          postgresql_using='gin', postgresql_ops={'parcel_number': 'gin_trgm_ops'}),
+    Index('ix_assessment_roll_search_vector', 'search_vector', postgresql_using='gin'),
+    Index('ix_assessment_roll_situs_normalized', 'situs_normalized'),
+)
+
+# Columns copied from PACS on every snapshot
+ROLL_COLUMNS = [
+    'parcel_id', 'parcel_number', 'situs_address', 'owner_name', 'property_class',
+    'land_value', 'improvement_value', 'market_value', 'assessed_value',
+    'assessment_year', 'tax_year',
+]
+
+
+def _like_pattern(term: str) -> str:
+    # Substring match; LIKE wildcards in user input are matched literally
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def build_search_query(address: Optional[str] = None, owner: Optional[str] = None,
+                       parcel: Optional[str] = None, text_query: Optional[str] = None,
+                       limit: int = 10):
+    """
+    Build the snapshot search query.
+
+    Field terms are OR-ed substring matches, as in the live PACS search.
+    A full-text query is AND-ed with them and orders results by rank.
+
+    Args:
+        address: Situs address substring
+        owner: Owner name substring
+        parcel: Parcel number substring
+        text_query: Full-text query over address and owner (web search syntax)
+        limit: Maximum number of rows
+
+    Returns:
+        Select: Query returning (parcel_id, situs_address, owner_name, parcel_number)
+    """
+    roll = assessment_roll.c
+    query = select(roll.parcel_id, roll.situs_address, roll.owner_name, roll.parcel_number)
+
+    conditions = []
+    if address:
+        conditions.append(roll.situs_address.ilike(_like_pattern(address), escape='\\'))
+    if owner:
+        conditions.append(roll.owner_name.ilike(_like_pattern(owner), escape='\\'))
+    if parcel:
+        conditions.append(roll.parcel_number.ilike(_like_pattern(parcel), escape='\\'))
+    if conditions:
+        query = query.where(or_(*conditions))
+
+    if text_query:
+        ts_query = func.websearch_to_tsquery(TS_CONFIG, text_query)
+        query = query.where(roll.search_vector.op('@@')(ts_query))
+        query = query.order_by(desc(func.ts_rank(roll.search_vector, ts_query)), roll.parcel_id)
+    else:
+        query = query.order_by(roll.parcel_id)
+
+    return query.limit(limit)
+
+
+class AssessmentRollStore:
+    """
+    PostgreSQL store for assessment-roll snapshots.
+
+    Loading upserts every parcel tagged with the new snapshot ID and then
+    deletes parcels that were not in it, so searches keep reading the
+    previous snapshot until the load commits.
+    """
+
+    def __init__(self, engine, max_age_hours: float = ASSESSMENT_ROLL_MAX_AGE_HOURS,
+                 status_ttl: float = 60.0):
+        """
+        Initialize the store.
+
+        Args:
+            engine: SQLAlchemy engine for the PostgreSQL database
+            max_age_hours (float): Age after which a snapshot is not used for searches
+            status_ttl (float): Seconds the latest snapshot status is cached
+        """
+        self.engine = engine
+        self.max_age = timedelta(hours=max_age_hours)
+        self.status_ttl = status_ttl
+        self._lock = threading.Lock()
+        self._latest: Optional[Dict[str, Any]] = None
+        self._latest_checked = 0.0
+
+    def ensure_schema(self):
+        """Create the pg_trgm extension, tables and indexes if missing."""
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            metadata.create_all(conn)
+            # Added after the first release; create_all skips existing tables
+            conn.execute(text(
+                "ALTER TABLE assessment_roll ADD COLUMN IF NOT EXISTS situs_normalized TEXT "
+                f"GENERATED ALWAYS AS ({normalized_column_sql('situs_address')}) STORED"
+            ))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_assessment_roll_situs_normalized "
+                "ON assessment_roll (situs_normalized)"
+            ))
+
+    def load(self, rows: Iterable[Dict[str, Any]], batch_size: int = 5000) -> Dict[str, Any]:
+        """
+        Load a new snapshot, replacing the previous one.
+
+        Args:
+            rows: Parcel dictionaries keyed by ROLL_COLUMNS
+            batch_size (int): Rows upserted per statement
+
+        Returns:
+            Dict[str, Any]: snapshot_id, records_processed and records_removed
+        """
+        self.ensure_schema()
+        with self.engine.begin() as conn:
+            snapshot_id = conn.execute(
+                assessment_roll_snapshot.insert()
+                .values(started_at=datetime.utcnow(), status='running')
+                .returning(assessment_roll_snapshot.c.id)
+            ).scalar_one()
+
+        try:
+            with self.engine.begin() as conn:
+                count = 0
+                batch = []
+                for row in rows:
+                    batch.append({**{c: row.get(c) for c in ROLL_COLUMNS}, 'snapshot_id': snapshot_id})
+                    if len(batch) >= batch_size:
+                        count += self._upsert(conn, batch)
+                        batch = []
+                if batch:
+                    count += self._upsert(conn, batch)
+
+                removed = conn.execute(
+                    assessment_roll.delete().where(assessment_roll.c.snapshot_id != snapshot_id)
+                ).rowcount
+                conn.execute(
+                    assessment_roll_snapshot.update()
+                    .where(assessment_roll_snapshot.c.id == snapshot_id)
+                    .values(completed_at=datetime.utcnow(), status='completed', row_count=count)
+                )
+        except Exception as e:
+            with self.engine.begin() as conn:
+                conn.execute(
+                    assessment_roll_snapshot.update()
+                    .where(assessment_roll_snapshot.c.id == snapshot_id)
+                    .values(completed_at=datetime.utcnow(), status='failed', error=str(e))
+                )
+            raise
+
+        self._latest_checked = 0.0
+        logger.info(f"Loaded assessment roll snapshot {snapshot_id}: {count} parcels, {removed} removed")
+        return {'snapshot_id': snapshot_id, 'records_processed': count, 'records_removed': removed}
+
+    @staticmethod
+    def _upsert(conn, batch: List[Dict[str, Any]]) -> int:
+        # PostgreSQL rejects an ON CONFLICT DO UPDATE that touches the same
+        # row twice, so a parcel repeated within a batch keeps its last row
+        rows = list({row['parcel_id']: row for row in batch}.values())
+        stmt = insert(assessment_roll).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[assessment_roll.c.parcel_id],
+            set_={c: stmt.excluded[c] for c in ROLL_COLUMNS[1:] + ['snapshot_id']}
+        )
+        conn.execute(stmt)
+        return len(rows)
+
+    def latest_snapshot(self, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get the most recent completed snapshot (cached for status_ttl seconds).
+
+        Args:
+            refresh (bool): Bypass the cached status
+
+        Returns:
+            Optional[Dict[str, Any]]: id, completed_at and row_count, or None
+        """
+        with self._lock:
+            if not refresh and time.monotonic() - self._latest_checked < self.status_ttl:
+                return self._latest
+        snapshots = assessment_roll_snapshot.c
+        query = (
+            select(snapshots.id, snapshots.completed_at, snapshots.row_count)
+            .where(snapshots.status == 'completed')
+            .order_by(desc(snapshots.completed_at))
+            .limit(1)
+        )
+        try:
+            with self.engine.connect() as conn:
+                row = conn.execute(query).first()
+            latest = dict(row._mapping) if row else None
+        except Exception as e:
+            # Tables not created yet or database unreachable
+            logger.warning(f"Cannot read assessment roll snapshot status: {str(e)}")
+            latest = None
+        with self._lock:
+            self._latest = latest
+            self._latest_checked = time.monotonic()
+        return latest
+
+    def is_fresh(self) -> bool:
+        """Check whether a completed snapshot younger than max_age exists."""
+        latest = self.latest_snapshot()
+        return bool(latest) and datetime.utcnow() - latest['completed_at'] <= self.max_age
+
+    def search(self, address: Optional[str] = None, owner: Optional[str] = None,
+               parcel: Optional[str] = None, text_query: Optional[str] = None,
+               limit: int = 10) -> List[tuple]:
+        """
+        Search the snapshot.
+
+        Args:
+            address: Situs address substring
+            owner: Owner name substring
+            parcel: Parcel number substring
+            text_query: Full-text query over address and owner
+            limit: Maximum number of rows
+
+        Returns:
+            List[tuple]: Rows of (parcel_id, situs_address, owner_name, parcel_number)
+        """
+        query = build_search_query(address, owner, parcel, text_query, limit)
+        with self.engine.connect() as conn:
+            return [tuple(row) for row in conn.execute(query)]
+
+    def owners_by_address(self, addresses: Iterable[str], chunk_size: int = 1000) -> Dict[str, str]:
+        """
+        Look up parcel owners by exact (normalized) situs address.
+
+        Args:
+            addresses: Addresses in any case or punctuation
+            chunk_size (int): Addresses per query
+
+        Returns:
+            Dict[str, str]: Normalized address -> owner name, for addresses found
+        """
+        keys = list(dict.fromkeys(filter(None, (normalize_search_text(a) for a in addresses))))
+        roll = assessment_roll.c
+        owners = {}
+        with self.engine.connect() as conn:
+            for start in range(0, len(keys), chunk_size):
+                query = select(roll.situs_normalized, roll.owner_name).where(
+                    roll.situs_normalized.in_(keys[start:start + chunk_size]),
+                    roll.owner_name.isnot(None)
+                )
+                for address, owner in conn.execute(query):
+                    owners.setdefault(address, owner)
+        return owners
+
+
+_store: Optional[AssessmentRollStore] = None
+_store_lock = threading.Lock()
+
+
+def get_assessment_roll_store() -> Optional[AssessmentRollStore]:
+    """
+    Get the shared assessment-roll store.
+
+    The database is taken from ASSESSMENT_ROLL_DATABASE_URL, falling back
+    to DATABASE_URL.
+
+    Returns:
+        Optional[AssessmentRollStore]: The store, or None if no database is configured
+    """
+    global _store
+    url = os.environ.get('ASSESSMENT_ROLL_DATABASE_URL') or os.environ.get('DATABASE_URL')
+    if not url:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = AssessmentRollStore(create_engine(url, pool_pre_ping=True, pool_recycle=300))
+        return _store
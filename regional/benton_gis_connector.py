@@ -11,7 +11,7 @@ access parcel, assessment, and ownership data.
 import os
 import requests
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional
 import json
 
 # Setup logging
@@ -24,6 +24,11 @@ PARCELS_URL = f"{GIS_BASE_URL}/Parcels/MapServer/0/query"
 PROPERTY_DETAILS_URL = f"{GIS_BASE_URL}/PropertyDetails/MapServer/0/query"
 PROPERTY_VALUES_URL = f"{GIS_BASE_URL}/PropertyValues/MapServer/0/query"
 
+# ArcGIS paging limits: the service's maxRecordCount, and IDs per IN-list
+# (kept well under typical where-clause length limits)
+MAX_RECORD_COUNT = 1000
+MAX_IN_LIST = 250
+
 # Headers for requests
 HEADERS = {
     "Content-Type": "application/x-www-form-urlencoded",
@@ -43,6 +48,235 @@ def validate_api_key() -> bool:
         return False
     return True
 
+class GisQueryError(Exception):
+    """Error returned by the ArcGIS REST service."""
+    pass
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _normalize_parcel_id(property_id: str) -> str:
+    return str(property_id).replace('-', '').strip()
+
+def _in_clause(field: str, values: Iterable[str]) -> str:
+    quoted = ", ".join("'" + str(v).replace("'", "''") + "'" for v in values)
+    return f"{field} IN ({quoted})"
+
+def _query(url: str, params: Dict[str, Any], session: Optional[requests.Session] = None) -> Dict[str, Any]:
+    """
+    Run one ArcGIS query request.
+    
+    Queries are POSTed so long IN-lists and object ID lists are not limited
+    by URL length.
+    
+    Args:
+        url (str): Layer query URL
+        params (Dict[str, Any]): Query parameters (f and token are added)
+        session (requests.Session, optional): Session to reuse connections
+    
+    Returns:
+        Dict[str, Any]: Parsed JSON response
+    
+    Raises:
+        GisQueryError: If the service returns an error
+    """
+    data = dict(params, f='json', token=API_KEY)
+    response = (session or requests).post(url, data=data, headers=HEADERS, timeout=60)
+    if response.status_code != 200:
+        raise GisQueryError(f"Error from Benton County GIS API: {response.status_code}")
+    
+    result = response.json()
+    # ArcGIS reports query errors with HTTP 200 and an error object
+    if 'error' in result:
+        error = result['error']
+        raise GisQueryError(f"Benton County GIS query failed: {error.get('code')} {error.get('message')}")
+    return result
+
+def iter_features(where: str = "1=1", out_fields: str = "*", url: str = PARCELS_URL,
+                  page_size: int = MAX_RECORD_COUNT, max_records: Optional[int] = None,
+                  return_geometry: bool = False, order_by: str = "OBJECTID",
+                  session: Optional[requests.Session] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the features matching a where-clause, paging with resultOffset.
+    
+    Args:
+        where (str): SQL where-clause
+        out_fields (str): Comma-separated fields to return
+        url (str): Layer query URL
+        page_size (int): Features per request (at most the service's maxRecordCount)
+        max_records (int, optional): Stop after this many features
+        return_geometry (bool): Include feature geometry
+        order_by (str): Stable ordering field, required for consistent pages
+        session (requests.Session, optional): Session to reuse connections
+    
+    Yields:
+        Dict[str, Any]: ArcGIS features ({'attributes': ..., 'geometry': ...})
+    """
+    offset = 0
+    returned = 0
+    while True:
+        count = page_size if max_records is None else min(page_size, max_records - returned)
+        if count <= 0:
+            return
+        
+        result = _query(url, {
+            'where': where,
+            'outFields': out_fields,
+            'returnGeometry': 'true' if return_geometry else 'false',
+            'orderByFields': order_by,
+            'resultOffset': offset,
+            'resultRecordCount': count,
+        }, session)
+        
+        features = result.get('features', [])
+        for feature in features:
+            yield feature
+        returned += len(features)
+        offset += len(features)
+        
+        # Servers may cap pages below the requested size; keep going while
+        # they report more results
+        if not features or not (result.get('exceededTransferLimit') or len(features) == count):
+            return
+
+def get_object_ids(where: str = "1=1", url: str = PARCELS_URL,
+                   session: Optional[requests.Session] = None) -> List[int]:
+    """
+    Get the object IDs of all features matching a where-clause in one request.
+    
+    Args:
+        where (str): SQL where-clause
+        url (str): Layer query URL
+        session (requests.Session, optional): Session to reuse connections
+    
+    Returns:
+        List[int]: Sorted object IDs
+    """
+    result = _query(url, {'where': where, 'returnIdsOnly': 'true'}, session)
+    return sorted(result.get('objectIds') or [])
+
+def iter_features_by_object_ids(object_ids: List[int], out_fields: str = "*", url: str = PARCELS_URL,
+                                chunk_size: int = MAX_RECORD_COUNT, return_geometry: bool = False,
+                                session: Optional[requests.Session] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream features for a list of object IDs, one request per chunk.
+    
+    Args:
+        object_ids (List[int]): Object IDs to fetch
+        out_fields (str): Comma-separated fields to return
+        url (str): Layer query URL
+        chunk_size (int): Object IDs per request (at most the service's maxRecordCount)
+        return_geometry (bool): Include feature geometry
+        session (requests.Session, optional): Session to reuse connections
+    
+    Yields:
+        Dict[str, Any]: ArcGIS features
+    """
+    for chunk in _chunks(list(object_ids), chunk_size):
+        result = _query(url, {
+            'objectIds': ",".join(str(oid) for oid in chunk),
+            'outFields': out_fields,
+            'returnGeometry': 'true' if return_geometry else 'false',
+        }, session)
+        for feature in result.get('features', []):
+            yield feature
+
+def iter_all_parcels(where: str = "1=1", out_fields: str = "*", chunk_size: int = MAX_RECORD_COUNT,
+                     return_geometry: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Stream every parcel matching a where-clause (the whole county by default).
+    
+    Fetches the matching object IDs once, then the parcels in object ID
+    chunks, so a full county pull takes one request per ``chunk_size``
+    parcels and does not depend on offset paging support.
+    
+    Args:
+        where (str): SQL where-clause
+        out_fields (str): Comma-separated fields to return
+        chunk_size (int): Parcels per request
+        return_geometry (bool): Include parcel geometry
+    
+    Yields:
+        Dict[str, Any]: Parcel attributes (with 'geometry' if requested)
+    """
+    with requests.Session() as session:
+        object_ids = get_object_ids(where, PARCELS_URL, session)
+        logger.info(f"Fetching {len(object_ids)} Benton County parcels in chunks of {chunk_size}")
+        for feature in iter_features_by_object_ids(object_ids, out_fields, PARCELS_URL, chunk_size,
+                                                   return_geometry, session):
+            attrs = dict(feature['attributes'])
+            if return_geometry and 'geometry' in feature:
+                attrs['geometry'] = feature['geometry']
+            yield attrs
+
+def iter_parcels_by_ids(property_ids: Iterable[str], out_fields: str = "*", url: str = PARCELS_URL,
+                        chunk_size: int = MAX_IN_LIST,
+                        session: Optional[requests.Session] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream records for many parcel IDs using PARCELID IN (...) queries.
+    
+    Args:
+        property_ids: Parcel numbers (dashes are ignored)
+        out_fields (str): Comma-separated fields to return
+        url (str): Layer query URL (parcels, details or values)
+        chunk_size (int): Parcel IDs per IN-list
+        session (requests.Session, optional): Session to reuse connections
+    
+    Yields:
+        Dict[str, Any]: Record attributes, in no particular order
+    """
+    ids = list(dict.fromkeys(_normalize_parcel_id(pid) for pid in property_ids if pid))
+    for chunk in _chunks(ids, chunk_size):
+        for feature in iter_features(_in_clause('PARCELID', chunk), out_fields, url, session=session):
+            yield feature['attributes']
+
+def get_property_data_many(property_ids: Iterable[str], chunk_size: int = MAX_IN_LIST) -> Dict[str, Dict[str, Any]]:
+    """
+    Get property data for many parcels with bulk queries.
+    
+    Equivalent to calling get_property_data for each ID, but uses three
+    IN-list queries (parcels, details, values) per ``chunk_size`` parcels
+    instead of three requests per parcel.
+    
+    Args:
+        property_ids: Parcel numbers
+        chunk_size (int): Parcel IDs per request
+    
+    Returns:
+        Dict[str, Dict[str, Any]]: Property data keyed by normalized parcel ID;
+        parcels not found are omitted
+    """
+    if not validate_api_key():
+        return {}
+    
+    ids = list(dict.fromkeys(_normalize_parcel_id(pid) for pid in property_ids if pid))
+    properties: Dict[str, Dict[str, Any]] = {}
+    with requests.Session() as session:
+        for attrs in iter_parcels_by_ids(ids, url=PARCELS_URL, chunk_size=chunk_size, session=session):
+            parcel_id = str(attrs.get('PARCELID', ''))
+            properties[parcel_id] = {
+                'property_id': parcel_id,
+                'parcel_data': attrs,
+                'address': attrs.get('SITEADDRESS', 'Unknown'),
+                'owner': attrs.get('OWNER', 'Unknown'),
+                'legal_description': attrs.get('LEGALDESC', 'Unknown'),
+                'data_source': 'Benton County GIS Services'
+            }
+        
+        found = list(properties)
+        for url, key in ((PROPERTY_DETAILS_URL, 'property_details'), (PROPERTY_VALUES_URL, 'property_values')):
+            try:
+                for attrs in iter_parcels_by_ids(found, url=url, chunk_size=chunk_size, session=session):
+                    parcel_id = str(attrs.get('PARCELID', ''))
+                    if parcel_id in properties and key not in properties[parcel_id]:
+                        properties[parcel_id][key] = attrs
+            except (requests.RequestException, GisQueryError) as e:
+                logger.warning(f"Error getting bulk {key}: {str(e)}")
+                # We'll continue with just the basic parcel data
+    
+    return properties
+
 def get_property_data(property_id: str) -> Dict[str, Any]:
     """
     Get property data from Benton County GIS services.
@@ -218,31 +452,20 @@ def search_properties(query: str, limit: int = 10) -> Dict[str, Any]:
         if not where_clause:
             where_clause = f"PARCELID LIKE '%{query}%' OR SITEADDRESS LIKE '%{query}%' OR OWNER LIKE '%{query}%'"
         
-        # Construct the query parameters
-        params = {
-            'where': where_clause,
-            'outFields': "PARCELID,SITEADDRESS,OWNER,ACRES,LEGALDESC",
-            'returnGeometry': 'false',
-            'f': 'json',
-            'token': API_KEY,
-            'resultRecordCount': limit
-        }
-        
-        # Send the request
-        response = requests.get(PARCELS_URL, params=params, headers=HEADERS)
-        
-        if response.status_code != 200:
-            logger.error(f"Error from GIS service: {response.status_code} - {response.text}")
+        # Page through the results (limits above the service's maxRecordCount
+        # take several requests)
+        try:
+            features = list(iter_features(where_clause, "PARCELID,SITEADDRESS,OWNER,ACRES,LEGALDESC",
+                                          max_records=limit))
+        except GisQueryError as e:
+            logger.error(str(e))
             return {
                 'error': 'gis_api_error',
-                'message': f"Error from Benton County GIS API: {response.status_code}"
+                'message': str(e)
             }
         
-        # Parse the JSON response
-        search_data = response.json()
-        
         # Check if any features were returned
-        if not search_data.get('features'):
+        if not features:
             return {
                 'count': 0,
                 'properties': [],
@@ -251,7 +474,7 @@ def search_properties(query: str, limit: int = 10) -> Dict[str, Any]:
         
         # Extract property data
         properties = []
-        for feature in search_data['features']:
+        for feature in features:
             attrs = feature['attributes']
             properties.append({
                 'property_id': attrs.get('PARCELID', 'Unknown'),
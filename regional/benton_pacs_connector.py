@@ -7,10 +7,13 @@ database to retrieve authentic property assessment data following IAAO and USPAP
 
 import os
 import logging
+import threading
 import pyodbc
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
+from regional.pacs_pool import ConnectionPool, PoolError
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -18,6 +21,51 @@ logger = logging.getLogger(__name__)
 PACS_SERVER = os.environ.get('PACS_SERVER', 'jcharrispacs')
 PACS_DATABASE = os.environ.get('PACS_DATABASE', 'pacs_training')
 PACS_USE_INTEGRATED_SECURITY = True
+PACS_POOL_SIZE = int(os.environ.get('PACS_POOL_SIZE', '8'))
+PACS_POOL_TIMEOUT = float(os.environ.get('PACS_POOL_TIMEOUT', '10'))
+
+CONN_STR = (
+    'DRIVER={ODBC Driver 17 for SQL Server};'
+    f'SERVER={PACS_SERVER};'
+    f'DATABASE={PACS_DATABASE};'
+    'Trusted_Connection=yes;'
+)
+
+# Full property detail in one round trip: four result sets (record,
+# building, land, assessment history) from a single batch
+PROPERTY_DETAIL_SQL = """
+    SET NOCOUNT ON;
+    DECLARE @ParcelId varchar(64) = ?;
+    
+    SELECT 
+        ParcelId, ParcelNumber, SitusAddress, OwnerName, LegalDescription, 
+        PropertyClass, TaxArea, LandValue, ImprovementValue, MarketValue, 
+        AssessedValue, ExemptionValue, LevyCode, TaxStatus, Acres, 
+        LastSaleDate, LastSalePrice, AssessmentYear, TaxYear
+    FROM Property 
+    WHERE ParcelId = @ParcelId;
+    
+    SELECT TOP 1
+        YearBuilt, EffectiveYear, SquareFeet, Quality, Condition, 
+        Bedrooms, Bathrooms, Foundation, ExteriorWalls, RoofType, 
+        HeatingCooling, Fireplaces, BasementSF, GarageType, GarageSF, Stories
+    FROM Building 
+    WHERE ParcelId = @ParcelId;
+    
+    SELECT TOP 1
+        LandType, Topography, Utilities, ViewQuality
+    FROM Land 
+    WHERE ParcelId = @ParcelId;
+    
+    SELECT 
+        Year, LandValue, ImprovementValue, TotalValue, Change
+    FROM AssessmentHistory 
+    WHERE ParcelId = @ParcelId
+    ORDER BY Year DESC;
+"""
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
 
 def get_pacs_connection():
     """
@@ -27,20 +75,71 @@ def get_pacs_connection():
         Connection object to the PACS database or None if connection fails
     """
     try:
-        conn_str = (
-            'DRIVER={ODBC Driver 17 for SQL Server};'
-            f'SERVER={PACS_SERVER};'
-            f'DATABASE={PACS_DATABASE};'
-            'Trusted_Connection=yes;'
-        )
+        # Windows Authentication is not available in hosted environments like Replit
+        if os.environ.get('REPLIT_DB_URL'):
+            logger.warning("Running in Replit environment - PACS database connection unavailable")
+            return None
         
         logger.info(f"Connecting to PACS database {PACS_SERVER}/{PACS_DATABASE}")
-        connection = pyodbc.connect(conn_str)
+        connection = pyodbc.connect(CONN_STR, autocommit=True)
         return connection
     except Exception as e:
         logger.error(f"Failed to connect to PACS database: {str(e)}")
         return None
 
+def get_pacs_pool() -> ConnectionPool:
+    """
+    Get the shared PACS connection pool.
+    
+    Used by both this connector and the PACS API server. The pool holds up
+    to PACS_POOL_SIZE connections (environment variable, default 8), waits
+    up to PACS_POOL_TIMEOUT seconds for a free one, and is created on first
+    use.
+    
+    Returns:
+        ConnectionPool: The shared pool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(get_pacs_connection, max_size=PACS_POOL_SIZE,
+                                   timeout=PACS_POOL_TIMEOUT, name='PACS')
+        return _pool
+
+def fetch_property_detail(cursor, property_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Retrieve the full property detail in a single database round trip.
+    
+    Args:
+        cursor: Database cursor
+        property_id: Parcel ID to retrieve
+        
+    Returns:
+        PropertyRecord, BuildingData, LandData and AssessmentHistory, or None if not found
+    """
+    cursor.execute(PROPERTY_DETAIL_SQL, property_id)
+    
+    record_row = cursor.fetchone()
+    if not record_row:
+        return None
+    property_record = _map_property_record(record_row, property_id)
+    
+    cursor.nextset()
+    building_data = _map_building_data(cursor.fetchone())
+    
+    cursor.nextset()
+    land_data = _map_land_data(cursor.fetchone())
+    
+    cursor.nextset()
+    assessment_history = _map_assessment_history(cursor.fetchall())
+    
+    return {
+        "PropertyRecord": property_record,
+        "BuildingData": building_data,
+        "LandData": land_data,
+        "AssessmentHistory": assessment_history
+    }
+
 def get_property_assessment_data(property_id: str) -> Dict[str, Any]:
     """
     Retrieve property assessment data from the Benton County PACS database.
@@ -55,24 +154,14 @@ def get_property_assessment_data(property_id: str) -> Dict[str, Any]:
     """
     logger.info(f"Retrieving Benton County property assessment data for parcel {property_id}")
     
-    conn = get_pacs_connection()
-    if not conn:
-        logger.error("Cannot retrieve property data - PACS database connection failed")
-        return {
-            "error": "DATABASE_CONNECTION_FAILED",
-            "property_id": property_id,
-            "county": "benton",
-            "message": "Could not connect to the Benton County PACS database"
-        }
-    
     try:
-        # Create a cursor from the connection
-        cursor = conn.cursor()
+        # Reuse a pooled connection and fetch everything in one round trip
+        with get_pacs_pool().connection() as conn:
+            cursor = conn.cursor()
+            detail = fetch_property_detail(cursor, property_id)
+            cursor.close()
         
-        # Get property record data
-        property_record = get_property_record(cursor, property_id)
-        if not property_record:
-            conn.close()
+        if not detail:
             return {
                 "error": "PROPERTY_NOT_FOUND",
                 "property_id": property_id,
@@ -80,32 +169,24 @@ def get_property_assessment_data(property_id: str) -> Dict[str, Any]:
                 "message": f"Property with ID {property_id} not found in Benton County PACS database"
             }
         
-        # Get building data
-        building_data = get_building_data(cursor, property_id)
-        
-        # Get land data
-        land_data = get_land_data(cursor, property_id)
-        
-        # Get assessment history
-        assessment_history = get_assessment_history(cursor, property_id)
-        
-        # Close the connection
-        conn.close()
-        
         # Return the assessment data in the standard format
         return {
             "using_real_data": True,
             "data_source": "Benton County PACS Database",
-            "PropertyRecord": property_record,
-            "BuildingData": building_data,
-            "LandData": land_data,
-            "AssessmentHistory": assessment_history
+            **detail
+        }
+    
+    except PoolError as e:
+        logger.error(f"Cannot retrieve property data - PACS database connection failed: {str(e)}")
+        return {
+            "error": "DATABASE_CONNECTION_FAILED",
+            "property_id": property_id,
+            "county": "benton",
+            "message": "Could not connect to the Benton County PACS database"
         }
         
     except Exception as e:
         logger.error(f"Error retrieving property data from PACS: {str(e)}")
-        if conn:
-            conn.close()
         
         return {
             "error": "DATA_RETRIEVAL_ERROR",
@@ -157,30 +238,7 @@ def get_property_record(cursor, property_id: str) -> Dict[str, Any]:
         if not row:
             return None
         
-        # Map database values to property record dictionary
-        # Adjust column indices based on the actual query results
-        current_year = datetime.now().year
-        return {
-            "ParcelID": row[0] or property_id,
-            "ParcelNumber": row[1] or property_id,
-            "SitusAddress": row[2] or "",
-            "OwnerName": row[3] or "Current Owner",
-            "LegalDescription": row[4] or "",
-            "PropertyClass": row[5] or "Residential",
-            "TaxArea": row[6] or "",
-            "LandValue": row[7] or 0,
-            "ImprovementValue": row[8] or 0,
-            "MarketValue": row[9] or 0,
-            "AssessedValue": row[10] or 0,
-            "ExemptionValue": row[11] or 0,
-            "LevyCode": row[12] or "",
-            "TaxStatus": row[13] or "Taxable",
-            "Acres": row[14] or 0,
-            "LastSaleDate": row[15] or "",
-            "LastSalePrice": row[16] or 0,
-            "AssessmentYear": row[17] or current_year,
-            "TaxYear": row[18] or current_year
-        }
+        return _map_property_record(row, property_id)
     except Exception as e:
         logger.error(f"Error in get_property_record: {str(e)}")
         return {}
@@ -221,48 +279,7 @@ def get_building_data(cursor, property_id: str) -> Dict[str, Any]:
             WHERE ParcelId = ?
         """, property_id)
         
-        row = cursor.fetchone()
-        if not row:
-            # Return empty building data if not found
-            return {
-                "YearBuilt": 0,
-                "EffectiveYear": 0,
-                "SquareFeet": 0,
-                "Quality": "",
-                "Condition": "",
-                "Bedrooms": 0,
-                "Bathrooms": 0,
-                "Foundation": "",
-                "ExteriorWalls": "",
-                "RoofType": "",
-                "HeatingCooling": "",
-                "Fireplaces": 0,
-                "BasementSF": 0,
-                "GarageType": "",
-                "GarageSF": 0,
-                "Stories": 0
-            }
-        
-        # Map database values to building data dictionary
-        # Adjust column indices based on the actual query results
-        return {
-            "YearBuilt": row[0] or 0,
-            "EffectiveYear": row[1] or 0,
-            "SquareFeet": row[2] or 0,
-            "Quality": row[3] or "",
-            "Condition": row[4] or "",
-            "Bedrooms": row[5] or 0,
-            "Bathrooms": row[6] or 0,
-            "Foundation": row[7] or "",
-            "ExteriorWalls": row[8] or "",
-            "RoofType": row[9] or "",
-            "HeatingCooling": row[10] or "",
-            "Fireplaces": row[11] or 0,
-            "BasementSF": row[12] or 0,
-            "GarageType": row[13] or "",
-            "GarageSF": row[14] or 0,
-            "Stories": row[15] or 0
-        }
+        return _map_building_data(cursor.fetchone())
     except Exception as e:
         logger.error(f"Error in get_building_data: {str(e)}")
         return {}
@@ -291,24 +308,7 @@ def get_land_data(cursor, property_id: str) -> Dict[str, Any]:
             WHERE ParcelId = ?
         """, property_id)
         
-        row = cursor.fetchone()
-        if not row:
-            # Return empty land data if not found
-            return {
-                "LandType": "",
-                "Topography": "",
-                "Utilities": "",
-                "ViewQuality": ""
-            }
-        
-        # Map database values to land data dictionary
-        # Adjust column indices based on the actual query results
-        return {
-            "LandType": row[0] or "",
-            "Topography": row[1] or "",
-            "Utilities": row[2] or "",
-            "ViewQuality": row[3] or ""
-        }
+        return _map_land_data(cursor.fetchone())
     except Exception as e:
         logger.error(f"Error in get_land_data: {str(e)}")
         return {}
@@ -339,23 +339,115 @@ def get_assessment_history(cursor, property_id: str) -> List[Dict[str, Any]]:
             ORDER BY Year DESC
         """, property_id)
         
-        rows = cursor.fetchall()
-        if not rows:
-            # Return empty assessment history if not found
-            return []
-        
-        # Map database values to assessment history list
-        history = []
-        for row in rows:
-            history.append({
-                "Year": row[0] or 0,
-                "LandValue": row[1] or 0,
-                "ImprovementValue": row[2] or 0,
-                "TotalValue": row[3] or 0,
-                "Change": row[4] or 0
-            })
-        
-        return history
+        return _map_assessment_history(cursor.fetchall())
     except Exception as e:
         logger.error(f"Error in get_assessment_history: {str(e)}")
-        return []
\ No newline at end of file
+        return []
+
+def _map_property_record(row, property_id: str) -> Dict[str, Any]:
+    """Map a Property row to the property record dictionary."""
+    current_year = datetime.now().year
+    return {
+        "ParcelID": row[0] or property_id,
+        "ParcelNumber": row[1] or property_id,
+        "SitusAddress": row[2] or "",
+        "OwnerName": row[3] or "Current Owner",
+        "LegalDescription": row[4] or "",
+        "PropertyClass": row[5] or "Residential",
+        "TaxArea": row[6] or "",
+        "LandValue": row[7] or 0,
+        "ImprovementValue": row[8] or 0,
+        "MarketValue": row[9] or 0,
+        "AssessedValue": row[10] or 0,
+        "ExemptionValue": row[11] or 0,
+        "LevyCode": row[12] or "",
+        "TaxStatus": row[13] or "Taxable",
+        "Acres": row[14] or 0,
+        "LastSaleDate": row[15] or "",
+        "LastSalePrice": row[16] or 0,
+        "AssessmentYear": row[17] or current_year,
+        "TaxYear": row[18] or current_year
+    }
+
+def _map_building_data(row) -> Dict[str, Any]:
+    """Map a Building row (or None) to the building data dictionary."""
+    if not row:
+        # Return empty building data if not found
+        return {
+            "YearBuilt": 0,
+            "EffectiveYear": 0,
+            "SquareFeet": 0,
+            "Quality": "",
+            "Condition": "",
+            "Bedrooms": 0,
+            "Bathrooms": 0,
+            "Foundation": "",
+            "ExteriorWalls": "",
+            "RoofType": "",
+            "HeatingCooling": "",
+            "Fireplaces": 0,
+            "BasementSF": 0,
+            "GarageType": "",
+            "GarageSF": 0,
+            "Stories": 0
+        }
+    
+    # Map database values to building data dictionary
+    # Adjust column indices based on the actual query results
+    return {
+        "YearBuilt": row[0] or 0,
+        "EffectiveYear": row[1] or 0,
+        "SquareFeet": row[2] or 0,
+        "Quality": row[3] or "",
+        "Condition": row[4] or "",
+        "Bedrooms": row[5] or 0,
+        "Bathrooms": row[6] or 0,
+        "Foundation": row[7] or "",
+        "ExteriorWalls": row[8] or "",
+        "RoofType": row[9] or "",
+        "HeatingCooling": row[10] or "",
+        "Fireplaces": row[11] or 0,
+        "BasementSF": row[12] or 0,
+        "GarageType": row[13] or "",
+        "GarageSF": row[14] or 0,
+        "Stories": row[15] or 0
+    }
+
+def _map_land_data(row) -> Dict[str, Any]:
+    """Map a Land row (or None) to the land data dictionary."""
+    if not row:
+        # Return empty land data if not found
+        return {
+            "LandType": "",
+            "Topography": "",
+            "Utilities": "",
+            "ViewQuality": ""
+        }
+    
+    # Map database values to land data dictionary
+    # Adjust column indices based on the actual query results
+    return {
+        "LandType": row[0] or "",
+        "Topography": row[1] or "",
+        "Utilities": row[2] or "",
+        "ViewQuality": row[3] or ""
+    }
+
+def _map_assessment_history(rows) -> List[Dict[str, Any]]:
+    """Map AssessmentHistory rows to the yearly assessment list."""
+    if not rows:
+        # Return empty assessment history if not found
+        return []
+    
+    # Map database values to assessment history list
+    history = []
+    for row in rows:
+        history.append({
+            "Year": row[0] or 0,
+            "LandValue": row[1] or 0,
+            "ImprovementValue": row[2] or 0,
+            "TotalValue": row[3] or 0,
+            "Change": row[4] or 0
+        })
+    
+    return history
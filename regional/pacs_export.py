@@ -0,0 +1,193 @@
+"""
+Streaming bulk export of the Benton County PACS assessment roll.
+
+Rows are read from a forward-only cursor in fixed-size batches and encoded
+as NDJSON or CSV chunk by chunk, so memory use does not depend on the size
+of the export. Exports are ordered by ParcelId and can be resumed after
+the last ParcelId a client received (keyset pagination rather than
+OFFSET, so resuming does not rescan skipped rows).
+"""
+
+import csv
+import io
+import json
+import logging
+from contextlib import ExitStack
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from fastapi.responses import StreamingResponse
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Property columns included in an export, in output order
+EXPORT_COLUMNS = [
+    'ParcelId', 'ParcelNumber', 'SitusAddress', 'OwnerName', 'LegalDescription',
+    'PropertyClass', 'TaxArea', 'LandValue', 'ImprovementValue', 'MarketValue',
+    'AssessedValue', 'ExemptionValue', 'LevyCode', 'TaxStatus', 'Acres',
+    'LastSaleDate', 'LastSalePrice', 'AssessmentYear', 'TaxYear',
+]
+
+
+def build_export_query(after: Optional[str] = None, changed_since: Optional[datetime] = None,
+                       changed_column: Optional[str] = None,
+                       limit: Optional[int] = None) -> Tuple[str, List[Any]]:
+    """
+    Build the export query.
+
+    Args:
+        after: Only export parcels with a ParcelId greater than this (resume point)
+        changed_since: Only export parcels changed at or after this time
+        changed_column: Property column holding the last-change time
+        limit: Maximum number of rows
+
+    Returns:
+        Tuple[str, List[Any]]: SQL and its parameters
+
+    Raises:
+        ValueError: If changed_since is given without a valid changed_column
+    """
+    params: List[Any] = []
+    top = ''
+    if limit:
+        top = 'TOP (?) '
+        params.append(limit)
+
+    conditions = []
+    if after:
+        conditions.append('ParcelId > ?')
+        params.append(after)
+    if changed_since:
+        if not changed_column or not changed_column.isidentifier():
+            raise ValueError("A change-tracking column is required for changed_since exports")
+        conditions.append(f'[{changed_column}] >= ?')
+        params.append(changed_since)
+
+    sql = f"SELECT {top}{', '.join(EXPORT_COLUMNS)} FROM Property"
+    if conditions:
+        sql += ' WHERE ' + ' AND '.join(conditions)
+    sql += ' ORDER BY ParcelId'
+    return sql, params
+
+
+def iter_export_batches(cursor, sql: str, params: List[Any],
+                        fetch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Execute the export query and yield rows in batches.
+
+    Args:
+        cursor: Database cursor
+        sql: Export SQL from build_export_query()
+        params: Its parameters
+        fetch_size: Rows fetched per round trip
+
+    Yields:
+        List[Dict[str, Any]]: Rows keyed by EXPORT_COLUMNS
+    """
+    cursor.execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(fetch_size)
+        if not rows:
+            break
+        yield [dict(zip(EXPORT_COLUMNS, row)) for row in rows]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def encode_ndjson(batches: Iterator[List[Dict[str, Any]]]) -> Iterator[str]:
+    """
+    Encode row batches as NDJSON, one chunk per batch.
+
+    Args:
+        batches: Row batches from iter_export_batches()
+
+    Yields:
+        str: Newline-delimited JSON
+    """
+    for batch in batches:
+        yield ''.join(json.dumps(row, default=_json_default) + '\n' for row in batch)
+
+
+def encode_csv(batches: Iterator[List[Dict[str, Any]]]) -> Iterator[str]:
+    """
+    Encode row batches as CSV with a header row, one chunk per batch.
+
+    Args:
+        batches: Row batches from iter_export_batches()
+
+    Yields:
+        str: CSV text
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in batches:
+        for row in batch:
+            writer.writerow([
+                value.isoformat() if isinstance(value, (datetime, date)) else value
+                for value in (row[column] for column in EXPORT_COLUMNS)
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header only: the export was empty
+        yield buffer.getvalue()
+
+
+ENCODERS = {
+    'ndjson': encode_ndjson,
+    'csv': encode_csv,
+}
+
+
+class ExportResponse(StreamingResponse):
+    """
+    Streaming export response that always releases its resources.
+
+    ``resources`` holds whatever the export has checked out (the export slot
+    and the pooled connection). It is closed when the stream completes, when
+    it is interrupted (the connection is then discarded by the pool), and
+    when the body never starts, e.g. because the client disconnected first.
+    Starlette skips background tasks in that last case, so the release runs
+    in a finally around the whole response instead.
+    """
+
+    def __init__(self, chunks: Callable[[], Iterator[str]], resources: ExitStack, **kwargs):
+        """
+        Initialize the response.
+
+        Args:
+            chunks: Called once streaming starts; yields the encoded chunks
+            resources: Exit stack released when the response ends
+            **kwargs: StreamingResponse options (media_type, headers)
+        """
+        self._resources = resources
+        self._stream = self._run(chunks)
+        super().__init__(self._stream, **kwargs)
+
+    def _run(self, chunks: Callable[[], Iterator[str]]) -> Iterator[str]:
+        with self._resources:
+            yield from chunks()
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # A suspended stream exits its with block here (as interrupted);
+            # one that never started has nothing open and is released directly
+            self._stream.close()
+            self._resources.close()
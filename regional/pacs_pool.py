@@ -0,0 +1,219 @@
+"""
+Database connection pool for the Benton County PACS connectors.
+
+This module provides a small thread-safe connection pool for DB-API
+connections (pyodbc in practice). Connections are reused across requests
+instead of being opened per request, the number open at once is bounded,
+and idle connections are health-checked before reuse.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class PoolError(Exception):
+    """A connection could not be provided by the pool."""
+    pass
+
+
+class PoolTimeoutError(PoolError):
+    """All connections stayed busy for the whole checkout timeout."""
+    pass
+
+
+class ConnectionPool:
+    """
+    Bounded pool of database connections.
+
+    Usage::
+
+        pool = ConnectionPool(lambda: pyodbc.connect(CONN_STR, autocommit=True))
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            ...
+
+    A connection is discarded rather than returned to the pool when an
+    exception escapes the ``with`` block, so a broken connection is never
+    handed out again. Connections idle longer than ``health_check_after``
+    seconds are probed with ``health_check_sql`` before reuse, and those
+    idle longer than ``max_idle`` are closed.
+    """
+
+    def __init__(self, connect: Callable[[], Any], max_size: int = 8, timeout: float = 10.0,
+                 health_check_after: float = 30.0, max_idle: float = 600.0,
+                 health_check_sql: str = "SELECT 1", name: str = "pacs"):
+        """
+        Initialize the pool. No connections are opened until first use.
+
+        Args:
+            connect (callable): Opens a new connection; may raise or return None on failure
+            max_size (int): Maximum connections open at once
+            timeout (float): Seconds to wait for a free connection
+            health_check_after (float): Idle seconds after which a connection is probed
+            max_idle (float): Idle seconds after which a connection is closed
+            health_check_sql (str): Cheap statement used as the probe
+            name (str): Name used in log messages
+        """
+        self._connect = connect
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+        self.max_idle = max_idle
+        self.health_check_sql = health_check_sql
+        self.name = name
+        self._condition = threading.Condition()
+        self._idle: List[Tuple[Any, float]] = []  # (connection, returned_at), most recent last
+        self._open = 0
+        self._generation = 0  # Bumped by close_all(); older connections are not reused
+        self.stats = {
+            'created': 0,
+            'reused': 0,
+            'discarded': 0,
+            'failed_health_checks': 0,
+            'waits': 0,
+            'timeouts': 0,
+        }
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        Check out a connection for the duration of a ``with`` block.
+
+        Yields:
+            A database connection
+
+        Raises:
+            PoolTimeoutError: If no connection became free within the timeout
+            PoolError: If a new connection could not be opened
+        """
+        # Read first, so a close_all() racing the checkout still retires this connection
+        generation = self._generation
+        conn = self._acquire()
+        try:
+            yield conn
+        except BaseException:
+            self._discard(conn)
+            raise
+        else:
+            self._release(conn, generation)
+
+    def status(self) -> Dict[str, Any]:
+        """Get pool size, usage and counters."""
+        with self._condition:
+            idle = len(self._idle)
+            return {
+                'name': self.name,
+                'max_size': self.max_size,
+                'open': self._open,
+                'idle': idle,
+                'in_use': self._open - idle,
+                **self.stats,
+            }
+
+    def close_all(self):
+        """Close all idle connections (connections in use are closed on return)."""
+        with self._condition:
+            self._generation += 1
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._condition.notify_all()
+        for conn, _ in idle:
+            self._close(conn)
+
+    def _acquire(self) -> Any:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._condition:
+                self._close_expired()
+                while not self._idle and self._open >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"No {self.name} database connection free after {self.timeout}s"
+                        )
+                    self.stats['waits'] += 1
+                    self._condition.wait(remaining)
+
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                else:
+                    conn, returned_at = None, None
+                    self._open += 1
+
+            if conn is None:
+                return self._create()
+            if time.monotonic() - returned_at < self.health_check_after or self._is_healthy(conn):
+                with self._condition:
+                    self.stats['reused'] += 1
+                return conn
+            # Stale connection: drop it and try again
+            with self._condition:
+                self.stats['failed_health_checks'] += 1
+            self._discard(conn)
+
+    def _create(self) -> Any:
+        try:
+            conn = self._connect()
+            if conn is None:
+                raise PoolError(f"Could not connect to the {self.name} database")
+        except BaseException as e:
+            with self._condition:
+                self._open -= 1
+                self._condition.notify()
+            if isinstance(e, PoolError):
+                raise
+            raise PoolError(f"Could not connect to the {self.name} database: {str(e)}") from e
+        with self._condition:
+            self.stats['created'] += 1
+            open_count = self._open
+        logger.info(f"Opened {self.name} database connection ({open_count}/{self.max_size})")
+        return conn
+
+    def _release(self, conn: Any, generation: int):
+        with self._condition:
+            if generation == self._generation:
+                self._idle.append((conn, time.monotonic()))
+                self._condition.notify()
+                return
+        # Checked out before close_all()
+        self._discard(conn)
+
+    def _discard(self, conn: Any):
+        with self._condition:
+            self._open -= 1
+            self.stats['discarded'] += 1
+            self._condition.notify()
+        self._close(conn)
+
+    def _close_expired(self):
+        # Called with the condition held; idle list is ordered oldest first
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][1] > self.max_idle:
+            conn, _ = self._idle.pop(0)
+            self._open -= 1
+            self._close(conn)
+
+    def _is_healthy(self, conn: Any) -> bool:
+        try:
+            cursor = conn.cursor()
+            cursor.execute(self.health_check_sql)
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception as e:
+            logger.warning(f"Discarding unhealthy {self.name} database connection: {str(e)}")
+            return False
+
+    @staticmethod
+    def _close(conn: Any):
+        try:
+            conn.close()
+        except Exception:
+            pass
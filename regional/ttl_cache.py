@@ -0,0 +1,191 @@
+"""
+In-process TTL cache.
+
+This module provides a thread-safe, size-bounded cache whose entries expire
+after a fixed time-to-live, with hit/miss counters for monitoring. It is
+used to serve hot property records without a database round trip, with
+CoalescingLoader sharing one load between concurrent asyncio requests for
+the same uncached key.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# Returned by get() on a miss so cached None values can be told apart
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Least-recently-used cache with per-entry expiry.
+
+    Entries expire ``ttl`` seconds after they are set. When more than
+    ``max_entries`` are stored the least recently used entry is evicted.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of entries kept
+            ttl (float): Seconds an entry stays valid
+            clock (callable): Time source, injectable for testing
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'evicted': 0,
+        }
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+            default: Returned on a miss (default: MISSING)
+
+        Returns:
+            The cached value, or default
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return value
+                del self._entries[key]
+                self.stats['expired'] += 1
+            self.stats['misses'] += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl (float, optional): Override the default time-to-live
+        """
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evicted'] += 1
+
+    def invalidate(self, key: Hashable):
+        """Remove a key if cached."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def status(self) -> Dict[str, Any]:
+        """Get size, settings, counters and hit rate."""
+        with self._lock:
+            stats = dict(self.stats)
+            size = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        return {
+            'entries': size,
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            **stats,
+            'hit_rate': round(stats['hits'] / lookups, 4) if lookups else None,
+        }
+
+
+class CoalescingLoader:
+    """
+    Serve keys from a TTLCache, loading misses with one shared task per key.
+
+    The load runs in its own task and every request for the key, the first
+    included, awaits it through asyncio.shield(). A request that is
+    cancelled (e.g. its client disconnected) therefore only stops waiting;
+    the load carries on for the other requests and still fills the cache.
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, cache: TTLCache, load: Callable[[Hashable], Awaitable[Any]],
+                 cacheable: Callable[[Any], bool] = lambda value: True):
+        """
+        Initialize the loader.
+
+        Args:
+            cache (TTLCache): Cache read before loading and filled after
+            load (callable): Coroutine function loading the value for a key
+            cacheable (callable): Whether a loaded value may be cached
+        """
+        self.cache = cache
+        self._load = load
+        self._cacheable = cacheable
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {
+            'loads': 0,
+            'coalesced': 0,
+        }
+
+    async def get(self, key: Hashable) -> Any:
+        """
+        Get the value for a key from the cache, or from a (shared) load.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached or loaded value
+
+        Raises:
+            Exception: Whatever the load raised, for every request sharing it
+        """
+        cached = self.cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats['loads'] += 1
+            task = asyncio.ensure_future(self._load(key))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._finished, key))
+        else:
+            self.stats['coalesced'] += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Get the number of loads currently running."""
+        return len(self._inflight)
+
+    def _finished(self, key: Hashable, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled():
+            return
+        # Retrieving the exception also stops it being logged as unhandled
+        # when every request waiting on the load was cancelled
+        if task.exception() is None and self._cacheable(task.result()):
+            self.cache.set(key, task.result())
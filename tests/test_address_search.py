@@ -0,0 +1,134 @@
+"""
+Unit tests for utils.address_search.
+"""
+import re
+import unittest
+from unittest.mock import MagicMock
+from sqlalchemy import Column, Integer, MetaData, Table, Text, create_engine, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, declarative_base
+from utils.address_search import (
+    fuzzy_match, normalize_search_text, normalized_column_sql, rank_fuzzy_matches, set_similarity_threshold,
+    similarity_score
+)
+
+locations = Table(
+    'property_location', MetaData(),
+    Column('id', Integer, primary_key=True),
+    Column('address_normalized', Text),
+)
+
+Base = declarative_base()
+
+
+class Location(Base):
+    __tablename__ = 'property_location'
+    id = Column(Integer, primary_key=True)
+    address_normalized = Column(Text)
+    owner_normalized = Column(Text)
+
+
+def compile_pg(expression):
+    return expression.compile(dialect=postgresql.dialect())
+
+
+def trigrams(text):
+    # pg_trgm: each word padded with two spaces in front and one behind
+    grams = []
+    for word in re.findall(r'[a-z0-9]+', text.lower()):
+        padded = f'  {word} '
+        grams.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_similarity(term, text):
+    """pg_trgm word_similarity: best match of the term's trigrams against a run of words."""
+    term_grams = set(trigrams(term))
+    words = text.split()
+    best = 0.0
+    for start in range(len(words)):
+        for end in range(start + 1, len(words) + 1):
+            extent = set(trigrams(' '.join(words[start:end])))
+            shared = len(term_grams & extent)
+            best = max(best, shared / (len(term_grams) + len(extent) - shared))
+    return best
+
+
+class TestAddressSearch(unittest.TestCase):
+    def test_normalize_search_text(self):
+        self.assertEqual(normalize_search_text('  123 N. Main St., Kennewick,WA '),
+                         '123 n main st kennewick wa')
+        self.assertEqual(normalize_search_text("O'Brien--Smith"), 'o brien smith')
+        self.assertEqual(normalize_search_text(None), '')
+        self.assertEqual(normalize_search_text('...'), '')
+
+    def test_normalized_column_sql(self):
+        self.assertEqual(normalized_column_sql('address'),
+                         "btrim(regexp_replace(lower(address), '[^a-z0-9]+', ' ', 'g'))")
+
+    def test_fuzzy_match_uses_word_similarity_operator(self):
+        compiled = compile_pg(fuzzy_match(locations.c.address_normalized, '123 mian st'))
+        self.assertRegex(str(compiled), r'<%+ property_location.address_normalized')
+        self.assertIn('123 mian st', compiled.params.values())
+
+    def test_similarity_score(self):
+        compiled = compile_pg(similarity_score(locations.c.address_normalized, '123 mian st'))
+        self.assertIn('word_similarity(', str(compiled))
+
+    def test_threshold_is_transaction_local(self):
+        session = MagicMock()
+        set_similarity_threshold(session, 0.35)
+        compiled = compile_pg(session.execute.call_args[0][0])
+        self.assertIn('set_config(', str(compiled))
+        self.assertEqual(sorted(map(str, compiled.params.values())),
+                         ['0.35', 'True', 'pg_trgm.word_similarity_threshold'])
+
+
+
+class TestRankedSearch(unittest.TestCase):
+    """Runs the ranking query on SQLite with a Python word_similarity."""
+
+    def setUp(self):
+        engine = create_engine('sqlite://')
+        event.listen(engine, 'connect',
+                     lambda conn, record: conn.create_function('word_similarity', 2, word_similarity))
+        Base.metadata.create_all(engine)
+        self.session = Session(engine)
+        self.addCleanup(self.session.close)
+        for id, address, owner in [
+            (1, '123 Main St, Kennewick, WA 99336', 'SMITH JOHN & MARY'),
+            (2, '123 Maine Ave, Pasco, WA 99301', 'SMYTHE JANE'),
+            (3, '900 Oak Rd, Richland, WA 99352', 'SMITH JOHN'),
+            (4, '4512 W Clearwater Ave, Kennewick, WA 99336', 'DOE RICHARD'),
+        ]:
+            self.session.add(Location(id=id, address_normalized=normalize_search_text(address),
+                                      owner_normalized=normalize_search_text(owner)))
+        self.session.commit()
+
+    def search(self, address=None, owner=None):
+        terms = []
+        if address:
+            terms.append((Location.address_normalized, normalize_search_text(address)))
+        if owner:
+            terms.append((Location.owner_normalized, normalize_search_text(owner)))
+        rows = rank_fuzzy_matches(self.session.query(Location), terms, Location.id).all()
+        return [(location.id, round(score, 2)) for location, score in rows]
+
+    def test_typo_in_address_ranks_closest_first(self):
+        results = self.search(address='123 mian st')
+        self.assertEqual(results[0][0], 1)
+        self.assertNotIn(4, [id for id, _ in results])
+        self.assertEqual([score for _, score in results], sorted((score for _, score in results), reverse=True))
+
+    def test_owner_search_ties_break_on_id(self):
+        results = self.search(owner='Smith, Jon')
+        self.assertEqual([id for id, _ in results], [1, 3])
+        self.assertEqual(self.search(owner='clearwater'), [])
+
+    def test_address_and_owner_must_both_match(self):
+        self.assertEqual([id for id, _ in self.search(address='123 main', owner='smith')], [1])
+        self.assertEqual(self.search(address='900 oak', owner='doe'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Unit tests for regional.assessment_roll and the snapshot ETL transform.
+"""
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+from etl.assessment_roll_etl import AssessmentRollSnapshotETL
+from regional.assessment_roll import AssessmentRollStore, assessment_roll, build_search_query
+
+
+def compile_pg(statement):
+    return statement.compile(dialect=postgresql.dialect())
+
+
+class TestSearchQuery(unittest.TestCase):
+    def test_field_terms_are_ored_substring_matches(self):
+        compiled = compile_pg(build_search_query(address='MAIN ST', owner='SMITH', limit=5))
+        sql = str(compiled)
+        self.assertIn("assessment_roll.situs_address ILIKE", sql)
+        self.assertIn(" OR assessment_roll.owner_name ILIKE", sql)
+        self.assertIn("ORDER BY assessment_roll.parcel_id", sql)
+        self.assertEqual(compiled.params['situs_address_1'], '%MAIN ST%')
+        self.assertEqual(compiled.params['owner_name_1'], '%SMITH%')
+        self.assertEqual(compiled.params['param_1'], 5)
+
+    def test_like_wildcards_are_escaped(self):
+        compiled = compile_pg(build_search_query(parcel='10_2%'))
+        self.assertEqual(compiled.params['parcel_number_1'], r'%10\_2\%%')
+
+    def test_full_text_query_orders_by_rank(self):
+        sql = str(compile_pg(build_search_query(text_query='smith kennewick')))
+        self.assertIn("assessment_roll.search_vector @@ websearch_to_tsquery(", sql)
+        self.assertIn("ORDER BY ts_rank(", sql)
+
+    def test_schema_has_trigram_and_full_text_indexes(self):
+        ddl = str(CreateTable(assessment_roll).compile(dialect=postgresql.dialect()))
+        self.assertIn("GENERATED ALWAYS AS", ddl)
+        indexes = [str(CreateIndex(i).compile(dialect=postgresql.dialect())) for i in assessment_roll.indexes]
+        self.assertTrue(any('situs_address gin_trgm_ops' in i for i in indexes))
+        self.assertTrue(any('owner_name gin_trgm_ops' in i for i in indexes))
+        self.assertTrue(any('USING gin (search_vector)' in i for i in indexes))
+        self.assertIn("situs_normalized TEXT GENERATED ALWAYS AS (btrim(regexp_replace(lower(situs_address)", ddl)
+
+    def test_upsert_keeps_last_row_per_parcel(self):
+        conn = MagicMock()
+        batch = [{'parcel_id': '1', 'owner_name': 'OLD', 'snapshot_id': 7},
+                 {'parcel_id': '2', 'owner_name': 'OTHER', 'snapshot_id': 7},
+                 {'parcel_id': '1', 'owner_name': 'NEW', 'snapshot_id': 7}]
+
+        self.assertEqual(AssessmentRollStore._upsert(conn, batch), 2)
+
+        params = compile_pg(conn.execute.call_args.args[0]).params
+        self.assertEqual((params['parcel_id_m0'], params['owner_name_m0']), ('1', 'NEW'))
+        self.assertEqual(params['parcel_id_m1'], '2')
+        self.assertNotIn('parcel_id_m2', params)
+
+    def test_owner_lookup_matches_normalized_situs_address(self):
+        engine = MagicMock()
+        conn = engine.connect.return_value.__enter__.return_value
+        conn.execute.return_value = [('123 main st', 'SMITH JOHN')]
+        store = AssessmentRollStore(engine)
+
+        owners = store.owners_by_address(['123 Main St.', '123 MAIN ST', '', None])
+
+        self.assertEqual(owners, {'123 main st': 'SMITH JOHN'})
+        compiled = compile_pg(conn.execute.call_args.args[0])
+        self.assertIn('assessment_roll.situs_normalized IN', str(compiled))
+        self.assertEqual(compiled.params['situs_normalized_1'], ['123 main st'])
+
+
+class TestSnapshotFreshness(unittest.TestCase):
+    def make_store(self, completed_at):
+        store = AssessmentRollStore(engine=None, max_age_hours=26)
+        latest = {'id': 1, 'completed_at': completed_at, 'row_count': 10} if completed_at else None
+        store.latest_snapshot = lambda refresh=False: latest
+        return store
+
+    def test_fresh_snapshot(self):
+        self.assertTrue(self.make_store(datetime.utcnow() - timedelta(hours=2)).is_fresh())
+
+    def test_stale_or_missing_snapshot(self):
+        self.assertFalse(self.make_store(datetime.utcnow() - timedelta(hours=30)).is_fresh())
+        self.assertFalse(self.make_store(None).is_fresh())
+
+
+class TestSnapshotTransform(unittest.TestCase):
+    def test_rows_are_mapped_and_blank_ids_skipped(self):
+        etl = AssessmentRollSnapshotETL()
+        rows = [
+            ('123 ', 'R-123', '1 MAIN ST ', 'SMITH JOHN', 'Residential', 1, 2, 3, 3, 2024, 2025),
+            ('  ', None, None, None, None, None, None, None, None, None, None),
+        ]
+        mapped = list(etl.transform(iter(rows)))
+        self.assertEqual(len(mapped), 1)
+        self.assertEqual(mapped[0]['parcel_id'], '123')
+        self.assertEqual(mapped[0]['situs_address'], '1 MAIN ST')
+        self.assertEqual(mapped[0]['tax_year'], 2025)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Unit tests for etl.async_api_connector adapters.
+"""
+import asyncio
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from etl import async_api_connector
+from etl.async_api_connector import HAS_AIOHTTP, AsyncBaseApiConnector, SyncApiConnectorAdapter
+
+if HAS_AIOHTTP:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+
+class InFlightCounter:
+    """Tracks the peak number of concurrent requests seen by a stub transport."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        with self.lock:
+            self.current -= 1
+
+
+class FakeAsyncConnector(AsyncBaseApiConnector):
+    def __init__(self, base_url="http://stub", **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+
+    async def search_properties(self, location, **kwargs):
+        return {"location": location, "limit": kwargs.get("limit")}
+
+    async def get_property_details(self, property_id):
+        return await self._request_json("GET", f"{self.base_url}/property", params={"id": property_id})
+
+    async def get_market_trends(self, location, **kwargs):
+        return {"location": location}
+
+    def standardize_property(self, data):
+        return {"source_id": data["id"]}
+
+
+class TestAsyncApiConnector(unittest.TestCase):
+    @unittest.skipUnless(HAS_AIOHTTP, "aiohttp not installed")
+    def test_gather_bounded_limits_concurrency_over_aiohttp(self):
+        counter = InFlightCounter()
+
+        async def handler(request):
+            with counter:
+                await asyncio.sleep(0.02)
+            return web.json_response({"id": request.query["id"]}, headers={"X-RateLimit-Remaining": "99"})
+
+        async def run():
+            app = web.Application()
+            app.router.add_get("/property", handler)
+            async with TestServer(app) as server:
+                connector = FakeAsyncConnector(str(server.make_url("")).rstrip("/"), max_concurrency=4)
+                try:
+                    return connector, await connector.gather_bounded(
+                        connector.get_property_details(str(i)) for i in range(20)
+                    )
+                finally:
+                    await connector.close()
+
+        connector, results = asyncio.run(run())
+        self.assertEqual([r["id"] for r in results], [str(i) for i in range(20)])
+        self.assertEqual(counter.peak, 4)
+        self.assertEqual(connector.metrics["requests"], 20)
+        self.assertEqual(connector.rate_limit_remaining, 99)
+
+    def test_gather_bounded_limits_concurrency_without_aiohttp(self):
+        counter = InFlightCounter()
+
+        def fake_request(method, url, params=None, **kwargs):
+            with counter:
+                time.sleep(0.02)
+            return SimpleNamespace(status_code=200, headers={}, raise_for_status=lambda: None,
+                                   json=lambda: {"id": params["id"]})
+
+        connector = FakeAsyncConnector(max_concurrency=3)
+
+        async def run():
+            return await connector.gather_bounded(
+                connector.get_property_details(str(i)) for i in range(12)
+            )
+
+        with patch.object(async_api_connector, "HAS_AIOHTTP", False), \
+                patch.object(async_api_connector.requests, "request", side_effect=fake_request):
+            results = asyncio.run(run())
+        self.assertEqual([r["id"] for r in results], [str(i) for i in range(12)])
+        self.assertEqual(counter.peak, 3)
+
+    def test_sync_adapter(self):
+        def fake_request(method, url, params=None, **kwargs):
+            return SimpleNamespace(status_code=200, headers={}, raise_for_status=lambda: None,
+                                   json=lambda: {"id": params["id"]})
+
+        adapter = SyncApiConnectorAdapter(FakeAsyncConnector())
+        try:
+            with patch.object(async_api_connector, "HAS_AIOHTTP", False), \
+                    patch.object(async_api_connector.requests, "request", side_effect=fake_request):
+                self.assertEqual(adapter.get_property_details("42"), {"id": "42"})
+            self.assertEqual(adapter.search_properties("99352", limit=1)["limit"], 1)
+            self.assertEqual(adapter.standardize_property({"id": "42"}), {"source_id": "42"})
+            self.assertEqual(adapter.get_health_status()["status"], "healthy")
+        finally:
+            adapter.close()
+
+
+class TestAsyncZillowApiConnector(unittest.TestCase):
+    def test_unsupported_endpoints_answer_natively(self):
+        from etl.zillow_api_connector import AsyncZillowApiConnector, ZillowApiConnector
+
+        connector = AsyncZillowApiConnector(api_key="test-key")
+        with patch.object(ZillowApiConnector, "search_properties") as sync_search, \
+                patch.object(ZillowApiConnector, "get_market_trends") as sync_trends:
+            search = asyncio.run(connector.search_properties("Kennewick, WA"))
+            trends = asyncio.run(connector.get_market_trends("Kennewick, WA"))
+        sync_search.assert_not_called()
+        sync_trends.assert_not_called()
+        self.assertEqual(search["status"], "limited")
+        self.assertEqual(search["properties"][0]["location"], "Kennewick, WA")
+        self.assertEqual(trends["status"], "unavailable")
+
+
+if __name__ == "__main__":
+    unittest.main()
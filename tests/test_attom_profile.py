@@ -0,0 +1,97 @@
+"""
+Unit tests for the concurrent ATTOM property profile and request throttling.
+"""
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from etl.attom_api_connector import AttomApiConnector
+
+RESPONSES = {
+    'property/detail': {'property': [{
+        'identifier': {'attomId': '42'},
+        'address': {'line1': '123 MAIN ST', 'locality': 'KENNEWICK', 'countrySubd': 'WA', 'postal1': '99336'},
+        'building': {'rooms': {'beds': 3}},
+    }]},
+    'sale/detail': {'property': [{'sale': {'amount': {'saleAmt': 350000}}, 'saleTransactions': [{'recordingDate': '2020-01-01'}]}]},
+    'property/expandedprofile': {'property': [{'avm': {'amount': {'value': 410000}}}]},
+    'neighborhood/detail': {'neighborhood': {'name': 'Southridge'}},
+}
+
+
+class TestAttomProfile(unittest.TestCase):
+    def setUp(self):
+        self.connector = AttomApiConnector(api_key='fake', min_request_interval=0)
+        self.addCleanup(self.connector.close)
+
+    def fake_request(self, delay=0.2, fail=()):
+        def make_request(endpoint, params):
+            time.sleep(delay)
+            if endpoint in fail:
+                return {'error': 'API error: 500'}
+            return RESPONSES[endpoint]
+        return make_request
+
+    def test_parts_are_fetched_concurrently_and_merged(self):
+        with patch.object(self.connector, '_make_request', side_effect=self.fake_request()):
+            start = time.time()
+            profile = self.connector.get_property_profile(property_id='42')
+            elapsed = time.time() - start
+
+        self.assertLess(elapsed, 0.6)  # serial would take 0.8s
+        self.assertTrue(profile['complete'])
+        self.assertEqual(profile['property']['avm'], {'amount': {'value': 410000}})
+        self.assertEqual(profile['property']['sale']['amount']['saleAmt'], 350000)
+        self.assertEqual(profile['property']['neighborhood']['name'], 'Southridge')
+        self.assertEqual(profile['standardized']['id'], '42')
+        self.assertEqual(profile['standardized']['price'], 350000)
+
+    def test_failed_part_degrades_gracefully(self):
+        fake = self.fake_request(delay=0, fail=('property/expandedprofile',))
+        with patch.object(self.connector, '_make_request', side_effect=fake):
+            profile = self.connector.get_property_profile(property_id='42')
+        self.assertFalse(profile['complete'])
+        self.assertEqual(profile['missing'], ['valuation'])
+        self.assertNotIn('avm', profile['property'])
+        self.assertEqual(profile['details']['identifier']['attomId'], '42')
+
+    def test_exception_and_timeout_are_reported(self):
+        with patch.object(self.connector, 'get_neighborhood_data', side_effect=RuntimeError('boom')), \
+                patch.object(self.connector, '_make_request', side_effect=self.fake_request(delay=0)):
+            profile = self.connector.get_property_profile(property_id='42')
+        self.assertEqual(profile['errors'], {'neighborhood': 'boom'})
+        self.assertEqual(profile['missing'], ['neighborhood'])
+
+        with patch.object(self.connector, '_make_request', side_effect=self.fake_request(delay=0.5)):
+            profile = self.connector.get_property_profile(property_id='42', parts=['details'], timeout=0.05)
+        self.assertEqual(profile['errors'], {'details': 'Timed out'})
+
+    def test_identifier_required(self):
+        self.assertEqual(self.connector.get_property_profile(address='123 MAIN ST'), {})
+        with self.assertRaises(ValueError):
+            self.connector.get_property_profile(property_id='42', parts=['photos'])
+
+
+class TestThrottle(unittest.TestCase):
+    def test_concurrent_callers_are_spaced(self):
+        connector = AttomApiConnector(api_key='fake', min_request_interval=0.05)
+        starts = []
+        lock = threading.Lock()
+
+        def call():
+            connector._throttle_requests()
+            with lock:
+                starts.append(time.time())
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        starts.sort()
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        self.assertTrue(all(gap >= 0.04 for gap in gaps), gaps)
+
+
+if __name__ == '__main__':
+    unittest.main()
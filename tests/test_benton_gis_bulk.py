@@ -0,0 +1,95 @@
+"""
+Unit tests for bulk queries in regional.benton_gis_connector.
+"""
+import re
+import unittest
+from unittest.mock import MagicMock, patch
+from regional import benton_gis_connector as gis
+
+PARCELS = [{'OBJECTID': i, 'PARCELID': f'P{i:05d}', 'OWNER': f'OWNER {i}'} for i in range(1, 2501)]
+
+
+class FakeArcGis:
+    """In-memory ArcGIS query endpoint with a 1000-record transfer limit."""
+
+    def __init__(self):
+        self.requests = []
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        self.requests.append(data)
+        rows = PARCELS
+        if 'objectIds' in data:
+            wanted = {int(x) for x in data['objectIds'].split(',')}
+            rows = [r for r in rows if r['OBJECTID'] in wanted]
+        elif data.get('where', '1=1') != '1=1':
+            wanted = set(re.findall(r"'([^']+)'", data['where']))
+            rows = [r for r in rows if r['PARCELID'] in wanted]
+
+        response = MagicMock(status_code=200)
+        if data.get('returnIdsOnly') == 'true':
+            response.json.return_value = {'objectIds': [r['OBJECTID'] for r in rows]}
+            return response
+
+        offset = int(data.get('resultOffset', 0))
+        count = min(int(data.get('resultRecordCount', 1000)), 1000)
+        page = rows[offset:offset + count]
+        response.json.return_value = {
+            'features': [{'attributes': r} for r in page],
+            'exceededTransferLimit': offset + count < len(rows),
+        }
+        return response
+
+
+class TestBulkQueries(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeArcGis()
+
+    def test_iter_features_pages_with_result_offset(self):
+        features = list(gis.iter_features(page_size=2000, session=self.server))
+
+        self.assertEqual(len(features), 2500)
+        self.assertEqual([r['resultOffset'] for r in self.server.requests], [0, 1000, 2000])
+
+    def test_max_records_stops_early(self):
+        features = list(gis.iter_features(page_size=1000, max_records=1200, session=self.server))
+
+        self.assertEqual(len(features), 1200)
+        self.assertEqual(self.server.requests[-1]['resultRecordCount'], 200)
+
+    def test_parcels_by_ids_uses_in_lists(self):
+        ids = [f'P{i:05d}' for i in range(1, 601)] + ['P00001']
+        records = list(gis.iter_parcels_by_ids(ids, chunk_size=250, session=self.server))
+
+        self.assertEqual(len(records), 600)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertTrue(self.server.requests[0]['where'].startswith("PARCELID IN ('P00001', "))
+
+    def test_full_county_pull_by_object_id_chunks(self):
+        with patch.object(gis.requests, 'Session') as session_cls:
+            session_cls.return_value.__enter__.return_value = self.server
+            parcels = list(gis.iter_all_parcels())
+
+        self.assertEqual(len(parcels), 2500)
+        # One ID request plus one request per 1000 parcels
+        self.assertEqual(len(self.server.requests), 4)
+
+    def test_property_data_many(self):
+        with patch.object(gis, 'API_KEY', 'key'), patch.object(gis.requests, 'Session') as session_cls:
+            session_cls.return_value.__enter__.return_value = self.server
+            properties = gis.get_property_data_many(['P-00002', 'P00003', 'MISSING'])
+
+        self.assertEqual(sorted(properties), ['P00002', 'P00003'])
+        self.assertEqual(properties['P00002']['owner'], 'OWNER 2')
+        self.assertIn('property_values', properties['P00003'])
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_service_error_is_raised(self):
+        server = MagicMock()
+        server.post.return_value = MagicMock(status_code=200)
+        server.post.return_value.json.return_value = {'error': {'code': 400, 'message': 'Invalid query'}}
+        with self.assertRaises(gis.GisQueryError):
+            list(gis.iter_features(session=server))
+
+
+if __name__ == '__main__':
+    unittest.main()
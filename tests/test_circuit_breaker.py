@@ -0,0 +1,117 @@
+"""
+Unit tests for etl.circuit_breaker and its use by the data connector.
+"""
+import sys
+import types
+import unittest
+from unittest.mock import MagicMock, patch
+from etl.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN, exponential_backoff
+
+# The Realtor connector imports the Flask models; the aggregator only needs the class name
+saved_realtor = sys.modules.get('etl.realtor_api_connector')
+sys.modules['etl.realtor_api_connector'] = types.SimpleNamespace(RealtorApiConnector=None)
+try:
+    from etl.real_estate_data_connector import RealEstateDataConnector
+finally:
+    if saved_realtor is None:
+        del sys.modules['etl.realtor_api_connector']
+    else:
+        sys.modules['etl.realtor_api_connector'] = saved_realtor
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker('test', failure_threshold=3, failure_window=60,
+                                      reset_after=10, max_reset_after=40, clock=self.clock)
+
+    def test_opens_after_threshold_within_window(self):
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_failures_decay_out_of_window(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now = 61
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.recent_failures(), 1)
+
+    def test_half_open_probe_closes_on_success(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertTrue(self.breaker.allow_request())
+        # Only one probe at a time
+        self.assertFalse(self.breaker.allow_request())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_failed_probe_backs_off_exponentially(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertEqual(self.breaker.seconds_until_probe(), 20)
+        self.clock.now = 30
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_failure()
+        self.clock.now = 70
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_failure()
+        # Capped at max_reset_after
+        self.assertEqual(self.breaker.seconds_until_probe(), 40)
+
+    def test_forced_open_stays_open(self):
+        self.breaker.force_open()
+        self.clock.now = 10000
+        self.assertEqual(self.breaker.state, OPEN)
+        self.breaker.reset()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_exponential_backoff(self):
+        self.assertEqual(exponential_backoff(1, base=0.5, jitter=False), 0.5)
+        self.assertEqual(exponential_backoff(3, base=0.5, jitter=False), 2.0)
+        self.assertEqual(exponential_backoff(10, base=0.5, cap=8, jitter=False), 8)
+        self.assertLessEqual(exponential_backoff(2, base=1.0), 2.0)
+
+
+class TestConnectorProbes(unittest.TestCase):
+    def setUp(self):
+        with patch.object(RealEstateDataConnector, '_load_connectors'):
+            self.connector = RealEstateDataConnector()
+        self.source = MagicMock()
+        self.connector._register_connector('source', self.source)
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker('source', failure_threshold=1, reset_after=10, clock=self.clock)
+        self.connector.circuit_breakers['source'] = self.breaker
+        self.breaker.record_failure()
+        self.clock.now = 10
+
+    def test_unknown_method_does_not_take_the_probe(self):
+        self.assertEqual(self.connector._get_from_specific_source('bogus', '1', 'source'), {})
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+        self.source.get_property_details.return_value = {'id': '1'}
+        self.assertEqual(self.connector._get_from_specific_source('property_details', '1', 'source'), {'id': '1'})
+        self.assertEqual(self.breaker.state, CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
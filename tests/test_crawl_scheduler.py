@@ -0,0 +1,105 @@
+"""
+Unit tests for etl.scrapers.rate_limiter and etl.scrapers.crawl_scheduler.
+"""
+import threading
+import time
+import unittest
+from etl.scrapers.base_scraper import BaseScraper
+from etl.scrapers.crawl_scheduler import CrawlScheduler
+from etl.scrapers.rate_limiter import HostRateLimiter
+
+
+class FakeScraper(BaseScraper):
+    """Scraper whose lookups go through the rate limiter without network access."""
+
+    def __init__(self, limiter, delay=0.0, max_concurrent=2):
+        super().__init__('Fake', 'WA')
+        self.rate_limiter = limiter
+        self.rate_limit_delay = delay
+        self.max_concurrent_requests = max_concurrent
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def _fetch(self, url):
+        with self.rate_limiter.slot(url, self.rate_limit_delay, self.max_concurrent_requests):
+            with self.lock:
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+            time.sleep(0.02)
+            with self.lock:
+                self.in_flight -= 1
+
+    def search_properties(self, query, **kwargs):
+        self._fetch('https://county.example/search')
+        return {'query': query, 'properties': [], **kwargs}
+
+    def get_property_details(self, property_id):
+        if property_id == 'bad':
+            raise RuntimeError('boom')
+        self._fetch(f'https://county.example/parcel/{property_id}')
+        return {'property_id': property_id}
+
+    def get_property_history(self, property_id):
+        return {'error': 'not available'}
+
+
+class TestHostRateLimiter(unittest.TestCase):
+    def test_spaces_request_starts_per_host(self):
+        limiter = HostRateLimiter()
+        starts = []
+
+        def request(url):
+            with limiter.slot(url, min_interval=0.05, max_concurrent=4):
+                starts.append((url, time.monotonic()))
+
+        threads = [threading.Thread(target=request, args=('https://a.example/x',)) for _ in range(3)]
+        threads.append(threading.Thread(target=request, args=('https://b.example/x',)))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        a_starts = sorted(t for url, t in starts if 'a.example' in url)
+        self.assertEqual(len(a_starts), 3)
+        self.assertGreaterEqual(a_starts[2] - a_starts[0], 0.09)
+        self.assertEqual(limiter.stats['requests'], 4)
+
+
+class TestCrawlScheduler(unittest.TestCase):
+    def test_streams_all_results_within_host_limit(self):
+        scraper = FakeScraper(HostRateLimiter(), max_concurrent=2)
+        scheduler = CrawlScheduler(scraper, max_workers=6)
+
+        results = list(scheduler.crawl(str(i) for i in range(10)))
+
+        self.assertEqual(sorted(r.item for r in results), sorted(str(i) for i in range(10)))
+        self.assertTrue(all(r.ok for r in results))
+        self.assertLessEqual(scraper.peak, 2)
+        self.assertEqual(scheduler.stats.completed, 10)
+
+    def test_failures_are_reported_not_raised(self):
+        scraper = FakeScraper(HostRateLimiter())
+        scheduler = CrawlScheduler(scraper)
+
+        results = {r.item: r for r in scheduler.crawl(['1', 'bad'])}
+        history = list(scheduler.crawl(['1'], operation='history'))
+
+        self.assertEqual(results['bad'].error, 'boom')
+        self.assertTrue(results['1'].ok)
+        self.assertFalse(history[0].ok)
+        self.assertEqual(scheduler.stats.failed, 1)
+
+    def test_search_passes_kwargs(self):
+        scheduler = CrawlScheduler(FakeScraper(HostRateLimiter()))
+        results = list(scheduler.crawl(['Main St'], operation='search', limit=5))
+        self.assertEqual(results[0].result['limit'], 5)
+
+    def test_unknown_operation(self):
+        scheduler = CrawlScheduler(FakeScraper(HostRateLimiter()))
+        with self.assertRaises(ValueError):
+            list(scheduler.crawl(['1'], operation='delete'))
+
+
+if __name__ == '__main__':
+    unittest.main()
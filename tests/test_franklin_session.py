@@ -0,0 +1,75 @@
+"""
+Unit tests for Franklin County scraper session reuse.
+"""
+import unittest
+from unittest.mock import MagicMock
+from etl.scrapers.county.franklin_scraper import FranklinCountyScraper
+
+DISCLAIMER_HTML = (
+    '<form><input name="__RequestVerificationToken" value="tok-{n}"/>'
+    '<input name="AcceptDisclaimer"/></form>'
+)
+RESULTS_HTML = (
+    '<table class="table"><tr><th>Parcel</th></tr>'
+    '<tr><td><a href="/franklin/Property/View/1">1</a></td><td>Owner</td>'
+    '<td>1 Main St</td><td>Residential</td></tr></table>'
+)
+
+
+def make_response(url, text):
+    response = MagicMock()
+    response.url = url
+    response.text = text
+    return response
+
+
+class FakePortal:
+    """Stand-in for BaseScraper._make_request that tracks portal sessions."""
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.calls = []
+        self.handshakes = 0
+        self.valid_token = None
+
+    def __call__(self, url, method='GET', data=None, **kwargs):
+        self.calls.append((method, url))
+        if url == self.scraper.search_url and method == 'GET':
+            self.handshakes += 1
+            return make_response(url, DISCLAIMER_HTML.format(n=self.handshakes))
+        if url == self.scraper.search_url:
+            self.valid_token = data['__RequestVerificationToken']
+            return make_response(url, 'ok')
+        if data.get('__RequestVerificationToken') != self.valid_token:
+            return make_response(self.scraper.search_url, DISCLAIMER_HTML.format(n=0))
+        return make_response(url, RESULTS_HTML)
+
+
+class TestFranklinSessionReuse(unittest.TestCase):
+    def setUp(self):
+        self.scraper = FranklinCountyScraper()
+        self.portal = FakePortal(self.scraper)
+        self.scraper._make_request = self.portal
+
+    def test_repeated_searches_reuse_session(self):
+        for _ in range(3):
+            results = self.scraper.search_properties('1')
+            self.assertEqual(results['count'], 1)
+
+        self.assertEqual(self.portal.handshakes, 1)
+        # One GET + POST handshake, then one request per search
+        self.assertEqual(len(self.portal.calls), 2 + 3)
+
+    def test_rejected_session_is_refreshed_once(self):
+        self.scraper.search_properties('1')
+        self.portal.valid_token = 'expired-on-server'
+
+        results = self.scraper.search_properties('1')
+
+        self.assertEqual(results['count'], 1)
+        self.assertEqual(self.portal.handshakes, 2)
+        self.assertEqual(self.scraper.session_stats['rejections'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Unit tests for the offline geocoder.
+"""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from utils.geocoder import DEFAULT_ZIP_TABLE, OfflineGeocoder, normalize_street, split_house_number
+
+STREET_RANGES = """zip,street,from_number,to_number,from_latitude,from_longitude,to_latitude,to_longitude
+99336,W Kennewick Ave,100,198,46.2100,-119.1200,46.2100,-119.1300
+99336,W Kennewick Ave,200,298,46.2100,-119.1300,46.2100,-119.1400
+99352,George Washington Way,1000,1998,46.2700,-119.2800,46.2900,-119.2800
+"""
+
+
+class TestOfflineGeocoder(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.street_table = os.path.join(self.tmpdir, 'street_ranges.csv')
+        with open(self.street_table, 'w') as f:
+            f.write(STREET_RANGES)
+        self.geocoder = OfflineGeocoder(DEFAULT_ZIP_TABLE, self.street_table)
+
+    def test_street_normalization(self):
+        self.assertEqual(normalize_street('West Kennewick Avenue'), 'w kennewick ave')
+        self.assertEqual(split_house_number('150 W. Kennewick Ave Apt 4'), (150, 'w kennewick ave'))
+        self.assertEqual(split_house_number('PO Box 12'), (None, 'po box 12'))
+
+    def test_street_range_interpolation(self):
+        result = self.geocoder.geocode('150 West Kennewick Avenue', 'Kennewick', 'WA', '99336')
+        self.assertEqual(result.precision, 'street')
+        self.assertAlmostEqual(result.latitude, 46.21)
+        self.assertAlmostEqual(result.longitude, -119.1251, places=4)
+
+        # Zip missing: candidate zips come from the city
+        result = self.geocoder.geocode('1500 George Washington Way', 'Richland', 'WA')
+        self.assertEqual(result.precision, 'street')
+        self.assertAlmostEqual(result.latitude, 46.28, places=2)
+
+    def test_falls_back_to_zip_then_city(self):
+        result = self.geocoder.geocode('999 W Kennewick Ave', 'Kennewick', 'WA', '99336')
+        self.assertEqual((result.latitude, result.longitude, result.precision), (46.2107, -119.1660, 'zip'))
+
+        result = self.geocoder.geocode('1 Unknown Rd', 'Kennewick', 'WA')
+        self.assertEqual(result.precision, 'city')
+        self.assertAlmostEqual(result.latitude, (46.2107 + 46.1520 + 46.1830) / 3)
+
+        self.assertIsNone(self.geocoder.geocode('1 Main St', 'Springfield', 'IL', '62701'))
+
+    def test_results_are_cached(self):
+        self.geocoder.geocode('150 W Kennewick Ave', 'Kennewick', 'WA', '99336')
+        self.geocoder.geocode('150 w kennewick ave', 'KENNEWICK', 'wa', '99336-1234')
+        status = self.geocoder.status()
+        self.assertEqual((status['hits'], status['misses'], status['cached']), (1, 1, 1))
+
+        small = OfflineGeocoder(DEFAULT_ZIP_TABLE, None, cache_size=2)
+        for zip_code in ('99301', '99336', '99352'):
+            small.geocode(zip_code=zip_code)
+        self.assertEqual(small.status()['cached'], 2)
+
+    def test_loads_census_gazetteer_format(self):
+        gazetteer = os.path.join(self.tmpdir, 'zcta.txt')
+        with open(gazetteer, 'w') as f:
+            f.write("GEOID\tALAND\tAWATER\tALAND_SQMI\tAWATER_SQMI\tINTPTLAT\tINTPTLONG\n")
+            f.write("98101\t1\t0\t0\t0\t47.610670\t-122.334442\n")
+        geocoder = OfflineGeocoder(gazetteer, None)
+        result = geocoder.geocode('1 Pike St', 'Seattle', 'WA', '98101')
+        self.assertEqual((result.latitude, result.precision), (47.61067, 'zip'))
+
+    def test_batch_throughput(self):
+        addresses = [
+            {'street': f"{100 + i % 198} W Kennewick Ave", 'city': 'Kennewick', 'state': 'WA', 'zip_code': '99336'}
+            if i % 2 else {'street': f"{i} Main St", 'city': 'Pasco', 'state': 'WA', 'zip_code': '99301'}
+            for i in range(5000)
+        ]
+        start = time.perf_counter()
+        results = self.geocoder.geocode_batch(addresses)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(results), 5000)
+        self.assertTrue(all(result is not None for result in results))
+        # Thousands of addresses per second, with plenty of headroom for slow CI machines
+        self.assertLess(elapsed, 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
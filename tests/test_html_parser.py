@@ -0,0 +1,87 @@
+"""
+Unit tests for etl.scrapers.html_parser.
+"""
+import os
+import re
+import unittest
+from etl.scrapers import parse_benchmark
+from etl.scrapers.county.franklin_scraper import FranklinCountyScraper
+from etl.scrapers.html_parser import HAS_LXML, find_input_value, parse_html
+
+# The Walla Walla scraper imports trafilatura, which needs lxml's html-clean extra
+try:
+    from etl.scrapers.county.walla_walla_scraper import WallaWallaCountyScraper
+    HAS_WALLA_WALLA = True
+except ImportError:
+    HAS_WALLA_WALLA = False
+
+PAGE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'county_pages')
+
+
+def read_page(county, name):
+    with open(os.path.join(PAGE_DIR, county, name), encoding='utf-8') as f:
+        return f.read()
+
+
+@unittest.skipUnless(HAS_LXML, "lxml not installed")
+class TestBackendEquivalence(unittest.TestCase):
+    """The lxml backend must extract exactly what BeautifulSoup does."""
+
+    def assertSameResult(self, workload, scraper, markup):
+        self.assertEqual(workload(scraper, markup, 'lxml'), workload(scraper, markup, 'html.parser'))
+
+    def test_franklin_pages(self):
+        scraper = FranklinCountyScraper()
+        details = read_page('franklin', 'property_details.html')
+        self.assertSameResult(parse_benchmark._franklin_details, scraper, details)
+        self.assertSameResult(parse_benchmark._franklin_search_results, scraper,
+                              read_page('franklin', 'search_results.html'))
+
+        sections, taxes, sales = parse_benchmark._franklin_details(scraper, details, 'lxml')
+        self.assertEqual(sections[0]['Name'], 'SMITH JOHN & MARY')
+        self.assertEqual(sections[4]['Year Built'], 2006)
+        self.assertEqual(len(taxes), 25)
+
+        # The benchmark times the scraper's own search result extraction
+        results = parse_benchmark._franklin_search_results(scraper, read_page('franklin', 'search_results.html'), 'lxml')
+        self.assertEqual(results, scraper._extract_search_results(
+            parse_html(read_page('franklin', 'search_results.html'))))
+        self.assertTrue(results[0]['url'].startswith(scraper.base_url))
+
+    @unittest.skipUnless(HAS_WALLA_WALLA, "Walla Walla scraper dependencies not installed")
+    def test_walla_walla_search_results(self):
+        self.assertSameResult(parse_benchmark._walla_walla_search_results, WallaWallaCountyScraper(),
+                              read_page('walla_walla', 'search_results.html'))
+
+    def test_find_semantics(self):
+        markup = ('<div class="a b"><h4>Tax History</h4><p><span id="x">1</span></p></div>'
+                  '<table><tr><td>2</td></tr></table><input name="t" value="v"/><input name="e"/>')
+        for backend in ('lxml', 'html.parser'):
+            soup = parse_html(markup, backend)
+            heading = soup.find('h4', string=re.compile('tax history', re.IGNORECASE))
+            self.assertEqual(heading.text, 'Tax History')
+            self.assertEqual(heading.find_next(['table', 'dl']).name, 'table')
+            self.assertEqual(soup.find('div', {'class': 'b'}).find('span', {'id': 'x'}).text, '1')
+            self.assertIsNone(soup.find('h4', string='Tax'))
+            self.assertEqual(len(soup.find_all(['td', 'span'])), 2)
+            self.assertEqual(find_input_value(markup, 't', backend), 'v')
+            self.assertEqual(find_input_value(markup, 'e', backend), '')
+            self.assertIsNone(find_input_value(markup, 'missing', backend))
+
+    def test_string_matches_beautifulsoup(self):
+        headings = ['<h4><b>Tax History</b></h4>', '<h4><b><i>Tax History</i></b></h4>',
+                    '<h4>Tax History<!-- c --></h4>', '<h4><!-- Tax --></h4>', '<h4></h4>',
+                    '<h4><b>Tax History</b> </h4>', '<h4>Tax <b>History</b></h4>', '<h4><b></b></h4>']
+        for markup in headings:
+            results = []
+            for backend in ('lxml', 'html.parser'):
+                soup = parse_html(markup, backend)
+                results.append((soup.find('h4').string,
+                                soup.find('h4', string=re.compile('Tax')) is not None,
+                                soup.find('h4', string='Tax History') is not None,
+                                soup.find('h4', string=re.compile('^$')) is not None))
+            self.assertEqual(results[0], results[1], markup)
+
+
+if __name__ == '__main__':
+    unittest.main()
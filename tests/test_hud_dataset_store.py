@@ -0,0 +1,122 @@
+"""
+Unit tests for the local HUD dataset store and its use by the HUD connector.
+"""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+from etl.hud_api_connector import HudApiConnector
+from etl.hud_dataset_store import DATASET_MAX_AGE, HudDatasetStore, geo_key, period_key
+from etl.hud_refresh_etl import HudDatasetRefreshETL
+
+FMR = {'zip_code': '99336', 'basicdata': {'Two-Bedroom': 1200}}
+
+
+class TestHudDatasetStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.path = os.path.join(self.tmpdir, 'hud.sqlite')
+
+    def test_keys_are_normalized(self):
+        self.assertEqual(geo_key('county', ' benton  ', 'wa'), 'WA:BENTON')
+        self.assertEqual(geo_key('zip', '99336'), '99336')
+        self.assertEqual(period_key(), 'latest')
+        self.assertEqual(period_key(2024, 3), '2024Q3')
+        with self.assertRaises(ValueError):
+            geo_key('county', 'Benton')
+
+    def test_entries_persist_across_reopen(self):
+        store = HudDatasetStore(self.path)
+        store.put('fmr', 'zip', '99336', FMR)
+        store.close()
+
+        reopened = HudDatasetStore(self.path)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.get('fmr', 'zip', '99336'), FMR)
+        self.assertIsNone(reopened.get('fmr', 'zip', '99301'))
+        self.assertEqual(reopened.status()['entries'], {'fmr': 1})
+
+    def test_expired_entries_are_only_returned_when_stale_allowed(self):
+        store = HudDatasetStore(':memory:')
+        store.put('usps', 'zip', '99336', {'vacant': 10}, period='2024Q1')
+        with patch('etl.hud_dataset_store.time.time', return_value=time.time() + DATASET_MAX_AGE['usps'] + 1):
+            self.assertIsNone(store.get('usps', 'zip', '99336', '2024Q1'))
+            self.assertEqual(store.get('usps', 'zip', '99336', '2024Q1', allow_stale=True), {'vacant': 10})
+        self.assertEqual(store.stats['stale'], 1)
+
+
+class TestHudConnectorStore(unittest.TestCase):
+    def setUp(self):
+        self.store = HudDatasetStore(':memory:')
+        self.connector = HudApiConnector(api_key='fake', min_request_interval=0, dataset_store=self.store)
+
+    def test_hit_skips_the_api(self):
+        self.store.put('fmr', 'zip', '99336', FMR)
+        with patch.object(self.connector, '_make_request') as make_request:
+            self.assertEqual(self.connector.get_fair_market_rents(zip_code='99336'), FMR)
+        make_request.assert_not_called()
+
+    def test_miss_fills_the_store(self):
+        with patch.object(self.connector, '_make_request', return_value={'data': FMR}) as make_request:
+            self.assertEqual(self.connector.get_fair_market_rents(zip_code='99336'), FMR)
+            self.assertEqual(self.connector.get_fair_market_rents(zip_code='99336'), FMR)
+        self.assertEqual(make_request.call_count, 1)
+        self.assertEqual(self.store.get('fmr', 'zip', '99336'), FMR)
+
+    def test_stale_entry_is_served_when_the_api_fails(self):
+        self.store.put('chas', 'county', geo_key('county', 'Benton', 'WA'), {'households': 5})
+        later = time.time() + DATASET_MAX_AGE['chas'] + 1
+        with patch('etl.hud_dataset_store.time.time', return_value=later), \
+                patch.object(self.connector, '_make_request', return_value={'error': 'API error: 503'}):
+            self.assertEqual(self.connector.get_chas_data('Benton', 'WA'), {'households': 5})
+
+    def test_disabled_store_always_calls_the_api(self):
+        connector = HudApiConnector(api_key='fake', min_request_interval=0, use_dataset_store=False)
+        with patch.object(connector, '_make_request', return_value={'data': FMR}) as make_request:
+            connector.get_fair_market_rents(zip_code='99336')
+            connector.get_fair_market_rents(zip_code='99336')
+        self.assertEqual(make_request.call_count, 2)
+
+
+class TestHudDatasetRefreshETL(unittest.TestCase):
+    def test_refresh_splits_state_data_by_county_and_metro(self):
+        store = HudDatasetStore(':memory:')
+        connector = HudApiConnector(api_key='fake', min_request_interval=0, use_dataset_store=False)
+        state_fmr = {
+            'counties': [{'county_name': 'Benton County', 'Two-Bedroom': 1200}],
+            'metroareas': [{'code': 'METRO28420M28420', 'Two-Bedroom': 1210}],
+        }
+
+        def make_request(endpoint, params):
+            if endpoint == connector.endpoints['fmr'] and 'state' in params:
+                return {'data': state_fmr}
+            return {'error': 'API error: 404'}
+
+        etl = HudDatasetRefreshETL({'states': ['WA'], 'connector': connector, 'store': store})
+        with patch.object(connector, '_make_request', side_effect=make_request):
+            result = etl.run()
+
+        self.assertEqual(result['records_processed'], 3)
+        self.assertEqual(store.get('fmr', 'state', 'WA'), state_fmr)
+        self.assertEqual(store.get('fmr', 'county', 'WA:BENTON')['Two-Bedroom'], 1200)
+        self.assertEqual(store.get('fmr', 'metro', 'METRO28420M28420')['Two-Bedroom'], 1210)
+
+        # Metro lookups are answered from the refreshed entries
+        connector = HudApiConnector(api_key='fake', min_request_interval=0, dataset_store=store)
+        with patch.object(connector, '_make_request') as make_request:
+            self.assertEqual(connector.get_fair_market_rents(metro='METRO28420M28420')['Two-Bedroom'], 1210)
+        make_request.assert_not_called()
+
+    def test_metro_miss_requests_the_metro_entity(self):
+        connector = HudApiConnector(api_key='fake', min_request_interval=0, dataset_store=HudDatasetStore(':memory:'))
+        with patch.object(connector, '_make_request', return_value={'data': {'median_income': 90000}}) as make_request:
+            self.assertEqual(connector.get_income_limits(metro='METRO28420M28420'), {'median_income': 90000})
+        make_request.assert_called_once_with('/il/data/METRO28420M28420', {})
+        self.assertEqual(connector.dataset_store.get('il', 'metro', 'METRO28420M28420'), {'median_income': 90000})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Unit tests for etl.latency_histogram and the data connector's latency metrics.
+"""
+import sys
+import types
+import unittest
+from unittest.mock import MagicMock, patch
+from etl.latency_histogram import LatencyHistogram
+
+# The Realtor connector imports the Flask models; the aggregator only needs the class name
+saved_realtor = sys.modules.get('etl.realtor_api_connector')
+sys.modules['etl.realtor_api_connector'] = types.SimpleNamespace(RealtorApiConnector=None)
+try:
+    from etl.real_estate_data_connector import RealEstateDataConnector
+finally:
+    if saved_realtor is None:
+        del sys.modules['etl.realtor_api_connector']
+    else:
+        sys.modules['etl.realtor_api_connector'] = saved_realtor
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.histogram = LatencyHistogram(slice_seconds=10, max_window=3600, clock=self.clock)
+
+    def test_percentiles_and_outcomes(self):
+        for _ in range(90):
+            self.histogram.record(0.040, 'success')
+        for _ in range(9):
+            self.histogram.record(0.200, 'empty')
+        self.histogram.record(2.0, 'error')
+
+        snap = self.histogram.snapshot('1m')
+        self.assertEqual(snap['count'], 100)
+        self.assertEqual((snap['success'], snap['empty'], snap['error']), (90, 9, 1))
+        self.assertTrue(25 <= snap['p50_ms'] <= 50)
+        self.assertTrue(150 <= snap['p95_ms'] <= 250)
+        self.assertTrue(snap['p99_ms'] <= 250)
+        self.assertAlmostEqual(snap['mean_ms'], 74.0, places=1)
+
+    def test_sliding_window_expiry(self):
+        self.histogram.record(0.01)
+        self.clock.now += 120
+        self.histogram.record(0.5)
+        self.assertEqual(self.histogram.snapshot('1m')['count'], 1)
+        self.assertEqual(self.histogram.snapshot('5m')['count'], 2)
+        self.clock.now += 4000
+        self.assertEqual(self.histogram.snapshot('1h')['count'], 0)
+        self.assertIsNone(self.histogram.snapshot('1h')['p50_ms'])
+        self.assertEqual(self.histogram.totals['success'], 2)
+
+
+class TestSourceMetrics(unittest.TestCase):
+    def test_latency_snapshots_are_computed_on_read(self):
+        with patch.object(RealEstateDataConnector, '_load_connectors'):
+            connector = RealEstateDataConnector()
+        connector._register_connector('source', MagicMock())
+        with patch.object(LatencyHistogram, 'snapshot', autospec=True) as snapshot:
+            for elapsed in (0.1, 0.3):
+                connector._update_metrics('source', True, elapsed)
+        self.assertEqual(snapshot.call_count, 0)
+
+        (status,) = connector.get_sources_status()
+        self.assertEqual(status['request_count'], 2)
+        self.assertAlmostEqual(status['avg_response_time'], 0.2, delta=0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,248 @@
+"""
+Unit tests for utils.location_data against a SQLite-backed session.
+
+The Flask app and models are replaced with stand-ins holding the same
+table and column names, so the extraction code runs real queries.
+"""
+import sys
+import types
+import unittest
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+from sqlalchemy import Column, Date, DateTime, Float, Integer, String, Text, create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, declarative_base, scoped_session, sessionmaker
+import regional.assessment_roll  # noqa: F401 - patched per test
+
+Base = declarative_base()
+
+
+class NarrprReports(Base):
+    __tablename__ = 'narrpr_reports'
+    id = Column(Integer, primary_key=True)
+    title = Column(String(255))
+    address = Column(String(255))
+    price = Column(String(50))
+
+
+class PropertyLocation(Base):
+    __tablename__ = 'property_location'
+    id = Column(Integer, primary_key=True)
+    address = Column(String(255), nullable=False)
+    street = Column(String(100))
+    city = Column(String(100))
+    state = Column(String(50))
+    zip_code = Column(String(20))
+    latitude = Column(Float)
+    longitude = Column(Float)
+    price = Column(String(50))
+    price_value = Column(Integer)
+    property_type = Column(String(50))
+    bedrooms = Column(Integer)
+    bathrooms = Column(Float)
+    square_feet = Column(Integer)
+    year_built = Column(Integer)
+    owner_name = Column(String(255))
+    report_id = Column(Integer)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+
+
+class PriceTrend(Base):
+    __tablename__ = 'price_trend'
+    id = Column(Integer, primary_key=True)
+    location_type = Column(String(20))
+    location_value = Column(String(100))
+    city = Column(String(100))
+    state = Column(String(20))
+    zip_code = Column(String(20))
+    date = Column(Date, nullable=False)
+    median_price = Column(Integer)
+    avg_price = Column(Integer)
+    price_change = Column(Float)
+    properties_sold = Column(Integer)
+    total_listings = Column(Integer)
+    new_listings = Column(Integer)
+    days_on_market = Column(Float)
+    price_per_sqft = Column(Integer)
+    created_at = Column(DateTime)
+
+
+class ActivityLog(Base):
+    __tablename__ = 'activity_log'
+    id = Column(Integer, primary_key=True)
+    action = Column(String(50))
+    details = Column(Text)
+
+
+engine = create_engine('sqlite://')
+session = scoped_session(sessionmaker(bind=engine))
+
+fake_modules = {
+    'app': types.SimpleNamespace(db=types.SimpleNamespace(session=session, Date=Date)),
+    'models': types.SimpleNamespace(NarrprReports=NarrprReports, PropertyLocation=PropertyLocation,
+                                    PriceTrend=PriceTrend, ActivityLog=ActivityLog),
+}
+# Swap in only the stand-ins, so modules imported along the way stay loaded
+saved_modules = {name: sys.modules.get(name) for name in fake_modules}
+sys.modules.update(fake_modules)
+try:
+    from utils import location_data
+finally:
+    for name, module in saved_modules.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+
+
+class FakeRollStore:
+    def __init__(self, owners):
+        self.owners = owners
+        self.lookups = []
+
+    def owners_by_address(self, addresses):
+        addresses = list(addresses)
+        self.lookups.append(addresses)
+        return {a: self.owners[a] for a in addresses if a in self.owners}
+
+
+class LocationDataTestCase(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.create_all(engine)
+        self.addCleanup(Base.metadata.drop_all, engine)
+        self.addCleanup(session.remove)
+        # Rollups are refreshed with PostgreSQL SQL; not under test here
+        rollups = types.SimpleNamespace(refresh_price_rollups=MagicMock())
+        modules = patch.dict(sys.modules, {'utils.price_rollups': rollups})
+        modules.start()
+        self.addCleanup(modules.stop)
+        self.roll = FakeRollStore({})
+        store = patch('regional.assessment_roll.get_assessment_roll_store', return_value=self.roll)
+        store.start()
+        self.addCleanup(store.stop)
+
+    def add_reports(self, *addresses):
+        for address in addresses:
+            session.add(NarrprReports(title='Single Family Home', address=address, price='$400,000'))
+        session.commit()
+
+
+class TestLocationExtraction(LocationDataTestCase):
+    def test_chunks_skip_processed_reports_and_missing_addresses(self):
+        self.add_reports('1 A St, Kennewick, WA 99336', '2 B St, Pasco, WA 99301', None,
+                         '4 D St, Richland, WA 99352', '5 E St, Kennewick, WA 99336')
+        session.add(PropertyLocation(address='2 B St, Pasco, WA 99301', report_id=2))
+        session.commit()
+
+        stats = location_data.process_reports_for_location_data(chunk_size=2)
+
+        # Report 2 already has a location and is never read; 3 has no address
+        self.assertEqual(stats, {'reports_scanned': 4, 'locations_created': 3, 'skipped': 1,
+                                 'errors': 0, 'chunks': 2})
+        self.assertEqual(sorted(r for (r,) in session.query(PropertyLocation.report_id)), [1, 2, 4, 5])
+        self.assertEqual(session.query(ActivityLog).count(), 2)
+
+        # A rerun only reads the report without an address
+        stats = location_data.process_reports_for_location_data(chunk_size=2)
+        self.assertEqual((stats['reports_scanned'], stats['locations_created']), (1, 0))
+
+    def test_failed_chunk_is_rolled_back_and_retried_next_run(self):
+        self.add_reports('1 A St, Kennewick, WA 99336', '2 B St, Pasco, WA 99301', '3 C St, Richland, WA 99352')
+        bulk_insert = Session.bulk_insert_mappings
+        calls = []
+
+        def fail_first_chunk(self, mapper, mappings, *args, **kwargs):
+            calls.append([row['report_id'] for row in mappings])
+            if len(calls) == 1:
+                bulk_insert(self, mapper, mappings, *args, **kwargs)
+                raise OperationalError('INSERT', {}, Exception('disk full'))
+            return bulk_insert(self, mapper, mappings, *args, **kwargs)
+
+        with patch.object(Session, 'bulk_insert_mappings', fail_first_chunk):
+            stats = location_data.process_reports_for_location_data(chunk_size=2)
+
+        self.assertEqual(calls, [[1, 2], [3]])
+        self.assertEqual((stats['locations_created'], stats['errors'], stats['chunks']), (1, 2, 1))
+        # The failed chunk left nothing behind
+        self.assertEqual([r for (r,) in session.query(PropertyLocation.report_id)], [3])
+        self.assertEqual(session.query(ActivityLog).count(), 1)
+
+        stats = location_data.process_reports_for_location_data(chunk_size=2)
+        self.assertEqual((stats['reports_scanned'], stats['locations_created']), (2, 2))
+
+
+class FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 3, 15, 12, 0)
+
+
+class TestPriceTrendUpsert(unittest.TestCase):
+    def compile(self, months):
+        with patch.object(location_data, 'datetime', FixedDatetime):
+            compiled = location_data.price_trend_upsert(months).compile(dialect=postgresql.dialect())
+        return ' '.join(str(compiled).split()), compiled.params
+
+    def test_compiles_for_postgresql(self):
+        sql, _ = self.compile(12)
+        self.assertIn('percentile_cont(%(percentile_cont_1)s) WITHIN GROUP '
+                      '(ORDER BY property_location.price_value)', sql)
+        self.assertIn('lag(anon_2.median_price) OVER (PARTITION BY anon_2.city, anon_2.state '
+                      'ORDER BY anon_2.date)', sql)
+        self.assertIn('ON CONFLICT (location_type, location_value, date) DO UPDATE SET', sql)
+        self.assertIn('price_change = excluded.price_change', sql)
+        self.assertNotIn('location_type = excluded', sql)
+
+    def test_lag_reads_one_month_before_the_window(self):
+        sql, params = self.compile(12)
+        # Months April 2024 - March 2025 are written; March 2024 only feeds lag()
+        self.assertIn('WHERE property_location.created_at >= %(created_at_1)s', sql)
+        self.assertEqual(params['created_at_1'], datetime(2024, 3, 1))
+        self.assertIn('WHERE anon_1.date >= %(date_1)s::DATE ON CONFLICT', sql)
+        self.assertEqual(params['date_1'], date(2024, 4, 1))
+
+        _, params = self.compile(1)
+        self.assertEqual((params['created_at_1'], params['date_1']), (datetime(2025, 2, 1), date(2025, 3, 1)))
+
+    def test_change_is_only_taken_from_the_previous_calendar_month(self):
+        sql, _ = self.compile(12)
+        # A city that skipped a month gets no change rather than one against an older month
+        self.assertIn('coalesce(CASE WHEN (lag(anon_2.date) OVER (PARTITION BY anon_2.city, anon_2.state '
+                      "ORDER BY anon_2.date) = CAST(anon_2.date - interval '1 month' AS DATE)) THEN", sql)
+        self.assertIn('CAST(NULL AS INTEGER) AS properties_sold', sql)
+        self.assertIn('CAST(NULL AS FLOAT) AS days_on_market', sql)
+        self.assertIn('days_on_market = excluded.days_on_market', sql)
+
+
+class TestOwnerNames(LocationDataTestCase):
+    def test_extraction_sets_owner_from_assessment_roll(self):
+        self.roll.owners = {'123 main st': 'SMITH JOHN'}
+        self.add_reports('123 Main St., Kennewick, WA 99336', '9 Elm St, Pasco, WA 99301')
+
+        stats = location_data.process_reports_for_location_data()
+
+        self.assertEqual(stats['locations_created'], 2)
+        owners = dict(session.query(PropertyLocation.street, PropertyLocation.owner_name))
+        self.assertEqual(owners, {'123 Main St.': 'SMITH JOHN', '9 Elm St': None})
+        # One lookup for the whole chunk
+        self.assertEqual(len(self.roll.lookups), 1)
+
+    def test_backfill_fills_only_missing_owners(self):
+        session.add_all([
+            PropertyLocation(address='123 Main St, Kennewick, WA', street='123 Main St'),
+            PropertyLocation(address='9 Elm St, Pasco, WA', street='9 Elm St', owner_name='KEEP ME'),
+            PropertyLocation(address='500 Oak Rd, Richland, WA', street='500 Oak Rd'),
+        ])
+        session.commit()
+        self.roll.owners = {'123 main st': 'SMITH JOHN', '9 elm st': 'OTHER'}
+
+        self.assertEqual(location_data.backfill_owner_names(chunk_size=2), 1)
+
+        owners = dict(session.query(PropertyLocation.street, PropertyLocation.owner_name))
+        self.assertEqual(owners, {'123 Main St': 'SMITH JOHN', '9 Elm St': 'KEEP ME', '500 Oak Rd': None})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Unit tests for regional.pacs_export.
+"""
+import asyncio
+import csv
+import io
+import json
+import unittest
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from decimal import Decimal
+from starlette.requests import ClientDisconnect
+from regional.pacs_export import (
+    EXPORT_COLUMNS, ExportResponse, build_export_query, encode_csv, encode_ndjson, iter_export_batches
+)
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.executed = None
+        self.fetches = 0
+
+    def execute(self, sql, params):
+        self.executed = (sql, params)
+
+    def fetchmany(self, size):
+        self.fetches += 1
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+
+def make_row(parcel_id):
+    row = [None] * len(EXPORT_COLUMNS)
+    row[0] = parcel_id
+    row[2] = f'{parcel_id} MAIN ST, KENNEWICK'
+    row[9] = Decimal('250000.00')
+    row[15] = datetime(2024, 5, 1)
+    return tuple(row)
+
+
+class TestExportQuery(unittest.TestCase):
+    def test_full_export_is_ordered_by_parcel(self):
+        sql, params = build_export_query()
+        self.assertTrue(sql.startswith('SELECT ParcelId, ParcelNumber'))
+        self.assertTrue(sql.endswith('FROM Property ORDER BY ParcelId'))
+        self.assertEqual(params, [])
+
+    def test_resume_changed_since_and_limit(self):
+        since = datetime(2025, 1, 1)
+        sql, params = build_export_query(after='100', changed_since=since,
+                                         changed_column='UpdateDate', limit=500)
+        self.assertTrue(sql.startswith('SELECT TOP (?) '))
+        self.assertIn('WHERE ParcelId > ? AND [UpdateDate] >= ? ORDER BY ParcelId', sql)
+        self.assertEqual(params, [500, '100', since])
+
+    def test_changed_since_requires_a_column(self):
+        with self.assertRaises(ValueError):
+            build_export_query(changed_since=datetime(2025, 1, 1))
+        with self.assertRaises(ValueError):
+            build_export_query(changed_since=datetime(2025, 1, 1), changed_column='x; DROP TABLE y')
+
+
+class TestExportEncoding(unittest.TestCase):
+    def test_rows_are_fetched_in_batches(self):
+        cursor = FakeCursor(make_row(str(i)) for i in range(5))
+        batches = list(iter_export_batches(cursor, 'SQL', [], fetch_size=2))
+        self.assertEqual([len(b) for b in batches], [2, 2, 1])
+        self.assertEqual(cursor.fetches, 4)
+
+    def test_ndjson(self):
+        cursor = FakeCursor([make_row('1'), make_row('2')])
+        output = ''.join(encode_ndjson(iter_export_batches(cursor, 'SQL', [], fetch_size=1)))
+        lines = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual([line['ParcelId'] for line in lines], ['1', '2'])
+        self.assertEqual(lines[0]['MarketValue'], 250000.0)
+        self.assertEqual(lines[0]['LastSaleDate'], '2024-05-01T00:00:00')
+
+    def test_csv_has_one_header(self):
+        cursor = FakeCursor([make_row('1'), make_row('2'), make_row('3')])
+        chunks = list(encode_csv(iter_export_batches(cursor, 'SQL', [], fetch_size=2)))
+        self.assertEqual(len(chunks), 2)
+        rows = list(csv.reader(io.StringIO(''.join(chunks))))
+        self.assertEqual(rows[0], EXPORT_COLUMNS)
+        self.assertEqual([r[0] for r in rows[1:]], ['1', '2', '3'])
+        self.assertEqual(rows[1][2], '1 MAIN ST, KENNEWICK')
+
+    def test_empty_csv_export_has_header(self):
+        output = ''.join(encode_csv(iter_export_batches(FakeCursor([]), 'SQL', [])))
+        self.assertEqual(output.strip(), ','.join(EXPORT_COLUMNS))
+
+
+class TestExportResponse(unittest.TestCase):
+    """Export slot and connection release across the ways a response can end."""
+
+    def setUp(self):
+        self.events = []
+
+        @contextmanager
+        def connection():
+            try:
+                yield 'conn'
+            except BaseException:
+                self.events.append('discarded')
+                raise
+            self.events.append('returned')
+
+        self.resources = ExitStack()
+        self.resources.callback(self.events.append, 'slot released')
+        self.resources.enter_context(connection())
+
+    def respond(self, fail_on=None):
+        def chunks():
+            self.events.append('started')
+            yield 'a'
+            yield 'b'
+
+        sent = []
+
+        async def send(message):
+            if message['type'] == fail_on and not any(m['type'] == fail_on for m in sent):
+                raise OSError('client went away')
+            sent.append(message)
+
+        async def receive():
+            return {'type': 'http.disconnect'}
+
+        scope = {'type': 'http', 'asgi': {'spec_version': '2.4'}}
+        response = ExportResponse(chunks, self.resources, media_type='application/x-ndjson')
+        try:
+            asyncio.run(response(scope, receive, send))
+        except (ClientDisconnect, OSError):
+            pass
+        released = list(self.events)
+        self.resources.close()
+        self.assertEqual(self.events, released, 'released twice')
+        return sent
+
+    def test_completed_stream_returns_connection(self):
+        sent = self.respond()
+        self.assertEqual(b''.join(m.get('body', b'') for m in sent), b'ab')
+        self.assertEqual(self.events, ['started', 'returned', 'slot released'])
+
+    def test_disconnect_before_body_releases(self):
+        self.respond(fail_on='http.response.start')
+        self.assertEqual(self.events, ['returned', 'slot released'])
+
+    def test_interrupted_stream_discards_connection(self):
+        self.respond(fail_on='http.response.body')
+        self.assertEqual(self.events, ['started', 'discarded', 'slot released'])
+
+
+if __name__ == '__main__':
+    unittest.main()
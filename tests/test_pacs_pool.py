@@ -0,0 +1,155 @@
+"""
+Unit tests for regional.pacs_pool and the batched PACS detail query.
+"""
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from regional.pacs_pool import ConnectionPool, PoolError, PoolTimeoutError
+
+try:
+    from regional.benton_pacs_connector import fetch_property_detail
+    HAS_PYODBC = True
+except ImportError:
+    HAS_PYODBC = False
+
+
+class FakeConnection:
+    def __init__(self, healthy=True):
+        self.healthy = healthy
+        self.closed = False
+
+    def cursor(self):
+        cursor = MagicMock()
+        if not self.healthy:
+            cursor.execute.side_effect = RuntimeError('connection reset')
+        return cursor
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool(unittest.TestCase):
+    def test_reuses_connections(self):
+        pool = ConnectionPool(FakeConnection, max_size=2)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(pool.stats['created'], 1)
+        self.assertEqual(pool.status()['idle'], 1)
+
+    def test_counters_are_exact_under_contention(self):
+        pool = ConnectionPool(FakeConnection, max_size=4, timeout=5)
+
+        def worker():
+            for _ in range(200):
+                with pool.connection():
+                    pass
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        status = pool.status()
+        self.assertEqual(status['created'] + status['reused'], 1600)
+        self.assertLessEqual(status['created'], 4)
+
+    def test_bounded_size_and_timeout(self):
+        pool = ConnectionPool(FakeConnection, max_size=1, timeout=0.05)
+        with pool.connection():
+            with self.assertRaises(PoolTimeoutError):
+                with pool.connection():
+                    pass
+
+    def test_waiter_gets_released_connection(self):
+        pool = ConnectionPool(FakeConnection, max_size=1, timeout=2)
+        got = []
+
+        def worker():
+            with pool.connection() as conn:
+                got.append(conn)
+
+        with pool.connection() as held:
+            thread = threading.Thread(target=worker)
+            thread.start()
+            time.sleep(0.05)
+        thread.join()
+
+        self.assertEqual(got, [held])
+        self.assertGreaterEqual(pool.stats['waits'], 1)
+
+    def test_error_discards_connection(self):
+        pool = ConnectionPool(FakeConnection, max_size=1)
+        with self.assertRaises(ValueError):
+            with pool.connection() as conn:
+                raise ValueError('query failed')
+
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.status()['open'], 0)
+
+    def test_unhealthy_idle_connection_is_replaced(self):
+        connections = [FakeConnection(healthy=False), FakeConnection()]
+        pool = ConnectionPool(lambda: connections.pop(0), health_check_after=0)
+        with pool.connection() as stale:
+            pass
+        with pool.connection() as fresh:
+            pass
+
+        self.assertIsNot(stale, fresh)
+        self.assertTrue(stale.closed)
+        self.assertEqual(pool.stats['failed_health_checks'], 1)
+
+    def test_close_all_retires_connections_in_use(self):
+        pool = ConnectionPool(FakeConnection, max_size=2)
+        with pool.connection() as in_use:
+            with pool.connection() as idle:
+                pass
+            pool.close_all()
+            self.assertTrue(idle.closed)
+            self.assertFalse(in_use.closed)
+
+        self.assertTrue(in_use.closed)
+        self.assertEqual(pool.status()['open'], 0)
+        with pool.connection() as fresh:
+            pass
+        self.assertIsNot(fresh, in_use)
+
+    def test_connect_failure(self):
+        pool = ConnectionPool(lambda: None, max_size=1)
+        with self.assertRaises(PoolError):
+            with pool.connection():
+                pass
+        self.assertEqual(pool.status()['open'], 0)
+
+
+@unittest.skipUnless(HAS_PYODBC, "pyodbc/ODBC driver manager not available")
+class TestFetchPropertyDetail(unittest.TestCase):
+    def test_single_round_trip(self):
+        record = ('123', '1-23', '1 Main St', 'OWNER', 'LOT 1', 'Residential', 'TA', 1, 2, 3, 3, 0,
+                  'L', 'Taxable', 0.2, '2020-01-01', 250000, 2024, 2024)
+        building = (2001, 2005, 1800, 'Good', 'Avg', 3, 2, 'Slab', 'Vinyl', 'Comp', 'FA', 1, 0, 'Att', 400, 1)
+        cursor = MagicMock()
+        cursor.fetchone.side_effect = [record, building, None]
+        cursor.fetchall.return_value = [(2024, 1, 2, 3, 0.05), (2023, 1, 2, 3, 0.0)]
+
+        detail = fetch_property_detail(cursor, '123')
+
+        self.assertEqual(cursor.execute.call_count, 1)
+        self.assertEqual(detail['PropertyRecord']['OwnerName'], 'OWNER')
+        self.assertEqual(detail['BuildingData']['YearBuilt'], 2001)
+        self.assertEqual(detail['LandData']['LandType'], '')
+        self.assertEqual([h['Year'] for h in detail['AssessmentHistory']], [2024, 2023])
+
+    def test_not_found(self):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = None
+        self.assertIsNone(fetch_property_detail(cursor, 'missing'))
+
+
+if __name__ == '__main__':
+    unittest.main()
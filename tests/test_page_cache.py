@@ -0,0 +1,135 @@
+"""
+Unit tests for etl.scrapers.page_cache and scraper conditional GETs.
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import requests
+from etl.scrapers.base_scraper import BaseScraper
+from etl.scrapers.page_cache import DEFAULT_CACHE_PATH, PageCache
+from etl.scrapers.rate_limiter import HostRateLimiter
+
+
+def make_response(status, body=b'', headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    response.encoding = 'utf-8'
+    response.url = 'https://county.example/parcel/1'
+    return response
+
+
+class PageScraper(BaseScraper):
+    def __init__(self, cache):
+        super().__init__('Test', 'WA')
+        self.rate_limit_delay = 0
+        self.rate_limiter = HostRateLimiter()
+        self.page_cache = cache
+        self.parse_calls = 0
+
+    def parse(self, html):
+        self.parse_calls += 1
+        return {'length': len(html)}
+
+    def parse_words(self, html):
+        self.parse_calls += 1
+        return {'words': len(html.split())}
+
+    def fetch(self, parse_func=None):
+        response = self._make_request('https://county.example/parcel/1')
+        return self._parse_page(response, 'test.details', parse_func or self.parse)
+
+    def search_properties(self, query, **kwargs):
+        return {}
+
+    def get_property_details(self, property_id):
+        return {}
+
+    def get_property_history(self, property_id):
+        return {}
+
+
+class TestPageCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = PageCache(os.path.join(tmp, 'pages.sqlite'), max_bytes=250)
+            cache.put('a', b'x' * 100)
+            cache.put('b', b'y' * 100)
+            cache.get('a')
+            cache.put('c', b'z' * 100)
+
+            self.assertIsNotNone(cache.get('a'))
+            self.assertIsNone(cache.get('b'))
+            self.assertLessEqual(cache.stats()['bytes'], 250)
+            cache.close()
+
+    def test_processes_sharing_a_file_enforce_one_budget(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'pages.sqlite')
+            first, second = PageCache(path, max_bytes=250), PageCache(path, max_bytes=250)
+            first.put('a', b'x' * 100)
+            second.put('b', b'y' * 100)
+            first.put('c', b'z' * 100)
+
+            self.assertIsNone(second.get('a'))
+            self.assertEqual(first.stats()['bytes'], 200)
+            first.close()
+            second.close()
+
+    def test_default_path_does_not_depend_on_working_directory(self):
+        self.assertTrue(os.path.isabs(DEFAULT_CACHE_PATH))
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(DEFAULT_CACHE_PATH, os.path.join(project_root, 'cache', 'scraper_pages.sqlite'))
+
+
+class TestConditionalGet(unittest.TestCase):
+    def setUp(self):
+        self.scraper = PageScraper(PageCache(':memory:'))
+        self.body = b'<html>' + b'a' * 1000 + b'</html>'
+
+    def test_not_modified_served_from_cache_without_parsing(self):
+        first = make_response(200, self.body, {'ETag': '"v1"'})
+        with patch.object(self.scraper.session, 'request', return_value=first):
+            self.assertEqual(self.scraper.fetch(), {'length': len(self.body)})
+
+        with patch.object(self.scraper.session, 'request', return_value=make_response(304)) as request:
+            self.assertEqual(self.scraper.fetch(), {'length': len(self.body)})
+        self.assertEqual(request.call_args.kwargs['headers']['If-None-Match'], '"v1"')
+
+        stats = self.scraper.get_stats()['cache']
+        self.assertEqual(self.scraper.parse_calls, 1)
+        self.assertEqual(stats['not_modified'], 1)
+        self.assertEqual(stats['bytes_saved'], len(self.body))
+        self.assertEqual(stats['parse_hits'], 1)
+
+    def test_changed_body_is_parsed_again(self):
+        for body in (self.body, self.body, self.body + b'!'):
+            with patch.object(self.scraper.session, 'request', return_value=make_response(200, body)):
+                self.scraper.fetch()
+
+        self.assertEqual(self.scraper.parse_calls, 2)
+        self.assertEqual(self.scraper.cache_stats['unchanged'], 1)
+
+    def test_parser_changes_invalidate_parse_results(self):
+        def fetch(parse_func=None):
+            with patch.object(self.scraper.session, 'request', return_value=make_response(200, self.body)):
+                return self.scraper.fetch(parse_func)
+
+        fetch()
+        fetch()
+        self.assertEqual(self.scraper.parse_calls, 1)
+
+        # Same step name, different parse code
+        self.assertEqual(fetch(self.scraper.parse_words), {'words': 1})
+        self.assertEqual(self.scraper.parse_calls, 2)
+
+        self.scraper.PARSER_VERSION = 2
+        fetch(self.scraper.parse_words)
+        fetch(self.scraper.parse_words)
+        self.assertEqual(self.scraper.parse_calls, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
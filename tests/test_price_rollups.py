@@ -0,0 +1,220 @@
+"""
+Unit tests for utils.price_rollups.
+
+The rollup reads run against SQLite with stand-in models; the refresh SQL
+is PostgreSQL-only, so its statements are compiled and the refresh is run
+with those statements intercepted.
+"""
+import sys
+import types
+import unittest
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+from sqlalchemy import BigInteger, Column, Date, DateTime, Integer, String, UniqueConstraint, create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, declarative_base, scoped_session, sessionmaker
+from sqlalchemy.sql.elements import TextClause
+
+Base = declarative_base()
+engine = create_engine('sqlite://')
+session = scoped_session(sessionmaker(bind=engine))
+
+
+class ModelsPropertyLocation(Base):
+    __tablename__ = 'property_location'
+    id = Column(Integer, primary_key=True)
+    city = Column(String(100))
+    state = Column(String(50))
+    zip_code = Column(String(20))
+    price_value = Column(Integer)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+
+
+class PriceRollup(Base):
+    __tablename__ = 'price_rollup'
+    __table_args__ = (UniqueConstraint('granularity', 'location_type', 'location_value', 'period_start'),)
+    query = session.query_property()
+    id = Column(Integer, primary_key=True)
+    granularity = Column(String(10), nullable=False)
+    location_type = Column(String(10), nullable=False)
+    location_value = Column(String(150), nullable=False)
+    city = Column(String(100))
+    state = Column(String(50))
+    zip_code = Column(String(20))
+    period_start = Column(Date, nullable=False)
+    listings = Column(Integer, nullable=False)
+    median_price = Column(BigInteger)
+    avg_price = Column(BigInteger)
+    price_per_sqft = Column(Integer)
+    refreshed_at = Column(DateTime, nullable=False)
+
+
+class PriceRollupWatermark(Base):
+    __tablename__ = 'price_rollup_watermark'
+    query = session.query_property()
+    name = Column(String(50), primary_key=True)
+    watermark = Column(DateTime)
+    refreshed_at = Column(DateTime)
+
+
+fake_models = types.SimpleNamespace(ModelsPropertyLocation=ModelsPropertyLocation, PriceRollup=PriceRollup,
+                                    PriceRollupWatermark=PriceRollupWatermark)
+fake_app = types.SimpleNamespace(db=types.SimpleNamespace(session=session))
+saved_app = sys.modules.get('app')
+sys.modules['app'] = fake_app
+try:
+    from utils import price_rollups
+finally:
+    if saved_app is None:
+        sys.modules.pop('app', None)
+    else:
+        sys.modules['app'] = saved_app
+
+
+def rollup(location_value, period_start, median_price, location_type='city', listings=1, **kwargs):
+    city, _, state = location_value.partition(', ')
+    values = dict(granularity='month', location_type=location_type, location_value=location_value,
+                  city=city if location_type == 'city' else kwargs.pop('city', None),
+                  state=state or kwargs.pop('state', None), period_start=period_start, listings=listings,
+                  median_price=median_price, avg_price=median_price + 10000,
+                  refreshed_at=datetime(2025, 1, 1))
+    values.update(kwargs)
+    return PriceRollup(**values)
+
+
+class PriceRollupTestCase(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.create_all(engine)
+        self.addCleanup(Base.metadata.drop_all, engine)
+        self.addCleanup(session.remove)
+        models = patch.dict(sys.modules, {'models': fake_models})
+        models.start()
+        self.addCleanup(models.stop)
+
+
+class TestRefreshSql(unittest.TestCase):
+    def compile(self, statement):
+        compiled = statement.compile(dialect=postgresql.dialect())
+        return ' '.join(str(compiled).split()), set(compiled.params)
+
+    def test_refresh_recomputes_changed_and_moved_buckets(self):
+        sql, params = self.compile(price_rollups._REFRESH_SQL)
+        self.assertEqual(params, {'since', 'refreshed_at', 'moved_city', 'moved_state',
+                                  'moved_zip_code', 'moved_created_at'})
+        self.assertIn('unnest(CAST(%(moved_city)s AS text[]), CAST(%(moved_state)s AS text[]), '
+                      'CAST(%(moved_zip_code)s AS text[]), CAST(%(moved_created_at)s AS timestamp[]))', sql)
+        self.assertIn('OR changed_at > CAST(%(since)s AS timestamp) UNION SELECT granularity, location_type, '
+                      'location_value, period_start FROM moved_buckets )', sql)
+        self.assertIn('UNION ALL SELECT created_at FROM moved', sql)
+        self.assertIn('percentile_cont(0.5) WITHIN GROUP (ORDER BY k.price_value)', sql)
+        self.assertIn('ON CONFLICT (granularity, location_type, location_value, period_start) DO UPDATE', sql)
+
+    def test_prune_only_drops_moved_buckets_left_unrefreshed(self):
+        sql, params = self.compile(price_rollups._PRUNE_SQL)
+        self.assertTrue(params <= {'refreshed_at', 'moved_city', 'moved_state', 'moved_zip_code',
+                                   'moved_created_at', 'since'})
+        self.assertIn('DELETE FROM price_rollup r USING moved_buckets b', sql)
+        self.assertIn('AND r.refreshed_at < CAST(%(refreshed_at)s AS timestamp)', sql)
+
+
+class TestRefreshPriceRollups(PriceRollupTestCase):
+    def setUp(self):
+        super().setUp()
+        self.executed = []
+        self.claimed = []
+        real_execute = Session.execute
+
+        def execute(session_self, statement, params=None, *args, **kwargs):
+            if not isinstance(statement, TextClause):
+                return real_execute(session_self, statement, params, *args, **kwargs)
+            self.executed.append((statement, params))
+            result = MagicMock(rowcount=3)
+            result.fetchall.return_value = self.claimed
+            return result
+
+        execute_patch = patch.object(Session, 'execute', execute)
+        execute_patch.start()
+        self.addCleanup(execute_patch.stop)
+
+    def test_incremental_refresh_overlaps_watermark_and_recomputes_moved_buckets(self):
+        since = datetime(2025, 3, 1, 12, 0)
+        session.add_all([
+            PriceRollupWatermark(name=price_rollups.WATERMARK_NAME, watermark=since),
+            ModelsPropertyLocation(city='Pasco', state='WA', price_value=1, created_at=datetime(2025, 3, 1),
+                                   updated_at=datetime(2025, 3, 2, 8, 0)),
+        ])
+        session.commit()
+        self.claimed = [types.SimpleNamespace(city='Kennewick', state='WA', zip_code='99336',
+                                              created_at=datetime(2025, 2, 10))]
+
+        result = price_rollups.refresh_price_rollups()
+
+        statements = [statement for statement, _ in self.executed]
+        self.assertEqual(statements, [price_rollups._CLAIM_CHANGES_SQL, price_rollups._REFRESH_SQL,
+                                      price_rollups._PRUNE_SQL])
+        params = self.executed[1][1]
+        self.assertEqual(params['since'], since - price_rollups.WATERMARK_OVERLAP)
+        self.assertEqual((params['moved_city'], params['moved_zip_code'], params['moved_created_at']),
+                         (['Kennewick'], ['99336'], [datetime(2025, 2, 10)]))
+        self.assertIs(self.executed[2][1], params)
+        self.assertEqual(result, {'upserted': 3, 'removed': 3, 'moved': 1,
+                                  'watermark': datetime(2025, 3, 2, 8, 0), 'full': False})
+        self.assertEqual(session.get(PriceRollupWatermark, price_rollups.WATERMARK_NAME).watermark,
+                         datetime(2025, 3, 2, 8, 0))
+
+    def test_full_refresh_drops_every_stale_bucket(self):
+        session.add(rollup('Pasco, WA', date(2024, 1, 1), 300000))
+        session.commit()
+
+        result = price_rollups.refresh_price_rollups(full=True)
+
+        self.assertEqual([statement for statement, _ in self.executed],
+                         [price_rollups._CLAIM_CHANGES_SQL, price_rollups._REFRESH_SQL])
+        self.assertIsNone(self.executed[1][1]['since'])
+        self.assertEqual((result['removed'], result['full']), (1, True))
+        self.assertEqual(PriceRollup.query.count(), 0)
+
+
+class TestPriceRollupReads(PriceRollupTestCase):
+    def setUp(self):
+        super().setUp()
+        session.add_all([
+            rollup('Pasco, WA', date(2025, 1, 1), 300000, listings=2),
+            rollup('Pasco, WA', date(2025, 2, 1), 330000, listings=3),
+            rollup('Pasco, WA', date(2025, 3, 1), 297000, listings=1),
+            rollup('Richland, WA', date(2025, 2, 1), 500000, listings=4),
+            rollup('99301', date(2025, 2, 1), 310000, location_type='zip', city='Pasco', state='WA',
+                   zip_code='99301'),
+        ])
+        session.commit()
+
+    def test_rollups_with_change_from_the_previous_period(self):
+        rows = price_rollups.get_price_rollups(city='pasco', start_date=date(2025, 2, 1))
+
+        # January is read only as February's previous period
+        self.assertEqual([(r['date'], r['median_price']) for r in rows],
+                         [('2025-02-01', 330000.0), ('2025-03-01', 297000.0)])
+        self.assertAlmostEqual(rows[0]['price_change'], 10.0)
+        self.assertAlmostEqual(rows[1]['price_change'], -10.0)
+        self.assertIsNone(rows[0]['properties_sold'])
+
+        rows = price_rollups.get_price_rollups(zip_code='99301')
+        self.assertEqual([(r['location_type'], r['location_value']) for r in rows], [('zip', '99301')])
+
+    def test_summary_keeps_the_city_keyed_stats_format(self):
+        stats = price_rollups.summarize_price_rollups(price_rollups.get_price_rollups())
+
+        self.assertEqual(set(stats), {'Pasco', 'Richland'})
+        self.assertEqual(stats['Pasco']['median_prices'], [300000.0, 330000.0, 297000.0])
+        self.assertEqual(stats['Pasco']['avg_prices'], [310000.0, 340000.0, 307000.0])
+        self.assertEqual(stats['Pasco']['avg_median_price'], 309000.0)
+        self.assertEqual(stats['Pasco']['avg_avg_price'], 319000.0)
+        self.assertEqual((stats['Pasco']['transactions'], stats['Pasco']['listings']), (0, 6))
+
+        stats = price_rollups.summarize_price_rollups(price_rollups.get_price_rollups(location_type='zip'))
+        self.assertEqual(list(stats), ['99301'])
+
+
+if __name__ == '__main__':
+    unittest.main()
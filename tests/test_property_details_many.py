@@ -0,0 +1,163 @@
+"""
+Unit tests for RealEstateDataConnector.get_property_details_many.
+"""
+import sys
+import threading
+import time
+import types
+import unittest
+from unittest.mock import patch
+
+# The Realtor connector imports the Flask models; the aggregator only needs the class name
+saved_realtor = sys.modules.get('etl.realtor_api_connector')
+sys.modules['etl.realtor_api_connector'] = types.SimpleNamespace(RealtorApiConnector=None)
+try:
+    from etl.real_estate_data_connector import RealEstateDataConnector
+finally:
+    if saved_realtor is None:
+        del sys.modules['etl.realtor_api_connector']
+    else:
+        sys.modules['etl.realtor_api_connector'] = saved_realtor
+
+from etl.benton_county_connector import BentonCountyConnector
+
+
+class FakeSource:
+    """Single-lookup source that records calls and tracks peak concurrency."""
+
+    def __init__(self, known, delay=0.0, release=None):
+        self.known = set(known)
+        self.delay = delay
+        self.release = release
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get_property_details(self, property_id):
+        with self._lock:
+            self.calls.append(property_id)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            if self.release is not None:
+                self.release.wait(5)
+            time.sleep(self.delay)
+            return {'id': property_id} if property_id in self.known else {}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class FakeBatchSource(FakeSource):
+    max_batch_size = 2
+
+    def __init__(self, known):
+        super().__init__(known)
+        self.batches = []
+
+    def get_property_details_batch(self, property_ids):
+        self.batches.append(list(property_ids))
+        return {pid: {'id': pid} for pid in property_ids if pid in self.known}
+
+
+def make_connector(**sources):
+    with patch.object(RealEstateDataConnector, '_load_connectors'):
+        connector = RealEstateDataConnector()
+    connector.max_retry_attempts = 0
+    connector.failover_timeout = 0
+    for priority, (name, source) in enumerate(sources.items(), start=1):
+        connector.priorities[name] = priority
+        connector._register_connector(name, source)
+    return connector
+
+
+class TestGetPropertyDetailsMany(unittest.TestCase):
+    def test_batch_source_first_then_single_lookups(self):
+        county = FakeBatchSource(known=['1', '2', '4', '5'])
+        fallback = FakeSource(known=['3'])
+        connector = make_connector(county=county, fallback=fallback)
+
+        results = connector.get_property_details_many(['1', '2', '3', '4', '5', '2', None])
+
+        self.assertEqual(county.batches, [['1', '2'], ['3', '4'], ['5']])
+        self.assertEqual(results['1']['metadata']['source'], 'county')
+        self.assertEqual(results['3']['metadata']['source'], 'fallback')
+        self.assertEqual(sorted(results), ['1', '2', '3', '4', '5'])
+        # Only the ID the batch source lacked went through the failover path
+        self.assertEqual(county.calls, ['3'])
+        self.assertEqual(fallback.calls, ['3'])
+
+    def test_failed_batch_falls_back_to_single_lookups(self):
+        county = FakeBatchSource(known=['1', '2'])
+        county.get_property_details_batch = lambda ids: (_ for _ in ()).throw(RuntimeError("down"))
+        connector = make_connector(county=county)
+
+        results = connector.get_property_details_many(['1', '2', '9'])
+
+        self.assertEqual(results['1']['id'], '1')
+        self.assertEqual(results['9'], {})
+        self.assertEqual(connector.source_status['county'].error_count, 1)
+
+    def test_fan_out_is_bounded(self):
+        source = FakeSource(known=[str(i) for i in range(20)], delay=0.02)
+        connector = make_connector(source=source)
+
+        results = connector.get_property_details_many([str(i) for i in range(20)], max_workers=4)
+
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all(data['id'] == pid for pid, data in results.items()))
+        self.assertLessEqual(source.peak, 4)
+        self.assertGreater(source.peak, 1)
+
+    def test_concurrent_calls_share_in_flight_lookups(self):
+        release = threading.Event()
+        source = FakeSource(known=['1', '2'], release=release)
+        connector = make_connector(source=source)
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(connector.get_property_details_many(['1', '2'])))
+        first.start()
+        deadline = time.time() + 5
+        while len(source.calls) < 2 and time.time() < deadline:
+            time.sleep(0.005)
+
+        second = threading.Thread(target=lambda: results.append(connector.get_property_details_many(['2', '1'])))
+        second.start()
+        while connector._single_flight.metrics['coalesced'] < 2 and time.time() < deadline:
+            time.sleep(0.005)
+        release.set()
+        first.join()
+        second.join()
+
+        self.assertEqual(sorted(source.calls), ['1', '2'])
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0], results[1])
+
+
+class TestBentonCountyConnector(unittest.TestCase):
+    def test_batch_lookup_keys_results_by_requested_ids(self):
+        bulk = {'123450000001': {'property_id': '123450000001', 'address': '1 Main St'}}
+        with patch('etl.benton_county_connector.gis.validate_api_key', return_value=True):
+            county = BentonCountyConnector()
+        with patch('etl.benton_county_connector.gis.get_property_data_many', return_value=bulk) as many:
+            results = county.get_property_details_batch(['12345-0000-001', '999'])
+
+        many.assert_called_once_with(['12345-0000-001', '999'])
+        self.assertEqual(list(results), ['12345-0000-001'])
+        self.assertEqual(results['12345-0000-001']['address'], '1 Main St')
+
+    def test_single_lookup_distinguishes_missing_from_errors(self):
+        with patch('etl.benton_county_connector.gis.validate_api_key', return_value=True):
+            county = BentonCountyConnector()
+        with patch('etl.benton_county_connector.gis.get_property_data',
+                   return_value={'error': 'property_not_found', 'message': 'not found'}):
+            self.assertEqual(county.get_property_details('1'), {})
+        with patch('etl.benton_county_connector.gis.get_property_data',
+                   return_value={'error': 'gis_api_error', 'message': 'HTTP 500'}):
+            with self.assertRaises(RuntimeError):
+                county.get_property_details('1')
+
+
+if __name__ == '__main__':
+    unittest.main()
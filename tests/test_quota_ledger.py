@@ -0,0 +1,149 @@
+"""
+Unit tests for the shared RapidAPI quota ledger.
+"""
+import sys
+import types
+import unittest
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+from etl.quota_ledger import QuotaLedger, _period_bounds, key_fingerprint
+from etl.zillow_api_connector import ZillowApiConnector
+
+# The scheduler only needs the Flask app and models at import time
+saved = {name: sys.modules.get(name) for name in ('app', 'models')}
+sys.modules['app'] = types.SimpleNamespace(db=None)
+sys.modules['models'] = types.SimpleNamespace(ETLSchedule=None)
+try:
+    from etl.scheduler import ETLScheduler
+finally:
+    for name, module in saved.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+
+KEY = 'test-rapidapi-key'
+# 2024-06-10 12:00 UTC
+NOON = datetime(2024, 6, 10, 12, tzinfo=timezone.utc).timestamp()
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance_days(self, days):
+        self.now += days * 86400
+
+
+class TestQuotaLedger(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(NOON)
+        self.ledger = QuotaLedger(':memory:', monthly_quota=1000, clock=self.clock)
+        self.addCleanup(self.ledger.close)
+
+    def use(self, requests, connector='ZillowApiConnector', headers=None):
+        self.ledger.record(KEY, connector, headers, requests=requests)
+
+    def test_period_bounds(self):
+        self.assertEqual(_period_bounds(date(2024, 6, 10)), (date(2024, 6, 1), date(2024, 7, 1)))
+        self.assertEqual(_period_bounds(date(2024, 1, 10), 15), (date(2023, 12, 15), date(2024, 1, 15)))
+        self.assertEqual(_period_bounds(date(2024, 12, 20), 15), (date(2024, 12, 15), date(2025, 1, 15)))
+
+    def test_usage_is_tracked_per_day_and_connector(self):
+        self.use(3)
+        self.use(2, 'RealtorApiConnector')
+        self.clock.advance_days(1)
+        self.use(4)
+        self.assertEqual(self.ledger.daily_usage(KEY), {
+            '2024-06-10': {'ZillowApiConnector': 3, 'RealtorApiConnector': 2},
+            '2024-06-11': {'ZillowApiConnector': 4},
+        })
+        self.assertEqual(self.ledger.forecast(KEY)['used'], 9)
+
+    def test_forecast_flags_exhaustion_before_reset(self):
+        self.use(100)
+        forecast = self.ledger.forecast(KEY)
+        self.assertEqual(forecast['remaining'], 900)
+        self.assertEqual(forecast['daily_rate'], 100)
+        # 900 left at 100/day runs out on June 19, before the July 1 reset
+        self.assertEqual(forecast['status'], 'at_risk')
+        self.assertEqual(forecast['exhaustion_at'].date(), date(2024, 6, 19))
+
+    def test_reported_quota_headers_take_precedence(self):
+        ledger = QuotaLedger(':memory:', clock=self.clock)
+        self.addCleanup(ledger.close)
+        ledger.record(KEY, 'ZillowScraper', {
+            'X-RateLimit-Requests-Limit': '500', 'X-RateLimit-Requests-Remaining': '480',
+            'X-RateLimit-Requests-Reset': str(5 * 86400),
+        })
+        forecast = ledger.forecast(KEY)
+        self.assertEqual((forecast['quota'], forecast['remaining']), (500, 480))
+        self.assertEqual(forecast['period_end'].date(), date(2024, 6, 15))
+        self.assertEqual(forecast['status'], 'ok')
+
+    def test_admission_by_priority(self):
+        self.use(750)
+        # 250 left; normal jobs must leave 200 and low jobs 400
+        self.assertFalse(self.ledger.admit(KEY, 10, 'low').admitted)
+        self.assertTrue(self.ledger.admit(KEY, 10, 'high').admitted)
+        decision = self.ledger.admit(KEY, 100, 'normal')
+        self.assertFalse(decision.admitted)
+        self.assertEqual(decision.retry_at, datetime(2024, 7, 1))
+        self.assertTrue(self.ledger.admit(KEY, 250, 'critical').admitted)
+
+    def test_normal_jobs_are_paced_to_a_daily_budget(self):
+        self.use(30)
+        # 970 left over 20.5 days: about 48 a day including today's 30
+        decision = self.ledger.admit(KEY, 40, 'normal')
+        self.assertFalse(decision.admitted)
+        self.assertEqual(decision.retry_at, datetime(2024, 6, 11))
+        self.assertTrue(self.ledger.admit(KEY, 10, 'normal').admitted)
+        self.assertTrue(self.ledger.admit(KEY, 40, 'high').admitted)
+
+    def test_unknown_quota_admits(self):
+        ledger = QuotaLedger(':memory:', clock=self.clock)
+        self.addCleanup(ledger.close)
+        self.assertTrue(ledger.admit(KEY, 10_000, 'low').admitted)
+        with self.assertRaises(ValueError):
+            ledger.admit(KEY, 1, 'urgent')
+
+    def test_connectors_record_usage_without_storing_the_key(self):
+        connector = ZillowApiConnector(api_key=KEY)
+        with patch('etl.quota_ledger.get_quota_ledger', return_value=self.ledger):
+            connector._update_rate_limits({'X-RateLimit-Requests-Remaining': '42'})
+        self.assertEqual(self.ledger.daily_usage(KEY), {'2024-06-10': {'ZillowApiConnector': 1}})
+        self.assertEqual([f['key_id'] for f in self.ledger.forecast_all()], [key_fingerprint(KEY)])
+        self.assertNotIn(KEY, key_fingerprint(KEY))
+
+
+class TestSchedulerQuotaCheck(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(NOON)
+        self.ledger = QuotaLedger(':memory:', monthly_quota=1000, clock=self.clock)
+        self.addCleanup(self.ledger.close)
+        ledger_patch = patch('etl.scheduler.get_quota_ledger', return_value=self.ledger)
+        ledger_patch.start()
+        self.addCleanup(ledger_patch.stop)
+
+    def job(self, plugin_name, **config):
+        return types.SimpleNamespace(id=1, plugin_name=plugin_name, config=dict(config, api_key=KEY))
+
+    def test_plugins_are_discovered_once(self):
+        class ZillowPlugin:
+            @classmethod
+            def rapidapi_requests(cls, config=None):
+                return 5
+
+        scheduler = ETLScheduler()
+        with patch('etl.scheduler.discover_plugins', return_value=[ZillowPlugin]) as discover:
+            for _ in range(3):
+                self.assertTrue(scheduler._check_quota(self.job('ZillowPlugin')).admitted)
+            self.assertIsNone(scheduler._check_quota(self.job('MissingPlugin')))
+        discover.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Unit tests for incremental JSON parsing and Redfin search streaming.
+"""
+import json
+import unittest
+from unittest.mock import patch
+from etl.json_stream import iter_json_array
+from etl.redfin_api_connector import RedfinApiConnector
+from etl.redfin_etl import RedfinListingsETL
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def search_page(ids):
+    return {
+        'version': 1,
+        'errorMessage': 'Success',
+        'homes': {
+            'meta': {'note': 'results: [not the array]', 'nested': [{'results': [0]}]},
+            'results': [
+                {'id': home_id, 'streetLine': {'value': f'{home_id} Main St'},
+                 'cityState': 'Kennewick, WA', 'price': {'value': 350000 + home_id}}
+                for home_id in ids
+            ],
+        },
+    }
+
+
+class FakeResponse:
+    def __init__(self, body, chunk_size=7, status_code=200):
+        self.body = body.encode('utf-8')
+        self.status_code = status_code
+        self.encoding = 'utf-8'
+        self.chunk_size = chunk_size
+        self.chunks_read = 0
+
+    def iter_content(self, chunk_size=None):
+        for i in range(0, len(self.body), self.chunk_size):
+            self.chunks_read += 1
+            yield self.body[i:i + self.chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class TestIterJsonArray(unittest.TestCase):
+    def test_items_match_full_parse_for_any_chunking(self):
+        document = json.dumps(search_page([1, 2, 3]) | {'tail': [1.5, -2e3, None, 'x"y']})
+        expected = search_page([1, 2, 3])['homes']['results']
+        for size in (1, 2, 5, 64, len(document)):
+            self.assertEqual(list(iter_json_array(chunked(document, size), ('homes', 'results'))), expected)
+
+    def test_root_array_with_scalars(self):
+        self.assertEqual(list(iter_json_array(chunked('[12345, true, "a,b", {"c": []}]', 3), ())),
+                         [12345, True, 'a,b', {'c': []}])
+
+    def test_missing_array_yields_nothing(self):
+        self.assertEqual(list(iter_json_array(['{"homes": {"meta": {}}}'], ('homes', 'results'))), [])
+
+    def test_truncated_document_raises(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(['{"homes": {"results": [{"id": 1}, {"id"'], ('homes', 'results')))
+
+
+class TestRedfinStreaming(unittest.TestCase):
+    def setUp(self):
+        self.connector = RedfinApiConnector(min_request_interval=0)
+
+    def test_first_listing_arrives_before_download_finishes(self):
+        response = FakeResponse('{}&&' + json.dumps(search_page(range(1, 50))))
+        with patch('etl.redfin_api_connector.requests.get', return_value=response):
+            listings = self.connector.iter_search_results('Kennewick, WA', page_size=100)
+            first = next(listings)
+            self.assertEqual(first['external_id'], 1)
+            self.assertEqual(first['source'], 'redfin')
+            self.assertLess(response.chunks_read * response.chunk_size, len(response.body) / 2)
+            self.assertEqual(len(list(listings)), 48)
+
+    def test_pages_until_a_short_page(self):
+        pages = [search_page([1, 2]), search_page([3, 4]), search_page([5])]
+        responses = [FakeResponse(json.dumps(page)) for page in pages]
+        with patch('etl.redfin_api_connector.requests.get', side_effect=responses) as get:
+            ids = [listing['external_id'] for listing in self.connector.iter_search_results('99336', page_size=2)]
+        self.assertEqual(ids, [1, 2, 3, 4, 5])
+        self.assertEqual(get.call_count, 3)
+        self.assertIn('start=4', get.call_args[0][0])
+
+    def test_search_properties_keeps_list_result(self):
+        with patch('etl.redfin_api_connector.requests.get', return_value=FakeResponse(json.dumps(search_page([7])))):
+            results = self.connector.search_properties(city='Kennewick', state='WA')
+        self.assertEqual([r['property_id'] for r in results], [7])
+        self.assertEqual(results[0]['address'], '7 Main St')
+
+    def test_error_status_yields_nothing(self):
+        with patch('etl.redfin_api_connector.requests.get', return_value=FakeResponse('', status_code=403)):
+            self.assertEqual(list(self.connector.iter_search_results('99336')), [])
+        self.assertEqual(self.connector.metrics['rate_limit_hits'], 1)
+
+    def test_etl_transform_streams_and_deduplicates(self):
+        responses = [FakeResponse(json.dumps(search_page([1, 2]))), FakeResponse(json.dumps(search_page([2, 3])))]
+        etl = RedfinListingsETL({'locations': ['Kennewick, WA', 'Richland, WA'], 'connector': self.connector})
+        with patch('etl.redfin_api_connector.requests.get', side_effect=responses):
+            ids = [listing['external_id'] for listing in etl.transform(etl.extract())]
+        self.assertEqual(ids, ['1', '2', '3'])
+
+
+if __name__ == '__main__':
+    unittest.main()
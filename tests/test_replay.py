@@ -0,0 +1,75 @@
+"""
+Unit tests for etl.replay record/replay transport.
+"""
+import glob
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from etl.replay import FixtureStore, RecordingTransport, ReplayServer, ReplayTransport
+
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"path": self.path.split("?")[0]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.fixture_dir = tempfile.mkdtemp()
+        self.upstream = ThreadingHTTPServer(("127.0.0.1", 0), UpstreamHandler)
+        threading.Thread(target=self.upstream.serve_forever, daemon=True).start()
+        self.upstream_url = f"http://127.0.0.1:{self.upstream.server_address[1]}"
+
+    def tearDown(self):
+        self.upstream.shutdown()
+        self.upstream.server_close()
+        shutil.rmtree(self.fixture_dir)
+
+    def test_record_then_replay(self):
+        store = FixtureStore(self.fixture_dir)
+        with RecordingTransport(store) as transport:
+            requests.get(f"{self.upstream_url}/property/detail", params={"id": "1", "apikey": "SECRET"})
+        self.assertEqual(transport.recorded, 1)
+
+        # Credentials are not written to fixtures
+        replay_store = FixtureStore(self.fixture_dir)
+        self.assertEqual(replay_store.load(), 1)
+        fixture_file, = glob.glob(os.path.join(self.fixture_dir, "*", "*.json"))
+        with open(fixture_file) as f:
+            self.assertNotIn("SECRET", f.read())
+
+        # Replay with a different key and the upstream shut down
+        self.upstream.shutdown()
+        with ReplayServer(replay_store) as server, ReplayTransport(server):
+            response = requests.get(f"{self.upstream_url}/property/detail", params={"id": "1", "apikey": "OTHER"})
+            missing = requests.get(f"{self.upstream_url}/unknown")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"path": "/property/detail"})
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(server.stats["hits"], 1)
+
+    def test_error_injection(self):
+        store = FixtureStore(self.fixture_dir)
+        with ReplayServer(store, error_rate=1.0, error_status=429) as server, ReplayTransport(server):
+            response = requests.get("https://api.example.com/anything")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(server.stats["injected_errors"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+Unit tests for etl.single_flight.
+"""
+import threading
+import time
+import unittest
+from etl.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+
+        def fetch(key):
+            calls.append(key)
+            time.sleep(0.05)
+            return {"id": key}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do("p1", fetch, "p1")))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(calls, ["p1"])
+        self.assertEqual(results, [{"id": "p1"}] * 8)
+        self.assertEqual(flight.metrics["coalesced"], 7)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_exceptions_propagate_and_are_not_cached(self):
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("upstream error")
+
+        with self.assertRaises(ValueError):
+            flight.do("p1", fail)
+        self.assertEqual(flight.do("p1", lambda: "ok"), "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,217 @@
+"""
+Unit tests for the in-memory property map spatial index.
+"""
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from utils.spatial_index import (
+    CLUSTER_MAX_ZOOM, GeohashClusters, GridIndex, PropertyMapIndex, encode_geohash, haversine_km,
+    map_point, precision_for_zoom
+)
+
+BASE_TIME = datetime(2026, 1, 1)
+
+
+def location(id, lat, lon, updated_at=BASE_TIME, **extra):
+    fields = dict(id=id, latitude=lat, longitude=lon, address=f"{id} Main St", price='$400,000',
+                  price_value=400000, property_type='Single Family', bedrooms=3, bathrooms=2,
+                  square_feet=2000, report_id=None, updated_at=updated_at)
+    fields.update(extra)
+    return SimpleNamespace(**fields)
+
+
+class FakeLoader:
+    """Serves rows the way load_property_locations filters them."""
+
+    def __init__(self, rows):
+        self.rows = {row.id: row for row in rows}
+        self.calls = []
+
+    def __call__(self, updated_since, after_id):
+        self.calls.append((updated_since, after_id))
+        if updated_since is None and after_id is None:
+            return list(self.rows.values())
+        return [row for row in self.rows.values()
+                if (updated_since is not None and row.updated_at and row.updated_at > updated_since)
+                or (after_id is not None and row.id > after_id)]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestGridIndex(unittest.TestCase):
+    def setUp(self):
+        self.grid = GridIndex(cell_size=0.1)
+        # Kennewick, Richland, Pasco and Seattle
+        self.grid.upsert(1, 46.21, -119.14, 'kennewick')
+        self.grid.upsert(2, 46.28, -119.28, 'richland')
+        self.grid.upsert(3, 46.24, -119.10, 'pasco')
+        self.grid.upsert(4, 47.61, -122.33, 'seattle')
+
+    def test_bbox_returns_only_points_inside(self):
+        points, truncated = self.grid.bbox(46.0, -119.5, 46.5, -119.0)
+        self.assertEqual(sorted(points), ['kennewick', 'pasco', 'richland'])
+        self.assertFalse(truncated)
+
+        points, _ = self.grid.bbox(46.0, -180.0, 90.0, 180.0)
+        self.assertEqual(len(points), 4)
+
+    def test_bbox_limit_samples_across_cells(self):
+        for i in range(100):
+            self.grid.upsert(100 + i, 46.21, -119.14, 'cluster')
+        points, truncated = self.grid.bbox(46.0, -123.0, 48.0, -119.0, limit=5)
+        self.assertTrue(truncated)
+        self.assertEqual(len(points), 5)
+        self.assertIn('seattle', points)
+
+    def test_upsert_moves_and_remove_deletes(self):
+        self.grid.upsert(4, 46.22, -119.15, 'moved')
+        self.assertEqual(self.grid.bbox(47.0, -123.0, 48.0, -122.0)[0], [])
+        self.assertIn('moved', self.grid.bbox(46.0, -119.5, 46.5, -119.0)[0])
+
+        self.grid.remove(4)
+        self.grid.remove(99)
+        self.assertEqual(len(self.grid), 3)
+
+    def test_bbox_across_antimeridian(self):
+        self.grid.upsert(5, -17.7, 178.0, 'fiji')
+        self.grid.upsert(6, -14.3, -170.7, 'samoa')
+        points, _ = self.grid.bbox(-20.0, 170.0, -10.0, -165.0)
+        self.assertEqual(sorted(points), ['fiji', 'samoa'])
+
+    def test_nearby_sorted_by_distance(self):
+        matches = self.grid.nearby(46.21, -119.14, 15.0)
+        self.assertEqual([data for _, data in matches], ['kennewick', 'pasco', 'richland'])
+        self.assertAlmostEqual(matches[0][0], 0.0)
+        self.assertEqual(len(self.grid.nearby(46.21, -119.14, 15.0, limit=1)), 1)
+        self.assertAlmostEqual(haversine_km(46.21, -119.14, 47.61, -122.33), 285, delta=5)
+
+
+class TestGeohashClusters(unittest.TestCase):
+    def test_encode_geohash(self):
+        self.assertEqual(encode_geohash(57.64911, 10.40744, 7), 'u4pruyd')
+        self.assertEqual(encode_geohash(46.21, -119.14, 3), 'c25')
+
+    def test_precision_grows_with_zoom(self):
+        precisions = [precision_for_zoom(zoom) for zoom in range(0, 16)]
+        self.assertEqual(precisions, sorted(precisions))
+        self.assertEqual(precisions[0], 1)
+        self.assertEqual(precisions[-1], 7)
+
+    def test_clusters_aggregate_count_centroid_and_price(self):
+        clusters = GeohashClusters()
+        clusters.upsert(1, 46.20, -119.10, 300000)
+        clusters.upsert(2, 46.22, -119.12, 500000)
+        clusters.upsert(3, 46.24, -119.14, None)
+        clusters.upsert(4, 47.61, -122.33, 900000)
+
+        (tri_cities,) = clusters.clusters(46.0, -120.0, 46.5, -119.0, 3)
+        self.assertEqual(tri_cities['geohash'], 'c25')
+        self.assertEqual(tri_cities['count'], 3)
+        self.assertAlmostEqual(tri_cities['latitude'], 46.22)
+        self.assertAlmostEqual(tri_cities['longitude'], -119.12)
+        self.assertEqual(tri_cities['avg_price'], 400000)
+
+        whole_state = clusters.clusters(45.5, -124.8, 49.0, -116.9, 2)
+        self.assertEqual(sum(cluster['count'] for cluster in whole_state), 4)
+
+    def test_moves_and_removals_update_aggregates(self):
+        clusters = GeohashClusters()
+        clusters.upsert(1, 46.20, -119.10, 300000)
+        clusters.upsert(2, 46.22, -119.12, 500000)
+        clusters.upsert(2, 47.61, -122.33, 500000)
+        clusters.remove(1)
+
+        self.assertEqual(clusters.clusters(46.0, -120.0, 46.5, -119.0, 3), [])
+        (seattle,) = clusters.clusters(47.0, -123.0, 48.0, -122.0, 5)
+        self.assertEqual((seattle['count'], seattle['avg_price']), (1, 500000))
+        self.assertEqual(len(clusters), 1)
+
+
+class TestPropertyMapIndex(unittest.TestCase):
+    def setUp(self):
+        self.loader = FakeLoader([location(1, 46.21, -119.14), location(2, 46.28, -119.28),
+                                  location(3, None, None)])
+        self.clock = FakeClock()
+        self.index = PropertyMapIndex(self.loader, cell_size=0.1, refresh_interval=30,
+                                      full_refresh_interval=3600, clock=self.clock)
+
+    def test_map_point_matches_map_data_shape(self):
+        point = map_point(location(1, 46.21, -119.14))
+        self.assertEqual(point['price_per_sqft'], 200)
+        self.assertEqual(point['address'], '1 Main St')
+
+    def test_loads_lazily_and_skips_rows_without_coordinates(self):
+        self.assertEqual(self.loader.calls, [])
+        points, _ = self.index.bbox(-90, -180, 90, 180)
+        self.assertEqual(sorted(point['id'] for point in points), [1, 2])
+        self.assertEqual(self.loader.calls, [(None, None)])
+
+        # Within the refresh interval the index is served as is
+        self.index.bbox(-90, -180, 90, 180)
+        self.assertEqual(len(self.loader.calls), 1)
+
+    def test_incremental_refresh_applies_new_and_changed_rows(self):
+        self.index.bbox(-90, -180, 90, 180)
+        later = BASE_TIME + timedelta(minutes=5)
+        self.loader.rows[4] = location(4, 47.61, -122.33, updated_at=None)
+        self.loader.rows[1] = location(1, 46.24, -119.10, updated_at=later)
+        self.loader.rows[2] = location(2, None, None, updated_at=later)
+
+        self.clock.now += 31
+        points = self.index.nearby(46.24, -119.10, 1.0)
+        self.assertEqual([point['id'] for point in points], [1])
+        self.assertEqual(self.loader.calls[-1], (BASE_TIME, 3))
+        self.assertEqual(self.index.status()['points'], 2)
+
+    def test_full_refresh_drops_deleted_rows(self):
+        self.index.bbox(-90, -180, 90, 180)
+        del self.loader.rows[2]
+        self.clock.now += 31
+        self.assertEqual(self.index.status()['points'], 2)
+        self.index.bbox(-90, -180, 90, 180)
+        self.assertEqual(self.index.status()['points'], 2)
+
+        self.clock.now += 3600
+        self.index.bbox(-90, -180, 90, 180)
+        self.assertEqual(self.loader.calls[-1], (None, None))
+        self.assertEqual(self.index.status()['points'], 1)
+
+    def test_view_clusters_when_zoomed_out(self):
+        for i in range(300):
+            self.loader.rows[100 + i] = location(100 + i, 46.0 + i * 0.001, -119.0 - i * 0.001)
+
+        view = self.index.view(45.0, -121.0, 48.0, -118.0, zoom=6)
+        self.assertEqual(view['mode'], 'clusters')
+        self.assertEqual(view['total'], 302)
+        self.assertLess(len(view['data']), 10)
+
+        view = self.index.view(45.0, -121.0, 48.0, -118.0, zoom=CLUSTER_MAX_ZOOM, limit=50)
+        self.assertEqual(view['mode'], 'points')
+        self.assertEqual(len(view['data']), 50)
+        self.assertTrue(view['truncated'])
+
+    def test_view_returns_points_when_few_in_view(self):
+        view = self.index.view(45.0, -121.0, 48.0, -118.0, zoom=4)
+        self.assertEqual(view['mode'], 'points')
+        self.assertEqual(len(view['data']), 2)
+
+    def test_failed_refresh_serves_previous_index(self):
+        self.index.bbox(-90, -180, 90, 180)
+
+        def broken(updated_since, after_id):
+            raise RuntimeError("database unavailable")
+
+        self.index.loader = broken
+        self.clock.now += 31
+        points, _ = self.index.bbox(-90, -180, 90, 180)
+        self.assertEqual(len(points), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Unit tests for regional.ttl_cache.
+"""
+import asyncio
+import unittest
+from regional.ttl_cache import MISSING, CoalescingLoader, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TTLCache(max_entries=3, ttl=60, clock=self.clock)
+
+    def test_hit_and_miss(self):
+        self.assertIs(self.cache.get('a'), MISSING)
+        self.cache.set('a', {'id': 'a'})
+        self.assertEqual(self.cache.get('a'), {'id': 'a'})
+
+        status = self.cache.status()
+        self.assertEqual(status['hits'], 1)
+        self.assertEqual(status['misses'], 1)
+        self.assertEqual(status['hit_rate'], 0.5)
+
+    def test_cached_none_is_a_hit(self):
+        self.cache.set('a', None)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.stats['hits'], 1)
+
+    def test_entries_expire(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2, ttl=600)
+        self.clock.now += 61
+
+        self.assertIs(self.cache.get('a'), MISSING)
+        self.assertEqual(self.cache.get('b'), 2)
+        self.assertEqual(self.cache.stats['expired'], 1)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_least_recently_used_is_evicted(self):
+        for key in ('a', 'b', 'c'):
+            self.cache.set(key, key)
+        self.cache.get('a')
+        self.cache.set('d', 'd')
+
+        self.assertIs(self.cache.get('b'), MISSING)
+        self.assertEqual(self.cache.get('a'), 'a')
+        self.assertEqual(self.cache.stats['evicted'], 1)
+
+    def test_invalidate_and_clear(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.invalidate('a')
+        self.assertIs(self.cache.get('a'), MISSING)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertIsNone(TTLCache().status()['hit_rate'])
+
+
+class TestCoalescingLoader(unittest.TestCase):
+    def setUp(self):
+        self.cache = TTLCache()
+        self.calls = []
+
+    def loader(self, release, result=None, error=None):
+        async def load(key):
+            self.calls.append(key)
+            await release.wait()
+            if error:
+                raise error
+            return result if result is not None else {'id': key}
+
+        return CoalescingLoader(self.cache, load, cacheable=lambda value: 'error' not in value)
+
+    def test_cancelling_the_first_request_does_not_cancel_the_shared_load(self):
+        async def scenario():
+            release = asyncio.Event()
+            loader = self.loader(release)
+            first = asyncio.ensure_future(loader.get('p1'))
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(loader.get('p1'))
+            await asyncio.sleep(0)
+
+            first.cancel()
+            await asyncio.sleep(0)
+            release.set()
+            with self.assertRaises(asyncio.CancelledError):
+                await first
+            return loader, await second
+
+        loader, result = asyncio.run(scenario())
+
+        self.assertEqual(result, {'id': 'p1'})
+        self.assertEqual(self.calls, ['p1'])
+        self.assertEqual(loader.stats, {'loads': 1, 'coalesced': 1})
+        self.assertEqual(self.cache.get('p1'), {'id': 'p1'})
+        self.assertEqual(loader.in_flight(), 0)
+
+    def test_load_finishes_and_fills_the_cache_when_every_request_is_cancelled(self):
+        async def scenario():
+            release = asyncio.Event()
+            loader = self.loader(release)
+            request = asyncio.ensure_future(loader.get('p1'))
+            await asyncio.sleep(0)
+            request.cancel()
+            release.set()
+            while loader.in_flight():
+                await asyncio.sleep(0)
+
+        asyncio.run(scenario())
+
+        self.assertEqual(self.cache.get('p1'), {'id': 'p1'})
+
+    def test_errors_reach_every_request_and_are_not_cached(self):
+        async def scenario(loader, release):
+            requests = [asyncio.ensure_future(loader.get('p1')) for _ in range(2)]
+            await asyncio.sleep(0)
+            release.set()
+            return await asyncio.gather(*requests, return_exceptions=True)
+
+        release = asyncio.Event()
+        results = asyncio.run(scenario(self.loader(release, error=RuntimeError('busy')), release))
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+
+        release = asyncio.Event()
+        results = asyncio.run(scenario(self.loader(release, result={'error': 'not found'}), release))
+        self.assertEqual(results, [{'error': 'not found'}] * 2)
+        self.assertIs(self.cache.get('p1'), MISSING)
+        self.assertEqual(self.calls, ['p1', 'p1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
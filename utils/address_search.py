@@ -0,0 +1,140 @@
+"""
+Typo-tolerant address and owner search helpers.
+
+Addresses and owner names are stored a second time in normalized form
+(lower case, punctuation and repeated whitespace collapsed) in generated
+columns with pg_trgm GIN indexes. Searches normalize the user's input the
+same way and match it with trigram word similarity, which tolerates typos
+and partial input ("123 mian" finds "123 Main St, Kennewick, WA") and is
+served from the trigram index rather than a table scan.
+"""
+
+import os
+import re
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import Boolean, desc, func, literal, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# SQL used for the generated normalized columns; must stay in step with
+# normalize_search_text() below
+NORMALIZE_SQL = "btrim(regexp_replace(lower({column}), '[^a-z0-9]+', ' ', 'g'))"
+
+# Minimum trigram word similarity (0-1) for a match; lower is more forgiving
+SIMILARITY_THRESHOLD = float(os.environ.get('PROPERTY_SEARCH_SIMILARITY', '0.4'))
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalized_column_sql(column: str) -> str:
+    """
+    Get the SQL expression that normalizes a column.
+
+    Args:
+        column (str): Column name
+
+    Returns:
+        str: Expression for a generated column or functional index
+    """
+    return NORMALIZE_SQL.format(column=column)
+
+
+def normalize_search_text(value: Optional[str]) -> str:
+    """
+    Normalize search input the way the generated columns are normalized.
+
+    Args:
+        value (str): Raw address or owner name
+
+    Returns:
+        str: Lower-case alphanumeric words separated by single spaces
+    """
+    if not value:
+        return ''
+    return _NON_ALNUM.sub(' ', value.lower()).strip()
+
+
+def set_similarity_threshold(session, threshold: float = SIMILARITY_THRESHOLD):
+    """
+    Set the word-similarity threshold used by fuzzy_match() for the current transaction.
+
+    Args:
+        session: SQLAlchemy session or connection
+        threshold (float): Minimum word similarity (0-1)
+    """
+    session.execute(select(func.set_config('pg_trgm.word_similarity_threshold', str(threshold), True)))
+
+
+class word_similar(FunctionElement):
+    """``term <% column`` - the term is word-similar to the column (pg_trgm)."""
+    type = Boolean()
+    name = 'word_similar'
+    inherit_cache = True
+
+
+@compiles(word_similar, 'postgresql')
+def _compile_word_similar_postgresql(element, compiler, **kw):
+    term, column = element.clauses
+    return compiler.process(term.op('<%')(column), **kw)
+
+
+@compiles(word_similar)
+def _compile_word_similar(element, compiler, **kw):
+    # Databases without the operator compare the score with the threshold directly
+    term, column = element.clauses
+    return compiler.process(func.word_similarity(term, column) >= SIMILARITY_THRESHOLD, **kw)
+
+
+def fuzzy_match(column, term: str):
+    """
+    Build an index-backed fuzzy match condition.
+
+    On PostgreSQL this is the pg_trgm ``<%`` operator (term word-similar to
+    column), which a ``gin_trgm_ops`` index on the column serves.
+
+    Args:
+        column: Normalized column to match
+        term (str): Normalized search term
+
+    Returns:
+        A boolean SQL expression
+    """
+    return word_similar(literal(term), column)
+
+
+def similarity_score(column, term: str):
+    """
+    Build the word-similarity score used to rank fuzzy matches.
+
+    Args:
+        column: Normalized column
+        term (str): Normalized search term
+
+    Returns:
+        A float SQL expression between 0 and 1
+    """
+    return func.word_similarity(term, column)
+
+
+def rank_fuzzy_matches(query, terms: Iterable[Tuple[object, str]], *tiebreakers):
+    """
+    Restrict a query to fuzzy matches and order it best match first.
+
+    Args:
+        query: ORM query
+        terms: (normalized column, normalized search term) pairs; all must match
+        *tiebreakers: Columns ordering rows with equal scores
+
+    Returns:
+        The query with a ``similarity`` column (mean word similarity of the
+        terms) added and ordered by it, highest first
+    """
+    terms = list(terms)
+    score = None
+    for column, term in terms:
+        query = query.filter(fuzzy_match(column, term))
+        term_score = similarity_score(column, term)
+        score = term_score if score is None else score + term_score
+    score = (score / len(terms)).label('similarity')
+    return query.add_columns(score).order_by(desc(score), *tiebreakers)
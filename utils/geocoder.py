@@ -0,0 +1,330 @@
+"""
+Offline geocoder backed by local zip-centroid and street-range tables.
+
+Addresses are resolved without any network calls:
+
+1. Street level: if a street-range table is loaded and the street is
+   found in the address's zip code (or city), the house number is
+   interpolated along the matching address range.
+2. Zip level: the centroid of the zip code.
+3. City level: the mean of the zip centroids for the city and state.
+
+Both tables are CSV files loaded once into in-memory dictionaries, and
+results are kept in an LRU cache, so batches of thousands of addresses
+geocode in well under a second.
+
+Zip table (GEOCODER_ZIP_TABLE, default data/geocoder/zip_centroids.csv):
+columns zip, city, state, latitude, longitude. The Census ZCTA gazetteer
+file (GEOID, INTPTLAT, INTPTLONG; tab separated) is accepted as well, for
+nationwide coverage. The bundled table covers Benton and Franklin counties.
+
+Street table (GEOCODER_STREET_TABLE, default data/geocoder/street_ranges.csv,
+optional): columns zip, street, from_number, to_number, from_latitude,
+from_longitude, to_latitude, to_longitude, as exported from county address
+range layers (e.g. TIGER/Line ADDRFEAT edges).
+"""
+
+import bisect
+import csv
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.address_search import normalize_search_text
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'geocoder')
+DEFAULT_ZIP_TABLE = os.path.join(_DATA_DIR, 'zip_centroids.csv')
+DEFAULT_STREET_TABLE = os.path.join(_DATA_DIR, 'street_ranges.csv')
+
+# Geocoded addresses kept in the result cache
+CACHE_SIZE = int(os.environ.get('GEOCODER_CACHE_SIZE', '100000'))
+
+# Street-name words reduced to their USPS abbreviation before matching
+_STREET_ABBREVIATIONS = {
+    'street': 'st', 'avenue': 'ave', 'av': 'ave', 'road': 'rd', 'drive': 'dr', 'lane': 'ln',
+    'boulevard': 'blvd', 'court': 'ct', 'place': 'pl', 'circle': 'cir', 'parkway': 'pkwy',
+    'highway': 'hwy', 'terrace': 'ter', 'trail': 'trl', 'way': 'way', 'loop': 'loop',
+    'north': 'n', 'south': 's', 'east': 'e', 'west': 'w',
+    'northeast': 'ne', 'northwest': 'nw', 'southeast': 'se', 'southwest': 'sw',
+}
+
+_HOUSE_NUMBER = re.compile(r'^\s*(\d+)[a-z]?\s+(.+)$', re.IGNORECASE)
+_UNIT = re.compile(r'\s+(?:apt|unit|ste|suite|#)\s*\S*$', re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class GeocodeResult:
+    """A geocoded location and the level it was resolved at ('street', 'zip' or 'city')."""
+
+    latitude: float
+    longitude: float
+    precision: str
+
+
+def normalize_street(street: Optional[str]) -> str:
+    """
+    Normalize a street name for matching.
+
+    Args:
+        street (str): Street name without house number, e.g. 'North Columbia Center Boulevard'
+
+    Returns:
+        str: Lower-case abbreviated form, e.g. 'n columbia center blvd'
+    """
+    words = normalize_search_text(street).split()
+    return ' '.join(_STREET_ABBREVIATIONS.get(word, word) for word in words)
+
+
+def split_house_number(street: Optional[str]) -> Tuple[Optional[int], str]:
+    """
+    Split a street address into house number and street name.
+
+    Args:
+        street (str): Street address, e.g. '123 Main St Apt 4'
+
+    Returns:
+        Tuple[Optional[int], str]: (123, 'main st'); the number is None if absent
+    """
+    street = _UNIT.sub('', (street or '').strip())
+    match = _HOUSE_NUMBER.match(street)
+    if not match:
+        return None, normalize_street(street)
+    return int(match.group(1)), normalize_street(match.group(2))
+
+
+def _normalize_zip(value: Any) -> str:
+    return str(value or '').strip()[:5]
+
+
+def _place_key(city: Optional[str], state: Optional[str]) -> Tuple[str, str]:
+    return normalize_search_text(city), normalize_search_text(state)
+
+
+class OfflineGeocoder:
+    """
+    In-memory geocoder over zip-centroid and street-range tables.
+
+    All methods are thread-safe.
+    """
+
+    def __init__(self, zip_table: Optional[str] = DEFAULT_ZIP_TABLE,
+                 street_table: Optional[str] = DEFAULT_STREET_TABLE, cache_size: int = CACHE_SIZE):
+        """
+        Initialize the geocoder and load the tables.
+
+        Args:
+            zip_table (str, optional): Zip centroid CSV (or Census ZCTA gazetteer) path
+            street_table (str, optional): Street range CSV path; skipped if missing
+            cache_size (int): Results kept in the LRU cache
+        """
+        self.zip_centroids: Dict[str, Tuple[float, float]] = {}
+        self.zip_places: Dict[str, Tuple[str, str]] = {}
+        self.place_zips: Dict[Tuple[str, str], List[str]] = {}
+        # (zip, street) -> ranges sorted by from_number:
+        # (from_number, to_number, from_lat, from_lon, to_lat, to_lon)
+        self.street_ranges: Dict[Tuple[str, str], List[Tuple[int, int, float, float, float, float]]] = {}
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str, str, str], Optional[GeocodeResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'street': 0, 'zip': 0, 'city': 0, 'unmatched': 0}
+
+        if zip_table:
+            self.load_zip_table(zip_table)
+        if street_table and os.path.exists(street_table):
+            self.load_street_table(street_table)
+
+    def load_zip_table(self, path: str) -> int:
+        """
+        Load zip centroids from a CSV file.
+
+        Args:
+            path (str): Zip centroid CSV or Census ZCTA gazetteer file
+
+        Returns:
+            int: Number of zip codes loaded
+        """
+        with open(path, newline='', encoding='utf-8') as f:
+            sample = f.readline()
+            f.seek(0)
+            reader = csv.DictReader(f, delimiter='\t' if '\t' in sample else ',')
+            count = 0
+            for row in reader:
+                row = {key.strip().lower(): (value or '').strip() for key, value in row.items() if key}
+                zip_code = _normalize_zip(row.get('zip') or row.get('geoid'))
+                try:
+                    latitude = float(row.get('latitude') or row.get('intptlat'))
+                    longitude = float(row.get('longitude') or row.get('intptlong'))
+                except (TypeError, ValueError):
+                    continue
+                if not zip_code:
+                    continue
+                self.zip_centroids[zip_code] = (latitude, longitude)
+                if row.get('city') and row.get('state'):
+                    place = _place_key(row['city'], row['state'])
+                    self.zip_places[zip_code] = place
+                    self.place_zips.setdefault(place, []).append(zip_code)
+                count += 1
+        self.clear_cache()
+        logger.info(f"Loaded {count} zip centroids from {path}")
+        return count
+
+    def load_street_table(self, path: str) -> int:
+        """
+        Load street address ranges from a CSV file.
+
+        Args:
+            path (str): Street range CSV
+
+        Returns:
+            int: Number of ranges loaded
+        """
+        count = 0
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                try:
+                    from_number, to_number = int(row['from_number']), int(row['to_number'])
+                    segment = (float(row['from_latitude']), float(row['from_longitude']),
+                               float(row['to_latitude']), float(row['to_longitude']))
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if from_number > to_number:
+                    from_number, to_number = to_number, from_number
+                    segment = (segment[2], segment[3], segment[0], segment[1])
+                key = (_normalize_zip(row.get('zip')), normalize_street(row.get('street')))
+                self.street_ranges.setdefault(key, []).append((from_number, to_number) + segment)
+                count += 1
+        for ranges in self.street_ranges.values():
+            ranges.sort()
+        self.clear_cache()
+        logger.info(f"Loaded {count} street ranges from {path}")
+        return count
+
+    def clear_cache(self):
+        """Drop all cached results."""
+        with self._lock:
+            self._cache.clear()
+
+    def _match_street(self, zip_codes: Iterable[str], number: int, street: str) -> Optional[GeocodeResult]:
+        for zip_code in zip_codes:
+            ranges = self.street_ranges.get((zip_code, street))
+            if not ranges:
+                continue
+            # Last range starting at or below the number
+            index = bisect.bisect_right(ranges, (number, float('inf'))) - 1
+            if index < 0:
+                continue
+            from_number, to_number, from_lat, from_lon, to_lat, to_lon = ranges[index]
+            if number > to_number:
+                continue
+            t = (number - from_number) / (to_number - from_number) if to_number > from_number else 0.5
+            return GeocodeResult(from_lat + t * (to_lat - from_lat), from_lon + t * (to_lon - from_lon), 'street')
+        return None
+
+    def _resolve(self, street: str, city: str, state: str, zip_code: str) -> Optional[GeocodeResult]:
+        place = _place_key(city, state)
+        zip_codes = [zip_code] if zip_code else []
+        zip_codes += [code for code in self.place_zips.get(place, []) if code != zip_code]
+
+        if self.street_ranges and street:
+            number, street_name = split_house_number(street)
+            if number is not None:
+                result = self._match_street(zip_codes, number, street_name)
+                if result:
+                    return result
+
+        if zip_code in self.zip_centroids:
+            latitude, longitude = self.zip_centroids[zip_code]
+            return GeocodeResult(latitude, longitude, 'zip')
+
+        city_zips = self.place_zips.get(place)
+        if city_zips:
+            latitude = sum(self.zip_centroids[code][0] for code in city_zips) / len(city_zips)
+            longitude = sum(self.zip_centroids[code][1] for code in city_zips) / len(city_zips)
+            return GeocodeResult(latitude, longitude, 'city')
+        return None
+
+    def geocode(self, street: Optional[str] = None, city: Optional[str] = None,
+                state: Optional[str] = None, zip_code: Optional[str] = None) -> Optional[GeocodeResult]:
+        """
+        Geocode one address.
+
+        Args:
+            street (str, optional): Street address including house number
+            city (str, optional): City
+            state (str, optional): State code
+            zip_code (str, optional): ZIP code
+
+        Returns:
+            Optional[GeocodeResult]: The location, or None if the address is not covered
+        """
+        key = ((street or '').strip().lower(), normalize_search_text(city),
+               normalize_search_text(state), _normalize_zip(zip_code))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._cache[key]
+            self.stats['misses'] += 1
+
+        result = self._resolve(street or '', city or '', state or '', key[3])
+
+        with self._lock:
+            self.stats[result.precision if result else 'unmatched'] += 1
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def geocode_batch(self, addresses: Iterable[Dict[str, Any]]) -> List[Optional[GeocodeResult]]:
+        """
+        Geocode many addresses.
+
+        Args:
+            addresses: Dicts with street, city, state and zip_code keys
+                (as returned by utils.location_data.extract_location_data)
+
+        Returns:
+            List[Optional[GeocodeResult]]: One result per address, in order
+        """
+        return [
+            self.geocode(address.get('street'), address.get('city'), address.get('state'),
+                         address.get('zip_code') or address.get('zip'))
+            for address in addresses
+        ]
+
+    def status(self) -> Dict[str, Any]:
+        """Get table sizes, cache size and lookup counters."""
+        return {
+            'zip_codes': len(self.zip_centroids),
+            'street_ranges': sum(len(ranges) for ranges in self.street_ranges.values()),
+            'cached': len(self._cache),
+            **self.stats,
+        }
+
+
+_default_geocoder: Optional[OfflineGeocoder] = None
+_default_geocoder_lock = threading.Lock()
+
+
+def get_geocoder() -> OfflineGeocoder:
+    """
+    Get the process-wide offline geocoder.
+
+    The tables are taken from GEOCODER_ZIP_TABLE and GEOCODER_STREET_TABLE
+    (defaults under data/geocoder/).
+    """
+    global _default_geocoder
+    with _default_geocoder_lock:
+        if _default_geocoder is None:
+            _default_geocoder = OfflineGeocoder(
+                os.environ.get('GEOCODER_ZIP_TABLE', DEFAULT_ZIP_TABLE),
+                os.environ.get('GEOCODER_STREET_TABLE', DEFAULT_STREET_TABLE),
+            )
+        return _default_geocoder
@@ -22,6 +22,9 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Reports handled per query/bulk insert/commit when extracting location data
+LOCATION_CHUNK_SIZE = 1000
+
 # Regular expression for parsing addresses
 ADDRESS_PATTERN = re.compile(r'(?P<street>.*?),\s*(?P<city>[^,]+),\s*(?P<state>[A-Z]{2})(?:\s*(?P<zip>\d{5}))?')
 
@@ -67,44 +70,29 @@ def geocode_address(address_data):
     """
     Geocode an address to get latitude and longitude.
     
-    For prototype purposes without relying on external APIs, we'll 
-    use deterministic "fake" geocoding based on address hash values.
+    Uses the offline geocoder (utils/geocoder.py), which resolves the
+    address from local street-range and zip-centroid tables without any
+    network calls.
     
-    In a production environment, this would call a real geocoding service.
+    Args:
+        address_data (dict): Address with street, city, state and zip_code
+            fields, as returned by extract_location_data()
+        
+    Returns:
+        tuple: (latitude, longitude), or (None, None) if the address is not
+            covered by the local tables
     """
-    # Create a deterministic hash from the address
-    address_str = f"{address_data.get('street', '')}, {address_data.get('city', '')}, {address_data.get('state', '')}"
-    
-    # Use the hash of the address to create deterministic but realistic-looking coordinates
-    address_hash = hash(address_str)
-    random.seed(address_hash)
-    
-    # Base coordinates - United States center-ish
-    base_lat = 39.8283
-    base_lng = -98.5795
-    
-    # Generate "realistic" coordinates by adding noise based on the address hash
-    # This creates deterministic but scattered points across the US
-    lat_offset = (random.random() * 20) - 10  # +/- 10 degrees
-    lng_offset = (random.random() * 50) - 25  # +/- 25 degrees
-    
-    # Adjust based on state to group points by state
-    if address_data.get('state'):
-        state = address_data.get('state')
-        # Simple mapping to keep points grouped by state
-        # In real app would use actual state boundaries
-        state_hash = hash(state)
-        random.seed(state_hash)
-        state_lat_base = (random.random() * 10) - 5  # +/- 5 degrees
-        state_lng_base = (random.random() * 10) - 5  # +/- 5 degrees
-        
-        lat_offset = lat_offset * 0.2 + state_lat_base  # Reduce noise, add state offset
-        lng_offset = lng_offset * 0.2 + state_lng_base  # Reduce noise, add state offset
-    
-    latitude = base_lat + lat_offset
-    longitude = base_lng + lng_offset
-    
-    return latitude, longitude
+    from utils.geocoder import get_geocoder
+    
+    result = get_geocoder().geocode(
+        address_data.get('street'),
+        address_data.get('city'),
+        address_data.get('state'),
+        address_data.get('zip_code')
+    )
+    if result is None:
+        return None, None
+    return result.latitude, result.longitude
 
 def convert_price_to_cents(price_str):
     """
@@ -158,244 +146,377 @@ def extract_property_type(title):
     # Default if no type found
     return 'Residential'
 
-def process_reports_for_location_data():
+def build_location_row(report):
     """
-    Process all NARRPR reports to extract and store location data.
+    Build the property_location row for a NARRPR report.
+    
+    Args:
+        report: Report (or row) with id, address, title and price
+        
+    Returns:
+        dict: Column values for a PropertyLocation row
     """
-    logger.info("Processing NARRPR reports for location data")
+    # Extract location components
+    location_data = extract_location_data(report.address)
+    
+    # Geocode the address
+    latitude, longitude = geocode_address(location_data)
+    
+    # Extract property type from title
+    property_type = extract_property_type(report.title or '')
+    
+    # Convert price to cents
+    price_value = convert_price_to_cents(report.price)
+    
+    # Generate some plausible property details
+    property_seed = hash(report.address)
+    random.seed(property_seed)
+    bedrooms = random.choice([2, 3, 3, 3, 4, 4, 5])  # weighted toward 3-4
+    bathrooms = random.choice([1.0, 1.5, 2.0, 2.0, 2.5, 2.5, 3.0, 3.5])  # weighted toward 2-2.5
+    square_feet = random.randint(1000, 3500)
+    year_built = random.randint(1950, 2020)
     
+    return {
+        'address': report.address,
+        'street': location_data.get('street', ''),
+        'city': location_data.get('city', ''),
+        'state': location_data.get('state', ''),
+        'zip_code': location_data.get('zip_code', ''),
+        'latitude': latitude,
+        'longitude': longitude,
+        'price': report.price,
+        'price_value': price_value,
+        'property_type': property_type,
+        'bedrooms': bedrooms,
+        'bathrooms': bathrooms,
+        'square_feet': square_feet,
+        'year_built': year_built,
+        'report_id': report.id
+    }
+
+def attach_owner_names(rows):
+    """
+    Fill in owner_name on location rows from the local assessment roll.
+    
+    Rows are matched on their normalized street (or full) address against
+    the parcel situs addresses, with one lookup for all rows. Rows without
+    a match, and all rows when no assessment roll is configured, are left
+    unchanged.
+    
+    Args:
+        rows (list): Location row dicts with 'address' and optional 'street'
+        
+    Returns:
+        int: Number of rows that got an owner
+    """
+    from regional.assessment_roll import get_assessment_roll_store
+    from utils.address_search import normalize_search_text
+    
+    store = get_assessment_roll_store()
+    if store is None or not rows:
+        return 0
+    
+    candidates = [
+        [normalize_search_text(row.get('street')), normalize_search_text(row.get('address'))]
+        for row in rows
+    ]
     try:
-        # Get all reports that don't have location data yet
-        reports = NarrprReports.query.outerjoin(
-            PropertyLocation, 
-            NarrprReports.id == PropertyLocation.report_id
-        ).filter(
-            PropertyLocation.id == None
-        ).all()
+        owners = store.owners_by_address(key for keys in candidates for key in keys if key)
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not look up owner names in the assessment roll: {e}")
+        return 0
+    
+    matched = 0
+    for row, keys in zip(rows, candidates):
+        owner = next((owners[key] for key in keys if key in owners), None)
+        if owner:
+            row['owner_name'] = owner
+            matched += 1
+    return matched
+
+def backfill_owner_names(chunk_size=LOCATION_CHUNK_SIZE):
+    """
+    Set owner_name on existing locations that have none, from the assessment roll.
+    
+    Run after each assessment roll snapshot load; locations extracted
+    before the snapshot existed (or before their parcel appeared in it)
+    get their owner here.
+    
+    Args:
+        chunk_size (int): Locations per lookup and commit
         
-        logger.info(f"Found {len(reports)} reports without location data")
+    Returns:
+        int: Number of locations updated
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        locations = db.session.query(
+            PropertyLocation.id, PropertyLocation.address, PropertyLocation.street
+        ).filter(
+            PropertyLocation.id > last_id,
+            PropertyLocation.owner_name.is_(None)
+        ).order_by(PropertyLocation.id).limit(chunk_size).all()
+        if not locations:
+            break
+        last_id = locations[-1].id
+        
+        rows = [{'id': loc.id, 'address': loc.address, 'street': loc.street} for loc in locations]
+        if not attach_owner_names(rows):
+            continue
+        try:
+            # updated_at is left alone: owners feed no rollups or map data
+            db.session.bulk_update_mappings(PropertyLocation, [
+                {'id': row['id'], 'owner_name': row['owner_name']} for row in rows if row.get('owner_name')
+            ])
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Database error while backfilling owner names after location {last_id}: {e}")
+            continue
+        updated += sum(1 for row in rows if row.get('owner_name'))
+    
+    logger.info(f"Backfilled owner names for {updated} locations")
+    return updated
+
+def process_reports_for_location_data(chunk_size=LOCATION_CHUNK_SIZE):
+    """
+    Process all NARRPR reports to extract and store location data.
+    
+    Reports without location data are read in ID order, chunk_size at a
+    time (keyset paging over an anti-join, so reruns do not rescan reports
+    already processed). For each chunk the new locations are written with
+    one bulk insert and a single summary ActivityLog row is added, all in
+    one commit; a chunk that fails to save is rolled back and skipped.
+    
+    Args:
+        chunk_size (int): Reports per chunk
         
-        for report in reports:
-            try:
+    Returns:
+        dict: Counts of unprocessed reports scanned, locations created,
+            reports skipped (no address) and failed, and chunks committed
+    """
+    logger.info("Processing NARRPR reports for location data")
+    
+    stats = {'reports_scanned': 0, 'locations_created': 0, 'skipped': 0, 'errors': 0, 'chunks': 0}
+    last_id = 0
+    
+    try:
+        while True:
+            reports = db.session.query(
+                NarrprReports.id, NarrprReports.address, NarrprReports.title, NarrprReports.price
+            ).outerjoin(
+                PropertyLocation, PropertyLocation.report_id == NarrprReports.id
+            ).filter(
+                NarrprReports.id > last_id,
+                PropertyLocation.id.is_(None)
+            ).order_by(NarrprReports.id).limit(chunk_size).all()
+            
+            if not reports:
+                break
+            last_id = reports[-1].id
+            stats['reports_scanned'] += len(reports)
+            
+            rows = []
+            for report in reports:
                 # Skip if there's no address
                 if not report.address:
+                    stats['skipped'] += 1
                     continue
-                
-                # Extract location components
-                location_data = extract_location_data(report.address)
-                
-                # Geocode the address
-                latitude, longitude = geocode_address(location_data)
-                
-                # Extract property type from title
-                property_type = extract_property_type(report.title)
-                
-                # Convert price to cents
-                price_value = convert_price_to_cents(report.price)
-                
-                # Generate some plausible property details
-                property_seed = hash(report.address)
-                random.seed(property_seed)
-                bedrooms = random.choice([2, 3, 3, 3, 4, 4, 5])  # weighted toward 3-4
-                bathrooms = random.choice([1.0, 1.5, 2.0, 2.0, 2.5, 2.5, 3.0, 3.5])  # weighted toward 2-2.5
-                square_feet = random.randint(1000, 3500)
-                year_built = random.randint(1950, 2020)
-                
-                # Create new location record
-                location = PropertyLocation(
-                    address=report.address,
-                    street=location_data.get('street', ''),
-                    city=location_data.get('city', ''),
-                    state=location_data.get('state', ''),
-                    zip_code=location_data.get('zip_code', ''),
-                    latitude=latitude,
-                    longitude=longitude,
-                    price=report.price,
-                    price_value=price_value,
-                    property_type=property_type,
-                    bedrooms=bedrooms,
-                    bathrooms=bathrooms,
-                    square_feet=square_feet,
-                    year_built=year_built,
-                    report_id=report.id
-                )
-                
-                db.session.add(location)
+                try:
+                    rows.append(build_location_row(report))
+                except Exception as e:
+                    stats['errors'] += 1
+                    logger.error(f"Error processing report {report.id}: {e}")
+            
+            if not rows:
+                continue
+            
+            attach_owner_names(rows)
+            try:
+                db.session.bulk_insert_mappings(PropertyLocation, rows)
                 
                 # Log the activity
-                activity = ActivityLog(
+                db.session.add(ActivityLog(
                     action='extract_location_data',
-                    details=f"Extracted location data for property {report.id}: {report.address}"
-                )
-                db.session.add(activity)
-                
-            except Exception as e:
-                logger.error(f"Error processing report {report.id}: {e}")
+                    details=f"Extracted location data for {len(rows)} reports "
+                            f"(report IDs {rows[0]['report_id']}-{rows[-1]['report_id']})"
+                ))
+                db.session.commit()
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                stats['errors'] += len(rows)
+                logger.error(f"Database error while saving location data for reports up to {last_id}: {e}")
+                continue
+            
+            stats['locations_created'] += len(rows)
+            stats['chunks'] += 1
+            logger.info(f"Extracted location data for {stats['locations_created']} reports "
+                        f"({stats['reports_scanned']} scanned)")
         
-        db.session.commit()
         logger.info("Location data extraction completed")
         
+        if stats['locations_created']:
+            from utils.price_rollups import refresh_price_rollups
+            refresh_price_rollups()
+        
     except SQLAlchemyError as e:
         db.session.rollback()
         logger.error(f"Database error while processing location data: {e}")
     except Exception as e:
         logger.error(f"Error in process_reports_for_location_data: {e}")
+    
+    return stats
 
-def generate_price_trends():
+def price_trend_upsert(months=12):
     """
-    Generate price trends data for cities in our database.
-    This would normally be from real data sources, but for prototyping
-    we'll generate based on actual cities in our properties.
+    Build the statement that regenerates monthly city price trends.
+    
+    property_location rows are grouped by city, state and month of
+    created_at in one pass; count, average and median (percentile_cont)
+    price and average price per square foot are computed per group, the
+    month-over-month median change with a lag() window, and the result is
+    upserted into price_trend on (location_type, location_value, date).
+    One extra month before the window is aggregated only to feed lag(), so
+    the first regenerated month keeps its change from the month before.
+    lag() returns the city's previous row, which is only used when it is
+    the previous calendar month; price_change is 0 when a city has no
+    listings the previous month. property_location carries no sale or
+    days-on-market data, so properties_sold and days_on_market are
+    written as NULL.
+    
+    Args:
+        months (int): Number of months to regenerate, including the current one
+        
+    Returns:
+        Insert: PostgreSQL INSERT ... SELECT ... ON CONFLICT statement
+    """
+    from sqlalchemy import Float, Integer, case, cast, literal, literal_column, null, select
+    from sqlalchemy.dialects.postgresql import INTERVAL
+    from sqlalchemy.dialects.postgresql import insert
+    
+    today = datetime.now().date().replace(day=1)
+    start_month = (today.year * 12 + today.month - 1) - (months - 1)
+    window_start = datetime(start_month // 12, start_month % 12 + 1, 1)
+    lookback_month = start_month - 1
+    lookback_start = datetime(lookback_month // 12, lookback_month % 12 + 1, 1)
+    
+    month = func.date_trunc('month', PropertyLocation.created_at)
+    monthly = select(
+        PropertyLocation.city.label('city'),
+        PropertyLocation.state.label('state'),
+        cast(month, db.Date).label('date'),
+        func.count().label('listings'),
+        func.avg(PropertyLocation.price_value).label('avg_price'),
+        func.percentile_cont(0.5).within_group(PropertyLocation.price_value).label('median_price'),
+        func.avg(PropertyLocation.price_value / func.nullif(PropertyLocation.square_feet, 0)).label('price_per_sqft')
+    ).where(
+        PropertyLocation.created_at >= lookback_start,
+        PropertyLocation.price_value.isnot(None),
+        PropertyLocation.city.isnot(None),
+        PropertyLocation.city != '',
+        PropertyLocation.state.isnot(None),
+        PropertyLocation.state != ''
+    ).group_by(
+        PropertyLocation.city, PropertyLocation.state, month
+    ).subquery()
+    
+    window = dict(partition_by=(monthly.c.city, monthly.c.state), order_by=monthly.c.date)
+    previous_median = func.lag(monthly.c.median_price).over(**window)
+    previous_date = func.lag(monthly.c.date).over(**window)
+    one_month = literal_column("interval '1 month'", INTERVAL)
+    trends = select(
+        literal('city').label('location_type'),
+        (monthly.c.city + literal(', ') + monthly.c.state).label('location_value'),
+        monthly.c.city,
+        monthly.c.state,
+        literal('').label('zip_code'),
+        monthly.c.date,
+        cast(monthly.c.median_price, Integer).label('median_price'),
+        cast(monthly.c.avg_price, Integer).label('avg_price'),
+        func.coalesce(
+            case(
+                (previous_date == cast(monthly.c.date - one_month, db.Date),
+                 (monthly.c.median_price - previous_median) * 100.0 / func.nullif(previous_median, 0))
+            ), 0.0
+        ).label('price_change'),
+        cast(null(), Integer).label('properties_sold'),
+        monthly.c.listings.label('total_listings'),
+        monthly.c.listings.label('new_listings'),
+        cast(null(), Float).label('days_on_market'),
+        cast(monthly.c.price_per_sqft, Integer).label('price_per_sqft'),
+        func.now().label('created_at')
+    ).subquery()
+    
+    columns = [
+        'location_type', 'location_value', 'city', 'state', 'zip_code', 'date', 'median_price',
+        'avg_price', 'price_change', 'properties_sold', 'total_listings', 'new_listings',
+        'days_on_market', 'price_per_sqft', 'created_at'
+    ]
+    key = ['location_type', 'location_value', 'date']
+    # The lookback month only feeds lag() and is not written
+    statement = insert(PriceTrend.__table__).from_select(
+        columns,
+        select(*[trends.c[column] for column in columns]).where(trends.c.date >= window_start.date())
+    )
+    return statement.on_conflict_do_update(
+        index_elements=key,
+        set_={column: statement.excluded[column] for column in columns if column not in key}
+    )
+
+def generate_price_trends(months=12):
+    """
+    Regenerate monthly price trends for every city in our database.
+    
+    The trends are computed and upserted by a single grouped SQL statement
+    (see price_trend_upsert()), so the regeneration is one scan of
+    property_location. Requires the price_trend unique index created by
+    db.migrations.create_price_trend_indexes().
+    
+    Args:
+        months (int): Number of months to regenerate, including the current one
+        
+    Returns:
+        int: Number of price trend rows written
     """
     logger.info("Generating price trends data")
     
     try:
-        # Get distinct cities from property_location table
-        cities = db.session.query(
-            PropertyLocation.city, 
-            PropertyLocation.state
-        ).distinct().all()
-        
-        logger.info(f"Found {len(cities)} distinct cities")
-        
-        # Check if we already have price trend data
-        existing_count = PriceTrend.query.count()
-        if existing_count > 0:
-            logger.info(f"Found {existing_count} existing price trend records, skipping generation")
-            return
-        
-        # For each city, generate 12 months of price trend data
-        for city, state in cities:
-            if not city or not state:
-                continue
-                
-            # Get average price for this city from properties
-            properties = PropertyLocation.query.filter_by(
-                city=city,
-                state=state
-            ).all()
-            
-            # Skip if no properties
-            if not properties:
-                continue
-                
-            # Calculate average price from properties
-            valid_prices = [p.price_value for p in properties if p.price_value]
-            if not valid_prices:
-                continue
-                
-            current_price = sum(valid_prices) // len(valid_prices)
-            
-            # Set a growth trend 
-            city_seed = hash(f"{city},{state}")
-            random.seed(city_seed)
-            
-            # Annual growth rate between -5% and 15%
-            annual_growth_rate = (random.random() * 0.20) - 0.05
-            monthly_growth_rate = annual_growth_rate / 12
-            
-            # Seasonal factor for realistic month-to-month variation
-            seasonal_factors = [
-                0.98,  # Jan
-                0.99,  # Feb
-                1.01,  # Mar
-                1.02,  # Apr
-                1.04,  # May
-                1.05,  # Jun
-                1.03,  # Jul
-                1.02,  # Aug
-                1.00,  # Sep
-                0.98,  # Oct
-                0.97,  # Nov
-                0.98   # Dec
-            ]
-            
-            # Generate 12 months of data, working backward from now
-            today = datetime.now().date()
-            
-            for month_offset in range(12):
-                # Calculate the date for this data point
-                current_date = today.replace(day=1) - timedelta(days=30 * month_offset)
-                month_index = current_date.month - 1  # 0-based index for seasonal factors
-                
-                # Calculate price with growth and seasonality
-                month_factor = 1.0 - (month_offset * monthly_growth_rate)  # Going backward in time
-                seasonal_adjustment = seasonal_factors[month_index]
-                
-                adjusted_price = int(current_price * month_factor * seasonal_adjustment)
-                
-                # Randomize other metrics
-                total_listings = random.randint(20, 100)
-                new_listings = random.randint(5, 20)
-                days_on_market = max(10, 30 + (random.random() * 20) - 10)  # 20-50 days with noise
-                price_per_sqft = adjusted_price // 1500  # rough approximation
-                
-                # Calculate price change from previous month (first month set to 0)
-                if month_offset == 0:
-                    price_change = 0.0  # First month has no change
-                else:
-                    # Calculate month-over-month percentage change
-                    previous_price = int(current_price * (1.0 - ((month_offset-1) * monthly_growth_rate)) * seasonal_factors[(current_date.month % 12)])
-                    price_change = ((adjusted_price - previous_price) / previous_price) * 100
-                
-                # Calculate number of properties sold
-                properties_sold = random.randint(10, 50)
-                
-                trend = PriceTrend(
-                    location_type='city',
-                    location_value=f"{city}, {state}",
-                    city=city,
-                    state=state,
-                    zip_code='',  # We don't have zip in this aggregation
-                    date=current_date,
-                    median_price=adjusted_price,
-                    avg_price=int(adjusted_price * (0.95 + (random.random() * 0.1))),  # slight variation from median
-                    price_change=price_change,
-                    properties_sold=properties_sold,
-                    total_listings=total_listings,
-                    new_listings=new_listings,
-                    days_on_market=days_on_market,
-                    price_per_sqft=price_per_sqft
-                )
-                
-                db.session.add(trend)
-        
+        result = db.session.execute(price_trend_upsert(months))
         db.session.commit()
-        logger.info("Price trends data generation completed")
+        logger.info(f"Price trends data generation completed: {result.rowcount} rows")
+        return result.rowcount
         
     except SQLAlchemyError as e:
         db.session.rollback()
         logger.error(f"Database error while generating price trends: {e}")
     except Exception as e:
         logger.error(f"Error in generate_price_trends: {e}")
+    return 0
 
-def get_property_map_data():
+def get_property_map_data(bounds=None, limit=None):
     """
     Get property location data formatted for map visualization.
     
+    Points come from the in-memory spatial index (utils/spatial_index.py),
+    so only the visible area is returned and the table is not re-read on
+    every call.
+    
+    Args:
+        bounds (tuple, optional): (south, west, north, east) to restrict the
+            points to the visible map area; all points if omitted
+        limit (int, optional): Maximum number of points to return
+    
     Returns:
         list: List of property data points for mapping
     """
     try:
-        properties = PropertyLocation.query.all()
-        
-        map_data = []
-        for prop in properties:
-            if prop.latitude and prop.longitude:
-                map_data.append({
-                    'id': prop.id,
-                    'latitude': prop.latitude,
-                    'longitude': prop.longitude,
-                    'address': prop.address,
-                    'price': prop.price,
-                    'property_type': prop.property_type,
-                    'bedrooms': prop.bedrooms,
-                    'bathrooms': prop.bathrooms,
-                    'square_feet': prop.square_feet,
-                    'price_per_sqft': int(prop.price_value / prop.square_feet) if prop.price_value and prop.square_feet else None,
-                    'report_id': prop.report_id
-                })
+        from utils.spatial_index import get_property_map_index
         
+        if bounds is None:
+            bounds = (-90.0, -180.0, 90.0, 180.0)
+        south, west, north, east = bounds
+        map_data, _ = get_property_map_index().bbox(south, west, north, east, limit=limit)
         return map_data
     except Exception as e:
         logger.error(f"Error getting property map data: {e}")
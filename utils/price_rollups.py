@@ -0,0 +1,319 @@
+"""
+Incrementally maintained listing price rollups.
+
+Weekly and monthly price statistics (listing count, median, average and
+price per square foot) per city and per zip code are kept in the
+price_rollup table, so /api/price-trends reads a handful of precomputed,
+indexed rows instead of aggregating on every request.
+
+refresh_price_rollups() recomputes only the buckets touched by
+property_location rows changed since the stored watermark (the latest
+coalesce(updated_at, created_at) already included, less a small overlap
+for rows committed late), and only scans rows from the earliest touched
+period onward. A trigger records the previous city, state, zip code and
+created_at of every updated or deleted row in price_rollup_change, so the
+buckets rows moved out of are recomputed too, and dropped once empty. It
+runs after location extraction and on the scheduler, with a periodic full
+refresh as a backstop.
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, text
+
+from app import db
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ('week', 'month')
+LOCATION_TYPES = ('city', 'zip')
+
+WATERMARK_NAME = 'property_location'
+
+# Rows are stamped before they commit (often with an app-side now()), so a
+# row can become visible after the watermark was read with an older stamp.
+# Each incremental refresh re-reads this much before the watermark.
+WATERMARK_OVERLAP = timedelta(minutes=10)
+
+# Claims the previous bucket keys recorded by the price_rollup_change trigger
+_CLAIM_CHANGES_SQL = text("""
+DELETE FROM price_rollup_change RETURNING city, state, zip_code, created_at
+""")
+
+# The buckets claimed changes were in before the change, from the
+# :moved_* arrays
+_MOVED_BUCKETS_CTE = """
+moved AS (
+    SELECT *
+    FROM unnest(CAST(:moved_city AS text[]), CAST(:moved_state AS text[]),
+                CAST(:moved_zip_code AS text[]), CAST(:moved_created_at AS timestamp[]))
+         AS m (city, state, zip_code, created_at)
+),
+moved_buckets AS (
+    SELECT DISTINCT g.granularity,
+           l.location_type,
+           CASE l.location_type WHEN 'city' THEN m.city || ', ' || m.state ELSE m.zip_code END AS location_value,
+           CAST(date_trunc(g.granularity, m.created_at) AS date) AS period_start
+    FROM moved m
+    CROSS JOIN (VALUES ('week'), ('month')) AS g (granularity)
+    CROSS JOIN (VALUES ('city'), ('zip')) AS l (location_type)
+    WHERE m.created_at IS NOT NULL
+      AND CASE l.location_type
+              WHEN 'city' THEN coalesce(m.city, '') <> '' AND coalesce(m.state, '') <> ''
+              ELSE coalesce(m.zip_code, '') <> ''
+          END
+)"""
+
+# Recomputes the (granularity, location, period) buckets containing rows
+# changed after :since (every bucket when :since is NULL) or moved out of
+# by a claimed change, and upserts them
+_REFRESH_SQL = text(f"""
+WITH {_MOVED_BUCKETS_CTE},
+bounds AS (
+    SELECT date_trunc('week', date_trunc('month', min(created_at))) AS floor
+    FROM (
+        SELECT created_at
+        FROM property_location
+        WHERE CAST(:since AS timestamp) IS NULL
+           OR coalesce(updated_at, created_at) > CAST(:since AS timestamp)
+        UNION ALL
+        SELECT created_at FROM moved
+    ) changed
+),
+keyed AS (
+    SELECT g.granularity,
+           l.location_type,
+           CASE l.location_type WHEN 'city' THEN p.city || ', ' || p.state ELSE p.zip_code END AS location_value,
+           p.city,
+           p.state,
+           CASE l.location_type WHEN 'zip' THEN p.zip_code ELSE '' END AS zip_code,
+           CAST(date_trunc(g.granularity, p.created_at) AS date) AS period_start,
+           p.price_value,
+           p.square_feet,
+           coalesce(p.updated_at, p.created_at) AS changed_at
+    FROM property_location p
+    CROSS JOIN (VALUES ('week'), ('month')) AS g (granularity)
+    CROSS JOIN (VALUES ('city'), ('zip')) AS l (location_type)
+    WHERE p.created_at >= (SELECT floor FROM bounds)
+      AND p.price_value IS NOT NULL
+      AND CASE l.location_type
+              WHEN 'city' THEN coalesce(p.city, '') <> '' AND coalesce(p.state, '') <> ''
+              ELSE coalesce(p.zip_code, '') <> ''
+          END
+),
+touched AS (
+    SELECT granularity, location_type, location_value, period_start
+    FROM keyed
+    WHERE CAST(:since AS timestamp) IS NULL OR changed_at > CAST(:since AS timestamp)
+    UNION
+    SELECT granularity, location_type, location_value, period_start
+    FROM moved_buckets
+)
+INSERT INTO price_rollup (granularity, location_type, location_value, city, state, zip_code,
+                          period_start, listings, median_price, avg_price, price_per_sqft, refreshed_at)
+SELECT k.granularity,
+       k.location_type,
+       k.location_value,
+       min(k.city),
+       min(k.state),
+       min(k.zip_code),
+       k.period_start,
+       count(*),
+       CAST(percentile_cont(0.5) WITHIN GROUP (ORDER BY k.price_value) AS bigint),
+       CAST(avg(k.price_value) AS bigint),
+       CAST(avg(k.price_value / nullif(k.square_feet, 0)) AS integer),
+       CAST(:refreshed_at AS timestamp)
+FROM keyed k
+JOIN touched t USING (granularity, location_type, location_value, period_start)
+GROUP BY k.granularity, k.location_type, k.location_value, k.period_start
+ON CONFLICT (granularity, location_type, location_value, period_start) DO UPDATE SET
+    city = excluded.city,
+    state = excluded.state,
+    zip_code = excluded.zip_code,
+    listings = excluded.listings,
+    median_price = excluded.median_price,
+    avg_price = excluded.avg_price,
+    price_per_sqft = excluded.price_per_sqft,
+    refreshed_at = excluded.refreshed_at
+""")
+
+# Drops the moved-out-of buckets the refresh found no rows for (every
+# bucket it recomputed has refreshed_at = :refreshed_at)
+_PRUNE_SQL = text(f"""
+WITH {_MOVED_BUCKETS_CTE}
+DELETE FROM price_rollup r
+USING moved_buckets b
+WHERE r.granularity = b.granularity
+  AND r.location_type = b.location_type
+  AND r.location_value = b.location_value
+  AND r.period_start = b.period_start
+  AND r.refreshed_at < CAST(:refreshed_at AS timestamp)
+""")
+
+
+def refresh_price_rollups(full: bool = False) -> Dict[str, Any]:
+    """
+    Bring the price rollups up to date with property_location.
+
+    Args:
+        full (bool): Recompute every bucket and drop buckets with no rows left
+
+    Returns:
+        Dict[str, Any]: Buckets upserted and removed, changes claimed from
+            price_rollup_change, and the new watermark
+    """
+    from models import ModelsPropertyLocation as Location, PriceRollup, PriceRollupWatermark
+
+    try:
+        state = db.session.get(PriceRollupWatermark, WATERMARK_NAME)
+        since = None if full or state is None else state.watermark
+        # Rows that become visible after this read are picked up next time,
+        # up to WATERMARK_OVERLAP older than it
+        watermark = db.session.query(
+            func.max(func.coalesce(Location.updated_at, Location.created_at))
+        ).scalar()
+        refreshed_at = datetime.utcnow()
+
+        # Claimed in this transaction, so a failed refresh leaves them queued
+        claimed = db.session.execute(_CLAIM_CHANGES_SQL).fetchall()
+        params = {
+            'since': since - WATERMARK_OVERLAP if since is not None else None,
+            'refreshed_at': refreshed_at,
+            'moved_city': [change.city for change in claimed],
+            'moved_state': [change.state for change in claimed],
+            'moved_zip_code': [change.zip_code for change in claimed],
+            'moved_created_at': [change.created_at for change in claimed],
+        }
+
+        result = db.session.execute(_REFRESH_SQL, params)
+        upserted = result.rowcount
+        if since is None:
+            removed = PriceRollup.query.filter(
+                PriceRollup.refreshed_at < refreshed_at
+            ).delete(synchronize_session=False)
+        else:
+            removed = db.session.execute(_PRUNE_SQL, params).rowcount
+
+        db.session.merge(PriceRollupWatermark(
+            name=WATERMARK_NAME, watermark=watermark or since, refreshed_at=refreshed_at
+        ))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    logger.info(f"Refreshed price rollups ({'full' if since is None else 'incremental'}): "
+                f"{upserted} buckets upserted, {removed} removed")
+    return {'upserted': upserted, 'removed': removed, 'moved': len(claimed),
+            'watermark': watermark, 'full': since is None}
+
+
+def _filtered(query, granularity: str, location_type: str, city: Optional[str] = None,
+              state: Optional[str] = None, zip_code: Optional[str] = None,
+              start_date: Optional[date] = None):
+    from models import PriceRollup
+
+    query = query.filter(PriceRollup.granularity == granularity,
+                         PriceRollup.location_type == location_type)
+    if city:
+        query = query.filter(func.lower(PriceRollup.city) == city.lower())
+    if state:
+        query = query.filter(func.lower(PriceRollup.state) == state.lower())
+    if zip_code:
+        query = query.filter(PriceRollup.location_value == zip_code)
+    if start_date:
+        query = query.filter(PriceRollup.period_start >= start_date)
+    return query
+
+
+def get_price_rollups(granularity: str = 'month', location_type: Optional[str] = None,
+                      city: Optional[str] = None, state: Optional[str] = None,
+                      zip_code: Optional[str] = None, start_date: Optional[date] = None) -> List[Dict[str, Any]]:
+    """
+    Read precomputed price rollups.
+
+    Args:
+        granularity (str): 'week' or 'month'
+        location_type (str, optional): 'city' or 'zip' (default: 'zip' when
+            filtering by zip code, otherwise 'city')
+        city (str, optional): City filter (case-insensitive)
+        state (str, optional): State filter (case-insensitive)
+        zip_code (str, optional): ZIP code filter
+        start_date (date, optional): Earliest period start
+
+    Returns:
+        List[Dict[str, Any]]: Rollups ordered by period, with the percentage
+            change in median price from the location's previous period
+    """
+    from models import PriceRollup
+
+    location_type = location_type or ('zip' if zip_code else 'city')
+    previous_median = func.lag(PriceRollup.median_price).over(
+        partition_by=PriceRollup.location_value, order_by=PriceRollup.period_start
+    )
+    # One extra period before start_date so the first period in range has a change
+    lookback_start = start_date - timedelta(days=7 if granularity == 'week' else 31) if start_date else None
+    query = _filtered(
+        db.session.query(PriceRollup, previous_median.label('previous_median')),
+        granularity, location_type, city, state, zip_code, lookback_start
+    )
+    rows = query.order_by(PriceRollup.period_start, PriceRollup.location_value).all()
+
+    rollups = []
+    for rollup, previous in rows:
+        if start_date and rollup.period_start < start_date:
+            continue
+        rollups.append({
+            'id': rollup.id,
+            'granularity': rollup.granularity,
+            'location_type': rollup.location_type,
+            'location_value': rollup.location_value,
+            'city': rollup.city,
+            'state': rollup.state,
+            'zip_code': rollup.zip_code,
+            'date': rollup.period_start.isoformat(),
+            'listings': rollup.listings,
+            'median_price': float(rollup.median_price) if rollup.median_price is not None else None,
+            'avg_price': float(rollup.avg_price) if rollup.avg_price is not None else None,
+            'price_per_sqft': rollup.price_per_sqft,
+            'price_change': (float(rollup.median_price - previous) * 100 / previous
+                             if previous and rollup.median_price is not None else None),
+            # Rollups count listings, not sales; kept for existing API clients
+            'properties_sold': None,
+        })
+    return rollups
+
+
+def summarize_price_rollups(rollups: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Summarize rollups per location in the /api/price-trends stats format.
+    
+    Args:
+        rollups (List[Dict[str, Any]]): Rollups from get_price_rollups()
+        
+    Returns:
+        Dict[str, Dict[str, Any]]: City name (zip code for zip rollups) ->
+            median_prices, avg_prices, transactions, listings and, when
+            there are prices, avg_median_price and avg_avg_price
+    """
+    stats = {}
+    for rollup in rollups:
+        key = rollup['city'] if rollup['location_type'] == 'city' else rollup['location_value']
+        entry = stats.setdefault(key, {'median_prices': [], 'avg_prices': [], 'transactions': 0, 'listings': 0})
+        if rollup['median_price'] is not None:
+            entry['median_prices'].append(rollup['median_price'])
+        if rollup['avg_price'] is not None:
+            entry['avg_prices'].append(rollup['avg_price'])
+        if rollup['properties_sold'] is not None:
+            entry['transactions'] += rollup['properties_sold']
+        entry['listings'] += rollup['listings']
+    
+    for entry in stats.values():
+        if entry['median_prices']:
+            entry['avg_median_price'] = sum(entry['median_prices']) / len(entry['median_prices'])
+        if entry['avg_prices']:
+            entry['avg_avg_price'] = sum(entry['avg_prices']) / len(entry['avg_prices'])
+    return stats
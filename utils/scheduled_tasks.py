@@ -39,6 +39,11 @@ def initialize_schedules():
     schedule.every(10).minutes.do(run_with_app_context, check_system_health)
     logger.info("Scheduled system health check every 10 minutes")
     
+    # Keep the price trend rollups current; the nightly full refresh drops emptied buckets
+    schedule.every(5).minutes.do(run_with_app_context, refresh_price_rollups_task)
+    schedule.every().day.at("03:00").do(run_with_app_context, refresh_price_rollups_task, full=True)
+    logger.info("Scheduled price rollup refresh every 5 minutes (full refresh daily at 03:00)")
+    
     # Schedule report delivery based on settings
     schedule_reports()
     
@@ -270,6 +275,24 @@ def send_ai_feedback_report(report_type, recipients):
         logger.error(f"Error sending AI feedback report: {str(e)}")
         return False
 
+def refresh_price_rollups_task(full=False):
+    """
+    Refresh the price trend rollups.
+    
+    Args:
+        full (bool): Recompute every rollup bucket
+        
+    Returns:
+        bool: True if refreshed successfully, False otherwise
+    """
+    try:
+        from utils.price_rollups import refresh_price_rollups
+        refresh_price_rollups(full=full)
+        return True
+    except Exception as e:
+        logger.error(f"Error refreshing price rollups: {str(e)}")
+        return False
+
 def run_with_app_context(func, *args, **kwargs):
     """
     Run a function within the Flask app context.
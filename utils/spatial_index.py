@@ -0,0 +1,625 @@
+"""
+In-memory spatial index over property coordinates.
+
+The property map used to load every property_location row on each request.
+This module keeps the map points in a uniform latitude/longitude grid held
+in process memory, so bounding-box and radius queries only visit the grid
+cells they overlap and return at most ``limit`` points, whatever the size
+of the table. The index is loaded once and then refreshed incrementally
+from rows added or updated since the last refresh, with a periodic full
+rebuild to pick up deletions.
+
+For zoomed-out views the index also keeps per-geohash cluster aggregates
+(count, centroid and average price), maintained alongside the points, so
+a whole-state view returns a few hundred clusters instead of every marker.
+"""
+
+import heapq
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Grid cell size in degrees (0.05 is about 5.5 km north-south)
+CELL_SIZE = float(os.environ.get('MAP_INDEX_CELL_SIZE', '0.05'))
+
+# Seconds between incremental refreshes and between full rebuilds
+REFRESH_INTERVAL = float(os.environ.get('MAP_INDEX_REFRESH_SECONDS', '30'))
+FULL_REFRESH_INTERVAL = float(os.environ.get('MAP_INDEX_FULL_REFRESH_SECONDS', '3600'))
+
+# Zoom level from which individual points are returned instead of clusters
+CLUSTER_MAX_ZOOM = int(os.environ.get('MAP_CLUSTER_MAX_ZOOM', '14'))
+
+# Views with at most this many points are returned as points at any zoom
+CLUSTER_MIN_POINTS = int(os.environ.get('MAP_CLUSTER_MIN_POINTS', '200'))
+
+# Longest geohash kept for clustering (precision 7 cells are about 150 m)
+MAX_GEOHASH_PRECISION = 7
+
+# Target cluster cell width in screen pixels (a 256 px tile holds four)
+CLUSTER_CELL_PIXELS = 64
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+Cell = Tuple[int, int]
+
+_EXHAUSTED = object()
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GridIndex:
+    """
+    Uniform grid of points keyed by ID.
+
+    Each point is stored in the cell containing it; queries enumerate the
+    overlapping cells (or, for very large areas, the occupied cells) rather
+    than every point. All methods are thread-safe.
+    """
+
+    def __init__(self, cell_size: float = CELL_SIZE):
+        """
+        Initialize an empty index.
+
+        Args:
+            cell_size (float): Cell size in degrees
+        """
+        self.cell_size = cell_size
+        self._lock = threading.RLock()
+        self._cells: Dict[Cell, Dict[Hashable, Tuple[float, float, Any]]] = {}
+        self._where: Dict[Hashable, Cell] = {}
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def _cell(self, lat: float, lon: float) -> Cell:
+        return math.floor(lat / self.cell_size), math.floor(lon / self.cell_size)
+
+    def upsert(self, point_id: Hashable, lat: float, lon: float, data: Any = None):
+        """
+        Add a point or move/replace an existing one.
+
+        Args:
+            point_id: Unique point ID
+            lat (float): Latitude
+            lon (float): Longitude
+            data: Value returned by queries for this point
+        """
+        cell = self._cell(lat, lon)
+        with self._lock:
+            old_cell = self._where.get(point_id)
+            if old_cell is not None and old_cell != cell:
+                self._discard(point_id, old_cell)
+            self._cells.setdefault(cell, {})[point_id] = (lat, lon, data)
+            self._where[point_id] = cell
+
+    def remove(self, point_id: Hashable):
+        """Remove a point if present."""
+        with self._lock:
+            cell = self._where.pop(point_id, None)
+            if cell is not None:
+                self._discard(point_id, cell)
+
+    def _discard(self, point_id: Hashable, cell: Cell):
+        points = self._cells.get(cell)
+        if points is not None:
+            points.pop(point_id, None)
+            if not points:
+                del self._cells[cell]
+
+    def _cells_in(self, south: float, west: float, north: float, east: float) -> List[Cell]:
+        row_min, col_min = self._cell(south, west)
+        row_max, col_max = self._cell(north, east)
+        area = (row_max - row_min + 1) * (col_max - col_min + 1)
+        if area > len(self._cells):
+            return [cell for cell in self._cells
+                    if row_min <= cell[0] <= row_max and col_min <= cell[1] <= col_max]
+        return [(row, col) for row in range(row_min, row_max + 1) for col in range(col_min, col_max + 1)
+                if (row, col) in self._cells]
+
+    def bbox(self, south: float, west: float, north: float, east: float,
+             limit: Optional[int] = None) -> Tuple[List[Any], bool]:
+        """
+        Find the points inside a bounding box.
+
+        When more than ``limit`` points are inside, points are taken from the
+        overlapping cells in turn so the sample covers the whole box.
+
+        Args:
+            south, west, north, east (float): Box edges in degrees; west > east
+                means the box crosses the antimeridian
+            limit (int, optional): Maximum number of points
+
+        Returns:
+            Tuple[List[Any], bool]: Point data, and whether the result was truncated
+        """
+        if west > east:
+            west_part, west_truncated = self.bbox(south, west, north, 180.0, limit)
+            remaining = None if limit is None else max(limit - len(west_part), 0)
+            east_part, east_truncated = self.bbox(south, -180.0, north, east, remaining)
+            return west_part + east_part, west_truncated or east_truncated
+
+        with self._lock:
+            cells = [self._cells[cell] for cell in self._cells_in(south, west, north, east)]
+            streams = [
+                (data for lat, lon, data in points.values()
+                 if south <= lat <= north and west <= lon <= east)
+                for points in cells
+            ]
+            if limit is None:
+                return [data for stream in streams for data in stream], False
+
+            # Take points from each cell in turn so a dense cell cannot crowd out the rest
+            results = []
+            pending = streams
+            while pending and len(results) < limit:
+                active = []
+                for stream in pending:
+                    data = next(stream, _EXHAUSTED)
+                    if data is _EXHAUSTED:
+                        continue
+                    results.append(data)
+                    active.append(stream)
+                    if len(results) >= limit:
+                        break
+                pending = active
+            truncated = len(results) >= limit and any(
+                next(stream, _EXHAUSTED) is not _EXHAUSTED for stream in streams
+            )
+        return results, truncated
+
+    def nearby(self, lat: float, lon: float, radius_km: float,
+               limit: Optional[int] = None) -> List[Tuple[float, Any]]:
+        """
+        Find the points within a radius, nearest first.
+
+        Args:
+            lat (float): Centre latitude
+            lon (float): Centre longitude
+            radius_km (float): Radius in kilometres
+            limit (int, optional): Maximum number of points
+
+        Returns:
+            List[Tuple[float, Any]]: (distance in km, point data) pairs
+        """
+        d_lat = radius_km / KM_PER_DEGREE
+        cos_lat = math.cos(math.radians(lat))
+        d_lon = 180.0 if cos_lat < 1e-6 else min(radius_km / (KM_PER_DEGREE * cos_lat), 180.0)
+        south, north = max(lat - d_lat, -90.0), min(lat + d_lat, 90.0)
+
+        boxes = [(lon - d_lon, lon + d_lon)]
+        if lon - d_lon < -180.0:
+            boxes = [(-180.0, lon + d_lon), (lon - d_lon + 360.0, 180.0)]
+        elif lon + d_lon > 180.0:
+            boxes = [(lon - d_lon, 180.0), (-180.0, lon + d_lon - 360.0)]
+
+        matches = []
+        with self._lock:
+            for west, east in boxes:
+                for cell in self._cells_in(south, west, north, east):
+                    for point_lat, point_lon, data in self._cells[cell].values():
+                        distance = haversine_km(lat, lon, point_lat, point_lon)
+                        if distance <= radius_km:
+                            matches.append((distance, data))
+
+        if limit is not None:
+            return heapq.nsmallest(limit, matches, key=lambda match: match[0])
+        return sorted(matches, key=lambda match: match[0])
+
+
+_GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def encode_geohash(lat: float, lon: float, precision: int = MAX_GEOHASH_PRECISION) -> str:
+    """
+    Encode a coordinate as a geohash.
+
+    Args:
+        lat (float): Latitude
+        lon (float): Longitude
+        precision (int): Number of characters
+
+    Returns:
+        str: Geohash of the cell containing the point
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if lon >= mid:
+                value = (value << 1) | 1
+                lon_range[0] = mid
+            else:
+                value <<= 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if lat >= mid:
+                value = (value << 1) | 1
+                lat_range[0] = mid
+            else:
+                value <<= 1
+                lat_range[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_GEOHASH_BASE32[value])
+            bits = 0
+            value = 0
+    return ''.join(chars)
+
+
+def geohash_cell_size(precision: int) -> Tuple[float, float]:
+    """Get the (height, width) in degrees of a geohash cell."""
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** (bits - bits // 2)
+
+
+def precision_for_zoom(zoom: float) -> int:
+    """
+    Pick the geohash precision whose cells best match the cluster size at a zoom level.
+
+    Args:
+        zoom (float): Web map zoom level (0 shows the whole world in one 256 px tile)
+
+    Returns:
+        int: Geohash precision between 1 and MAX_GEOHASH_PRECISION
+    """
+    target = 360.0 / 2 ** zoom * CLUSTER_CELL_PIXELS / 256
+    return min(range(1, MAX_GEOHASH_PRECISION + 1),
+               key=lambda precision: abs(math.log(geohash_cell_size(precision)[1] / target)))
+
+
+def _geohash_cover(south: float, west: float, north: float, east: float, precision: int) -> Iterator[str]:
+    """Yield the geohashes of the cells overlapping a box (west <= east)."""
+    height, width = geohash_cell_size(precision)
+    row_min = max(math.floor((south + 90.0) / height), 0)
+    row_max = min(math.floor((north + 90.0) / height), round(180.0 / height) - 1)
+    col_min = max(math.floor((west + 180.0) / width), 0)
+    col_max = min(math.floor((east + 180.0) / width), round(360.0 / width) - 1)
+    for row in range(row_min, row_max + 1):
+        for col in range(col_min, col_max + 1):
+            yield encode_geohash(-90.0 + (row + 0.5) * height, -180.0 + (col + 0.5) * width, precision)
+
+
+class GeohashClusters:
+    """
+    Point counts, centroids and average prices per geohash cell.
+
+    Aggregates are kept for every precision up to MAX_GEOHASH_PRECISION and
+    updated as points are added, moved or removed, so a cluster query only
+    reads the cells in view. All methods are thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # precision -> geohash -> [count, lat_sum, lon_sum, price_sum, priced_count]
+        self._cells: Dict[int, Dict[str, List[float]]] = {
+            precision: {} for precision in range(1, MAX_GEOHASH_PRECISION + 1)
+        }
+        self._points: Dict[Hashable, Tuple[str, float, float, Optional[float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _add(self, geohash: str, lat: float, lon: float, price: Optional[float], sign: int):
+        for precision, cells in self._cells.items():
+            key = geohash[:precision]
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = [0, 0.0, 0.0, 0.0, 0]
+            cell[0] += sign
+            cell[1] += sign * lat
+            cell[2] += sign * lon
+            if price:
+                cell[3] += sign * price
+                cell[4] += sign
+            if cell[0] <= 0:
+                del cells[key]
+
+    def upsert(self, point_id: Hashable, lat: float, lon: float, price: Optional[float] = None):
+        """
+        Add a point or move/replace an existing one.
+
+        Args:
+            point_id: Unique point ID
+            lat (float): Latitude
+            lon (float): Longitude
+            price (float, optional): Price included in the cluster average
+        """
+        geohash = encode_geohash(lat, lon)
+        with self._lock:
+            self.remove(point_id)
+            self._points[point_id] = (geohash, lat, lon, price)
+            self._add(geohash, lat, lon, price, 1)
+
+    def remove(self, point_id: Hashable):
+        """Remove a point if present."""
+        with self._lock:
+            old = self._points.pop(point_id, None)
+            if old is not None:
+                self._add(*old, -1)
+
+    def clusters(self, south: float, west: float, north: float, east: float,
+                 precision: int) -> List[Dict[str, Any]]:
+        """
+        Get the clusters whose centroid is inside a bounding box.
+
+        Args:
+            south, west, north, east (float): Box edges in degrees; west > east
+                means the box crosses the antimeridian
+            precision (int): Geohash precision of the cluster cells
+
+        Returns:
+            List[Dict[str, Any]]: Clusters with geohash, count, latitude,
+                longitude (centroid) and avg_price
+        """
+        precision = max(1, min(precision, MAX_GEOHASH_PRECISION))
+        boxes = [(west, east)] if west <= east else [(west, 180.0), (-180.0, east)]
+        results = []
+        with self._lock:
+            cells = self._cells[precision]
+            for box_west, box_east in boxes:
+                height, width = geohash_cell_size(precision)
+                cover_size = ((north - south) / height + 2) * ((box_east - box_west) / width + 2)
+                if cover_size > len(cells):
+                    keys = list(cells)
+                else:
+                    keys = [key for key in _geohash_cover(south, box_west, north, box_east, precision)
+                            if key in cells]
+                for key in keys:
+                    count, lat_sum, lon_sum, price_sum, priced = cells[key]
+                    lat, lon = lat_sum / count, lon_sum / count
+                    if south <= lat <= north and box_west <= lon <= box_east:
+                        results.append({
+                            'geohash': key,
+                            'count': int(count),
+                            'latitude': round(lat, 6),
+                            'longitude': round(lon, 6),
+                            'avg_price': int(round(price_sum / priced)) if priced else None,
+                        })
+        return results
+
+
+def map_point(row: Any) -> Dict[str, Any]:
+    """
+    Format a property_location row as a map point.
+
+    Args:
+        row: Row or object with the property_location columns
+
+    Returns:
+        Dict[str, Any]: Map point, as returned by the map endpoints
+    """
+    return {
+        'id': row.id,
+        'latitude': row.latitude,
+        'longitude': row.longitude,
+        'address': row.address,
+        'price': row.price,
+        'property_type': row.property_type,
+        'bedrooms': row.bedrooms,
+        'bathrooms': row.bathrooms,
+        'square_feet': row.square_feet,
+        'price_per_sqft': int(row.price_value / row.square_feet) if row.price_value and row.square_feet else None,
+        'report_id': row.report_id,
+    }
+
+
+# Loader signature: (updated_since, after_id) -> rows changed since then
+# (all rows when both are None)
+Loader = Callable[[Optional[datetime], Optional[int]], Iterable[Any]]
+
+
+class PropertyMapIndex:
+    """
+    Property map points indexed in a GridIndex, with GeohashClusters
+    aggregates for zoomed-out views, kept in step with the database.
+    """
+
+    def __init__(self, loader: Loader, cell_size: float = CELL_SIZE,
+                 refresh_interval: float = REFRESH_INTERVAL,
+                 full_refresh_interval: float = FULL_REFRESH_INTERVAL, clock=time.monotonic):
+        """
+        Initialize the index; nothing is loaded until the first query.
+
+        Args:
+            loader (Loader): Returns property_location rows changed after
+                (updated_since, after_id); rows need id, latitude, longitude,
+                updated_at and the map_point() columns
+            cell_size (float): Grid cell size in degrees
+            refresh_interval (float): Seconds between incremental refreshes
+            full_refresh_interval (float): Seconds between full rebuilds
+            clock (callable): Monotonic time source
+        """
+        self.loader = loader
+        self.cell_size = cell_size
+        self.refresh_interval = refresh_interval
+        self.full_refresh_interval = full_refresh_interval
+        self.clock = clock
+        self.grid = GridIndex(cell_size)
+        self.clusters = GeohashClusters()
+        self._refresh_lock = threading.Lock()
+        self._loaded = False
+        self._last_refresh = 0.0
+        self._last_full_refresh = 0.0
+        self._updated_since: Optional[datetime] = None
+        self._max_id: Optional[int] = None
+
+    def _apply(self, grid: GridIndex, clusters: GeohashClusters, rows: Iterable[Any]) -> int:
+        count = 0
+        for row in rows:
+            count += 1
+            if row.latitude is None or row.longitude is None:
+                grid.remove(row.id)
+                clusters.remove(row.id)
+            else:
+                grid.upsert(row.id, row.latitude, row.longitude, map_point(row))
+                clusters.upsert(row.id, row.latitude, row.longitude, row.price_value)
+            if row.updated_at and (self._updated_since is None or row.updated_at > self._updated_since):
+                self._updated_since = row.updated_at
+            if self._max_id is None or row.id > self._max_id:
+                self._max_id = row.id
+        return count
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        Load changed rows into the index.
+
+        Args:
+            full (bool): Rebuild from every row (also drops deleted rows)
+
+        Returns:
+            int: Number of rows loaded
+        """
+        with self._refresh_lock:
+            if full or not self._loaded:
+                self._updated_since = None
+                self._max_id = None
+                grid = GridIndex(self.cell_size)
+                clusters = GeohashClusters()
+                count = self._apply(grid, clusters, self.loader(None, None))
+                # Readers switch to the new structures without waiting for the rebuild
+                self.grid, self.clusters = grid, clusters
+                self._loaded = True
+                self._last_full_refresh = self.clock()
+                logger.info(f"Built property map index: {len(grid)} points")
+            else:
+                count = self._apply(self.grid, self.clusters, self.loader(self._updated_since, self._max_id))
+                if count:
+                    logger.debug(f"Refreshed property map index: {count} changed rows")
+            self._last_refresh = self.clock()
+            return count
+
+    def ensure_fresh(self):
+        """Refresh the index if it is due; concurrent callers use the current index."""
+        now = self.clock()
+        if self._loaded and now - self._last_refresh < self.refresh_interval:
+            return
+        if self._loaded and self._refresh_lock.locked():
+            return
+        try:
+            self.refresh(full=self._loaded and now - self._last_full_refresh >= self.full_refresh_interval)
+        except Exception as e:
+            if not self._loaded:
+                raise
+            logger.error(f"Property map index refresh failed, serving previous data: {str(e)}")
+            self._last_refresh = now
+
+    def bbox(self, south: float, west: float, north: float, east: float,
+             limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """Find map points inside a bounding box (see GridIndex.bbox)."""
+        self.ensure_fresh()
+        return self.grid.bbox(south, west, north, east, limit)
+
+    def nearby(self, lat: float, lon: float, radius_km: float,
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find map points within a radius, nearest first.
+
+        Returns:
+            List[Dict[str, Any]]: Map points with a 'distance_km' field
+        """
+        self.ensure_fresh()
+        return [{**data, 'distance_km': round(distance, 3)}
+                for distance, data in self.grid.nearby(lat, lon, radius_km, limit)]
+
+    def view(self, south: float, west: float, north: float, east: float, zoom: float,
+             limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get what the map should draw for a viewport: clusters when zoomed
+        out, individual points when zoomed in or when few points are in view.
+
+        Args:
+            south, west, north, east (float): Viewport edges in degrees
+            zoom (float): Web map zoom level
+            limit (int, optional): Maximum number of points in points mode
+
+        Returns:
+            Dict[str, Any]: 'mode' ('clusters' or 'points'), 'data',
+                'truncated' and, for clusters, 'precision' and 'total'
+        """
+        self.ensure_fresh()
+        if zoom < CLUSTER_MAX_ZOOM:
+            precision = precision_for_zoom(zoom)
+            clusters = self.clusters.clusters(south, west, north, east, precision)
+            total = sum(cluster['count'] for cluster in clusters)
+            if total > CLUSTER_MIN_POINTS:
+                return {'mode': 'clusters', 'precision': precision, 'total': total,
+                        'truncated': False, 'data': clusters}
+        points, truncated = self.grid.bbox(south, west, north, east, limit)
+        return {'mode': 'points', 'truncated': truncated, 'data': points}
+
+    def status(self) -> Dict[str, Any]:
+        """Get the point count and refresh ages in seconds."""
+        now = self.clock()
+        return {
+            'points': len(self.grid),
+            'loaded': self._loaded,
+            'last_refresh_age': round(now - self._last_refresh, 1) if self._loaded else None,
+            'last_full_refresh_age': round(now - self._last_full_refresh, 1) if self._loaded else None,
+        }
+
+
+def load_property_locations(updated_since: Optional[datetime] = None,
+                            after_id: Optional[int] = None) -> Iterable[Any]:
+    """
+    Load property_location rows for the map index.
+
+    Args:
+        updated_since (datetime, optional): Only rows updated after this time...
+        after_id (int, optional): ...or added after this ID
+
+    Returns:
+        Iterable of rows with the map point columns
+    """
+    # Imported here so the index can be used without the Flask app
+    from sqlalchemy import or_
+    from app import db
+    from models import ModelsPropertyLocation as Location
+
+    query = db.session.query(
+        Location.id, Location.latitude, Location.longitude, Location.address, Location.price,
+        Location.price_value, Location.property_type, Location.bedrooms, Location.bathrooms,
+        Location.square_feet, Location.report_id, Location.updated_at
+    )
+    conditions = []
+    if updated_since is not None:
+        conditions.append(Location.updated_at > updated_since)
+    if after_id is not None:
+        conditions.append(Location.id > after_id)
+    if conditions:
+        query = query.filter(or_(*conditions))
+    return query.yield_per(5000)
+
+
+_property_map_index: Optional[PropertyMapIndex] = None
+_property_map_index_lock = threading.Lock()
+
+
+def get_property_map_index() -> PropertyMapIndex:
+    """Get the process-wide property map index."""
+    global _property_map_index
+    with _property_map_index_lock:
+        if _property_map_index is None:
+            _property_map_index = PropertyMapIndex(load_property_locations)
+        return _property_map_index